@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Task, Notification
+from .models import Task, Notification, InstallerScorecard
 
 admin.site.register(Task)
 
@@ -13,3 +13,14 @@ class NotificationAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('user', 'related_installation')
+
+
+@admin.register(InstallerScorecard)
+class InstallerScorecardAdmin(admin.ModelAdmin):
+    list_display = ('installer', 'offered', 'accepted', 'rejected', 'expired', 'completed', 'updated_at')
+    search_fields = ('installer__username',)
+    readonly_fields = [field.name for field in InstallerScorecard._meta.fields]
+    ordering = ('installer__username',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('installer')
@@ -0,0 +1,109 @@
+# accounts/asset_build.py
+"""
+Offline build of the stylesheet and script bundle the pages load.
+
+Sources live in accounts/assets/; `manage.py build_assets` writes
+accounts/static/accounts/build/app.css and app.js, which are committed so a
+deploy needs no Node or network access, only `collectstatic` (hashed
+names and .gz/.br variants, see accounts/static_storage.py).
+
+app.css is the preflight reset, the Tailwind utilities the project uses
+(accounts/utility_css.py) and the project's own rules, minified. The
+utilities are found by scanning the templates, the scripts and the Python
+code (forms set widget classes), so a class is only shipped if it appears
+somewhere in CONTENT.
+"""
+import re
+from pathlib import Path
+
+from . import utility_css
+
+APP_DIR = Path(__file__).resolve().parent
+ASSETS_DIR = APP_DIR / 'assets'
+BUILD_DIR = APP_DIR / 'static' / 'accounts' / 'build'
+
+# Files scanned for class names, relative to the app directory
+CONTENT = ['templates/**/*.html', 'jinja2/**/*.html', 'assets/js/*.js', '**/*.py']
+CONTENT_EXCLUDE = ['migrations', 'tests.py', 'asset_build.py', 'utility_css.py']
+
+CSS_SOURCES = ['css/preflight.css', '@utilities', 'css/app.css']
+JS_SOURCES = ['js/profile_menu.js', 'js/notifications.js']
+
+
+def content_files():
+    files = set()
+    for pattern in CONTENT:
+        for path in APP_DIR.glob(pattern):
+            relative = path.relative_to(APP_DIR)
+            if not any(part in CONTENT_EXCLUDE for part in relative.parts):
+                files.add(path)
+    return sorted(files)
+
+
+def collect_candidates():
+    candidates = set()
+    for path in content_files():
+        candidates |= utility_css.extract_candidates(path.read_text(encoding='utf-8'))
+    return candidates
+
+
+def unsupported_utilities():
+    """
+    Class names in CONTENT that look like Tailwind utilities but compile to
+    nothing (see utility_css.unsupported).
+    """
+    return utility_css.unsupported(collect_candidates())
+
+
+def minify_css(css):
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    # Empty custom properties (`--tw-ring-inset: ;`) need their space
+    css = re.sub(r'(--[\w-]+):(?=[;}])', r'\1: ', css)
+    return css.replace(';}', '}').strip() + '\n'
+
+
+def minify_js(js):
+    """
+    Drop comment lines, indentation and blank lines. Deliberately
+    conservative: statements and string contents are left untouched.
+    """
+    lines = (line.strip() for line in js.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//')) + '\n'
+
+
+def build():
+    """
+    Returns:
+        dict: Output file name -> (contents, list of the utilities compiled)
+    """
+    utilities, names = utility_css.generate(collect_candidates())
+    css = ''.join(
+        utilities if source == '@utilities' else (ASSETS_DIR / source).read_text(encoding='utf-8')
+        for source in CSS_SOURCES
+    )
+    js = ''.join((ASSETS_DIR / source).read_text(encoding='utf-8') for source in JS_SOURCES)
+    return {
+        'app.css': (minify_css(css), names),
+        'app.js': (minify_js(js), []),
+    }
+
+
+def stale_outputs(outputs):
+    """
+    Names of the outputs whose file in BUILD_DIR differs from `outputs`.
+    """
+    stale = []
+    for name, (contents, _) in outputs.items():
+        path = BUILD_DIR / name
+        if not path.exists() or path.read_text(encoding='utf-8') != contents:
+            stale.append(name)
+    return stale
+
+
+def write_outputs(outputs):
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    for name, (contents, _) in outputs.items():
+        (BUILD_DIR / name).write_text(contents, encoding='utf-8')
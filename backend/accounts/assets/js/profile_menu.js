@@ -0,0 +1,16 @@
+// accounts/assets/js/profile_menu.js
+// Header profile dropdown (base.html).
+const profileButton = document.getElementById('profile-button');
+const profileMenu = document.getElementById('profile-menu');
+
+// Toggle dropdown on button click
+profileButton.addEventListener('click', () => {
+    profileMenu.classList.toggle('hidden');
+});
+
+// Close dropdown when clicking outside
+window.addEventListener('click', (event) => {
+    if (!profileButton.contains(event.target) && !profileMenu.contains(event.target)) {
+        profileMenu.classList.add('hidden');
+    }
+});
@@ -0,0 +1,183 @@
+# accounts/blob_storage.py
+"""
+Content-addressed storage for certificates and task documents.
+
+Files are stored once under the SHA-256 of their content
+(blobs/ab/cd/<sha256>.pdf) on top of STORAGES['default']. Saving hashes the
+file as it streams; if a blob with that content already exists, the write
+to object storage is skipped and the existing key returned, so a repeated
+submission costs one database lookup instead of an upload.
+
+Each StoredBlob counts the file fields that point at it (kept current by
+the signals in accounts/signals.py); `manage.py gc_blobs` deletes blobs
+that are no longer referenced. Files saved before this storage was in use
+keep their names and are left alone.
+"""
+import hashlib
+import os
+from collections import Counter
+
+from django.apps import apps
+from django.core.files import File
+from django.core.files.storage import Storage, storages
+from django.db.models import F, FileField
+from django.utils import timezone
+
+BLOB_PREFIX = 'blobs/'
+
+
+def get_stored_blob_model():
+    return apps.get_model('accounts', 'StoredBlob')
+
+
+def hash_content(content):
+    """
+    SHA-256 and size of a file, read in chunks and rewound afterwards.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in content.chunks():
+        digest.update(chunk)
+        size += len(chunk)
+    content.seek(0)
+    return digest.hexdigest(), size
+
+
+class ContentAddressedStorage(Storage):
+    """
+    Stores each distinct file once, keyed by its content hash, in the
+    storage configured as STORAGES[backend_alias]. Reads, URLs and deletes
+    go straight to that storage.
+    """
+
+    def __init__(self, backend_alias='default'):
+        self.backend_alias = backend_alias
+
+    @property
+    def backend(self):
+        # Looked up on use so a changed STORAGES setting (e.g. in tests) applies
+        return storages[self.backend_alias]
+
+    @staticmethod
+    def blob_name(sha256, name):
+        # The extension is kept so object storage serves the right content type
+        extension = os.path.splitext(name or '')[1].lower()
+        return f'{BLOB_PREFIX}{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}'
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        StoredBlob = get_stored_blob_model()
+        sha256, size = hash_content(content)
+        key = self.blob_name(sha256, name)
+        # Touching the blob also keeps gc_blobs away from it until the field
+        # that is about to reference it has been saved
+        if StoredBlob.objects.filter(name=key).update(updated_at=timezone.now()):
+            return key
+
+        if not self.backend.exists(key):
+            key = self.backend.save(key, content, max_length=max_length)
+        StoredBlob.objects.get_or_create(name=key, defaults={'sha256': sha256, 'size': size})
+        return key
+
+    # -----------------------------------------------
+    # Delegated to the backend
+    # -----------------------------------------------
+    def _open(self, name, mode='rb'):
+        return self.backend.open(name, mode)
+
+    def delete(self, name):
+        return self.backend.delete(name)
+
+    def exists(self, name):
+        return self.backend.exists(name)
+
+    def listdir(self, path):
+        return self.backend.listdir(path)
+
+    def size(self, name):
+        return self.backend.size(name)
+
+    def url(self, name):
+        return self.backend.url(name)
+
+    def path(self, name):
+        return self.backend.path(name)
+
+    def get_accessed_time(self, name):
+        return self.backend.get_accessed_time(name)
+
+    def get_created_time(self, name):
+        return self.backend.get_created_time(name)
+
+    def get_modified_time(self, name):
+        return self.backend.get_modified_time(name)
+
+
+blob_storage = ContentAddressedStorage()
+
+
+def get_blob_storage():
+    """
+    Storage callable for FileField(storage=...), so migrations refer to this
+    function instead of serializing the storage.
+    """
+    return blob_storage
+
+
+# -----------------------------------------------
+# Reference counting
+# -----------------------------------------------
+def blob_field_names(model):
+    """
+    Names of the model's file fields stored through blob_storage.
+    """
+    return tuple(
+        field.name for field in model._meta.concrete_fields
+        if isinstance(field, FileField) and field.storage is blob_storage
+    )
+
+
+def blob_refs(instance, field_names=None):
+    """
+    Count the blobs an instance's file fields point at.
+
+    Returns:
+        Counter: Blob name -> number of fields referencing it
+    """
+    field_names = field_names or blob_field_names(type(instance))
+    names = (getattr(instance, field_name).name for field_name in field_names)
+    return Counter(name for name in names if name and name.startswith(BLOB_PREFIX))
+
+
+def adjust_blob_refs(added, removed):
+    """
+    Apply reference changes (Counters of blob name -> count) to StoredBlob.
+    """
+    StoredBlob = get_stored_blob_model()
+    changes = Counter(added)
+    changes.subtract(removed)
+    now = timezone.now()
+    for name, delta in changes.items():
+        if delta:
+            StoredBlob.objects.filter(name=name).update(ref_count=F('ref_count') + delta, updated_at=now)
+
+
+def count_blob_refs():
+    """
+    Count blob references by scanning every blob-backed file field.
+
+    Returns:
+        Counter: Blob name -> number of fields referencing it
+    """
+    counts = Counter()
+    for model in apps.get_app_config('accounts').get_models():
+        field_names = blob_field_names(model)
+        if not field_names:
+            continue
+        for row in model._default_manager.values_list(*field_names).iterator():
+            counts.update(name for name in row if name and name.startswith(BLOB_PREFIX))
+    return counts
@@ -0,0 +1,289 @@
+# accounts/chunked_uploads.py
+"""
+Resumable chunked uploads for task documents and certificates.
+
+A multipart POST buffers the whole file through Django's upload handlers
+and starts again from zero when a mobile connection drops. Here the client
+sends the file in pieces instead:
+
+    POST   /auth/uploads/                {target, filename, size}  -> {id, chunk_size, offset}
+    PUT    /auth/uploads/<id>/           one chunk, Content-Range: bytes <start>-<end>/<size>
+    GET    /auth/uploads/<id>/           -> {offset, size}; where to resume after a drop
+    POST   /auth/uploads/<id>/finalize/  attach the file ({task_id} for a task document)
+
+Each chunk is streamed from the request straight into a staging file at its
+offset, so memory per upload is one copy buffer whatever the file size.
+Bytes that arrived before a connection dropped are kept. Finalized
+certificates go through the background upload queue
+(accounts/upload_queue.py); task documents are saved to the field's storage.
+Sessions nobody finishes are removed by `manage.py process_uploads`.
+"""
+import os
+import re
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .models import InstallerProfile, Task, UploadSession
+from .upload_queue import get_staging_dir, queue_staged_certificate, remove_staged_file
+
+# Defaults for settings.CHUNKED_UPLOADS
+DEFAULT_CHUNKED_UPLOADS = {
+    'CHUNK_SIZE': 2 * 1024 * 1024,       # Largest chunk a PUT may carry
+    'MAX_SIZE': 100 * 1024 * 1024,       # Largest file a session accepts
+    'EXPIRE_HOURS': 24,                  # Unfinished sessions idle this long are removed
+}
+
+COPY_BUFFER_SIZE = 64 * 1024
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+
+def get_chunked_upload_settings():
+    return {**DEFAULT_CHUNKED_UPLOADS, **getattr(settings, 'CHUNKED_UPLOADS', {})}
+
+
+class ChunkedUploadError(Exception):
+    """
+    A request the upload protocol rejects. `status` is the HTTP status to
+    answer with; `offset`, when set, is where the client should resume.
+    """
+
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+def parse_content_range(header):
+    """
+    Returns:
+        tuple: (start, end, total) from 'bytes <start>-<end>/<total>'
+    """
+    match = CONTENT_RANGE_RE.match(header or '')
+    if not match:
+        raise ChunkedUploadError("Content-Range must be 'bytes <start>-<end>/<size>'.")
+    start, end, total = (int(value) for value in match.groups())
+    if end < start:
+        raise ChunkedUploadError("Content-Range end is before its start.")
+    return start, end, total
+
+
+def check_target(user, target):
+    """
+    Raises:
+        ChunkedUploadError: The user may not upload to this target
+    """
+    if target == 'task_document':
+        if user.role != '1':
+            raise ChunkedUploadError("Only admins can upload task documents.", status=403)
+    elif target in InstallerProfile.CERTIFICATE_FIELDS:
+        if user.role != '2' or not InstallerProfile.objects.filter(user=user).exists():
+            raise ChunkedUploadError("Only installers can upload certificates.", status=403)
+    else:
+        raise ChunkedUploadError(f"Unknown upload target {target!r}.")
+
+
+def start_session(user, target, filename, size):
+    """
+    Open an upload session with an empty staging file.
+
+    Returns:
+        UploadSession: The new session
+    """
+    check_target(user, target)
+    config = get_chunked_upload_settings()
+    filename = os.path.basename(filename or '')
+    if not filename:
+        raise ChunkedUploadError("A filename is required.")
+    if size <= 0:
+        raise ChunkedUploadError("The file is empty.")
+    if size > config['MAX_SIZE']:
+        raise ChunkedUploadError(f"Files can be at most {config['MAX_SIZE'] // (1024 * 1024)} MiB.", status=413)
+
+    extension = os.path.splitext(filename)[1].lower()
+    staged_path = os.path.join(get_staging_dir(), f'chunked-{uuid.uuid4().hex}{extension}')
+    open(staged_path, 'wb').close()
+    try:
+        return UploadSession.objects.create(
+            user=user, target=target, original_name=filename, size=size, staged_path=staged_path,
+        )
+    except Exception:
+        remove_staged_file(staged_path)
+        raise
+
+
+@contextmanager
+def locked_staged_file(path):
+    """
+    Open a staged file for writing, holding an exclusive lock on it, so PUTs
+    to the same session take turns. The lock is per open file, so it also
+    serializes threads of one process.
+    """
+    with open(path, 'r+b') as staged:
+        if fcntl is not None:
+            fcntl.flock(staged.fileno(), fcntl.LOCK_EX)  # Released when the file is closed
+            yield staged
+            return
+        staged.seek(0)
+        msvcrt.locking(staged.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield staged
+        finally:
+            staged.seek(0)
+            msvcrt.locking(staged.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def write_chunk(session_id, start, end, total, stream):
+    """
+    Write one chunk, read from `stream` in small pieces, at its offset.
+
+    The chunk must start where the previous one ended. If the stream ends
+    early, the bytes that did arrive are kept and the error carries the
+    offset to resume from.
+
+    No database lock is held while the request body is read. PUTs to the
+    same session take turns on a lock on the staged file, and each checks
+    the offset again once it holds it: of two PUTs racing for the same
+    offset (a client retrying a chunk) one writes, and the other gets a 409
+    with the offset to resume from without touching the file.
+
+    Returns:
+        UploadSession: The session with its new offset
+    """
+    length = end - start + 1
+    session = UploadSession.objects.get(pk=session_id)
+    if total != session.size:
+        raise ChunkedUploadError("Content-Range size does not match the session.")
+    if start != session.offset:
+        raise ChunkedUploadError("Chunk does not start at the current offset.", status=409, offset=session.offset)
+    if length > get_chunked_upload_settings()['CHUNK_SIZE']:
+        raise ChunkedUploadError("Chunk is larger than the chunk size.", status=413, offset=session.offset)
+    if end >= session.size:
+        raise ChunkedUploadError("Chunk runs past the end of the file.", offset=session.offset)
+
+    received = 0
+    with locked_staged_file(session.staged_path) as staged:
+        current = UploadSession.objects.filter(pk=session.pk).values_list('offset', flat=True).first()
+        if current != start:
+            # Another PUT of this chunk got the lock first
+            raise ChunkedUploadError("Chunk does not start at the current offset.", status=409, offset=current)
+
+        staged.seek(start)
+        staged.truncate()  # Drop anything past the offset from an earlier attempt
+        while received < length:
+            piece = stream.read(min(COPY_BUFFER_SIZE, length - received))
+            if not piece:
+                break
+            staged.write(piece)
+            received += len(piece)
+        staged.flush()
+
+        # Still under the lock, so the offset always matches the file
+        session.offset, session.updated_at = start + received, timezone.now()
+        UploadSession.objects.filter(pk=session.pk, offset=start).update(
+            offset=session.offset, updated_at=session.updated_at,
+        )
+
+    if received < length:
+        raise ChunkedUploadError("Chunk ended early.", offset=session.offset)
+    return session
+
+
+def finalize(session_id, user, task_id=None):
+    """
+    Attach a completely received file to its target field and close the
+    session. Certificates go to the user's own profile through the upload
+    queue; task documents to the task `task_id`.
+
+    The file is stored before any transaction starts, so hashing and the
+    storage PUT never hold the database write lock; the transaction that
+    follows only claims the session and sets the field.
+
+    Returns:
+        object: The CertificateUpload (certificates) or Task (documents)
+    """
+    session = UploadSession.objects.get(pk=session_id, user=user)
+    check_target(user, session.target)
+    if not session.is_complete:
+        raise ChunkedUploadError("The upload is not complete.", status=409, offset=session.offset)
+    check_staged_size(session)
+
+    if session.target == 'task_document':
+        task = Task.objects.get(pk=task_id)
+        # A blob stored here but never referenced (e.g. a lost race below)
+        # is collected by gc_blobs
+        with open(session.staged_path, 'rb') as staged:
+            task.document.save(session.original_name, File(staged, name=session.original_name), save=False)
+        with transaction.atomic():
+            claim_session(session)
+            task.save(update_fields=['document'])
+        remove_staged_file(session.staged_path)
+        return task
+
+    profile = InstallerProfile.objects.get(user=user)
+    error = None
+    with transaction.atomic():
+        claim_session(session)
+        try:
+            # The queue takes over the staged file
+            upload = queue_staged_certificate(profile, session.target, session.staged_path, session.original_name)
+        except Exception as exc:
+            # The queue has removed the staged file, so keep the session
+            # deleted: resuming would point at a file that is gone
+            error = exc
+    if error is not None:
+        raise error
+    return upload
+
+
+def check_staged_size(session):
+    """
+    Make sure the staged file holds exactly the bytes the session counted.
+    If it does not (e.g. the disk lost writes in a crash), the session is
+    rewound to what is on disk and the error says where to resume.
+    """
+    with locked_staged_file(session.staged_path) as staged:
+        staged_size = staged.seek(0, os.SEEK_END)
+        if staged_size == session.size:
+            return
+        resume_at = staged_size if staged_size < session.size else 0
+        staged.truncate(resume_at)
+        UploadSession.objects.filter(pk=session.pk).update(offset=resume_at, updated_at=timezone.now())
+    raise ChunkedUploadError("The received file does not match its size.", status=409, offset=resume_at)
+
+
+def claim_session(session):
+    """
+    Delete a session being finalized; of two concurrent finalizes of the
+    same session, only one gets past this.
+    """
+    if not UploadSession.objects.filter(pk=session.pk).delete()[0]:
+        raise ChunkedUploadError("The upload has already been finalized.", status=409)
+
+
+def expire_sessions(hours=None):
+    """
+    Delete sessions idle for longer than EXPIRE_HOURS, with their staged files.
+
+    Returns:
+        int: Sessions removed
+    """
+    hours = get_chunked_upload_settings()['EXPIRE_HOURS'] if hours is None else hours
+    cutoff = timezone.now() - timedelta(hours=hours)
+    expired = 0
+    for session in UploadSession.objects.filter(updated_at__lt=cutoff).iterator():
+        if UploadSession.objects.filter(pk=session.pk, updated_at__lt=cutoff).delete()[0]:
+            remove_staged_file(session.staged_path)
+            expired += 1
+    return expired
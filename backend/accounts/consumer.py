@@ -1,17 +1,31 @@
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 
-class MyConsumer(AsyncWebsocketConsumer):
+# Group every admin socket joins; views group_send task notifications to it
+ADMINS_GROUP = "admins"
+
+
+class AdminNotificationConsumer(AsyncWebsocketConsumer):
     async def connect(self):
-        await self.channel_layer.group_add("admins", self.channel_name)
+        user = self.scope.get("user")
+        if user is None or not user.is_authenticated:
+            await self.close()
+            return
+
+        # Installers may connect (base.html opens the socket on every page)
+        # but only admins receive the admin broadcasts
+        self.groups_joined = []
+        if user.role == '1':
+            await self.channel_layer.group_add(ADMINS_GROUP, self.channel_name)
+            self.groups_joined.append(ADMINS_GROUP)
         await self.accept()
 
     async def disconnect(self, close_code):
-        await self.channel_layer.group_discard("admins", self.channel_name)
+        for group in getattr(self, "groups_joined", []):
+            await self.channel_layer.group_discard(group, self.channel_name)
 
     async def send_notification(self, event):  # 👈 matches "type" in group_send
         await self.send(text_data=json.dumps({
             "message": event["message"],
             "timestamp": event["timestamp"]
         }))
-
@@ -1,17 +1,24 @@
+from django.db.models import Count, Q
+
+from .db_router import reporting_reads
 from .models import Task
 from .models import Installation
 from .models import InstallerProfile
+from .services import InstallationService
 
+@reporting_reads()
 def task_metrics(request):
     if not request.user.is_authenticated:
         return {}
 
-    tasks = Task.objects.all()
-
-    total_tasks = tasks.count()
-    in_progress = tasks.filter(status="In Progress").count()
-    pending = tasks.filter(status="Pending").count()
-    completed = tasks.filter(status="Completed").count()
+    counts = Task.objects.aggregate(
+        total=Count('pk'),
+        in_progress=Count('pk', filter=Q(status="In Progress")),
+        pending=Count('pk', filter=Q(status="Pending")),
+        completed=Count('pk', filter=Q(status="Completed")),
+    )
+    total_tasks, in_progress = counts['total'], counts['in_progress']
+    pending, completed = counts['pending'], counts['completed']
     completion_rate = int((completed / total_tasks) * 100) if total_tasks > 0 else 0
 
     return {
@@ -22,6 +29,7 @@ def task_metrics(request):
     }
 
 
+@reporting_reads()
 def installer_task_metrics(request):
     # Ensure the user is authenticated before proceeding.
     if not request.user.is_authenticated:
@@ -38,33 +46,9 @@ def installer_task_metrics(request):
     # Filter installations by the current installer's profile.
     installations = Installation.objects.filter(installer=installer_profile)
 
-    # Calculate the total number of tasks assigned to the installer.
-    total_tasks = installations.count()
-
-    # Count tasks with 'IN_PROGRESS' status.
-    # This aligns with ('IN_PROGRESS', 'In Progress') in STATUS_CHOICES.
-    in_progress = installations.filter(status="IN_PROGRESS").count()
-
-    # Count tasks with 'PENDING_ACCEPTANCE' status for 'pending' tasks.
-    # This replaces the old "Scheduled" which wasn't in STATUS_CHOICES and
-    # assumes 'PENDING_ACCEPTANCE' is the new equivalent for tasks awaiting action.
-    pending = installations.filter(status="PENDING_ACCEPTANCE").count()
-
-    # Count tasks with 'COMPLETED' status.
-    # This aligns with ('COMPLETED', 'Completed') in STATUS_CHOICES.
-    completed = installations.filter(status="COMPLETED").count()
-
-    # Calculate the completion rate. Avoid division by zero.
-    completion_rate = int((completed / total_tasks) * 100) if total_tasks > 0 else 0
-
-    # Return a dictionary containing the calculated metrics.
-    return {
-        'total_tasks': total_tasks,
-        'in_progress': in_progress,
-        'pending': pending,
-        'completed' : completed,
-        'completion_rate': completion_rate,
-    }
+    # Total, IN_PROGRESS, PENDING_ACCEPTANCE ('pending') and COMPLETED counts
+    # plus the completion rate, in one query.
+    return InstallationService.calculate_installer_stats(installations)
 
 def current_company(request):
     if not request.user.is_authenticated:
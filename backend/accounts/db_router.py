@@ -0,0 +1,171 @@
+# accounts/db_router.py
+"""
+Routes heavy reads (dashboard KPIs, statistics, list pages) to a reporting
+database so they stop competing with transactional writes.
+
+Reads only go to the reporting alias inside `reporting_reads()`; everything
+else keeps using the default database. A request that writes pins its user
+to the default database for PIN_SECONDS (a cookie set by
+ReadYourWritesMiddleware), so people see their own changes straight away.
+
+The reporting alias may be a Postgres replica, or a second SQLite file kept
+current with `manage.py refresh_reporting_db` (the SQLite online backup
+API). Until that file exists, reads fall back to the default database.
+
+Anything that fills a shared cache should read inside `primary_reads()`:
+a lagging copy would otherwise be cached for everyone.
+"""
+import contextvars
+import os
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Defaults for settings.REPORTING_DATABASE
+DEFAULT_REPORTING_DATABASE = {
+    'ALIAS': 'reporting',
+    'PIN_SECONDS': 10,              # Read-your-writes window after a write
+    'PIN_COOKIE': 'reporting_pin',
+    'PINNED_APPS': ['accounts'],    # Writes to these apps pin the user (not e.g. session saves)
+}
+
+# False outside reporting_reads(); inside, the reporting alias resolved when
+# the outermost block was entered, or None to read from the default database
+_reporting = contextvars.ContextVar('reporting_reads', default=False)
+# Read-your-writes state of the request being handled, see ReadYourWritesMiddleware
+current_pin = contextvars.ContextVar('reporting_pin', default=None)
+
+
+def get_reporting_settings():
+    return {**DEFAULT_REPORTING_DATABASE, **getattr(settings, 'REPORTING_DATABASE', {})}
+
+
+class RequestPin:
+    """
+    Whether the current request must read from the default database: the
+    user wrote recently (pinned) or has written during this request.
+    """
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+    @property
+    def active(self):
+        return self.pinned or self.wrote
+
+
+@contextmanager
+def reporting_reads():
+    """
+    Send reads made in this block (or, as a decorator, in this function) to
+    the reporting database. Querysets are routed when they are evaluated,
+    so decorate the view that renders them, not the code that builds them.
+
+    The alias is resolved once, when the outermost block is entered, so a
+    request does not check the reporting copy on every query.
+    """
+    alias = _reporting.get()
+    token = _reporting.set(reporting_alias() if alias is False else alias)
+    try:
+        yield
+    finally:
+        _reporting.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """
+    Read from the default database in this block, even inside (or around)
+    reporting_reads(). Use it for reads whose result is cached.
+    """
+    token = _reporting.set(None)
+    try:
+        yield
+    finally:
+        _reporting.reset(token)
+
+
+def reporting_alias():
+    """
+    The reporting alias if it is configured and ready to be read, else None.
+    """
+    alias = get_reporting_settings()['ALIAS']
+    if alias not in settings.DATABASES:
+        return None
+    connection = connections[alias]
+    if connection.vendor == 'sqlite':
+        # The copy only exists once refresh_reporting_db has run; test runs
+        # mirror it onto the (in-memory) default database
+        if connection.is_in_memory_db() or not os.path.exists(connection.settings_dict['NAME']):
+            return None
+    return alias
+
+
+class ReportingRouter:
+    """
+    Database router for the reporting alias, see the module docstring.
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            # Related lookups stay on the database the instance came from
+            return instance._state.db
+        alias = _reporting.get()
+        if not alias:
+            return None
+        pin = current_pin.get()
+        if pin is not None and pin.active:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        pin = current_pin.get()
+        if pin is not None and model._meta.app_label in get_reporting_settings()['PINNED_APPS']:
+            pin.wrote = True
+        # Instances read from the reporting copy are saved to the primary
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db == get_reporting_settings()['ALIAS']:
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, get_reporting_settings()['ALIAS']}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The copy (or replica) gets its schema from the primary
+        if db == get_reporting_settings()['ALIAS']:
+            return False
+        return None
+
+
+def refresh_sqlite_copy(source_alias=DEFAULT_DB_ALIAS, target_alias=None, pages=-1):
+    """
+    Copy a SQLite database into the reporting file with the online backup
+    API. Writers on the source are only held up while pages are read; readers
+    of the copy keep their snapshot until the copy step commits.
+
+    Args:
+        source_alias (str): Database to copy from
+        target_alias (str): Reporting alias (defaults to REPORTING_DATABASE['ALIAS'])
+        pages (int): Pages per backup step; -1 copies everything in one step
+
+    Returns:
+        int: Size of the copy in pages
+    """
+    target_alias = target_alias or get_reporting_settings()['ALIAS']
+    source, target = connections[source_alias], connections[target_alias]
+    if source.vendor != 'sqlite' or target.vendor != 'sqlite':
+        raise ValueError("Only SQLite databases can be copied; a Postgres replica is kept current by replication.")
+
+    source.ensure_connection()
+    target.ensure_connection()
+    source.connection.backup(target.connection, pages=pages)
+    with target.cursor() as cursor:
+        cursor.execute('PRAGMA page_count')
+        return cursor.fetchone()[0]
@@ -0,0 +1,54 @@
+# accounts/forms/fields.py
+from django import forms
+from django.forms.models import ModelChoiceIterator
+
+from ..reference_data import reference_data
+
+
+class ReferenceDataChoiceIterator(ModelChoiceIterator):
+    """
+    Builds <select> options from the in-process reference data registry
+    instead of evaluating the field's queryset on every render.
+    """
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for obj in reference_data.all(self.field.reference_table):
+            yield self.choice(obj)
+
+    def __len__(self):
+        return len(reference_data.all(self.field.reference_table)) + (1 if self.field.empty_label is not None else 0)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(reference_data.all(self.field.reference_table))
+
+
+class ReferenceDataChoiceField(forms.ModelChoiceField):
+    """
+    A ModelChoiceField whose choices and validation are served from a
+    reference data table (see accounts.reference_data) rather than the database.
+
+    Args:
+        reference_table (str): Name of the registry table holding the choices
+        queryset: Kept for model introspection only; it is never evaluated
+    """
+    iterator = ReferenceDataChoiceIterator
+
+    def __init__(self, reference_table, queryset, **kwargs):
+        self.reference_table = reference_table
+        super().__init__(queryset, **kwargs)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        if isinstance(value, self.queryset.model):
+            value = value.pk
+        obj = reference_data.get(self.reference_table, value)
+        if obj is None:
+            raise forms.ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+        return obj
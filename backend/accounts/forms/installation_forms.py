@@ -10,6 +10,8 @@ User = get_user_model()
 # ----------------------------
 from django import forms
 from accounts.models import Installation, Customer, ChargerModel, InstallerProfile
+from .fields import ReferenceDataChoiceField
+from .widgets import AutocompleteSelect
 
 class InstallationForm(forms.ModelForm):
     """
@@ -41,30 +43,35 @@ class InstallationForm(forms.ModelForm):
     postcode = forms.CharField(max_length=10, label='Postcode')
 
     # Installation Fields (Directly from Installation model)
-    charger_model = forms.ModelChoiceField(
+    # Choices are validated against the in-process reference data registry and
+    # searched through the autocomplete endpoints instead of full dropdowns
+    charger_model = ReferenceDataChoiceField(
+        'charger_models',
         queryset=ChargerModel.objects.all(),
         empty_label='Choose Charger Model',
         label='Charger Model',
-        widget=forms.Select(attrs={'class': 'w-9/12 bg-[#222222] text-white text-sm rounded-md p-3 border border-[#2c2c2c] focus:ring-0 focus:border-[#2c2c2c] focus:outline-none'}),
+        widget=AutocompleteSelect('charger_model_autocomplete', attrs={'class': 'w-9/12 bg-[#222222] text-white text-sm rounded-md p-3 border border-[#2c2c2c] focus:ring-0 focus:border-[#2c2c2c] focus:outline-none'}),
     )
     
     # Installer dropdown (optional) - InstallerProfile ForeignKey on Installation
-    installer = forms.ModelChoiceField(
+    installer = ReferenceDataChoiceField(
+        'installer_profiles',
         queryset=InstallerProfile.objects.all(),
         required=False, # This is correctly set to False here
         empty_label='Choose Installer Company (Optional)',
         label='Installer Company',
-        widget=forms.Select(attrs={'class': 'w-9/12 bg-[#222222] text-white text-sm rounded-md p-3 border border-[#2c2c2c] focus:ring-0 focus:border-[#2c2c2c] focus:outline-none'}),
+        widget=AutocompleteSelect('installer_autocomplete', value_key='profile_id', attrs={'class': 'w-9/12 bg-[#222222] text-white text-sm rounded-md p-3 border border-[#2c2c2c] focus:ring-0 focus:border-[#2c2c2c] focus:outline-none'}),
     )
 
     # Assigned Installer (CustomUser) - AssignedInstaller ForeignKey on Installation
     # This field is crucial for the notification system as it links to CustomUser
-    assigned_installer = forms.ModelChoiceField(
+    assigned_installer = ReferenceDataChoiceField(
+        'installer_users',
         queryset=CustomUser.objects.filter(role='2').order_by('username'), # Filter for installer users
         required=False, # This is also optional at creation
         empty_label="Choose Installer User (Optional)",
         label="Assign Installer User Account",
-        widget=forms.Select(attrs={'class': 'w-9/12 bg-[#222222] text-white text-sm rounded-md p-3 border border-[#2c2c2c] focus:ring-0 focus:border-[#2c2c2c] focus:outline-none'})
+        widget=AutocompleteSelect('installer_autocomplete', attrs={'class': 'w-9/12 bg-[#222222] text-white text-sm rounded-md p-3 border border-[#2c2c2c] focus:ring-0 focus:border-[#2c2c2c] focus:outline-none'})
     )
 
     def __init__(self, *args, **kwargs):
@@ -137,7 +137,9 @@ class InstallerProfileForm(forms.ModelForm):
             if field_name in self.fields:
                 self.fields[field_name].widget.attrs.update({
                     'class': 'custom-file-input',
-                    'hidden': True
+                    'hidden': True,
+                    # Sent through the resumable chunked upload API when JS is available
+                    'data-upload-target': field_name,
                 })
 
     class Meta:
@@ -204,6 +206,12 @@ class InstallerProfileForm(forms.ModelForm):
             ('coi_history', 'coi_certificate', 'COI Certificate'),
         ]
 
+        # Certificates still on their way to storage (background or chunked
+        # uploads) count as provided.
+        pending = set()
+        if self.instance.pk:
+            pending = set(self.instance.certificate_uploads.values_list('field_name', flat=True))
+
         # Iterates through the list to check the conditional dependencies.
         for toggle_field, file_field, label in conditional_requirements:
             toggle = cleaned_data.get(toggle_field)
@@ -211,7 +219,7 @@ class InstallerProfileForm(forms.ModelForm):
 
             # If the toggle is checked (`True`) but no file is provided,
             # an error is added to the form for that specific file field.
-            if toggle and not file:
+            if toggle and not file and file_field not in pending:
                 self.add_error(file_field, f"{label} is required when '{self.fields[toggle_field].label}' is checked.")
 
         # Returns the cleaned data, which now includes the custom validation errors if any.
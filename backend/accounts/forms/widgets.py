@@ -0,0 +1,46 @@
+# accounts/forms/widgets.py
+from django import forms
+from django.urls import reverse
+
+
+class AutocompleteSelect(forms.Select):
+    """
+    A <select> that only renders its empty option and the current value.
+    Further options are fetched from a JSON autocomplete endpoint as the user
+    types (see the autocomplete script in admin_installation_page.html), so
+    page weight does not grow with the number of choices.
+
+    Args:
+        url_name (str): URL name of the autocomplete endpoint
+        value_key (str): Result key used as the option value (defaults to 'id')
+    """
+
+    def __init__(self, url_name, value_key='id', attrs=None):
+        super().__init__(attrs)
+        self.url_name = url_name
+        self.value_key = value_key
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-autocomplete-url'] = reverse(self.url_name)
+        context['widget']['attrs']['data-autocomplete-value'] = self.value_key
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        field = self.choices.field
+        options = []
+        if field.empty_label is not None:
+            options.append(self.create_option(name, '', field.empty_label, not any(value), 0, attrs=attrs))
+
+        for selected in value:
+            if not selected:
+                continue
+            try:
+                obj = field.to_python(selected)
+            except forms.ValidationError:
+                continue
+            options.append(self.create_option(
+                name, field.prepare_value(obj), field.label_from_instance(obj), True, len(options), attrs=attrs,
+            ))
+
+        return [(None, options, 0)]
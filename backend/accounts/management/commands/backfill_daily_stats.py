@@ -0,0 +1,59 @@
+# accounts/management/commands/backfill_daily_stats.py
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.services import InstallationStatsService
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the InstallationDailyStats rollup from the installations, one chunk of "
+        "days per transaction so writers are only held up briefly. Run it once after "
+        "migrating; signals keep the rollup current afterwards. Re-run it to repair counts "
+        "after queryset updates that bypassed the signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First date to rebuild, YYYY-MM-DD (default: earliest installation).')
+        parser.add_argument('--end', help='Last date to rebuild, YYYY-MM-DD (default: latest installation).')
+        parser.add_argument('--chunk-days', type=int, default=31, help='Days rebuilt per transaction (default: 31).')
+
+    def handle(self, *args, **options):
+        if options['chunk_days'] < 1:
+            raise CommandError("--chunk-days must be at least 1.")
+
+        date_range = InstallationStatsService.get_date_range()
+        start = self.parse_date(options['start'], 'start') or (date_range and date_range[0])
+        end = self.parse_date(options['end'], 'end') or (date_range and date_range[1])
+        if start is None or end is None:
+            self.stdout.write("No installations to roll up.")
+            return
+        if start > end:
+            raise CommandError("--start must not be after --end.")
+
+        started = time.perf_counter()
+        chunks = rows = 0
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + datetime.timedelta(days=options['chunk_days'] - 1), end)
+            written = InstallationStatsService.rebuild(chunk_start, chunk_end)
+            chunks += 1
+            rows += written
+            if options['verbosity'] > 1:
+                self.stdout.write(f"{chunk_start} to {chunk_end}: {written} row(s)")
+            chunk_start = chunk_end + datetime.timedelta(days=1)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {start} to {end} in {chunks} chunk(s): {rows} rollup row(s) "
+            f"in {(time.perf_counter() - started) * 1000:.0f} ms."
+        ))
+
+    def parse_date(self, value, name):
+        if value is None:
+            return None
+        try:
+            return datetime.date.fromisoformat(value)
+        except ValueError:
+            raise CommandError(f"--{name} must be a date in YYYY-MM-DD format.")
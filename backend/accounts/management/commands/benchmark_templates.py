@@ -0,0 +1,211 @@
+# accounts/management/commands/benchmark_templates.py
+import json
+import platform
+import statistics
+import time
+
+import django
+import jinja2
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.template import engines
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from accounts import context_processors
+from accounts.management.commands.benchmark_views import percentile
+from accounts.models import CIDB_GRADE_CHOICES, LICENSE_CLASS_CHOICES, CustomUser, Installation, InstallerProfile
+from accounts.services import InstallationRowCacheService, InstallationService, InstallerDirectoryService
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the hot list templates (installation rows and list, installer directory, "
+        "installer dashboard) with the Django and Jinja2 engines on the same data and print "
+        "p50/p95 render times and the speed-up as JSON. Only rendering is timed: querysets "
+        "and context processors are evaluated beforehand. Seed data first with `manage.py seed_synthetic`."
+    )
+
+    ENGINES = ['django', 'jinja2']
+    SCENARIOS = [
+        'installation_rows',
+        'admin_installation_list',
+        'installer_directory',
+        'admin_installer_list',
+        'installer_dashboard',
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Timed renders per scenario and engine (default: 20).')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed renders per scenario and engine first (default: 2).')
+        parser.add_argument(
+            '--scenario', action='append', choices=self.SCENARIOS, dest='scenarios',
+            help='Only run the given scenario (repeatable). Defaults to all.',
+        )
+        parser.add_argument('--output', help='Also write the JSON report to this file.')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError("--iterations must be at least 1.")
+        for alias in self.ENGINES:
+            if alias not in [engine['NAME'] for engine in settings.TEMPLATES if 'NAME' in engine]:
+                raise CommandError(f"No template engine named '{alias}' in settings.TEMPLATES.")
+
+        admin, installer = self.get_users()
+        scenarios = self.get_scenarios(admin, installer)
+
+        results = {}
+        for name in options['scenarios'] or self.SCENARIOS:
+            timings = {
+                alias: self.run_scenario(scenarios[name], engines[alias], options['warmup'], options['iterations'])
+                for alias in self.ENGINES
+            }
+            timings['speedup'] = round(timings['django']['p50_ms'] / max(timings['jinja2']['p50_ms'], 0.001), 2)
+            results[name] = timings
+
+        report = {
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'jinja2': jinja2.__version__,
+            },
+            'data': {
+                'installations': len(scenarios['installation_rows'][1]),
+                'installer_jobs': len(scenarios['installer_dashboard'][1]['installations']),
+                'directory_page': len(scenarios['installer_directory'][1]['installers']),
+            },
+            'users': {'admin': admin.username, 'installer': installer.username},
+            'iterations': options['iterations'],
+            'results': results,
+        }
+        output = json.dumps(report, indent=2)
+        self.stdout.write(output)
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                report_file.write(output + '\n')
+
+    # -----------------------------------------------
+    # Scenarios
+    # -----------------------------------------------
+    def get_users(self):
+        """
+        Use the first admin and the installer with the most jobs, i.e. the
+        heaviest installer dashboard.
+        """
+        admin = CustomUser.objects.filter(role='1').order_by('pk').first()
+        profile = (
+            InstallerProfile.objects.filter(user__role='2')
+            .annotate(job_count=Count('assigned_installations'))
+            .order_by('-job_count', 'pk')
+            .select_related('user')
+            .first()
+        )
+        if admin is None or profile is None:
+            raise CommandError("Need at least one admin and one installer with a profile; run `manage.py seed_synthetic`.")
+        return admin, profile.user
+
+    def page_context(self, user, url_name, context):
+        """
+        The context a view would render `context` with: the request and the
+        context processors' values, with the view's values on top.
+        """
+        request = RequestFactory().get(reverse(url_name))
+        request.user = user
+        request.resolver_match = resolve(request.path)
+        values = {'request': request}
+        for processor in (
+            context_processors.task_metrics,
+            context_processors.installer_task_metrics,
+            context_processors.current_company,
+            context_processors.user_company_info,
+        ):
+            values.update(processor(request))
+        return {**values, **context}
+
+    def get_scenarios(self, admin, installer):
+        """
+        Returns:
+            dict: Scenario name -> (template name, context), or for
+                  installation_rows (template name, list of contexts)
+        """
+        installations = list(
+            Installation.objects.select_related(*InstallationService.LIST_RELATED).order_by('-created_at')
+        )
+        rows = InstallationRowCacheService.render_rows(installations)
+
+        page_obj = InstallerDirectoryService.get_page({}, 1)
+        page_obj.object_list = list(page_obj.object_list)
+        directory = {
+            'installers': page_obj.object_list,
+            'page_obj': page_obj,
+            'filters': {},
+            'query_string': '',
+            'region_choices': InstallerDirectoryService.get_region_choices(),
+            'license_class_choices': LICENSE_CLASS_CHOICES,
+            'cidb_grade_choices': CIDB_GRADE_CHOICES,
+        }
+
+        profile = installer.installerprofile
+        jobs = list(
+            Installation.objects.filter(installer=profile)
+            .select_related(*InstallationService.LIST_RELATED)
+            .order_by('-installation_created_date')
+        )
+        completed = sum(1 for job in jobs if job.status == 'COMPLETED')
+        dashboard = {
+            'profile': profile,
+            'installations': jobs,
+            'total_tasks': len(jobs),
+            'in_progress': sum(1 for job in jobs if job.status == 'IN_PROGRESS'),
+            'pending': sum(1 for job in jobs if job.status == 'PENDING_ACCEPTANCE'),
+            'completion_rate': int(completed / len(jobs) * 100) if jobs else 0,
+        }
+
+        return {
+            'installation_rows': (
+                InstallationRowCacheService.ROW_TEMPLATE,
+                [{'installation': installation} for installation in installations],
+            ),
+            'admin_installation_list': (
+                'accounts/admin/admin_installation_list.html',
+                self.page_context(admin, 'installation_list', {'installation_rows': rows}),
+            ),
+            'installer_directory': ('partials/_installer_directory.html', directory),
+            'admin_installer_list': (
+                'accounts/admin/admin_installer_list.html',
+                self.page_context(admin, 'installer_list', {
+                    'directory_html': engines['django'].get_template('partials/_installer_directory.html').render(directory),
+                }),
+            ),
+            'installer_dashboard': (
+                'accounts/installer/installer_dashboard.html',
+                self.page_context(installer, 'installer_dashboard', dashboard),
+            ),
+        }
+
+    def run_scenario(self, scenario, engine, warmup, iterations):
+        template_name, contexts = scenario
+        template = engine.get_template(template_name)
+        if isinstance(contexts, dict):
+            contexts = [contexts]
+
+        def render():
+            for context in contexts:
+                template.render(dict(context))
+
+        for _ in range(warmup):
+            render()
+
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        return {
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'mean_ms': round(statistics.fmean(timings), 2),
+            'min_ms': round(min(timings), 2),
+        }
@@ -0,0 +1,215 @@
+# accounts/management/commands/benchmark_views.py
+import contextlib
+import io
+import json
+import math
+import platform
+import statistics
+import time
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Count
+from django.test import Client, RequestFactory
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from accounts import context_processors
+from accounts.models import CustomUser, InstallerProfile, Installation, Customer, ChargerModel, Notification, Task
+
+# Benchmarked requests must not be slowed down (or drowned) by the sampled request log
+QUIET_INSTRUMENTATION = {'SAMPLE_RATE': 0, 'SLOW_REQUEST_MS': None}
+
+
+def percentile(samples, percent):
+    """
+    Nearest-rank percentile of a list of samples.
+    """
+    ordered = sorted(samples)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the hot views (admin installation list, installer dashboard, notification "
+        "list, job creation with auto-assignment) and the context processors, and print "
+        "p50/p95 latency and query counts as JSON. Seed data first with `manage.py seed_synthetic`."
+    )
+
+    SCENARIOS = [
+        'installation_list',
+        'installer_dashboard',
+        'notification_list',
+        'create_installation',
+        'context_processors_admin',
+        'context_processors_installer',
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Timed runs per scenario (default: 20).')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed runs per scenario first (default: 2).')
+        parser.add_argument(
+            '--scenario', action='append', choices=self.SCENARIOS, dest='scenarios',
+            help='Only run the given scenario (repeatable). Defaults to all.',
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database alias (default: "default").')
+        parser.add_argument('--output', help='Also write the JSON report to this file.')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError("--iterations must be at least 1.")
+
+        alias = options['database']
+        connection = connections[alias]
+        admin, installer = self.get_users()
+
+        # Job creation writes rows, so the whole run is rolled back
+        results = {}
+        with transaction.atomic(using=alias), override_settings(
+            ALLOWED_HOSTS=['*'], REQUEST_INSTRUMENTATION=QUIET_INSTRUMENTATION,
+        ), contextlib.redirect_stdout(io.StringIO()):
+            scenarios = self.get_scenarios(admin, installer)
+            for name in options['scenarios'] or self.SCENARIOS:
+                results[name] = self.run_scenario(
+                    connection, scenarios[name], options['warmup'], options['iterations'],
+                )
+            transaction.set_rollback(True, using=alias)
+
+        report = {
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+            },
+            'data': {
+                'installers': CustomUser.objects.filter(role='2').count(),
+                'installations': Installation.objects.count(),
+                'notifications': Notification.objects.count(),
+                'tasks': Task.objects.count(),
+            },
+            'users': {'admin': admin.username, 'installer': installer.username},
+            'iterations': options['iterations'],
+            'results': results,
+        }
+        output = json.dumps(report, indent=2)
+        self.stdout.write(output)
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                report_file.write(output + '\n')
+
+    # -----------------------------------------------
+    # Scenarios
+    # -----------------------------------------------
+    def get_users(self):
+        """
+        Use the admin with the most notifications and the installer with the
+        most jobs, i.e. the heaviest notification list and installer dashboard.
+        """
+        admin = (
+            CustomUser.objects.filter(role='1')
+            .annotate(notification_count=Count('notifications'))
+            .order_by('-notification_count', 'pk')
+            .first()
+        )
+        profile = (
+            InstallerProfile.objects.filter(user__role='2')
+            .annotate(job_count=Count('assigned_installations'))
+            .order_by('-job_count', 'pk')
+            .select_related('user')
+            .first()
+        )
+        if admin is None or profile is None:
+            raise CommandError("Need at least one admin and one installer with a profile; run `manage.py seed_synthetic`.")
+        return admin, profile.user
+
+    def get_scenarios(self, admin, installer):
+        admin_client = Client()
+        admin_client.force_login(admin)
+        installer_client = Client()
+        installer_client.force_login(installer)
+        request_factory = RequestFactory()
+
+        def get(client, url):
+            def run():
+                response = client.get(url)
+                if response.status_code != 200:
+                    raise CommandError(f"GET {url} returned {response.status_code}.")
+            return run
+
+        charger_model = ChargerModel.objects.order_by('pk').first()
+        if charger_model is None:
+            raise CommandError("Need at least one charger model; run `manage.py seed_synthetic`.")
+        states = [state for state, _ in Customer.STATE_CHOICES if state]
+        sequence = iter(range(10**9))
+
+        def create_installation():
+            # A new customer every time, in rotating states; no installer is
+            # chosen so the view auto-assigns one
+            number = next(sequence)
+            response = admin_client.post(reverse('create_installation'), {
+                'customer_name': f'Benchmark Customer {number}',
+                'customer_email': f'benchmark{number}@benchmark.invalid',
+                'address': '1 Jalan Benchmark',
+                'city': 'Shah Alam',
+                'state': states[number % len(states)],
+                'house_type': 'L',
+                'postcode': '40000',
+                'charger_model': charger_model.pk,
+            })
+            if response.status_code != 302:
+                raise CommandError(f"Job creation did not redirect (status {response.status_code}).")
+
+        def context_processor_calls(user):
+            def run():
+                request = request_factory.get('/')
+                request.user = user
+                for processor in (
+                    context_processors.task_metrics,
+                    context_processors.installer_task_metrics,
+                    context_processors.current_company,
+                    context_processors.user_company_info,
+                ):
+                    processor(request)
+            return run
+
+        return {
+            'installation_list': get(admin_client, reverse('installation_list')),
+            'installer_dashboard': get(installer_client, reverse('installer_dashboard')),
+            'notification_list': get(admin_client, reverse('admin_notifications')),
+            'create_installation': create_installation,
+            'context_processors_admin': context_processor_calls(admin),
+            'context_processors_installer': context_processor_calls(installer),
+        }
+
+    def run_scenario(self, connection, scenario, warmup, iterations):
+        for _ in range(warmup):
+            scenario()
+
+        # Counted with an execute_wrapper: connection.queries is capped at
+        # 9000 entries, which the unpaginated lists exceed on large data sets
+        executed = [0]
+
+        def count_query(execute, sql, params, many, context):
+            executed[0] += 1
+            return execute(sql, params, many, context)
+
+        timings, query_counts = [], []
+        for _ in range(iterations):
+            executed[0] = 0
+            with connection.execute_wrapper(count_query):
+                started = time.perf_counter()
+                scenario()
+                timings.append((time.perf_counter() - started) * 1000)
+            query_counts.append(executed[0])
+
+        return {
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'mean_ms': round(statistics.fmean(timings), 2),
+            'min_ms': round(min(timings), 2),
+            'max_ms': round(max(timings), 2),
+            'queries_p50': percentile(query_counts, 50),
+            'queries_max': max(query_counts),
+        }
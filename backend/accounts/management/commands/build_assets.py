@@ -0,0 +1,51 @@
+# accounts/management/commands/build_assets.py
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import asset_build
+
+
+class Command(BaseCommand):
+    help = (
+        "Build accounts/static/accounts/build/app.css (the Tailwind utilities used by the "
+        "templates, scripts and forms, plus accounts/assets/css) and app.js (accounts/assets/js), "
+        "minified. Run after changing classes in a template or form and commit the output; "
+        "`collectstatic` then adds hashed names and compressed variants."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help=(
+                'Only verify the committed build is up to date and every utility-like class compiles; '
+                'exit with an error if not (for CI).'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        outputs = asset_build.build()
+        stale = asset_build.stale_outputs(outputs)
+        unsupported = asset_build.unsupported_utilities()
+        for name in unsupported:
+            self.stderr.write(f"Unsupported utility class (not compiled): {name}")
+
+        if options['check']:
+            if stale:
+                raise CommandError(f"Stale build output: {', '.join(stale)}. Run `manage.py build_assets`.")
+            if unsupported:
+                raise CommandError(
+                    f"{len(unsupported)} utility class(es) cannot be compiled: {', '.join(unsupported)}. "
+                    "Fix the class names or add them to accounts/utility_css.py."
+                )
+            self.stdout.write("Build output is up to date.")
+            return
+
+        asset_build.write_outputs(outputs)
+        for name, (contents, utilities) in outputs.items():
+            line = f"{name}: {len(contents.encode()) / 1024:.1f} KiB"
+            if utilities:
+                line += f", {len(utilities)} utilities"
+            if name not in stale:
+                line += " (unchanged)"
+            self.stdout.write(line)
+            if options['verbosity'] > 1 and utilities:
+                self.stdout.write('  ' + ' '.join(utilities))
@@ -0,0 +1,29 @@
+# accounts/management/commands/expire_offers.py
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts.models import Installation
+from accounts.services import InstallationTransitionService
+
+
+class Command(BaseCommand):
+    help = (
+        "Move installations whose acceptance offer has run out (assignment_expires_at "
+        "in the past) to EXPIRED. Each job is expired with a conditional update, so an "
+        "installer accepting at the same moment either wins or sees the offer expired. "
+        "Run it from cron every few minutes."
+    )
+
+    def handle(self, *args, **options):
+        expired = lost = 0
+        offers = Installation.objects.filter(
+            status='PENDING_ACCEPTANCE', assignment_expires_at__lte=timezone.now(),
+        ).select_related('customer')
+        for installation in offers:
+            if InstallationTransitionService.transition(installation, 'EXPIRED'):
+                expired += 1
+            else:
+                lost += 1
+        self.stdout.write(self.style.SUCCESS(
+            f"Expired {expired} offer(s); {lost} were answered first."
+        ))
@@ -0,0 +1,62 @@
+# accounts/management/commands/gc_blobs.py
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts.blob_storage import blob_storage, count_blob_refs
+from accounts.models import StoredBlob
+from accounts.previews import discard_previews
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete content-addressed blobs (certificates, task documents) that no file "
+        "field references any more. Blobs touched within the grace period are kept, "
+        "so an upload whose row is not saved yet is never collected."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--recount', action='store_true',
+            help='Rebuild reference counts from the file fields first (repairs counts changed by queryset updates).',
+        )
+        parser.add_argument('--grace-hours', type=float, default=24, help='Keep blobs touched this recently (default: 24).')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted without deleting it.')
+
+    def handle(self, *args, **options):
+        if options['grace_hours'] < 0:
+            raise CommandError("--grace-hours cannot be negative.")
+
+        if options['recount']:
+            repaired = self.recount(options['dry_run'])
+            self.stdout.write(f"Reference counts corrected on {repaired} blob(s).")
+
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        unused = StoredBlob.objects.filter(ref_count__lte=0, updated_at__lt=cutoff)
+        deleted = freed = 0
+        for blob in unused.iterator():
+            if options['dry_run']:
+                deleted += 1
+                freed += blob.size
+                continue
+            # Conditional delete: a save may have reused the blob meanwhile
+            if StoredBlob.objects.filter(pk=blob.pk, ref_count__lte=0, updated_at__lt=cutoff).delete()[0]:
+                blob_storage.delete(blob.name)
+                discard_previews([blob.name])
+                deleted += 1
+                freed += blob.size
+
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(f"{verb} {deleted} unused blob(s), {freed / 1024 / 1024:.1f} MiB."))
+
+    def recount(self, dry_run):
+        counts = count_blob_refs()
+        repaired = 0
+        for blob in StoredBlob.objects.only('pk', 'name', 'ref_count').iterator():
+            actual = counts.get(blob.name, 0)
+            if blob.ref_count != actual:
+                repaired += 1
+                if not dry_run:
+                    StoredBlob.objects.filter(pk=blob.pk).update(ref_count=actual)
+        return repaired
@@ -0,0 +1,53 @@
+# accounts/management/commands/generate_previews.py
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts.blob_storage import count_blob_refs
+from accounts.models import DocumentPreview
+from accounts.previews import preview_pool, queue_previews
+
+
+class Command(BaseCommand):
+    help = (
+        "Render document previews (certificate and task document thumbnails) that are "
+        "pending, e.g. after a restart interrupted the background pool. Run it from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--missing', action='store_true',
+            help='Also create previews for stored files that have none (files saved before previews existed).',
+        )
+        parser.add_argument('--retry-failed', action='store_true', help='Also retry previews that failed.')
+        parser.add_argument(
+            '--stale-minutes', type=int, default=30,
+            help="Treat previews stuck in 'rendering' for this long as abandoned (default: 30).",
+        )
+
+    def handle(self, *args, **options):
+        if options['stale_minutes'] < 0:
+            raise CommandError("--stale-minutes cannot be negative.")
+
+        if options['missing']:
+            queue_previews(count_blob_refs(), submit=False)
+
+        stale_before = timezone.now() - timedelta(minutes=options['stale_minutes'])
+        DocumentPreview.objects.filter(status='rendering', updated_at__lt=stale_before).update(status='pending')
+        statuses = ['pending', 'failed'] if options['retry_failed'] else ['pending']
+
+        ready = skipped = 0
+        for name in DocumentPreview.objects.filter(status__in=statuses).order_by('created_at').values_list('name', flat=True):
+            try:
+                rendered = preview_pool.process(name)
+            except Exception as exc:
+                self.stderr.write(f"{name}: {exc}")
+                rendered = False
+            if rendered:
+                ready += 1
+            else:
+                skipped += 1
+        preview_pool.shutdown()
+
+        self.stdout.write(self.style.SUCCESS(f"Rendered {ready} preview(s); {skipped} skipped or failed."))
@@ -0,0 +1,48 @@
+# accounts/management/commands/process_uploads.py
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts.chunked_uploads import expire_sessions
+from accounts.models import CertificateUpload
+from accounts.upload_queue import upload_pool
+
+
+class Command(BaseCommand):
+    help = (
+        "Upload staged certificates that are still pending, e.g. after a restart "
+        "interrupted the background upload pool, and remove chunked upload sessions "
+        "that were abandoned. Run it from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retry-failed', action='store_true',
+            help='Also retry uploads that used up their attempts (their attempt count is reset).',
+        )
+        parser.add_argument(
+            '--stale-minutes', type=int, default=30,
+            help="Treat uploads stuck in 'uploading' for this long as abandoned (default: 30).",
+        )
+
+    def handle(self, *args, **options):
+        # A worker that died mid-upload leaves its row claimed
+        stale_before = timezone.now() - timedelta(minutes=options['stale_minutes'])
+        CertificateUpload.objects.filter(status='uploading', updated_at__lt=stale_before).update(status='pending')
+        if options['retry_failed']:
+            CertificateUpload.objects.filter(status='failed').update(status='pending', attempts=0)
+
+        landed = failed = 0
+        for upload_id in CertificateUpload.objects.filter(status='pending').order_by('created_at').values_list('pk', flat=True):
+            if upload_pool.process(upload_id):
+                landed += 1
+            else:
+                failed += 1
+
+        expired = expire_sessions()
+        if expired:
+            self.stdout.write(f"Removed {expired} abandoned chunked upload(s).")
+
+        message = f"Uploaded {landed} certificate(s); {failed} did not land."
+        self.stdout.write(self.style.SUCCESS(message) if not failed else self.style.WARNING(message))
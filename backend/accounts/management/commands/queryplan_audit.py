@@ -0,0 +1,301 @@
+# accounts/management/commands/queryplan_audit.py
+import contextlib
+import io
+import re
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import QuerySet
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from accounts import context_processors
+from accounts.models import CustomUser, InstallerProfile, Installation, Customer, Notification
+from accounts.services import InstallationService
+from accounts.views.installation_views import auto_assign_installers
+
+# Tables owned by Django itself or small enough that a scan is always cheap
+IGNORED_TABLE_PREFIXES = ('django_', 'auth_', 'sqlite_')
+IGNORED_TABLES = {'accounts_state', 'accounts_chargermodel'}
+
+SCAN_RE = re.compile(r'^SCAN (?:TABLE )?(?P<table>\w+)(?: AS \w+)?$')
+ORDER_BY_RE = re.compile(r'"(?P<table>\w+)"\."(?P<column>\w+)" (?P<direction>ASC|DESC)')
+EQUALITY_RE = re.compile(r'"(?P<table>\w+)"\."(?P<column>\w+)" (?:= |IN \()')
+CLAUSE_END_RE = re.compile(r' (?:GROUP BY|ORDER BY|LIMIT|HAVING) ')
+
+
+class Command(BaseCommand):
+    help = (
+        "Run representative queries from InstallationService, the views and the "
+        "context processors, capture their EXPLAIN QUERY PLAN and propose "
+        "Meta.indexes for full table scans and ORDER BY temp B-trees."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='Database alias to audit (default: "default").',
+        )
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Exit with an error if any query needs a new index.',
+        )
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        connection = connections[alias]
+        if connection.vendor != 'sqlite':
+            raise CommandError("queryplan_audit only understands SQLite query plans.")
+
+        # Scenarios may write (sessions, test notifications, sample users),
+        # so everything runs in a transaction that is rolled back.
+        with transaction.atomic(using=alias):
+            statements, errors = self.collect_statements(connection)
+            findings = [self.analyse(connection, label, sql, params) for label, sql, params in statements]
+            transaction.set_rollback(True, using=alias)
+
+        findings = [finding for finding in findings if finding['issues']]
+        recommendations = self.report(findings, errors)
+
+        if options['check'] and (recommendations or errors):
+            raise CommandError(
+                f"{len(recommendations)} index recommendation(s), {len(errors)} failed scenario(s)."
+            )
+
+    # -----------------------------------------------
+    # Scenarios
+    # -----------------------------------------------
+    def get_sample_users(self):
+        """
+        Get an admin and an installer with a profile, creating throwaway ones
+        (rolled back with the audit transaction) if the database has none.
+        """
+        admin = CustomUser.objects.filter(role='1').first()
+        if admin is None:
+            admin = CustomUser.objects.create_user('queryplan-admin', role='1')
+
+        profile = InstallerProfile.objects.select_related('user').filter(user__role='2').first()
+        if profile is None:
+            installer = CustomUser.objects.create_user('queryplan-installer', role='2')
+            profile = InstallerProfile.objects.create(user=installer, company_name='Query Plan Audit')
+        return admin, profile.user, profile
+
+    def get_scenarios(self, admin, installer, profile):
+        """
+        Each scenario returns a QuerySet to explain, or runs code whose SQL
+        is captured and explained.
+        """
+        request_factory = RequestFactory()
+
+        def context_processor_calls(user):
+            def run():
+                request = request_factory.get('/')
+                request.user = user
+                for processor in (
+                    context_processors.task_metrics,
+                    context_processors.installer_task_metrics,
+                    context_processors.current_company,
+                    context_processors.user_company_info,
+                ):
+                    processor(request)
+            return run
+
+        def view_call(user, url):
+            def run():
+                client = Client()
+                client.force_login(user)
+                client.get(url)
+            return run
+
+        return [
+            ('InstallationService.get_installations_for_user (admin)',
+             lambda: InstallationService.get_installations_for_user(admin)),
+            ('InstallationService.get_installations_for_user (installer)',
+             lambda: InstallationService.get_installations_for_user(installer)),
+            ('InstallationService.get_status_counts', InstallationService.get_status_counts),
+            ('InstallationService.get_installer_installations',
+             lambda: InstallationService.get_installer_installations(profile)),
+            ('InstallationService.calculate_installer_stats',
+             lambda: InstallationService.calculate_installer_stats(
+                 InstallationService.get_installer_installations(profile))),
+            ('Installation.save (installation_id sequence)',
+             lambda: Installation.objects.filter(installation_id__startswith='SEL').order_by('-installation_id')[:1]),
+            ('auto_assign_installers',
+             lambda: auto_assign_installers([Installation(customer=Customer(state='Selangor'))])),
+            ('Notification list (user)',
+             lambda: Notification.objects.filter(user=admin).order_by('-created_at')),
+            ('Notification unread count (user)',
+             lambda: Notification.objects.filter(user=admin, is_read=False).count()),
+            ('context processors (admin)', context_processor_calls(admin)),
+            ('context processors (installer)', context_processor_calls(installer)),
+            ('view: dashboard_view', view_call(admin, reverse('admin_dashboard'))),
+            ('view: installation_list_view', view_call(admin, reverse('installation_list'))),
+            ('view: installer_list_view', view_call(admin, reverse('installer_list'))),
+            ('view: notification_list_view', view_call(admin, reverse('admin_notifications'))),
+            ('view: installer_dashboard_view', view_call(installer, reverse('installer_dashboard'))),
+        ]
+
+    def collect_statements(self, connection):
+        """
+        Run every scenario and collect the distinct SELECT statements it issues.
+
+        Returns:
+            tuple: ([(label, sql, params)], [(label, error)])
+        """
+        admin, installer, profile = self.get_sample_users()
+        statements, errors, seen = [], [], set()
+
+        # Views and debug prints are run quietly; the test client needs a host it may use
+        with override_settings(ALLOWED_HOSTS=['*']), contextlib.redirect_stdout(io.StringIO()):
+            for label, scenario in self.get_scenarios(admin, installer, profile):
+                try:
+                    with CaptureQueriesContext(connection) as captured:
+                        result = scenario()
+                except Exception as exc:
+                    errors.append((label, f"{type(exc).__name__}: {exc}"))
+                    continue
+
+                if isinstance(result, QuerySet):
+                    sql, params = result.query.sql_with_params()
+                    candidates = [(sql, params)]
+                else:
+                    candidates = [(query['sql'], ()) for query in captured.captured_queries]
+
+                for sql, params in candidates:
+                    key = (sql, tuple(params))
+                    if not sql.lstrip().upper().startswith('SELECT') or key in seen:
+                        continue
+                    seen.add(key)
+                    statements.append((label, sql, params))
+
+        return statements, errors
+
+    # -----------------------------------------------
+    # Plan analysis
+    # -----------------------------------------------
+    @staticmethod
+    def is_ignored(table):
+        return table in IGNORED_TABLES or table.startswith(IGNORED_TABLE_PREFIXES)
+
+    def analyse(self, connection, label, sql, params):
+        """
+        EXPLAIN a statement and flag full table scans and temp B-trees used
+        for ORDER BY, with an index recommendation where one can be derived.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            plan = [row[3] for row in cursor.fetchall()]
+
+        scanned = []
+        for step in plan:
+            match = SCAN_RE.match(step)
+            if match and not self.is_ignored(match.group('table')):
+                scanned.append(match.group('table'))
+        temp_order_by = any('TEMP B-TREE' in step and 'ORDER BY' in step for step in plan)
+
+        issues = []
+        for table in scanned:
+            issues.append(('SCAN', table, self.recommend(sql, table, include_order_by=True)))
+        if temp_order_by:
+            ordered_tables = {match.group('table') for match in ORDER_BY_RE.finditer(self.order_by_clause(sql))}
+            for table in sorted(ordered_tables - set(scanned)):
+                if not self.is_ignored(table):
+                    issues.append(('ORDER BY', table, self.recommend(sql, table, include_order_by=True)))
+
+        return {'label': label, 'sql': sql, 'plan': plan, 'issues': issues}
+
+    @staticmethod
+    def where_clause(sql):
+        if ' WHERE ' not in sql:
+            return ''
+        where = sql.split(' WHERE ', 1)[1]
+        end = CLAUSE_END_RE.search(where)
+        return where[:end.start()] if end else where
+
+    @staticmethod
+    def order_by_clause(sql):
+        if ' ORDER BY ' not in sql:
+            return ''
+        order_by = sql.rsplit(' ORDER BY ', 1)[1]
+        return order_by.split(' LIMIT ', 1)[0]
+
+    def recommend(self, sql, table, include_order_by):
+        """
+        Derive an index from the equality filters and ORDER BY terms on a
+        table. Returns None when the filter is an OR (a composite index does
+        not help) or when there is nothing to index, e.g. a bare COUNT(*).
+
+        Returns:
+            tuple: (model, [field names]) or None
+        """
+        model = next((m for m in apps.get_models() if m._meta.db_table == table), None)
+        if model is None:
+            return None
+        where = self.where_clause(sql)
+        if ' OR ' in where:
+            return None
+
+        columns = {field.column: field.name for field in model._meta.concrete_fields}
+        fields = []
+        for match in EQUALITY_RE.finditer(where):
+            name = columns.get(match.group('column'))
+            if match.group('table') == table and name and name not in fields:
+                fields.append(name)
+        if include_order_by:
+            for match in ORDER_BY_RE.finditer(self.order_by_clause(sql)):
+                name = columns.get(match.group('column'))
+                if match.group('table') == table and name and name not in fields and f'-{name}' not in fields:
+                    fields.append(f'-{name}' if match.group('direction') == 'DESC' else name)
+
+        return (model, fields) if fields else None
+
+    # -----------------------------------------------
+    # Reporting
+    # -----------------------------------------------
+    def report(self, findings, errors):
+        """
+        Print the flagged statements and the proposed Meta.indexes.
+
+        Returns:
+            dict: {model: [field lists]} of proposed indexes
+        """
+        recommendations = {}
+        for finding in findings:
+            self.stdout.write(self.style.WARNING(f"\n▶ {finding['label']}"))
+            self.stdout.write(f"  SQL:  {finding['sql'][:300]}{'…' if len(finding['sql']) > 300 else ''}")
+            self.stdout.write(f"  Plan: {' | '.join(finding['plan'])}")
+            for kind, table, recommendation in finding['issues']:
+                if recommendation is None:
+                    self.stdout.write(f"  {kind} on {table}: no single index applies (whole-table aggregate or OR filter)")
+                    continue
+                model, fields = recommendation
+                self.stdout.write(self.style.ERROR(f"  {kind} on {table}: add models.Index(fields={fields!r})"))
+                proposed = recommendations.setdefault(model, [])
+                if fields not in proposed:
+                    proposed.append(fields)
+
+        # An index whose fields lead another proposed index is redundant
+        for model, field_lists in recommendations.items():
+            recommendations[model] = [
+                fields for fields in field_lists
+                if not any(other != fields and other[:len(fields)] == fields for other in field_lists)
+            ]
+
+        for label, error in errors:
+            self.stdout.write(self.style.ERROR(f"\n✖ {label} failed: {error}"))
+
+        if not recommendations:
+            self.stdout.write(self.style.SUCCESS("\nNo index recommendations."))
+            return recommendations
+
+        self.stdout.write("\nProposed Meta.indexes:")
+        for model, field_lists in recommendations.items():
+            self.stdout.write(f"\n    # {model._meta.label}")
+            self.stdout.write("    class Meta:")
+            self.stdout.write("        indexes = [")
+            for fields in field_lists:
+                self.stdout.write(f"            models.Index(fields={fields!r}),")
+            self.stdout.write("        ]")
+        return recommendations
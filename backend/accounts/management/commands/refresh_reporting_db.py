@@ -0,0 +1,45 @@
+# accounts/management/commands/refresh_reporting_db.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from accounts.db_router import get_reporting_settings, refresh_sqlite_copy
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database into the reporting database with the online "
+        "backup API. Run it from cron, or keep it running with --interval. Not needed "
+        "when the reporting alias is a Postgres replica."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database to copy from (default: "default").')
+        parser.add_argument(
+            '--interval', type=float,
+            help='Keep running and refresh every this many seconds (default: refresh once).',
+        )
+
+    def handle(self, *args, **options):
+        source_alias = options['database']
+        target_alias = get_reporting_settings()['ALIAS']
+        if target_alias not in connections.settings:
+            raise CommandError(f"No {target_alias!r} database is configured in settings.DATABASES.")
+        if target_alias == source_alias:
+            raise CommandError("The reporting database cannot be refreshed from itself.")
+        if connections[source_alias].vendor != 'sqlite' or connections[target_alias].vendor != 'sqlite':
+            raise CommandError("refresh_reporting_db only copies SQLite databases; a replica is kept current by replication.")
+
+        while True:
+            started = time.perf_counter()
+            pages = refresh_sqlite_copy(source_alias, target_alias)
+            self.stdout.write(self.style.SUCCESS(
+                f"Copied {pages} pages from {source_alias!r} to {target_alias!r} "
+                f"in {(time.perf_counter() - started) * 1000:.0f} ms."
+            ))
+            if not options['interval']:
+                break
+            # Don't hold connections (or a WAL snapshot) open between refreshes
+            connections.close_all()
+            time.sleep(options['interval'])
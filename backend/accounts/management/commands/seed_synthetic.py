@@ -0,0 +1,468 @@
+# accounts/management/commands/seed_synthetic.py
+import contextlib
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import (
+    CustomUser, InstallerProfile, State, Customer, ChargerModel, Installation, InstallationStatusEvent, Notification, Task,
+)
+from accounts.models.installer_models import STATE_CHOICES, LICENSE_CLASS_CHOICES, CIDB_CATEGORY_CHOICES, CIDB_GRADE_CHOICES
+from accounts.reference_data import reference_data
+from accounts.region_index import installer_region_index
+from accounts.services import (
+    InstallationEventService, InstallationStatsService, InstallationTransitionService, InstallerDirectoryService,
+)
+from accounts.utils import CUSTOMER_STATE_REGIONS
+
+# Everything created here is tagged so it can be found and removed again
+USERNAME_PREFIX = 'synthetic-'
+EMAIL_DOMAIN = 'synthetic.invalid'
+TASK_TITLE_PREFIX = '[synthetic]'
+PASSWORD = 'synthetic'
+
+# Rough share of installations in each status
+STATUS_WEIGHTS = {
+    'SUBMITTED': 5,
+    'PENDING_ACCEPTANCE': 15,
+    'ACCEPTED': 10,
+    'REJECTED': 5,
+    'IN_PROGRESS': 15,
+    'COMPLETED': 45,
+    'EXPIRED': 5,
+}
+# Status history leading to each status, as the workflow would have recorded it
+STATUS_PATHS = {
+    'SUBMITTED': ('SUBMITTED',),
+    'PENDING_ACCEPTANCE': ('SUBMITTED', 'PENDING_ACCEPTANCE'),
+    'ACCEPTED': ('SUBMITTED', 'PENDING_ACCEPTANCE', 'ACCEPTED'),
+    'REJECTED': ('SUBMITTED', 'PENDING_ACCEPTANCE', 'REJECTED'),
+    'IN_PROGRESS': ('SUBMITTED', 'PENDING_ACCEPTANCE', 'ACCEPTED', 'IN_PROGRESS'),
+    'COMPLETED': ('SUBMITTED', 'PENDING_ACCEPTANCE', 'ACCEPTED', 'IN_PROGRESS', 'COMPLETED'),
+    'EXPIRED': ('SUBMITTED', 'PENDING_ACCEPTANCE', 'EXPIRED'),
+}
+
+CITIES = ['Shah Alam', 'Petaling Jaya', 'Johor Bahru', 'Ipoh', 'George Town', 'Kuantan',
+          'Kota Kinabalu', 'Kuching', 'Seremban', 'Melaka', 'Alor Setar', 'Kota Bharu']
+NOTIFICATION_MESSAGES = [
+    "New installation #{id} has been assigned to you.",
+    "Installer has accepted installation #{id}.",
+    "Installation #{id} is now in progress.",
+    "Installation #{id} has been completed.",
+    "Assignment for installation #{id} has expired.",
+]
+CHARGER_MANUFACTURERS = {
+    'ABB Terra AC 22': ('ABB', '22.00', 'Type 2'),
+    'ABB Terra DC 50': ('ABB', '50.00', 'CCS2'),
+    'Delta DC Wallbox 25': ('Delta', '25.00', 'CCS2'),
+    'Schneider EVlink AC 22': ('Schneider Electric', '22.00', 'Type 2'),
+    'Siemens VersiCharge 22': ('Siemens', '22.00', 'Type 2'),
+    'Tesla Wall Connector Gen 3': ('Tesla', '11.50', 'Type 2'),
+}
+
+
+@contextlib.contextmanager
+def explicit_timestamps(*fields):
+    """
+    Let bulk_create keep the timestamps we generate instead of overwriting
+    them with auto_now/auto_now_add, so synthetic rows spread over time.
+    """
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    try:
+        for field in fields:
+            field.auto_now = field.auto_now_add = False
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic installers, customers, installations, notifications and "
+        "tasks with bulk inserts, for benchmarking (see `manage.py benchmark_views`)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--installers', type=int, default=500, help='Installer accounts to create (default: 500).')
+        parser.add_argument('--installations', type=int, default=20000, help='Installations to create, one customer each (default: 20000).')
+        parser.add_argument('--notifications', type=int, default=100000, help='Notifications to create (default: 100000).')
+        parser.add_argument('--tasks', type=int, default=1000, help='Tasks to create (default: 1000).')
+        parser.add_argument('--days', type=int, default=365, help='Spread creation dates over this many days (default: 365).')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per bulk insert (default: 2000).')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed, for reproducible data sets (default: 42).')
+        parser.add_argument('--flush', action='store_true', help='Delete previously generated synthetic data first.')
+
+    def handle(self, *args, **options):
+        for name in ('installers', 'installations', 'notifications', 'tasks', 'batch_size'):
+            if options[name] < 0 or (name == 'batch_size' and options[name] == 0):
+                raise CommandError(f"--{name.replace('_', '-')} must be a positive number.")
+
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.days = max(options['days'], 1)
+
+        if options['flush']:
+            self.flush()
+
+        with transaction.atomic():
+            admin = self.seed_admin()
+            states = self.seed_states()
+            charger_model_ids = self.seed_charger_models()
+            installers = self.seed_installers(options['installers'], states)
+            installation_ids = self.seed_installations(options['installations'], installers, charger_model_ids)
+            task_ids = self.seed_tasks(options['tasks'])
+            self.seed_notifications(options['notifications'], [admin.pk] + [user_id for user_id, _, _ in installers],
+                                    installation_ids, task_ids)
+
+        # bulk_create sends no signals, so in-process caches are reset by hand
+        installer_region_index.invalidate()
+        reference_data.invalidate()
+        InstallerDirectoryService.invalidate()
+        # ...and the rollup and scorecards its receivers would have kept are recounted
+        self.rebuild_daily_stats()
+        self.rebuild_scorecards()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. Log in as '{admin.username}' or '{USERNAME_PREFIX}installer-00001' with password '{PASSWORD}'."
+        ))
+
+    # -----------------------------------------------
+    # Helpers
+    # -----------------------------------------------
+    def timed(self, label, count):
+        self.stdout.write(f"  {label}: {count} rows", ending='')
+        self.stdout.flush()
+        return time.perf_counter()
+
+    def done(self, started):
+        self.stdout.write(f" ({time.perf_counter() - started:.1f}s)")
+
+    def random_datetime(self):
+        return self.now - timedelta(seconds=self.random.randrange(self.days * 86400))
+
+    def batches(self, count):
+        for start in range(0, count, self.batch_size):
+            yield start, min(start + self.batch_size, count)
+
+    def rebuild_daily_stats(self):
+        date_range = InstallationStatsService.get_date_range()
+        if date_range is None:
+            return
+        started = time.perf_counter()
+        rows = InstallationStatsService.rebuild(*date_range)
+        self.stdout.write(f"  daily stats rollup: {rows} rows", ending='')
+        self.done(started)
+
+    def rebuild_scorecards(self):
+        started = time.perf_counter()
+        rows = InstallationEventService.rebuild()
+        self.stdout.write(f"  installer scorecards: {rows} rows", ending='')
+        self.done(started)
+
+    def flush(self):
+        """
+        Delete synthetic rows. Installations and notifications go with their
+        customers and users (CASCADE).
+        """
+        self.stdout.write("Removing previous synthetic data...")
+        with transaction.atomic():
+            Customer.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').delete()
+            Task.objects.filter(title__startswith=TASK_TITLE_PREFIX).delete()
+            InstallerProfile.objects.filter(user__username__startswith=USERNAME_PREFIX).delete()
+            CustomUser.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+    # -----------------------------------------------
+    # Reference data
+    # -----------------------------------------------
+    def seed_admin(self):
+        admin, created = CustomUser.objects.get_or_create(
+            username=f'{USERNAME_PREFIX}admin',
+            defaults={'role': '1', 'email': f'admin@{EMAIL_DOMAIN}', 'password': make_password(PASSWORD)},
+        )
+        return admin
+
+    def seed_states(self):
+        """
+        Make sure every region in STATE_CHOICES exists.
+
+        Returns:
+            dict: {region code: State id}
+        """
+        for code, name in STATE_CHOICES:
+            State.objects.get_or_create(code=code, defaults={'name': name})
+        return dict(State.objects.filter(code__in=[code for code, _ in STATE_CHOICES]).values_list('code', 'id'))
+
+    def seed_charger_models(self):
+        for model_name, _ in ChargerModel.CHARGER_MODEL_CHOICES:
+            manufacturer, power, connector = CHARGER_MANUFACTURERS.get(model_name, ('Generic', '22.00', 'Type 2'))
+            ChargerModel.objects.get_or_create(
+                model_name=model_name,
+                defaults={'manufacturer': manufacturer, 'power_rating_kw': power, 'connector_type': connector},
+            )
+        return list(ChargerModel.objects.values_list('id', flat=True))
+
+    # -----------------------------------------------
+    # Installers
+    # -----------------------------------------------
+    def seed_installers(self, count, states):
+        """
+        Create installer users with complete profiles, each operating in one
+        to three regions.
+
+        Returns:
+            list: (user id, profile id, [region codes]) per installer
+        """
+        started = self.timed('installers', count)
+        password = make_password(PASSWORD)
+        existing = CustomUser.objects.filter(username__startswith=f'{USERNAME_PREFIX}installer-').count()
+        region_codes = list(states)
+        installers = []
+
+        for start, end in self.batches(count):
+            users = CustomUser.objects.bulk_create([
+                CustomUser(
+                    username=f'{USERNAME_PREFIX}installer-{existing + number + 1:05d}',
+                    email=f'installer{existing + number + 1}@{EMAIL_DOMAIN}',
+                    password=password, role='2',
+                    date_joined=self.random_datetime(),
+                )
+                for number in range(start, end)
+            ])
+            # Databases without RETURNING support do not set pks on bulk_create
+            if users and users[0].pk is None:
+                users = list(CustomUser.objects.filter(
+                    username__in=[user.username for user in users]
+                ).order_by('username'))
+
+            profiles = InstallerProfile.objects.bulk_create([
+                InstallerProfile(
+                    user_id=user.pk,
+                    company_name=f'Synthetic Installer {user.username[-5:]} Sdn Bhd',
+                    company_ssm_number=f'{self.random.randrange(10**11, 10**12)}',
+                    company_address=f'{self.random.randrange(1, 200)} Jalan Synthetic, {self.random.choice(CITIES)}',
+                    year_established=self.random.randrange(1990, 2024),
+                    epf_contributors=self.random.randrange(1, 200),
+                    pic_name=f'PIC {user.username[-5:]}',
+                    pic_designation='Manager',
+                    pic_contact_number=f'01{self.random.randrange(10**7, 10**8)}',
+                    pic_email=user.email,
+                    is_st_registered=True,
+                    license_class=self.random.choice(LICENSE_CLASS_CHOICES)[0],
+                    is_cidb_registered=self.random.random() < 0.7,
+                    cidb_category=self.random.choice(CIDB_CATEGORY_CHOICES)[0],
+                    cidb_grade=self.random.choice(CIDB_GRADE_CHOICES)[0],
+                    is_sst_registered=self.random.random() < 0.5,
+                    registration_status=self.random.choice(['submitted', 'approved', 'approved', 'approved', 'rejected']),
+                    created_at=user.date_joined,
+                )
+                for user in users
+            ])
+            if profiles and profiles[0].pk is None:
+                profiles = list(InstallerProfile.objects.filter(user__in=users).order_by('user__username'))
+
+            memberships = []
+            for user, profile in zip(users, profiles):
+                codes = self.random.sample(region_codes, self.random.randint(1, min(3, len(region_codes))))
+                installers.append((user.pk, profile.pk, codes))
+                memberships.extend(
+                    InstallerProfile.operational_states.through(installerprofile_id=profile.pk, state_id=states[code])
+                    for code in codes
+                )
+            InstallerProfile.operational_states.through.objects.bulk_create(memberships)
+
+        self.done(started)
+        return installers
+
+    # -----------------------------------------------
+    # Customers and installations
+    # -----------------------------------------------
+    def next_installation_numbers(self, prefixes):
+        numbers = {}
+        for prefix in prefixes:
+            last = Installation.objects.filter(
+                installation_id__startswith=prefix
+            ).order_by('-installation_id').values_list('installation_id', flat=True).first()
+            numbers[prefix] = int(last[-6:]) + 1 if last else 1
+        return numbers
+
+    def seed_installations(self, count, installers, charger_model_ids):
+        """
+        Create one customer and one installation per row. Installations are
+        assigned to installers operating in the customer's region, the same way
+        auto-assignment would; installation_id follows Installation.save().
+
+        Returns:
+            list: Installation ids
+        """
+        started = self.timed('customers + installations', count)
+        customer_states = [state for state, _ in Customer.STATE_CHOICES if state]
+        house_types = [code for code, _ in Customer.HOUSE_TYPE_CHOICES]
+        next_numbers = self.next_installation_numbers({
+            f'{state[:2].upper()}{house_type}' for state in customer_states for house_type in house_types
+        })
+
+        installers_by_region = {}
+        for user_id, profile_id, codes in installers:
+            for code in codes:
+                installers_by_region.setdefault(code, []).append((user_id, profile_id))
+        all_installers = [(user_id, profile_id) for user_id, profile_id, _ in installers]
+
+        statuses = list(STATUS_WEIGHTS)
+        weights = list(STATUS_WEIGHTS.values())
+        existing = Customer.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').count()
+        installation_ids = []
+        installation_fields = [Installation._meta.get_field(name) for name in ('created_at', 'updated_at')]
+
+        for start, end in self.batches(count):
+            customers = []
+            for number in range(start, end):
+                customer_number = existing + number + 1
+                customers.append(Customer(
+                    name=f'Synthetic Customer {customer_number}',
+                    contact_person=f'Contact {customer_number}',
+                    email=f'customer{customer_number}@{EMAIL_DOMAIN}',
+                    phone_number=f'01{self.random.randrange(10**7, 10**8)}',
+                    address=f'{self.random.randrange(1, 500)} Jalan Contoh {self.random.randrange(1, 50)}',
+                    city=self.random.choice(CITIES),
+                    state=self.random.choice(customer_states),
+                    house_type=self.random.choice(house_types),
+                    postcode=f'{self.random.randrange(10000, 99999)}',
+                ))
+            customers = Customer.objects.bulk_create(customers)
+            if customers and customers[0].pk is None:
+                customers = list(Customer.objects.filter(
+                    email__in=[customer.email for customer in customers]
+                ).order_by('id'))
+
+            installations = []
+            for customer in customers:
+                prefix = f'{customer.state[:2].upper()}{customer.house_type.upper()}'
+                installation_id = f'{prefix}{next_numbers[prefix]:06d}'
+                next_numbers[prefix] += 1
+
+                status = self.random.choices(statuses, weights)[0]
+                created_at = self.random_datetime()
+                user_id = profile_id = None
+                if status != 'SUBMITTED' and all_installers:
+                    region_installers = installers_by_region.get(CUSTOMER_STATE_REGIONS.get(customer.state)) or all_installers
+                    user_id, profile_id = self.random.choice(region_installers)
+
+                installations.append(Installation(
+                    installation_id=installation_id,
+                    customer_id=customer.pk,
+                    charger_model_id=self.random.choice(charger_model_ids),
+                    assigned_installer_id=user_id,
+                    installer_id=profile_id,
+                    installation_created_date=created_at.date(),
+                    status=status,
+                    created_at=created_at,
+                    updated_at=created_at + timedelta(hours=self.random.randrange(0, 24 * 14)),
+                    assignment_expires_at=(
+                        created_at + timedelta(hours=InstallationTransitionService.OFFER_HOURS)
+                        if status == 'PENDING_ACCEPTANCE' else None
+                    ),
+                ))
+
+            with explicit_timestamps(*installation_fields):
+                installations = Installation.objects.bulk_create(installations)
+            if installations and installations[0].pk is None:
+                installations = list(Installation.objects.filter(
+                    installation_id__in=[installation.installation_id for installation in installations]
+                ))
+            installation_ids.extend(installation.pk for installation in installations)
+            self.seed_status_events(installations)
+
+        self.done(started)
+        return installation_ids
+
+    def seed_status_events(self, installations):
+        """
+        Give each installation the status history that led to its status,
+        spread between its created_at and updated_at.
+        """
+        events = []
+        for installation in installations:
+            path = STATUS_PATHS[installation.status]
+            step = (installation.updated_at - installation.created_at) / max(len(path) - 1, 1)
+            for number, to_status in enumerate(path):
+                events.append(InstallationStatusEvent(
+                    installation_id=installation.pk,
+                    # Offered once it left SUBMITTED
+                    installer_id=installation.assigned_installer_id if number else None,
+                    from_status=path[number - 1] if number else '',
+                    to_status=to_status,
+                    created_at=installation.created_at + step * number,
+                ))
+        InstallationStatusEvent.objects.bulk_create(events, batch_size=self.batch_size)
+
+    # -----------------------------------------------
+    # Tasks and notifications
+    # -----------------------------------------------
+    def seed_tasks(self, count):
+        started = self.timed('tasks', count)
+        priorities = [code for code, _ in Task.PRIORITY_CHOICES]
+        statuses = [code for code, _ in Task.STATUS_CHOICES]
+        created_at_field = Task._meta.get_field('created_at')
+
+        for start, end in self.batches(count):
+            tasks = [
+                Task(
+                    title=f'{TASK_TITLE_PREFIX} Task {number + 1}',
+                    pic=f'PIC {self.random.randrange(1, 50)}',
+                    remarks='Generated by seed_synthetic.',
+                    priority=self.random.choice(priorities),
+                    status=self.random.choice(statuses),
+                    created_at=self.random_datetime(),
+                )
+                for number in range(start, end)
+            ]
+            with explicit_timestamps(created_at_field):
+                Task.objects.bulk_create(tasks)
+
+        self.done(started)
+        return list(Task.objects.filter(title__startswith=TASK_TITLE_PREFIX).values_list('id', flat=True))
+
+    def seed_notifications(self, count, user_ids, installation_ids, task_ids):
+        """
+        Create notifications spread over the synthetic users, mostly linked
+        to an installation, some to a task, older ones mostly read.
+        """
+        started = self.timed('notifications', count)
+        priorities = [code for code, _ in Notification.PRIORITY_CHOICES]
+        created_at_field = Notification._meta.get_field('created_at')
+
+        for start, end in self.batches(count):
+            notifications = []
+            for _ in range(start, end):
+                created_at = self.random_datetime()
+                installation_id = task_id = priority = None
+                if task_ids and self.random.random() < 0.2:
+                    task_id = self.random.choice(task_ids)
+                    priority = self.random.choice(priorities)
+                    message = f"Task #{task_id} was updated."
+                elif installation_ids:
+                    installation_id = self.random.choice(installation_ids)
+                    message = self.random.choice(NOTIFICATION_MESSAGES).format(id=installation_id)
+                else:
+                    message = "System notification."
+                age_days = (self.now - created_at).days
+                notifications.append(Notification(
+                    user_id=self.random.choice(user_ids),
+                    message=message,
+                    is_read=self.random.random() < (0.95 if age_days > 7 else 0.4),
+                    related_installation_id=installation_id,
+                    related_task_id=task_id,
+                    priority=priority,
+                    created_at=created_at,
+                ))
+            with explicit_timestamps(created_at_field):
+                Notification.objects.bulk_create(notifications)
+
+        self.done(started)
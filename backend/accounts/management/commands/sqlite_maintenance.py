@@ -0,0 +1,41 @@
+# accounts/management/commands/sqlite_maintenance.py
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from accounts.sqlite_tuning import CHECKPOINT_MODES, run_maintenance
+
+
+class Command(BaseCommand):
+    help = (
+        "Checkpoint the SQLite WAL and run PRAGMA optimize. Connections already do "
+        "this every SQLITE_TUNING['MAINTENANCE_INTERVAL']; run this from cron to "
+        "truncate the WAL file during quiet hours."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database alias (default: "default").')
+        parser.add_argument(
+            '--mode', default='TRUNCATE', choices=CHECKPOINT_MODES,
+            help='wal_checkpoint mode (default: TRUNCATE).',
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError("sqlite_maintenance only applies to SQLite databases.")
+
+        result = run_maintenance(connection, options['mode'])
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+
+        if result['busy']:
+            self.stdout.write(self.style.WARNING(
+                f"Checkpoint could not finish: the database was busy ({result['checkpointed_pages']} of "
+                f"{result['log_pages']} WAL pages copied)."
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Checkpointed {result['checkpointed_pages']} of {result['log_pages']} WAL pages "
+                f"(journal_mode={journal_mode}); statistics optimized."
+            ))
@@ -0,0 +1,140 @@
+# accounts/management/commands/startup_profile.py
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a fresh worker imports before it can answer its first request
+ENTRY_POINTS = {
+    'wsgi': 'import config.wsgi',
+    'asgi': 'import config.asgi',
+    'setup': 'import django; django.setup()',
+}
+LOAD_URLCONF = 'from django.urls import get_resolver; get_resolver().url_patterns'
+
+# A line of `python -X importtime` output: "import time: self | cumulative | module",
+# times in microseconds, nesting shown by two spaces per level. Modules loaded
+# with importlib.import_module (URLconfs, dotted paths in settings) get no line
+# of their own; their imports are listed as top-level entries.
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+
+def parse_importtime(stderr):
+    """
+    Returns:
+        dict: Module name -> (self µs, cumulative µs, nesting depth)
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        "Start a fresh interpreter the way a worker boots (import the WSGI or ASGI "
+        "application and load the URLconf) under `python -X importtime`, and print the "
+        "boot time and the slowest imports per module and per package as JSON. Use it to "
+        "keep heavy dependencies (boto3, Channels, Jinja2, PIL) out of worker startup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--entry', choices=sorted(ENTRY_POINTS), default='wsgi',
+            help='What to import: the WSGI or ASGI application, or just django.setup() (default: wsgi).',
+        )
+        parser.add_argument('--no-urlconf', action='store_true', help='Do not load the URLconf after the entry point.')
+        parser.add_argument('--runs', type=int, default=3, help='Interpreters to start; timings are medians (default: 3).')
+        parser.add_argument('--top', type=int, default=25, help='Modules to list, slowest first (default: 25).')
+        parser.add_argument('--prefix', help='Only list modules starting with this, e.g. "accounts".')
+        parser.add_argument('--output', help='Also write the JSON report to this file.')
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError("--runs must be at least 1.")
+
+        code = ENTRY_POINTS[options['entry']]
+        if not options['no_urlconf']:
+            code += '\n' + LOAD_URLCONF
+        runs = [self.run_interpreter(code) for _ in range(options['runs'])]
+
+        # Medians across runs; a module missing from a run counts as 0 there
+        names = set().union(*(modules for _, _, modules in runs))
+        modules = {}
+        for name in names:
+            samples = [run_modules.get(name, (0, 0, 0)) for _, _, run_modules in runs]
+            modules[name] = {
+                'self_ms': round(statistics.median(s[0] for s in samples) / 1000, 2),
+                'cumulative_ms': round(statistics.median(s[1] for s in samples) / 1000, 2),
+                'depth': max(s[2] for s in samples),
+            }
+
+        packages = {}
+        for name, timing in modules.items():
+            package = name.split('.')[0]
+            packages[package] = packages.get(package, 0) + timing['self_ms']
+
+        listed = [
+            {'module': name, **timing} for name, timing in modules.items()
+            if not options['prefix'] or name.startswith(options['prefix'])
+        ]
+        listed.sort(key=lambda row: (-row['cumulative_ms'], row['module']))
+
+        report = {
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+            },
+            'entry': options['entry'],
+            'urlconf': not options['no_urlconf'],
+            'runs': options['runs'],
+            'boot_ms': round(statistics.median(boot for boot, _, _ in runs), 1),
+            'process_ms': round(statistics.median(process for _, process, _ in runs), 1),
+            'modules_imported': len(modules),
+            'packages': {
+                package: round(total, 2)
+                for package, total in sorted(packages.items(), key=lambda item: -item[1])[:options['top']]
+            },
+            'modules': listed[:options['top']],
+        }
+        output = json.dumps(report, indent=2)
+        self.stdout.write(output)
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                report_file.write(output + '\n')
+
+    def run_interpreter(self, code):
+        """
+        Run `code` in a new interpreter with -X importtime.
+
+        Returns:
+            tuple: (in-process ms for `code`, wall ms for the whole process, parsed imports)
+        """
+        script = (
+            'import time\n'
+            '_started = time.perf_counter()\n'
+            f'{code}\n'
+            'print((time.perf_counter() - _started) * 1000)\n'
+        )
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE}
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        process_ms = (time.perf_counter() - started) * 1000
+        if result.returncode != 0:
+            raise CommandError(f"Startup failed:\n{result.stderr[-2000:]}")
+        boot_ms = float(result.stdout.strip().splitlines()[-1])
+        return boot_ms, process_ms, parse_importtime(result.stderr)
@@ -0,0 +1,294 @@
+# accounts/management/commands/ws_loadtest.py
+import asyncio
+import contextlib
+import io
+import json
+import time
+import tracemalloc
+from importlib import import_module
+
+from asgiref.sync import sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils.module_loading import import_string
+
+from accounts.models import CustomUser, Notification, Task
+from accounts.write_queue import batch_writer
+from .benchmark_views import QUIET_INSTRUMENTATION, percentile
+
+# Users and tasks created by the harness, removed again when it finishes
+USERNAME_PREFIX = 'wsload-'
+TASK_TITLE_PREFIX = '[wsload]'
+WEBSOCKET_PATH = '/ws/admin/notifications/'
+
+
+def read_rss():
+    """
+    Resident set size of this process in bytes (Linux only, else None).
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * import_module('resource').getpagesize()
+    except (OSError, ImportError, IndexError, ValueError):
+        return None
+
+
+def latency_summary(samples):
+    if not samples:
+        return None
+    return {
+        'p50': round(percentile(samples, 50), 2),
+        'p95': round(percentile(samples, 95), 2),
+        'p99': round(percentile(samples, 99), 2),
+        'max': round(max(samples), 2),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Open N authenticated admin/installer WebSockets against the project's ASGI "
+        "application, fire M task notifications through the add_task view, and report "
+        "delivery latency percentiles, messages/second and memory per connection as JSON. "
+        "It writes users, tasks and notifications to the configured database and broadcasts "
+        "to the live admins group, so it refuses to run without --allow-writes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--admins', type=int, default=100, help='Admin sockets to open (default: 100).')
+        parser.add_argument('--installers', type=int, default=100, help='Installer sockets to open (default: 100).')
+        parser.add_argument('--events', type=int, default=50, help='Notification events to fire (default: 50).')
+        parser.add_argument('--rate', type=float, default=0, help='Events per second; 0 fires them back to back (default: 0).')
+        parser.add_argument('--timeout', type=float, default=30, help='Seconds to wait for outstanding deliveries (default: 30).')
+        parser.add_argument('--output', help='Also write the JSON report to this file.')
+        parser.add_argument(
+            '--allow-writes', action='store_true',
+            help='Confirm the run may write to this database and notify connected admins.',
+        )
+
+    def handle(self, *args, **options):
+        if not options['allow_writes']:
+            raise CommandError(
+                "ws_loadtest creates users, tasks and notifications in the "
+                f"'{settings.DATABASES['default']['NAME']}' database and broadcasts every event to the "
+                "admins group, so any admin connected to this channel layer sees them. "
+                "Point it at a scratch database and pass --allow-writes."
+            )
+        if options['admins'] < 1:
+            raise CommandError("--admins must be at least 1; events are fired by an admin.")
+        if options['installers'] < 0 or options['events'] < 1:
+            raise CommandError("--installers must be >= 0 and --events >= 1.")
+
+        try:
+            # channels.testing needs daphne installed
+            from channels.testing import WebsocketCommunicator
+        except ImportError as exc:
+            raise CommandError(f"ws_loadtest needs Channels' test tools ({exc}); pip install daphne.")
+        self.communicator_class = WebsocketCommunicator
+        self.application = import_string(settings.ASGI_APPLICATION)
+        admins, installers = self.create_users(options['admins'], options['installers'])
+        session_keys = []
+        try:
+            sockets = []
+            for role, users in (('admin', admins), ('installer', installers)):
+                for user in users:
+                    session_key = self.create_session(user)
+                    session_keys.append(session_key)
+                    sockets.append((role, session_key))
+
+            with override_settings(ALLOWED_HOSTS=['*'], REQUEST_INSTRUMENTATION=QUIET_INSTRUMENTATION), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                report = asyncio.run(self.run(sockets, admins[0], options))
+        finally:
+            self.cleanup(session_keys)
+
+        output = json.dumps(report, indent=2)
+        self.stdout.write(output)
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                report_file.write(output + '\n')
+
+    # -----------------------------------------------
+    # Setup and cleanup
+    # -----------------------------------------------
+    def create_users(self, admin_count, installer_count):
+        self.cleanup([])
+        password = make_password(None)
+        CustomUser.objects.bulk_create(
+            [CustomUser(username=f'{USERNAME_PREFIX}admin-{n}', role='1', password=password) for n in range(admin_count)]
+            + [CustomUser(username=f'{USERNAME_PREFIX}installer-{n}', role='2', password=password) for n in range(installer_count)]
+        )
+        users = list(CustomUser.objects.filter(username__startswith=USERNAME_PREFIX).order_by('pk'))
+        return [user for user in users if user.role == '1'], [user for user in users if user.role == '2']
+
+    def create_session(self, user):
+        """
+        Log a user in without a request, the way the socket's session cookie
+        would have been created by the login view.
+        """
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.save()
+        return session.session_key
+
+    def cleanup(self, session_keys):
+        session_store = import_module(settings.SESSION_ENGINE).SessionStore
+        for session_key in session_keys:
+            session_store(session_key).delete()
+        # Notifications are written by the batch writer; let it catch up first
+        batch_writer.flush()
+        # Notifications for real admins point at the harness tasks; the rest
+        # go with the harness users
+        Notification.objects.filter(related_task__title__startswith=TASK_TITLE_PREFIX).delete()
+        Task.objects.filter(title__startswith=TASK_TITLE_PREFIX).delete()
+        CustomUser.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+    # -----------------------------------------------
+    # Load run
+    # -----------------------------------------------
+    async def run(self, sockets, sender, options):
+        channel_layer = get_channel_layer()
+        group_sent_at = {}
+
+        # Time fan-out from the moment group_send is called by the view
+        original_group_send = channel_layer.group_send
+
+        async def timed_group_send(group, message):
+            group_sent_at[message.get('message')] = time.perf_counter()
+            return await original_group_send(group, message)
+
+        channel_layer.group_send = timed_group_send
+        try:
+            communicators, connect = await self.connect_all(sockets)
+            try:
+                delivery = await self.fire_events(communicators, sender, options, group_sent_at)
+            finally:
+                await asyncio.gather(*(communicator.disconnect() for _, communicator in communicators))
+        finally:
+            del channel_layer.group_send
+
+        return {
+            'config': {
+                'admin_sockets': sum(1 for role, _ in sockets if role == 'admin'),
+                'installer_sockets': sum(1 for role, _ in sockets if role == 'installer'),
+                'events': options['events'],
+                'rate': options['rate'] or None,
+                'channel_layer': f"{type(channel_layer).__module__}.{type(channel_layer).__name__}",
+            },
+            'connect': connect,
+            'delivery': delivery,
+        }
+
+    async def connect_all(self, sockets):
+        rss_before = read_rss()
+        tracemalloc.start()
+        heap_before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+
+        async def connect(role, session_key):
+            communicator = self.communicator_class(
+                self.application, WEBSOCKET_PATH,
+                headers=[(b'cookie', f'{settings.SESSION_COOKIE_NAME}={session_key}'.encode()), (b'host', b'localhost')],
+            )
+            connected, _ = await communicator.connect(timeout=30)
+            if not connected:
+                raise CommandError(f"A {role} socket was refused; is the consumer authenticating sessions?")
+            return role, communicator
+
+        communicators = await asyncio.gather(*(connect(role, key) for role, key in sockets))
+        elapsed = time.perf_counter() - started
+        heap_after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        rss_after = read_rss()
+
+        count = len(communicators)
+        return communicators, {
+            'sockets': count,
+            'seconds': round(elapsed, 3),
+            'per_second': round(count / elapsed, 1) if elapsed else None,
+            'python_heap_bytes_per_connection': round((heap_after - heap_before) / count),
+            'rss_bytes_per_connection': round((rss_after - rss_before) / count) if rss_before and rss_after else None,
+        }
+
+    async def fire_events(self, communicators, sender, options, group_sent_at):
+        """
+        Post M tasks through the add_task view (which stores a Notification per
+        admin and group_sends to the admin sockets) while every socket collects
+        what it receives.
+        """
+        client = Client()
+        await sync_to_async(client.force_login)(sender)
+        url = reverse('add_task')
+        fired_at = {}
+        deliveries = {'admin': [], 'installer': []}
+        admin_sockets = sum(1 for role, _ in communicators if role == 'admin')
+        expected = admin_sockets * options['events']
+        all_delivered = asyncio.Event()
+
+        async def collect(role, communicator):
+            # Read the communicator's output queue directly: receive_from()
+            # kills the consumer when it times out
+            while True:
+                message = await communicator.output_queue.get()
+                if message.get('type') != 'websocket.send':
+                    continue
+                deliveries[role].append((time.perf_counter(), json.loads(message['text'])['message']))
+                if len(deliveries['admin']) >= expected:
+                    all_delivered.set()
+
+        def post_task(number):
+            title = f'{TASK_TITLE_PREFIX} event {number}'
+            fired_at[title] = time.perf_counter()
+            response = client.post(url, {'title': title, 'pic': 'wsload', 'priority': 'Low', 'status': 'Pending'})
+            if response.status_code != 302:
+                raise CommandError(f"add_task returned {response.status_code}.")
+            return title
+
+        collectors = [asyncio.ensure_future(collect(role, communicator)) for role, communicator in communicators]
+        started = time.perf_counter()
+        titles = []
+        try:
+            for number in range(options['events']):
+                titles.append(await sync_to_async(post_task)(number))
+                if options['rate']:
+                    await asyncio.sleep(max(started + (number + 1) / options['rate'] - time.perf_counter(), 0))
+            fired = time.perf_counter() - started
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(all_delivered.wait(), options['timeout'])
+        finally:
+            for collector in collectors:
+                collector.cancel()
+            await asyncio.gather(*collectors, return_exceptions=True)
+
+        # Messages carry the task title, which identifies the event
+        event_of = {f"✅ New Task Added: {title} by {sender.username}": title for title in titles}
+        fanout, end_to_end = [], []
+        for received_at, text in deliveries['admin']:
+            title = event_of.get(text)
+            if title is None:
+                continue
+            end_to_end.append((received_at - fired_at[title]) * 1000)
+            if text in group_sent_at:
+                fanout.append((received_at - group_sent_at[text]) * 1000)
+
+        delivered = len(end_to_end)
+        last_delivery = max((received_at for received_at, _ in deliveries['admin']), default=started)
+        duration = last_delivery - started
+        return {
+            'events_seconds': round(fired, 3),
+            'events_per_second': round(options['events'] / fired, 1) if fired else None,
+            'expected': expected,
+            'delivered': delivered,
+            'dropped': expected - delivered,
+            'installer_messages': len(deliveries['installer']),
+            'messages_per_second': round(delivered / duration, 1) if duration > 0 else None,
+            'fanout_latency_ms': latency_summary(fanout),
+            'end_to_end_latency_ms': latency_summary(end_to_end),
+        }
@@ -0,0 +1,203 @@
+# accounts/media_cache.py
+"""
+Read-through disk cache for files served by the media proxy
+(accounts/views/media_views.py).
+
+The first request for a certificate or task document copies it from object
+storage into MEDIA_PROXY['CACHE_DIR']; later requests are answered from
+disk. The transfer itself is handed to the front-end server with
+X-Accel-Redirect (nginx) or X-Sendfile (Apache, lighttpd), so Python never
+streams the bytes; without either (development) Django streams the file.
+
+The cache is an LRU bounded by MAX_BYTES: hits refresh a file's mtime and
+a fill evicts the least recently used files once the total is over the
+limit. Each process keeps a running total of the cache size, seeded by the
+first eviction's directory walk and advanced by its own fills, so the
+directory is only walked again when that total goes over the limit (files
+added by other processes are counted at the next walk). Content-addressed blobs never change, so they are cached by name;
+other files are keyed by name and etag (or modification time), so an
+overwritten file is fetched again.
+
+nginx example for SENDFILE = 'x-accel-redirect':
+
+    location /protected-media/ {
+        internal;
+        alias /srv/app/media/proxy-cache/;
+    }
+"""
+import contextlib
+import hashlib
+import mimetypes
+import os
+import shutil
+import tempfile
+import threading
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import content_disposition_header
+
+from .blob_storage import BLOB_PREFIX
+
+# Defaults for settings.MEDIA_PROXY
+DEFAULT_MEDIA_PROXY = {
+    'CACHE_DIR': None,                   # Defaults to MEDIA_ROOT/proxy-cache
+    'MAX_BYTES': 2 * 1024 ** 3,          # 2 GiB
+    'SENDFILE': None,                    # 'x-accel-redirect', 'x-sendfile' or None (Django streams)
+    'ACCEL_PREFIX': '/protected-media/', # nginx internal location aliased to CACHE_DIR
+    'BROWSER_MAX_AGE': 3600,
+}
+
+
+def get_media_proxy_settings():
+    return {**DEFAULT_MEDIA_PROXY, **getattr(settings, 'MEDIA_PROXY', {})}
+
+
+def _remove(path):
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+
+
+class MediaCache:
+    """
+    Bounded on-disk LRU of files copied from storage; see the module docstring.
+    """
+
+    LOCK_STRIPES = 64
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self):
+        # One lock per stripe of cache keys, so concurrent requests for the
+        # same file download it once without a lock per file
+        self._locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        self._evict_lock = threading.Lock()
+        # Cache directory -> bytes in it, as of the last walk plus later fills
+        self._totals = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cache_dir():
+        cache_dir = get_media_proxy_settings()['CACHE_DIR'] or os.path.join(settings.MEDIA_ROOT, 'proxy-cache')
+        return str(cache_dir)
+
+    @staticmethod
+    def cache_key(storage, name):
+        """
+        Relative cache path for a stored file.
+        """
+        version = ''
+        if not name.startswith(BLOB_PREFIX):
+            # May be overwritten in place, so the version is part of the key
+            etag = getattr(storage, 'etag', None)
+            version = etag(name) if etag else storage.get_modified_time(name).isoformat()
+        digest = hashlib.sha256(f'{name}\0{version}'.encode()).hexdigest()
+        return f'{digest[:2]}/{digest}{os.path.splitext(name)[1].lower()}'
+
+    def fetch(self, storage, name):
+        """
+        Make sure a stored file is in the cache.
+
+        Raises:
+            FileNotFoundError: The file is not in storage
+
+        Returns:
+            tuple: (path relative to the cache directory, absolute path)
+        """
+        relative = self.cache_key(storage, name)
+        cache_dir = self.cache_dir()
+        path = os.path.join(cache_dir, relative)
+        if self._touch(path):
+            self.hits += 1
+            return relative, path
+
+        lock = self._locks[int(relative[:2], 16) % self.LOCK_STRIPES]
+        with lock:
+            if self._touch(path):
+                self.hits += 1
+                return relative, path
+            self.misses += 1
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Written next to its final place and renamed, so other
+            # processes never serve a partial file
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.part')
+            try:
+                with storage.open(name, 'rb') as source, os.fdopen(fd, 'wb') as target:
+                    shutil.copyfileobj(source, target, self.CHUNK_SIZE)
+                os.replace(temp_path, path)
+            except BaseException:
+                _remove(temp_path)
+                raise
+            size = os.path.getsize(path)
+
+        with self._evict_lock:
+            total = self._totals.get(cache_dir)
+            if total is not None:
+                total = self._totals[cache_dir] = total + size
+        if total is None or total > get_media_proxy_settings()['MAX_BYTES']:
+            self.evict()
+        return relative, path
+
+    @staticmethod
+    def _touch(path):
+        try:
+            os.utime(path)  # Marks the file as recently used
+            return True
+        except FileNotFoundError:
+            return False
+
+    def evict(self, max_bytes=None):
+        """
+        Delete least recently used files until the cache fits in MAX_BYTES.
+
+        Returns:
+            int: Bytes freed
+        """
+        max_bytes = get_media_proxy_settings()['MAX_BYTES'] if max_bytes is None else max_bytes
+        cache_dir = self.cache_dir()
+        with self._evict_lock:
+            entries, total = [], 0
+            for directory, _, filenames in os.walk(cache_dir):
+                for filename in filenames:
+                    if filename.endswith('.part'):
+                        continue
+                    path = os.path.join(directory, filename)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+
+            freed = 0
+            for _, size, path in sorted(entries):
+                if total - freed <= max_bytes:
+                    break
+                _remove(path)
+                freed += size
+            self._totals[cache_dir] = total - freed
+            return freed
+
+    @staticmethod
+    def response(relative, path, filename, as_attachment=False):
+        """
+        Response that serves a cached file, through the front-end server
+        when MEDIA_PROXY['SENDFILE'] is set.
+        """
+        config = get_media_proxy_settings()
+        content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        if config['SENDFILE'] == 'x-accel-redirect':
+            response = HttpResponse(content_type=content_type)
+            response['X-Accel-Redirect'] = config['ACCEL_PREFIX'] + relative
+        elif config['SENDFILE'] == 'x-sendfile':
+            response = HttpResponse(content_type=content_type)
+            response['X-Sendfile'] = path
+        else:
+            response = FileResponse(open(path, 'rb'), content_type=content_type)
+        response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+        patch_cache_control(response, private=True, max_age=config['BROWSER_MAX_AGE'])
+        return response
+
+
+media_cache = MediaCache()
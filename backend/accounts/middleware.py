@@ -0,0 +1,220 @@
+# accounts/middleware.py
+import contextvars
+import json
+import logging
+import os
+import random
+import re
+import sys
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .db_router import RequestPin, current_pin, get_reporting_settings
+
+logger = logging.getLogger('accounts.instrumentation')
+
+# Defaults for settings.REQUEST_INSTRUMENTATION
+DEFAULT_INSTRUMENTATION = {
+    'ENABLED': True,
+    'SAMPLE_RATE': 0.01,        # Share of requests that get a structured log line
+    'SLOW_REQUEST_MS': None,    # Always log requests slower than this (None disables)
+    'SERVER_TIMING': True,      # Emit the Server-Timing response header
+    'DUPLICATE_THRESHOLD': 3,   # Executions of one statement that count as N+1
+    'MAX_DUPLICATES_LOGGED': 5,
+}
+
+IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+PROJECT_ROOT = str(settings.BASE_DIR)
+THIS_FILE = os.path.abspath(__file__)
+
+
+def get_instrumentation_settings():
+    return {**DEFAULT_INSTRUMENTATION, **getattr(settings, 'REQUEST_INSTRUMENTATION', {})}
+
+
+class RequestMetrics:
+    """
+    Query, SQL time and template time counters for a single request.
+    """
+
+    def __init__(self, duplicate_threshold):
+        self.duplicate_threshold = duplicate_threshold
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.fingerprints = {}
+        self.call_sites = {}
+
+    @staticmethod
+    def fingerprint(sql):
+        """
+        Normalize a statement so repeated executions with different
+        parameters (or IN lists of different lengths) share one key.
+        """
+        return IN_LIST_RE.sub('IN (...)', sql)
+
+    @staticmethod
+    def call_site():
+        """
+        Find the innermost project frame (outside Django and this module)
+        that led to the current query.
+        """
+        frame = sys._getframe(2)
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            # Skip frozen modules and code run from strings (e.g. `manage.py shell`)
+            if filename.startswith('<'):
+                frame = frame.f_back
+                continue
+            filename = os.path.abspath(filename)
+            if (filename.startswith(PROJECT_ROOT) and filename != THIS_FILE
+                    and 'site-packages' not in filename):
+                return f"{os.path.relpath(filename, PROJECT_ROOT)}:{frame.f_lineno} in {frame.f_code.co_name}"
+            frame = frame.f_back
+        return None
+
+    def record_query(self, sql, duration):
+        self.query_count += 1
+        self.sql_time += duration
+        key = self.fingerprint(sql)
+        count = self.fingerprints.get(key, 0) + 1
+        self.fingerprints[key] = count
+        # The call site is only looked up once per repeated statement
+        if count == self.duplicate_threshold:
+            self.call_sites[key] = self.call_site()
+
+    def duplicates(self, limit):
+        """
+        Get the statements executed at least duplicate_threshold times, most repeated first.
+        """
+        repeated = [
+            {'sql': sql, 'count': count, 'call_site': self.call_sites.get(sql)}
+            for sql, count in self.fingerprints.items()
+            if count >= self.duplicate_threshold
+        ]
+        repeated.sort(key=lambda item: item['count'], reverse=True)
+        return repeated[:limit]
+
+
+# Metrics of the request being handled in the current thread or task
+current_metrics = contextvars.ContextVar('request_metrics', default=None)
+
+
+def record_template_time(duration):
+    """
+    Add template render time to the current request, if it is instrumented.
+    Called by accounts.template_backends.InstrumentedDjangoTemplates and
+    accounts.jinja2_env.InstrumentedJinja2.
+    """
+    metrics = current_metrics.get()
+    if metrics is not None:
+        metrics.template_time += duration
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Records query count, SQL time, repeated statements (N+1 candidates with
+    their call site) and template render time for every request.
+
+    Every response gets a Server-Timing header; a sampled share of requests
+    (plus slow ones, if configured) also gets a structured JSON log line on
+    the 'accounts.instrumentation' logger. Configure through
+    settings.REQUEST_INSTRUMENTATION (see DEFAULT_INSTRUMENTATION).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = get_instrumentation_settings()
+
+    def __call__(self, request):
+        if not self.config['ENABLED']:
+            return self.get_response(request)
+
+        metrics = RequestMetrics(self.config['DUPLICATE_THRESHOLD'])
+
+        def wrapper(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                metrics.record_query(sql, time.perf_counter() - start)
+
+        token = current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(wrapper))
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        total_time = time.perf_counter() - start
+
+        if self.config['SERVER_TIMING']:
+            response['Server-Timing'] = self.server_timing(metrics, total_time)
+
+        slow_ms = self.config['SLOW_REQUEST_MS']
+        if random.random() < self.config['SAMPLE_RATE'] or (slow_ms is not None and total_time * 1000 >= slow_ms):
+            self.log(request, response, metrics, total_time)
+
+        return response
+
+    @staticmethod
+    def server_timing(metrics, total_time):
+        """
+        Build the Server-Timing header value. `view` is the time spent outside
+        template rendering (it includes SQL); `total` covers the whole
+        middleware chain below this one.
+        """
+        view_time = max(total_time - metrics.template_time, 0.0)
+        return ', '.join([
+            f'db;dur={metrics.sql_time * 1000:.1f};desc="{metrics.query_count} queries"',
+            f'view;dur={view_time * 1000:.1f}',
+            f'tpl;dur={metrics.template_time * 1000:.1f}',
+            f'total;dur={total_time * 1000:.1f}',
+        ])
+
+    def log(self, request, response, metrics, total_time):
+        resolver_match = getattr(request, 'resolver_match', None)
+        logger.info(json.dumps({
+            'event': 'request_metrics',
+            'method': request.method,
+            'path': request.path,
+            'view': resolver_match.view_name if resolver_match else None,
+            'status': response.status_code,
+            'total_ms': round(total_time * 1000, 1),
+            'template_ms': round(metrics.template_time * 1000, 1),
+            'sql_ms': round(metrics.sql_time * 1000, 1),
+            'queries': metrics.query_count,
+            'duplicates': metrics.duplicates(self.config['MAX_DUPLICATES_LOGGED']),
+        }))
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pins a user to the default database for REPORTING_DATABASE['PIN_SECONDS']
+    after a request of theirs writes, so reads routed to the reporting copy
+    (see accounts/db_router.py) never hide their own changes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = get_reporting_settings()
+
+    def __call__(self, request):
+        pin = RequestPin(pinned=self.config['PIN_COOKIE'] in request.COOKIES)
+        token = current_pin.set(pin)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_pin.reset(token)
+
+        if pin.wrote:
+            response.set_cookie(
+                self.config['PIN_COOKIE'], '1', max_age=self.config['PIN_SECONDS'],
+                httponly=True, samesite='Lax',
+            )
+        return response
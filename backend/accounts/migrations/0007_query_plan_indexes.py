@@ -0,0 +1,42 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_notification_related_task'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['role', '-date_joined', '-id'], name='accounts_cu_role_7841a0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='installation',
+            index=models.Index(fields=['-created_at'], name='accounts_in_created_d300d7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='installation',
+            index=models.Index(fields=['installer', '-installation_created_date'], name='accounts_in_install_e0d0e7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at'], name='accounts_no_user_id_b37b35_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'is_read'], name='accounts_no_user_id_a4ff2e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status'], name='accounts_ta_status_7456d2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['created_at'], name='accounts_ta_created_43f3bd_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_query_plan_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CertificateUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field_name', models.CharField(max_length=50)),
+                ('original_name', models.CharField(max_length=255)),
+                ('staged_path', models.CharField(max_length=500)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('uploading', 'Uploading'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='certificate_uploads', to='accounts.installerprofile')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('profile', 'field_name'), name='unique_certificate_upload')],
+            },
+        ),
+    ]
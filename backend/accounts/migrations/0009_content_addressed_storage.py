@@ -0,0 +1,60 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:05
+
+import accounts.blob_storage
+import accounts.models.installer_models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_certificate_upload'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='installerprofile',
+            name='cidb_certificate',
+            field=models.FileField(blank=True, null=True, storage=accounts.blob_storage.get_blob_storage, upload_to=accounts.models.installer_models.upload_to_cert),
+        ),
+        migrations.AlterField(
+            model_name='installerprofile',
+            name='coi_certificate',
+            field=models.FileField(blank=True, null=True, storage=accounts.blob_storage.get_blob_storage, upload_to=accounts.models.installer_models.upload_to_cert),
+        ),
+        migrations.AlterField(
+            model_name='installerprofile',
+            name='insurance_certificate',
+            field=models.FileField(blank=True, null=True, storage=accounts.blob_storage.get_blob_storage, upload_to=accounts.models.installer_models.upload_to_cert),
+        ),
+        migrations.AlterField(
+            model_name='installerprofile',
+            name='sst_certificate',
+            field=models.FileField(blank=True, null=True, storage=accounts.blob_storage.get_blob_storage, upload_to=accounts.models.installer_models.upload_to_cert),
+        ),
+        migrations.AlterField(
+            model_name='installerprofile',
+            name='st_certificate',
+            field=models.FileField(blank=True, null=True, storage=accounts.blob_storage.get_blob_storage, upload_to=accounts.models.installer_models.upload_to_cert),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='document',
+            field=models.FileField(blank=True, null=True, storage=accounts.blob_storage.get_blob_storage, upload_to='tasks/docs/'),
+        ),
+        migrations.CreateModel(
+            name='StoredBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('size', models.PositiveBigIntegerField()),
+                ('ref_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ref_count', 'updated_at'], name='accounts_st_ref_cou_a2cca1_idx')],
+            },
+        ),
+    ]
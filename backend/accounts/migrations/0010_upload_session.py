@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:12
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_content_addressed_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('target', models.CharField(choices=[('task_document', 'Task document'), ('st_certificate', 'ST certificate'), ('cidb_certificate', 'CIDB certificate'), ('sst_certificate', 'SST certificate'), ('insurance_certificate', 'Insurance certificate'), ('coi_certificate', 'COI certificate')], max_length=50)),
+                ('original_name', models.CharField(max_length=255)),
+                ('size', models.PositiveBigIntegerField()),
+                ('offset', models.PositiveBigIntegerField(default=0)),
+                ('staged_path', models.CharField(max_length=500)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['updated_at'], name='accounts_up_updated_b604b8_idx')],
+            },
+        ),
+    ]
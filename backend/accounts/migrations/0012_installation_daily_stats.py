@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_document_preview'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InstallationDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('region', models.CharField(blank=True, max_length=50)),
+                ('house_type', models.CharField(choices=[('L', 'Landed House'), ('H', 'High-Rise')], max_length=1)),
+                ('status', models.CharField(choices=[('SUBMITTED', 'Submitted'), ('PENDING_ACCEPTANCE', 'Pending Acceptance'), ('ACCEPTED', 'Accepted'), ('REJECTED', 'Rejected'), ('IN_PROGRESS', 'In Progress'), ('COMPLETED', 'Completed'), ('EXPIRED', 'Expired')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('charger_model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='accounts.chargermodel')),
+            ],
+            options={
+                'verbose_name_plural': 'installation daily stats',
+                'constraints': [models.UniqueConstraint(fields=('date', 'region', 'house_type', 'charger_model', 'status'), name='installation_daily_stats_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-19 05:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0013_installation_status_events'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='installation',
+            index=models.Index(fields=['status'], name='accounts_in_status_30543b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='installation',
+            index=models.Index(fields=['installer', 'status'], name='accounts_in_install_7b183e_idx'),
+        ),
+    ]
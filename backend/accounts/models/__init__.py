@@ -2,4 +2,6 @@ from .admin_models import *
 from .installer_models import *
 from .installation_models import *
 from .test_models import *
-from .notification_models import *
\ No newline at end of file
+from .notification_models import *
+from .storage_models import *
+from .reporting_models import *
\ No newline at end of file
@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+from ..blob_storage import get_blob_storage
+
 class Task(models.Model):
     # Priority levels for task urgency
     PRIORITY_CHOICES = [
@@ -19,7 +21,7 @@ class Task(models.Model):
     # Task metadata
     title = models.CharField(max_length=255)
     pic = models.CharField(max_length=100)  # Person in charge
-    document = models.FileField(upload_to='tasks/docs/', blank=True, null=True)
+    document = models.FileField(upload_to='tasks/docs/', storage=get_blob_storage, blank=True, null=True)
     remarks = models.TextField(blank=True)
 
     # System-generated fields
@@ -29,6 +31,13 @@ class Task(models.Model):
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES)
 
+    class Meta:
+        # Dashboard status counts and ordering; see `manage.py queryplan_audit`
+        indexes = [
+            models.Index(fields=['status']),
+            models.Index(fields=['created_at']),
+        ]
+
     def __str__(self):
         return self.title
 
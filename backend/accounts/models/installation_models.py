@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings  # For referencing CustomUser
 from ..models import InstallerProfile  # Replace with the actual path to your InstallerProfile model
 from django.utils import timezone
@@ -45,6 +45,12 @@ class Customer(models.Model):
     house_type = models.CharField(max_length=1, choices=HOUSE_TYPE_CHOICES, default='L')  # L or H
     postcode = models.CharField(max_length=10)
 
+    def save(self, *args, **kwargs):
+        # The rollup receivers (accounts/signals.py) move this customer's
+        # installation counts; they commit or roll back with the row
+        with transaction.atomic(using=kwargs.get('using'), savepoint=False):
+            super().save(*args, **kwargs)
+
     def __str__(self):
         return self.name
 
@@ -160,6 +166,16 @@ class Installation(models.Model):
         help_text="Crucial Field. Timestamp for when the installer's offer to accept expires. Null if not pending."
     )
 
+    class Meta:
+        # Keep in step with `manage.py queryplan_audit`
+        indexes = [
+            models.Index(fields=['-created_at']),
+            models.Index(fields=['installer', '-installation_created_date']),
+            # Status GROUP BY and the per-status counts of every dashboard
+            models.Index(fields=['status']),
+            models.Index(fields=['installer', 'status']),
+        ]
+
     def save(self, *args, **kwargs):
         """
         Overrides the save method to generate installation_id based on customer's
@@ -189,7 +205,10 @@ class Installation(models.Model):
         if not self.installation_created_date:
             self.installation_created_date = timezone.now().date()
 
-        super().save(*args, **kwargs)
+        # The rollup and status history receivers (accounts/signals.py)
+        # commit or roll back with the row
+        with transaction.atomic(using=kwargs.get('using'), savepoint=False):
+            super().save(*args, **kwargs)
 
     def __str__(self):
         """
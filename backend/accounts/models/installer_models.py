@@ -2,6 +2,8 @@ import os
 import re
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+
+from ..blob_storage import get_blob_storage
 # -----------------------------------------------
 # 🔐 CUSTOM USER MODEL WITH ROLE-BASED ACCESS
 # -----------------------------------------------
@@ -18,6 +20,12 @@ class CustomUser(AbstractUser):
         default='2'
     )
 
+    class Meta(AbstractUser.Meta):
+        # Installer directory and role lookups; see `manage.py queryplan_audit`
+        indexes = [
+            models.Index(fields=['role', '-date_joined', '-id']),
+        ]
+
     def __str__(self):
         return f"{self.username} ({self.get_role_display()})"
 
@@ -113,26 +121,32 @@ class InstallerProfile(models.Model):
     # ST Registration
     is_st_registered = models.BooleanField(default=False)
     license_class = models.CharField(max_length=10, choices=LICENSE_CLASS_CHOICES, null=True, blank=True)
-    st_certificate = models.FileField(upload_to=upload_to_cert, null=True, blank=True)
+    st_certificate = models.FileField(upload_to=upload_to_cert, storage=get_blob_storage, null=True, blank=True)
 
     # CIDB Registration
     is_cidb_registered = models.BooleanField(default=False)
     cidb_category = models.CharField(max_length=100, choices=CIDB_CATEGORY_CHOICES, null=True, blank=True)
     cidb_grade = models.CharField(max_length=10, choices=CIDB_GRADE_CHOICES, null=True, blank=True)
-    cidb_certificate = models.FileField(upload_to=upload_to_cert, null=True, blank=True)
+    cidb_certificate = models.FileField(upload_to=upload_to_cert, storage=get_blob_storage, null=True, blank=True)
 
     # SST Registration
     is_sst_registered = models.BooleanField(default=False)
     sst_number = models.CharField(max_length=100, null=True, blank=True)
-    sst_certificate = models.FileField(upload_to=upload_to_cert, null=True, blank=True)
+    sst_certificate = models.FileField(upload_to=upload_to_cert, storage=get_blob_storage, null=True, blank=True)
 
     # Insurance (PLWC)
     plwc_has_insurance = models.BooleanField(default=False)
-    insurance_certificate = models.FileField(upload_to=upload_to_cert, null=True, blank=True)
+    insurance_certificate = models.FileField(upload_to=upload_to_cert, storage=get_blob_storage, null=True, blank=True)
 
     # Inspection COI for EVCS
     coi_history = models.BooleanField(default=False)
-    coi_certificate = models.FileField(upload_to=upload_to_cert, null=True, blank=True)
+    coi_certificate = models.FileField(upload_to=upload_to_cert, storage=get_blob_storage, null=True, blank=True)
+
+    # Certificate file fields, uploaded through accounts/upload_queue.py
+    CERTIFICATE_FIELDS = (
+        'st_certificate', 'cidb_certificate', 'sst_certificate',
+        'insurance_certificate', 'coi_certificate',
+    )
 
     # Status & timestamps
     registration_status = models.CharField(
@@ -164,5 +178,42 @@ class InstallerProfile(models.Model):
 
     def __str__(self):
         return f"{self.company_name or 'Unnamed Installer Profile'}"
+
+
+# -----------------------------------------------
+# 📤 STAGED CERTIFICATE UPLOAD
+# -----------------------------------------------
+
+class CertificateUpload(models.Model):
+    """
+    A certificate saved to local staging while the upload queue
+    (accounts/upload_queue.py) pushes it to storage. The row is removed once
+    the file is stored and set on the profile; until then the profile pages
+    show the certificate as pending.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('uploading', 'Uploading'),
+        ('failed', 'Failed'),
+    ]
+
+    profile = models.ForeignKey(InstallerProfile, on_delete=models.CASCADE, related_name='certificate_uploads')
+    field_name = models.CharField(max_length=50)
+    original_name = models.CharField(max_length=255)
+    staged_path = models.CharField(max_length=500)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            # A newer upload of the same certificate replaces the pending one
+            models.UniqueConstraint(fields=['profile', 'field_name'], name='unique_certificate_upload'),
+        ]
+
+    def __str__(self):
+        return f"{self.profile} {self.field_name} ({self.status})"
     
 
@@ -60,6 +60,11 @@ class Notification(models.Model):
     class Meta:
         # Orders notifications by creation date, most recent first
         ordering = ['-created_at']
+        # Per-user list and unread badge lookups; see `manage.py queryplan_audit`
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['user', 'is_read']),
+        ]
         verbose_name = "Notification"
         verbose_name_plural = "Notifications"
 
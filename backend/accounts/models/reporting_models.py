@@ -0,0 +1,108 @@
+from django.db import models
+from django.utils import timezone
+
+from .installer_models import CustomUser
+from .installation_models import ChargerModel, Customer, Installation
+
+
+# -----------------------------------------------
+# 📈 DAILY INSTALLATION ROLLUP
+# -----------------------------------------------
+
+class InstallationDailyStats(models.Model):
+    """
+    Number of installations created on `date` that are currently in
+    `status`, per region (State.code of the customer's state), house type
+    and charger model. Kept current by the Installation and Customer
+    signal receivers (InstallationStatsService.apply) and rebuilt from the
+    installations by `manage.py backfill_daily_stats`, so trend charts
+    read a few hundred rows instead of grouping the whole Installation table.
+    """
+    date = models.DateField()  # Installation.installation_created_date
+    region = models.CharField(max_length=50, blank=True)  # '' when the customer's state maps to no region
+    house_type = models.CharField(max_length=1, choices=Customer.HOUSE_TYPE_CHOICES)
+    charger_model = models.ForeignKey(ChargerModel, on_delete=models.CASCADE, related_name='daily_stats')
+    status = models.CharField(max_length=20, choices=Installation.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'region', 'house_type', 'charger_model', 'status'],
+                name='installation_daily_stats_key',
+            ),
+        ]
+        verbose_name_plural = 'installation daily stats'
+
+    def __str__(self):
+        return f"{self.date} {self.region or '-'} {self.house_type} {self.charger_model_id} {self.status}: {self.count}"
+
+
+# -----------------------------------------------
+# 🧭 INSTALLATION STATUS HISTORY
+# -----------------------------------------------
+
+class InstallationStatusEvent(models.Model):
+    """
+    One status transition of an installation. Append-only: rows are
+    written by InstallationEventService.record and never updated, so the
+    table is the job's full history and the source InstallerScorecard
+    rows are rebuilt from.
+    """
+    installation = models.ForeignKey(Installation, on_delete=models.CASCADE, related_name='status_events')
+    # The installer the job was assigned to at the time of the transition
+    installer = models.ForeignKey(
+        CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='installation_status_events',
+    )
+    from_status = models.CharField(max_length=20, choices=Installation.STATUS_CHOICES, blank=True)  # '' on creation
+    to_status = models.CharField(max_length=20, choices=Installation.STATUS_CHOICES)
+    # The user who made the change, when known
+    actor = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['installation', 'to_status', '-created_at']),
+            models.Index(fields=['installer', 'created_at']),
+        ]
+        ordering = ['created_at', 'pk']
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Installation status events are append-only.")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.installation_id}: {self.from_status or '-'} -> {self.to_status} at {self.created_at:%Y-%m-%d %H:%M}"
+
+
+class InstallerScorecard(models.Model):
+    """
+    Running totals of an installer's offers and how they ended, updated
+    from each InstallationStatusEvent as it is recorded, so rates and
+    medians are read from one row instead of scanning the history.
+    Rebuilt from the events by `manage.py rebuild_scorecards`.
+
+    Durations are kept as counts per DURATION_BUCKETS bucket (seconds,
+    upper bounds; the last bucket is open-ended), which is enough for a
+    median to within a bucket.
+    """
+    DURATION_BUCKETS = [
+        60, 300, 900, 1800, 3600, 2 * 3600, 4 * 3600, 8 * 3600, 12 * 3600,
+        86400, 2 * 86400, 4 * 86400, 7 * 86400, 14 * 86400, 30 * 86400,
+    ]
+
+    installer = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='scorecard')
+    offered = models.PositiveIntegerField(default=0)  # Times a job was put to them for acceptance
+    accepted = models.PositiveIntegerField(default=0)
+    rejected = models.PositiveIntegerField(default=0)
+    expired = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    # Offer to acceptance, and acceptance to completion
+    accept_seconds = models.JSONField(default=list)
+    complete_seconds = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Scorecard for {self.installer}"
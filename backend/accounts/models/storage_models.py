@@ -0,0 +1,116 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+
+# -----------------------------------------------
+# 🗃️ CONTENT-ADDRESSED FILE STORAGE
+# -----------------------------------------------
+
+class StoredBlob(models.Model):
+    """
+    A file in content-addressed storage (accounts/blob_storage.py), stored
+    once under the SHA-256 of its content. ref_count is the number of file
+    fields pointing at it; `manage.py gc_blobs` deletes blobs nobody uses.
+    """
+    name = models.CharField(max_length=255, unique=True)  # Storage key
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Last time the blob was written, reused or (de)referenced; GC leaves
+    # recently touched blobs alone
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['ref_count', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+
+# -----------------------------------------------
+# 📦 RESUMABLE (CHUNKED) UPLOADS
+# -----------------------------------------------
+
+class UploadSession(models.Model):
+    """
+    A file being sent in chunks (accounts/chunked_uploads.py). Chunks are
+    written to staged_path as they arrive; `offset` is how many bytes have
+    been received, so an interrupted upload resumes from there. The row is
+    removed when the upload is finalized onto its target field.
+    """
+    TARGET_CHOICES = [
+        ('task_document', 'Task document'),
+        ('st_certificate', 'ST certificate'),
+        ('cidb_certificate', 'CIDB certificate'),
+        ('sst_certificate', 'SST certificate'),
+        ('insurance_certificate', 'Insurance certificate'),
+        ('coi_certificate', 'COI certificate'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)  # Unguessable, used in URLs
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='upload_sessions')
+    target = models.CharField(max_length=50, choices=TARGET_CHOICES)
+    original_name = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)  # Bytes received so far
+    staged_path = models.CharField(max_length=500)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['updated_at']),
+        ]
+
+    @property
+    def is_complete(self):
+        return self.offset >= self.size
+
+    def __str__(self):
+        return f"{self.original_name} ({self.offset}/{self.size} bytes)"
+
+
+# -----------------------------------------------
+# 🖼️ DOCUMENT PREVIEWS
+# -----------------------------------------------
+
+class DocumentPreview(models.Model):
+    """
+    First-page thumbnail and text of a stored certificate or task document,
+    generated in the background by accounts/previews.py. Keyed by the
+    file's storage name, so a content-addressed file shared by several rows
+    is rendered once.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('rendering', 'Rendering'),
+        ('ready', 'Ready'),
+        ('unsupported', 'Unsupported'),
+        ('failed', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=255, unique=True)  # Storage name of the source file
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    thumbnail = models.FileField(upload_to='previews/', null=True, blank=True)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    page_count = models.PositiveIntegerField(null=True, blank=True)
+    title = models.CharField(max_length=255, blank=True)
+    author = models.CharField(max_length=255, blank=True)
+    text = models.TextField(blank=True)  # Excerpt of the extracted text
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return f"Preview of {self.name} ({self.status})"
@@ -0,0 +1,89 @@
+# accounts/preview_render.py
+"""
+Thumbnail and text extraction for document previews.
+
+Runs inside the preview process pool (accounts/previews.py), so this module
+must not import Django: worker processes only get a local file path and
+return plain data.
+"""
+import io
+import os
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tif', '.tiff', '.webp')
+TEXT_PAGES = 5  # Pages read for the text excerpt
+
+
+class UnsupportedDocument(Exception):
+    """The file type has no preview."""
+
+
+def render_preview(path, width=320, text_chars=2000):
+    """
+    Render the first page of a PDF or image as a JPEG thumbnail and pull out
+    its text and metadata.
+
+    Args:
+        path (str): Local file to read
+        width (int): Thumbnail width in pixels
+        text_chars (int): Longest text excerpt kept
+
+    Returns:
+        dict: 'thumbnail' (JPEG bytes), 'width', 'height', 'page_count',
+              'title', 'author' and 'text'
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.pdf':
+        return _render_pdf(path, width, text_chars)
+    if extension in IMAGE_EXTENSIONS:
+        return _render_image(path, width)
+    raise UnsupportedDocument(f"No preview for {extension or 'files without an extension'}.")
+
+
+def _render_pdf(path, width, text_chars):
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(path)
+    try:
+        first_page = pdf[0]
+        bitmap = first_page.render(scale=width / first_page.get_width())
+        image = bitmap.to_pil()
+
+        text = []
+        length = 0
+        for index in range(min(len(pdf), TEXT_PAGES)):
+            page = pdf[index]
+            text_page = page.get_textpage()
+            page_text = ' '.join(text_page.get_text_range().split())
+            text_page.close()
+            page.close()
+            text.append(page_text)
+            length += len(page_text)
+            if length >= text_chars:
+                break
+
+        metadata = pdf.get_metadata_dict(skip_empty=True)
+        return {
+            **_encode(image),
+            'page_count': len(pdf),
+            'title': metadata.get('Title', '')[:255],
+            'author': metadata.get('Author', '')[:255],
+            'text': ' '.join(text).strip()[:text_chars],
+        }
+    finally:
+        pdf.close()
+
+
+def _render_image(path, width):
+    from PIL import Image
+
+    with Image.open(path) as image:
+        image.thumbnail((width, width * 4))
+        return {**_encode(image), 'page_count': 1, 'title': '', 'author': '', 'text': ''}
+
+
+def _encode(image):
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=80, optimize=True)
+    return {'thumbnail': buffer.getvalue(), 'width': image.width, 'height': image.height}
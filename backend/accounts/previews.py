@@ -0,0 +1,209 @@
+# accounts/previews.py
+"""
+Background thumbnails and text for certificates and task documents.
+
+Reviewing an installer meant opening every certificate PDF in full. When a
+certificate or task document is stored, the signals in accounts/signals.py
+queue a DocumentPreview for it; a small thread pool pulls the file through
+the local media cache (accounts/media_cache.py) and hands the path to a
+process pool, which renders the first page as a JPEG and extracts the text
+and metadata (accounts/preview_render.py). Rasterizing is CPU-bound, so it
+runs in separate processes, away from the request threads and the GIL.
+
+The thumbnail is saved to the default storage and shown inline on the
+profile and task pages. Previews are keyed by file name, so identical
+(content-addressed) files are rendered once. `manage.py generate_previews`
+creates missing previews and retries failed ones.
+"""
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .blob_storage import blob_storage
+from .media_cache import media_cache
+from .models import DocumentPreview
+from .preview_render import UnsupportedDocument, render_preview
+
+logger = logging.getLogger(__name__)
+
+# Defaults for settings.DOCUMENT_PREVIEWS
+DEFAULT_DOCUMENT_PREVIEWS = {
+    'ENABLED': True,
+    'PROCESSES': 2,                      # Render processes; 0 renders in the worker thread
+    'THUMBNAIL_WIDTH': 320,
+    'TEXT_CHARS': 2000,
+    'MAX_SOURCE_BYTES': 50 * 1024 * 1024,
+    'RENDER_TIMEOUT': 60,                # Seconds a render process may take (not enforced with PROCESSES=0)
+}
+
+
+def get_preview_settings():
+    return {**DEFAULT_DOCUMENT_PREVIEWS, **getattr(settings, 'DOCUMENT_PREVIEWS', {})}
+
+
+def queue_previews(names, submit=True):
+    """
+    Create pending previews for files that have none and, with `submit`,
+    render them in the background once the current transaction commits.
+    """
+    if not get_preview_settings()['ENABLED']:
+        return
+    names = {name for name in names if name}
+    existing = set(DocumentPreview.objects.filter(name__in=names).values_list('name', flat=True))
+    for name in names - existing:
+        _, created = DocumentPreview.objects.get_or_create(name=name)
+        if created and submit:
+            transaction.on_commit(lambda name=name: preview_pool.submit(name))
+
+
+def previews_for(names):
+    """
+    Returns:
+        dict: File name -> DocumentPreview, for the names that have one
+    """
+    names = [name for name in names if name]
+    if not names:
+        return {}
+    return DocumentPreview.objects.in_bulk(names, field_name='name')
+
+
+def discard_previews(names):
+    """
+    Delete the previews of files that were removed from storage.
+    """
+    for preview in DocumentPreview.objects.filter(name__in=list(names)):
+        if preview.thumbnail:
+            preview.thumbnail.delete(save=False)
+        preview.delete()
+
+
+class PreviewPool:
+    """
+    Worker threads that fetch files and wait on the render process pool.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._threads = None
+        self._processes = None
+
+    def submit(self, name):
+        """
+        Queue a pending preview for a worker.
+        """
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(
+                    max_workers=max(get_preview_settings()['PROCESSES'], 1), thread_name_prefix='document-preview',
+                )
+            return self._threads.submit(self._run, name)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            threads, self._threads = self._threads, None
+            processes, self._processes = self._processes, None
+        if threads is not None:
+            threads.shutdown(wait=wait)
+        if processes is not None:
+            processes.shutdown(wait=wait)
+
+    def _after_fork(self):
+        # A forked worker does not inherit the parent's threads or children
+        self._lock = threading.Lock()
+        self._threads = None
+        self._processes = None
+
+    def _run(self, name):
+        close_old_connections()
+        try:
+            return self.process(name)
+        except Exception:  # Keep the worker alive; generate_previews retries
+            logger.exception("Preview of %s failed", name)
+            return False
+        finally:
+            close_old_connections()
+
+    def _render(self, path, config):
+        if not config['PROCESSES']:
+            return render_preview(path, config['THUMBNAIL_WIDTH'], config['TEXT_CHARS'])
+        with self._lock:
+            if self._processes is None:
+                # Spawned, not forked: the parent has threads and open connections
+                self._processes = ProcessPoolExecutor(
+                    max_workers=config['PROCESSES'], mp_context=multiprocessing.get_context('spawn'),
+                )
+            processes = self._processes
+        future = processes.submit(render_preview, path, config['THUMBNAIL_WIDTH'], config['TEXT_CHARS'])
+        try:
+            return future.result(timeout=config['RENDER_TIMEOUT'])
+        except TimeoutError:
+            self._kill_processes(processes)
+            raise TimeoutError(f"Rendering took longer than {config['RENDER_TIMEOUT']} seconds.") from None
+
+    def _kill_processes(self, processes):
+        """
+        Stop a pool whose render hung: a stuck process would otherwise hold a
+        slot forever. Renders still running in it fail and are retried by
+        generate_previews; the next render starts a new pool.
+        """
+        with self._lock:
+            if self._processes is processes:
+                self._processes = None
+        # ProcessPoolExecutor has no public way to stop a busy worker
+        for process in list((getattr(processes, '_processes', None) or {}).values()):
+            process.terminate()
+        processes.shutdown(wait=False, cancel_futures=True)
+
+    # -----------------------------------------------
+    # Processing
+    # -----------------------------------------------
+    def process(self, name):
+        """
+        Render one pending preview. Runs synchronously; workers and
+        generate_previews call it.
+
+        Returns:
+            bool: True if the preview is ready
+        """
+        # Claim the row so a file is never rendered twice at once
+        claimed = DocumentPreview.objects.filter(
+            name=name, status__in=['pending', 'failed'],
+        ).update(status='rendering', updated_at=timezone.now())
+        if not claimed:
+            return False
+
+        config = get_preview_settings()
+        try:
+            if blob_storage.size(name) > config['MAX_SOURCE_BYTES']:
+                raise UnsupportedDocument("The file is too large to preview.")
+            _, path = media_cache.fetch(blob_storage, name)
+            result = self._render(path, config)
+        except UnsupportedDocument as exc:
+            DocumentPreview.objects.filter(name=name).update(status='unsupported', error=str(exc), updated_at=timezone.now())
+            return False
+        except Exception as exc:
+            DocumentPreview.objects.filter(name=name).update(status='failed', error=str(exc), updated_at=timezone.now())
+            raise
+
+        preview = DocumentPreview.objects.get(name=name)
+        digest = hashlib.sha256(name.encode()).hexdigest()
+        preview.thumbnail.save(f'{digest}.jpg', ContentFile(result.pop('thumbnail')), save=False)
+        for field, value in result.items():
+            setattr(preview, field, value)
+        preview.status = 'ready'
+        preview.error = ''
+        preview.save()
+        return True
+
+
+preview_pool = PreviewPool()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=preview_pool._after_fork)
@@ -0,0 +1,121 @@
+# accounts/reference_data.py
+import threading
+import time
+
+from django.core.cache import cache
+
+from .models import State, ChargerModel, InstallerProfile, CustomUser
+
+
+class ReferenceDataRegistry:
+    """
+    In-process registry for small, rarely-changing reference tables
+    (states, charger models, installer profiles and installer users).
+
+    Each table is loaded once per process on first use and served from memory
+    afterwards. Model signals bump a version stamp in the default cache once
+    a change commits (see accounts/signals.py); a process reloads when the
+    stamp moves. The stamp only reaches other workers when CACHES is shared
+    (Redis); with the per-process LocMemCache they reload after MAX_AGE
+    seconds instead, which bounds how stale their tables can get.
+
+    The returned model instances are shared between requests and must be
+    treated as read-only.
+    """
+
+    CACHE_VERSION_KEY = 'reference_data:version'
+    MAX_AGE = 300
+
+    # Table name -> callable returning the rows to keep in memory
+    LOADERS = {
+        'states': lambda: State.objects.order_by('code'),
+        'charger_models': lambda: ChargerModel.objects.order_by('pk'),
+        'installer_profiles': lambda: InstallerProfile.objects.select_related('user').order_by('pk'),
+        'installer_users': lambda: CustomUser.objects.filter(role='2').order_by('username'),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._loaded_at = 0.0
+        self._tables = {}
+
+    def _current_version(self):
+        version = cache.get(self.CACHE_VERSION_KEY)
+        if version is None:
+            version = 1
+            cache.add(self.CACHE_VERSION_KEY, version, None)
+        return version
+
+    def _get_table(self, name):
+        """
+        Return (rows, rows_by_pk) for a table, reloading it if the version
+        stamp has moved or the tables are older than MAX_AGE.
+        """
+        version = self._current_version()
+        now = time.monotonic()
+        with self._lock:
+            if version != self._version or now - self._loaded_at > self.MAX_AGE:
+                self._tables = {}
+                self._version = version
+                self._loaded_at = now
+            table = self._tables.get(name)
+            if table is None:
+                rows = tuple(self.LOADERS[name]())
+                table = (rows, {row.pk: row for row in rows})
+                self._tables[name] = table
+            return table
+
+    def all(self, name):
+        """
+        Get every row of a reference table, in the loader's order.
+
+        Args:
+            name (str): One of the keys of LOADERS
+
+        Returns:
+            tuple: Model instances
+        """
+        return self._get_table(name)[0]
+
+    def get(self, name, pk):
+        """
+        Get a single row of a reference table by primary key.
+
+        Args:
+            name (str): One of the keys of LOADERS
+            pk: Primary key (int or numeric string)
+
+        Returns:
+            Model instance or None if not found
+        """
+        try:
+            pk = int(pk)
+        except (TypeError, ValueError):
+            return None
+        return self._get_table(name)[1].get(pk)
+
+    def state_by_code(self, code):
+        """
+        Get a State by its code (e.g. 'Central 1'), or None if not found.
+        """
+        for state in self.all('states'):
+            if state.code == code:
+                return state
+        return None
+
+    def invalidate(self):
+        """
+        Drop the in-memory tables by bumping the version stamp (of every
+        process when the cache is shared).
+        """
+        try:
+            cache.incr(self.CACHE_VERSION_KEY)
+        except ValueError:
+            cache.set(self.CACHE_VERSION_KEY, 2, None)
+        with self._lock:
+            self._tables = {}
+            self._version = None
+
+
+reference_data = ReferenceDataRegistry()
@@ -0,0 +1,216 @@
+# accounts/region_index.py
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+
+from django.core.cache import cache
+
+from .models import CustomUser, InstallerProfile
+
+
+class InstallerRegionIndex:
+    """
+    In-memory index from region code (State.code, e.g. 'Central 1') to the
+    sorted IDs of the installer users operating there, used by auto-assignment.
+
+    The index is built with two queries on first use and then kept current
+    incrementally from signals (see accounts/signals.py). A version stamp in
+    the shared cache tells other processes to rebuild their own copy.
+    """
+
+    CACHE_VERSION_KEY = 'installer_region_index:version'
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._version = None
+        self._regions = None
+        self._installers = None
+
+    # -----------------------------------------------
+    # Building and versioning
+    # -----------------------------------------------
+    def _current_version(self):
+        version = cache.get(self.CACHE_VERSION_KEY)
+        if version is None:
+            self._reset_version(only_if_missing=True)
+            version = cache.get(self.CACHE_VERSION_KEY)
+        return version
+
+    def _reset_version(self, only_if_missing=False):
+        """
+        Restart a missing (evicted) version stamp from the clock rather than
+        from a small number, so it never equals a version some process built
+        its copy at and every copy is rebuilt.
+        """
+        write = cache.add if only_if_missing else cache.set
+        write(self.CACHE_VERSION_KEY, time.time_ns(), None)
+
+    def _build(self):
+        installers = array('q', sorted(
+            CustomUser.objects.filter(role='2').values_list('id', flat=True)
+        ))
+        memberships = InstallerProfile.operational_states.through.objects.filter(
+            installerprofile__user__role='2'
+        ).values_list('state__code', 'installerprofile__user_id')
+
+        regions = {}
+        for code, user_id in memberships:
+            regions.setdefault(code, []).append(user_id)
+        self._regions = {code: array('q', sorted(set(ids))) for code, ids in regions.items()}
+        self._installers = installers
+
+    def _ensure_current(self):
+        version = self._current_version()
+        if self._regions is None or version != self._version:
+            self._build()
+            self._version = version
+
+    def _publish_change(self):
+        """
+        Bump the shared version after a change. If this copy was current and
+        no other process changed the index meanwhile, it stays current (the
+        change was applied incrementally); otherwise it is rebuilt on next use.
+        """
+        try:
+            version = cache.incr(self.CACHE_VERSION_KEY)
+        except ValueError:
+            version = None
+            self._reset_version()
+        if self._regions is not None and self._version is not None and version == self._version + 1:
+            self._version = version
+        else:
+            self._regions = None
+
+    # -----------------------------------------------
+    # Lookups
+    # -----------------------------------------------
+    def candidates(self, region_code):
+        """
+        Get the sorted installer user IDs operating in a region.
+        A copy is returned, so callers may keep it across later updates.
+
+        Args:
+            region_code (str): State.code of the region
+
+        Returns:
+            array: Installer user IDs (empty if none)
+        """
+        with self._lock:
+            self._ensure_current()
+            return array('q', self._regions.get(region_code, ()))
+
+    def all_installers(self):
+        """
+        Get the sorted IDs of every installer user, used as a fallback when a
+        region has no installers.
+        """
+        with self._lock:
+            self._ensure_current()
+            return array('q', self._installers)
+
+    # -----------------------------------------------
+    # Incremental updates
+    # -----------------------------------------------
+    @staticmethod
+    def _insert(ids, user_id):
+        position = bisect_left(ids, user_id)
+        if position == len(ids) or ids[position] != user_id:
+            insort(ids, user_id)
+
+    @staticmethod
+    def _discard(ids, user_id):
+        position = bisect_left(ids, user_id)
+        if position < len(ids) and ids[position] == user_id:
+            del ids[position]
+
+    def add_memberships(self, pairs):
+        """
+        Record that installers started operating in regions.
+
+        Args:
+            pairs: Iterable of (region_code, user_id)
+        """
+        with self._lock:
+            for code, user_id in (pairs if self._regions is not None else ()):
+                if user_id is None:
+                    continue
+                self._insert(self._regions.setdefault(code, array('q')), user_id)
+            self._publish_change()
+
+    def remove_memberships(self, pairs):
+        """
+        Record that installers stopped operating in regions.
+
+        Args:
+            pairs: Iterable of (region_code, user_id)
+        """
+        with self._lock:
+            for code, user_id in (pairs if self._regions is not None else ()):
+                if user_id is None or code not in self._regions:
+                    continue
+                self._discard(self._regions[code], user_id)
+            self._publish_change()
+
+    def add_installer(self, user_id):
+        """
+        Record a new installer user (without any regions yet).
+        """
+        with self._lock:
+            if self._regions is not None:
+                self._insert(self._installers, user_id)
+            self._publish_change()
+
+    def remove_installer(self, user_id):
+        """
+        Drop an installer user from every region, e.g. when the account is
+        deleted or no longer has the installer role.
+        """
+        with self._lock:
+            if self._regions is not None:
+                self._discard(self._installers, user_id)
+                for ids in self._regions.values():
+                    self._discard(ids, user_id)
+            self._publish_change()
+
+    def sync_installer(self, user_id, is_installer):
+        """
+        Add or drop a user after an account change, publishing only if the
+        user's installer status actually changed. An unbuilt copy has nothing
+        to compare against and publishes nothing: the caller reports known
+        role changes with add_installer/remove_installer.
+        """
+        with self._lock:
+            if self._regions is None:
+                return
+            position = bisect_left(self._installers, user_id)
+            indexed = position < len(self._installers) and self._installers[position] == user_id
+            if is_installer and not indexed:
+                self.add_installer(user_id)
+            elif not is_installer and indexed:
+                self.remove_installer(user_id)
+
+    def clear_regions(self, user_id):
+        """
+        Drop an installer from every region but keep them as an installer,
+        e.g. when their profile is deleted.
+        """
+        with self._lock:
+            if self._regions is not None:
+                for ids in self._regions.values():
+                    self._discard(ids, user_id)
+            self._publish_change()
+
+    def invalidate(self):
+        """
+        Rebuild the index in every process on next use.
+        """
+        with self._lock:
+            try:
+                cache.incr(self.CACHE_VERSION_KEY)
+            except ValueError:
+                self._reset_version()
+            self._regions = None
+
+
+installer_region_index = InstallerRegionIndex()
@@ -0,0 +1,247 @@
+# accounts/s3_storage.py
+"""
+S3 storage with pooled clients and a metadata cache.
+
+S3Boto3Storage builds a new boto3 session and resource in every thread of
+every storage instance, shares one (thread-unsafe) Bucket resource between
+threads, and sends a HEAD request for each exists(), size() and
+get_modified_time() call. A page listing certificates or task documents
+pays that per file.
+
+CachedS3Storage keeps one resource per thread for each set of credentials
+and endpoint, shared by all instances, over a larger keep-alive connection
+pool. It also caches object metadata (exists, size, etag, last modified)
+from a single HEAD in a thread-safe LRU with a TTL, so repeated lookups stay
+in memory. Writes and deletes through the storage update the cache; objects
+changed behind its back are seen again after metadata_cache_ttl seconds.
+
+Async variants (aexists, asize, aurl, asave, adelete, aopen) run the calls
+in a worker thread for ASGI views. To test against a local S3 stand-in
+(MinIO, moto server), point endpoint_url at it.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.utils.timezone import make_naive
+from s3transfer.constants import ALLOWED_DOWNLOAD_ARGS
+from storages.backends.s3 import S3Storage
+from storages.utils import clean_name
+
+# Resources per thread, keyed by the settings that define a client, so
+# every storage instance with the same account and endpoint reuses them
+_thread_resources = threading.local()
+
+
+class MetadataCache:
+    """
+    Thread-safe LRU cache of object metadata whose entries expire after
+    `ttl` seconds.
+    """
+
+    def __init__(self, max_entries=10000, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Returns:
+            dict | None: Cached metadata, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, metadata):
+        if not self.max_entries or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, metadata)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CachedS3Storage(S3Storage):
+    """
+    S3Boto3Storage with shared thread-local clients and an object metadata
+    cache; see the module docstring.
+    """
+
+    def __init__(self, **settings):
+        explicit_client_config = settings.get('client_config')
+        super().__init__(**settings)
+        if explicit_client_config is None:
+            # Reuse TCP connections across requests, and enough of them for
+            # the threads that share a client
+            self.client_config = self.client_config.merge(Config(
+                max_pool_connections=self.max_pool_connections,
+                tcp_keepalive=True,
+            ))
+        self.metadata_cache = MetadataCache(self.metadata_cache_size, self.metadata_cache_ttl)
+
+    def get_default_settings(self):
+        return {
+            **super().get_default_settings(),
+            'max_pool_connections': 32,
+            'metadata_cache_size': 10000,    # Objects whose metadata is kept
+            'metadata_cache_ttl': 300,       # Seconds before metadata is fetched again
+        }
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.pop('metadata_cache', None)
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.metadata_cache = MetadataCache(self.metadata_cache_size, self.metadata_cache_ttl)
+
+    # -----------------------------------------------
+    # Connections
+    # -----------------------------------------------
+    def _connection_key(self):
+        return (
+            self.access_key, self.secret_key, self.security_token, self.session_profile,
+            self.region_name, self.endpoint_url, self.use_ssl, self.verify,
+            self.client_config.max_pool_connections,
+        )
+
+    @property
+    def connection(self):
+        resources = getattr(_thread_resources, 'resources', None)
+        if resources is None:
+            resources = _thread_resources.resources = {}
+        key = self._connection_key()
+        resource = resources.get(key)
+        if resource is None:
+            resource = resources[key] = self._create_session().resource(
+                's3',
+                region_name=self.region_name,
+                use_ssl=self.use_ssl,
+                endpoint_url=self.endpoint_url,
+                config=self.client_config,
+                verify=self.verify,
+            )
+        return resource
+
+    @property
+    def bucket(self):
+        # boto3 resources are not thread-safe: build the Bucket from this
+        # thread's resource rather than sharing the first thread's
+        return self.connection.Bucket(self.bucket_name)
+
+    # -----------------------------------------------
+    # Metadata
+    # -----------------------------------------------
+    def head(self, name):
+        """
+        Metadata of an object from the cache, or from one HEAD request.
+
+        Returns:
+            dict: 'exists', plus 'size', 'etag' and 'last_modified' if it does
+        """
+        key = self._normalize_name(clean_name(name))
+        metadata = self.metadata_cache.get(key)
+        if metadata is not None:
+            return metadata
+
+        params = {
+            param: value for param, value in self.get_object_parameters(key).items()
+            if param in ALLOWED_DOWNLOAD_ARGS
+        }
+        try:
+            response = self.connection.meta.client.head_object(Bucket=self.bucket_name, Key=key, **params)
+        except ClientError as err:
+            if err.response['ResponseMetadata']['HTTPStatusCode'] != 404:
+                raise
+            metadata = {'exists': False}
+        else:
+            metadata = {
+                'exists': True,
+                'size': response['ContentLength'],
+                'etag': response.get('ETag', '').strip('"'),
+                'last_modified': response.get('LastModified'),
+            }
+        self.metadata_cache.set(key, metadata)
+        return metadata
+
+    def exists(self, name):
+        return self.head(name)['exists']
+
+    def size(self, name):
+        metadata = self.head(name)
+        if not metadata['exists']:
+            raise FileNotFoundError(f"File does not exist: {name}")
+        return metadata['size']
+
+    def etag(self, name):
+        metadata = self.head(name)
+        if not metadata['exists']:
+            raise FileNotFoundError(f"File does not exist: {name}")
+        return metadata['etag']
+
+    def get_modified_time(self, name):
+        metadata = self.head(name)
+        if not metadata['exists']:
+            raise FileNotFoundError(f"File does not exist: {name}")
+        if settings.USE_TZ:
+            return metadata['last_modified']
+        return make_naive(metadata['last_modified'])
+
+    def _save(self, name, content):
+        saved_name = super()._save(name, content)
+        # The next lookup fetches the new size and etag
+        self.metadata_cache.invalidate(self._normalize_name(clean_name(saved_name)))
+        return saved_name
+
+    def delete(self, name):
+        super().delete(name)
+        self.metadata_cache.set(self._normalize_name(clean_name(name)), {'exists': False})
+
+    # -----------------------------------------------
+    # Async variants for ASGI views
+    # -----------------------------------------------
+    async def aexists(self, name):
+        return await sync_to_async(self.exists, thread_sensitive=False)(name)
+
+    async def asize(self, name):
+        return await sync_to_async(self.size, thread_sensitive=False)(name)
+
+    async def aurl(self, name, **kwargs):
+        return await sync_to_async(self.url, thread_sensitive=False)(name, **kwargs)
+
+    async def asave(self, name, content, max_length=None):
+        return await sync_to_async(self.save, thread_sensitive=False)(name, content, max_length=max_length)
+
+    async def adelete(self, name):
+        return await sync_to_async(self.delete, thread_sensitive=False)(name)
+
+    async def aopen(self, name, mode='rb'):
+        return await sync_to_async(self.open, thread_sensitive=False)(name, mode)
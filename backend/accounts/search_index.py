@@ -0,0 +1,165 @@
+# accounts/search_index.py
+"""
+Full-text search indexes backing the autocomplete endpoints.
+
+On SQLite these are FTS5 tables kept in sync by triggers, so bulk and raw SQL
+writes are indexed too. SQLite drops a table's triggers whenever a migration
+rebuilds that table, so the index is (re)installed idempotently after every
+migrate run instead of once in a migration. Other database vendors skip it
+and the autocomplete service falls back to plain ORM lookups.
+"""
+
+INSTALL_SQL = [
+    # Customers: external-content index over name and email
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS accounts_customer_fts USING fts5(
+        name, email, content='accounts_customer', content_rowid='id', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS accounts_customer_fts_ai AFTER INSERT ON accounts_customer BEGIN
+        INSERT INTO accounts_customer_fts(rowid, name, email) VALUES (new.id, new.name, new.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS accounts_customer_fts_ad AFTER DELETE ON accounts_customer BEGIN
+        INSERT INTO accounts_customer_fts(accounts_customer_fts, rowid, name, email)
+        VALUES ('delete', old.id, old.name, old.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS accounts_customer_fts_au AFTER UPDATE ON accounts_customer BEGIN
+        INSERT INTO accounts_customer_fts(accounts_customer_fts, rowid, name, email)
+        VALUES ('delete', old.id, old.name, old.email);
+        INSERT INTO accounts_customer_fts(rowid, name, email) VALUES (new.id, new.name, new.email);
+    END
+    """,
+    "INSERT INTO accounts_customer_fts(accounts_customer_fts) VALUES ('rebuild')",
+
+    # Charger models: external-content index over model name and manufacturer
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS accounts_chargermodel_fts USING fts5(
+        model_name, manufacturer, content='accounts_chargermodel', content_rowid='id', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS accounts_chargermodel_fts_ai AFTER INSERT ON accounts_chargermodel BEGIN
+        INSERT INTO accounts_chargermodel_fts(rowid, model_name, manufacturer)
+        VALUES (new.id, new.model_name, new.manufacturer);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS accounts_chargermodel_fts_ad AFTER DELETE ON accounts_chargermodel BEGIN
+        INSERT INTO accounts_chargermodel_fts(accounts_chargermodel_fts, rowid, model_name, manufacturer)
+        VALUES ('delete', old.id, old.model_name, old.manufacturer);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS accounts_chargermodel_fts_au AFTER UPDATE ON accounts_chargermodel BEGIN
+        INSERT INTO accounts_chargermodel_fts(accounts_chargermodel_fts, rowid, model_name, manufacturer)
+        VALUES ('delete', old.id, old.model_name, old.manufacturer);
+        INSERT INTO accounts_chargermodel_fts(rowid, model_name, manufacturer)
+        VALUES (new.id, new.model_name, new.manufacturer);
+    END
+    """,
+    "INSERT INTO accounts_chargermodel_fts(accounts_chargermodel_fts) VALUES ('rebuild')",
+
+    # Installers: one row per installer user (rowid = user id) holding the
+    # username and the company name of the linked profile
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS accounts_installer_fts USING fts5(username, company_name, prefix='2 3')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS accounts_installer_fts_user_ai AFTER INSERT ON accounts_customuser
+    WHEN new.role = '2' BEGIN
+        INSERT INTO accounts_installer_fts(rowid, username, company_name)
+        VALUES (new.id, new.username,
+                (SELECT company_name FROM accounts_installerprofile WHERE user_id = new.id));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS accounts_installer_fts_user_au AFTER UPDATE OF username, role ON accounts_customuser BEGIN
+        DELETE FROM accounts_installer_fts WHERE rowid = old.id;
+        INSERT INTO accounts_installer_fts(rowid, username, company_name)
+        SELECT new.id, new.username,
+               (SELECT company_name FROM accounts_installerprofile WHERE user_id = new.id)
+        WHERE new.role = '2';
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS accounts_installer_fts_user_ad AFTER DELETE ON accounts_customuser BEGIN
+        DELETE FROM accounts_installer_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS accounts_installer_fts_profile_ai AFTER INSERT ON accounts_installerprofile BEGIN
+        UPDATE accounts_installer_fts SET company_name = new.company_name WHERE rowid = new.user_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS accounts_installer_fts_profile_au AFTER UPDATE OF company_name, user_id ON accounts_installerprofile BEGIN
+        UPDATE accounts_installer_fts SET company_name = NULL WHERE rowid = old.user_id;
+        UPDATE accounts_installer_fts SET company_name = new.company_name WHERE rowid = new.user_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS accounts_installer_fts_profile_ad AFTER DELETE ON accounts_installerprofile BEGIN
+        UPDATE accounts_installer_fts SET company_name = NULL WHERE rowid = old.user_id;
+    END
+    """,
+    "DELETE FROM accounts_installer_fts",
+    """
+    INSERT INTO accounts_installer_fts(rowid, username, company_name)
+    SELECT u.id, u.username, p.company_name
+    FROM accounts_customuser u
+    LEFT JOIN accounts_installerprofile p ON p.user_id = u.id
+    WHERE u.role = '2'
+    """,
+]
+
+UNINSTALL_SQL = [
+    "DROP TRIGGER IF EXISTS accounts_customer_fts_ai",
+    "DROP TRIGGER IF EXISTS accounts_customer_fts_ad",
+    "DROP TRIGGER IF EXISTS accounts_customer_fts_au",
+    "DROP TABLE IF EXISTS accounts_customer_fts",
+    "DROP TRIGGER IF EXISTS accounts_chargermodel_fts_ai",
+    "DROP TRIGGER IF EXISTS accounts_chargermodel_fts_ad",
+    "DROP TRIGGER IF EXISTS accounts_chargermodel_fts_au",
+    "DROP TABLE IF EXISTS accounts_chargermodel_fts",
+    "DROP TRIGGER IF EXISTS accounts_installer_fts_user_ai",
+    "DROP TRIGGER IF EXISTS accounts_installer_fts_user_au",
+    "DROP TRIGGER IF EXISTS accounts_installer_fts_user_ad",
+    "DROP TRIGGER IF EXISTS accounts_installer_fts_profile_ai",
+    "DROP TRIGGER IF EXISTS accounts_installer_fts_profile_au",
+    "DROP TRIGGER IF EXISTS accounts_installer_fts_profile_ad",
+    "DROP TABLE IF EXISTS accounts_installer_fts",
+]
+
+
+def is_supported(connection):
+    """
+    Whether the search index can exist on this database connection.
+    """
+    return connection.vendor == 'sqlite'
+
+
+def install_search_index(connection):
+    """
+    Create any missing FTS tables and triggers and rebuild their contents.
+    """
+    if not is_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        for statement in INSTALL_SQL:
+            cursor.execute(statement)
+
+
+def uninstall_search_index(connection):
+    """
+    Drop the FTS tables and their triggers.
+    """
+    if not is_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        for statement in UNINSTALL_SQL:
+            cursor.execute(statement)
@@ -1,5 +1,12 @@
 # accounts/services/__init__.py
 from .installation_service import InstallationService
+from .installer_directory_service import InstallerDirectoryService
+from .autocomplete_service import AutocompleteService
+from .installation_row_cache_service import InstallationRowCacheService
+from .installation_stats_service import InstallationStatsService
+from .installation_event_service import InstallationEventService
+from .installation_transition_service import InstallationTransitionService
 
-__all__ = ['InstallationService']
-
+__all__ = ['InstallationService', 'InstallerDirectoryService', 'AutocompleteService', 'InstallationRowCacheService',
+           'InstallationStatsService', 'InstallationEventService',
+           'InstallationTransitionService']
@@ -0,0 +1,158 @@
+# accounts/services/autocomplete_service.py
+import re
+
+from django.db import connection
+from django.db.models import Q
+from ..models import Customer, ChargerModel, CustomUser
+from ..search_index import is_supported
+
+
+class AutocompleteService:
+    """
+    Service class for the autocomplete endpoints used on the installation form.
+    Matches are served from the FTS5 search index (see accounts/search_index.py)
+    with a result limit, so lookups stay fast as the tables grow.
+    """
+
+    DEFAULT_LIMIT = 10
+    MAX_LIMIT = 25
+
+    @staticmethod
+    def clean_limit(value):
+        """
+        Clamp a requested result limit to [1, MAX_LIMIT].
+        """
+        try:
+            limit = int(value)
+        except (TypeError, ValueError):
+            return AutocompleteService.DEFAULT_LIMIT
+        return max(1, min(limit, AutocompleteService.MAX_LIMIT))
+
+    @staticmethod
+    def _tokens(term):
+        return re.findall(r'\w+', term or '')
+
+    @staticmethod
+    def _match_ids(fts_table, term, limit):
+        """
+        Run a prefix match against an FTS5 table.
+
+        Every word of the term must match the start of a word in one of the
+        indexed columns; results are ordered by relevance.
+
+        Returns:
+            list: Matching rowids, best match first
+        """
+        tokens = AutocompleteService._tokens(term)
+        if not tokens:
+            return []
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH %s ORDER BY rank LIMIT %s",
+                [match, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def _orm_filter(fields, term):
+        """
+        Fallback filter for databases without the search index: every word
+        of the term must be contained in one of the fields.
+        """
+        condition = Q()
+        for token in AutocompleteService._tokens(term):
+            token_condition = Q()
+            for field in fields:
+                token_condition |= Q(**{f'{field}__icontains': token})
+            condition &= token_condition
+        return condition
+
+    @staticmethod
+    def _in_order(queryset, ids):
+        objects = queryset.in_bulk(ids)
+        return [objects[pk] for pk in ids if pk in objects]
+
+    @staticmethod
+    def search_installers(term, limit=DEFAULT_LIMIT):
+        """
+        Search installer users by username or company name.
+
+        Returns:
+            list: Dicts with the user id, profile id, username and company name
+        """
+        if not AutocompleteService._tokens(term):
+            return []
+        installers = CustomUser.objects.filter(role='2').select_related('installerprofile')
+        if is_supported(connection):
+            ids = AutocompleteService._match_ids('accounts_installer_fts', term, limit)
+            users = AutocompleteService._in_order(installers, ids)
+        else:
+            users = list(installers.filter(
+                AutocompleteService._orm_filter(['username', 'installerprofile__company_name'], term)
+            ).order_by('username')[:limit])
+
+        results = []
+        for user in users:
+            profile = getattr(user, 'installerprofile', None)
+            company_name = profile.company_name if profile else None
+            results.append({
+                'id': user.pk,
+                'profile_id': profile.pk if profile else None,
+                'username': user.username,
+                'company_name': company_name,
+                'text': f"{company_name} ({user.username})" if company_name else user.username,
+            })
+        return results
+
+    @staticmethod
+    def search_customers(term, limit=DEFAULT_LIMIT):
+        """
+        Search customers by name or email.
+
+        Returns:
+            list: Dicts with the customer fields needed to prefill the installation form
+        """
+        if not AutocompleteService._tokens(term):
+            return []
+        if is_supported(connection):
+            ids = AutocompleteService._match_ids('accounts_customer_fts', term, limit)
+            customers = AutocompleteService._in_order(Customer.objects.all(), ids)
+        else:
+            customers = list(Customer.objects.filter(
+                AutocompleteService._orm_filter(['name', 'email'], term)
+            ).order_by('name')[:limit])
+
+        return [{
+            'id': customer.pk,
+            'text': f"{customer.name} <{customer.email}>" if customer.email else customer.name,
+            'name': customer.name,
+            'contact_person': customer.contact_person,
+            'email': customer.email,
+            'phone_number': customer.phone_number,
+            'address': customer.address,
+            'city': customer.city,
+            'state': customer.state,
+            'house_type': customer.house_type,
+            'postcode': customer.postcode,
+        } for customer in customers]
+
+    @staticmethod
+    def search_charger_models(term, limit=DEFAULT_LIMIT):
+        """
+        Search charger models by model name or manufacturer.
+
+        Returns:
+            list: Dicts with the charger model id and display text
+        """
+        if not AutocompleteService._tokens(term):
+            return []
+        if is_supported(connection):
+            ids = AutocompleteService._match_ids('accounts_chargermodel_fts', term, limit)
+            charger_models = AutocompleteService._in_order(ChargerModel.objects.all(), ids)
+        else:
+            charger_models = list(ChargerModel.objects.filter(
+                AutocompleteService._orm_filter(['model_name', 'manufacturer'], term)
+            ).order_by('model_name')[:limit])
+
+        return [{'id': charger_model.pk, 'text': str(charger_model)} for charger_model in charger_models]
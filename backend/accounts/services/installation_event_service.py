@@ -0,0 +1,223 @@
+# accounts/services/installation_event_service.py
+import bisect
+
+from django.db import transaction
+
+from ..db_router import reporting_reads
+from ..models import InstallerProfile, InstallationStatusEvent, InstallerScorecard
+
+
+class InstallationEventService:
+    """
+    Service class for the installation status history: appending
+    InstallationStatusEvent rows, keeping each installer's InstallerScorecard
+    current as they are appended, and reading the scorecards back.
+    """
+
+    # Statuses that end an offer or a job, and the scorecard counter they add to
+    OUTCOMES = {'ACCEPTED': 'accepted', 'REJECTED': 'rejected', 'EXPIRED': 'expired', 'COMPLETED': 'completed'}
+    # Outcomes with a duration: the status it is measured from, and the histogram field
+    DURATIONS = {'ACCEPTED': ('PENDING_ACCEPTANCE', 'accept_seconds'), 'COMPLETED': ('ACCEPTED', 'complete_seconds')}
+    SCORED_STATUSES = {'PENDING_ACCEPTANCE', *OUTCOMES}
+
+    @staticmethod
+    def get_installer_id(installation):
+        """
+        The CustomUser id of the installer a job is assigned to, or None.
+        """
+        if installation.assigned_installer_id is not None or installation.installer_id is None:
+            return installation.assigned_installer_id
+        return InstallerProfile.objects.filter(pk=installation.installer_id).values_list('user_id', flat=True).first()
+
+    @staticmethod
+    def record(installation, from_status, to_status, actor=None, installer_id=None):
+        """
+        Append a status event for an installation and count it on the
+        installer's scorecard, in the caller's transaction.
+
+        Args:
+            installation: The Installation that changed
+            from_status: Its previous status ('' when it was just created)
+            to_status: Its new status
+            actor: Optional CustomUser who made the change
+            installer_id: The assigned installer's user id, if already known
+
+        Returns:
+            InstallationStatusEvent: The appended event
+        """
+        if installer_id is None:
+            installer_id = InstallationEventService.get_installer_id(installation)
+        event = InstallationStatusEvent.objects.create(
+            installation_id=installation.pk,
+            installer_id=installer_id,
+            from_status=from_status or '',
+            to_status=to_status,
+            actor=actor if actor is not None and actor.is_authenticated else None,
+        )
+        InstallationEventService.apply(event)
+        return event
+
+    @staticmethod
+    def apply(event):
+        """
+        Count one event on its installer's scorecard. Durations are measured
+        from the installer's latest earlier event in the start status.
+        """
+        if event.installer_id is None or event.to_status not in InstallationEventService.SCORED_STATUSES:
+            return
+        seconds = None
+        if event.to_status in InstallationEventService.DURATIONS:
+            start_status = InstallationEventService.DURATIONS[event.to_status][0]
+            started_at = (
+                InstallationStatusEvent.objects
+                .filter(
+                    installation_id=event.installation_id, installer_id=event.installer_id,
+                    to_status=start_status, created_at__lte=event.created_at,
+                )
+                .exclude(pk=event.pk)
+                .order_by('-created_at')
+                .values_list('created_at', flat=True)
+                .first()
+            )
+            if started_at is not None:
+                seconds = (event.created_at - started_at).total_seconds()
+
+        with transaction.atomic():
+            scorecard, _ = InstallerScorecard.objects.select_for_update().get_or_create(installer_id=event.installer_id)
+            InstallationEventService.count(scorecard, event.to_status, seconds)
+            scorecard.save()
+
+    @staticmethod
+    def count(scorecard, to_status, seconds=None):
+        """
+        Add one event to an unsaved scorecard.
+        """
+        if to_status == 'PENDING_ACCEPTANCE':
+            scorecard.offered += 1
+        field = InstallationEventService.OUTCOMES.get(to_status)
+        if field:
+            setattr(scorecard, field, getattr(scorecard, field) + 1)
+        if seconds is not None and to_status in InstallationEventService.DURATIONS:
+            histogram = InstallationEventService.DURATIONS[to_status][1]
+            setattr(scorecard, histogram, InstallationEventService.add_duration(getattr(scorecard, histogram), seconds))
+
+    @staticmethod
+    def add_duration(buckets, seconds):
+        """
+        Returns:
+            list: A copy of the bucket counts with one more duration of `seconds`
+        """
+        bounds = InstallerScorecard.DURATION_BUCKETS
+        buckets = list(buckets) + [0] * (len(bounds) + 1 - len(buckets))
+        buckets[bisect.bisect_left(bounds, seconds)] += 1
+        return buckets
+
+    @staticmethod
+    def median(buckets):
+        """
+        Median duration in seconds from bucket counts, interpolated within
+        its bucket (the lower bound when it falls in the open-ended last
+        bucket), or None without durations.
+        """
+        bounds = InstallerScorecard.DURATION_BUCKETS
+        half = sum(buckets) / 2
+        if not half:
+            return None
+        seen = 0
+        for index, count in enumerate(buckets):
+            if count and seen + count >= half:
+                low = bounds[index - 1] if index else 0
+                if index == len(bounds):
+                    return low
+                return round(low + (bounds[index] - low) * (half - seen) / count)
+            seen += count
+        return None
+
+    @staticmethod
+    def summarize(scorecard):
+        """
+        Rates and medians of a scorecard, as served by the scorecard API.
+        """
+        decided = scorecard.accepted + scorecard.rejected + scorecard.expired
+        return {
+            'installer': scorecard.installer_id,
+            'username': scorecard.installer.username,
+            'offered': scorecard.offered,
+            'accepted': scorecard.accepted,
+            'rejected': scorecard.rejected,
+            'expired': scorecard.expired,
+            'completed': scorecard.completed,
+            'acceptance_rate': round(scorecard.accepted / decided, 4) if decided else None,
+            'rejection_rate': round(scorecard.rejected / decided, 4) if decided else None,
+            'completion_rate': round(scorecard.completed / scorecard.accepted, 4) if scorecard.accepted else None,
+            'median_accept_seconds': InstallationEventService.median(scorecard.accept_seconds),
+            'median_complete_seconds': InstallationEventService.median(scorecard.complete_seconds),
+            'updated_at': scorecard.updated_at.isoformat(),
+        }
+
+    @staticmethod
+    @reporting_reads()
+    def get_scorecards(installer_id=None):
+        """
+        Summaries of every installer's scorecard, or of one installer's.
+
+        Returns:
+            list: summarize() dicts ordered by username
+        """
+        scorecards = InstallerScorecard.objects.select_related('installer').order_by('installer__username')
+        if installer_id is not None:
+            scorecards = scorecards.filter(installer_id=installer_id)
+        return [InstallationEventService.summarize(scorecard) for scorecard in scorecards]
+
+    @staticmethod
+    def get_acceptance_scores(installer_ids):
+        """
+        Smoothed acceptance rates, (accepted + 1) / (decided + 2), for
+        auto-assignment: an installer without history scores 0.5, and a
+        few offers move the score less than many.
+
+        Returns:
+            dict: Installer user id -> score, for every id given
+        """
+        scores = dict.fromkeys(installer_ids, 0.5)
+        for installer_id, accepted, rejected, expired in InstallerScorecard.objects.filter(
+            installer_id__in=installer_ids
+        ).values_list('installer_id', 'accepted', 'rejected', 'expired'):
+            scores[installer_id] = (accepted + 1) / (accepted + rejected + expired + 2)
+        return scores
+
+    @staticmethod
+    def rebuild():
+        """
+        Recount every scorecard from the event log in one transaction.
+
+        Returns:
+            int: Scorecards written
+        """
+        with transaction.atomic():
+            scorecards = {}
+            started_at = {}  # (installation, installer, status) -> latest time
+            events = (
+                InstallationStatusEvent.objects
+                .filter(installer__isnull=False)
+                .order_by('created_at', 'pk')
+                .values_list('installation_id', 'installer_id', 'to_status', 'created_at')
+            )
+            for installation_id, installer_id, to_status, created_at in events.iterator(chunk_size=2000):
+                started_at[installation_id, installer_id, to_status] = created_at
+                if to_status not in InstallationEventService.SCORED_STATUSES:
+                    continue
+                seconds = None
+                if to_status in InstallationEventService.DURATIONS:
+                    start_status = InstallationEventService.DURATIONS[to_status][0]
+                    start = started_at.get((installation_id, installer_id, start_status))
+                    if start is not None:
+                        seconds = (created_at - start).total_seconds()
+                scorecard = scorecards.get(installer_id)
+                if scorecard is None:
+                    scorecard = scorecards[installer_id] = InstallerScorecard(installer_id=installer_id)
+                InstallationEventService.count(scorecard, to_status, seconds)
+
+            InstallerScorecard.objects.all().delete()
+            InstallerScorecard.objects.bulk_create(scorecards.values())
+        return len(scorecards)
@@ -1,5 +1,6 @@
 # accounts/services/installation_service.py
 from django.db.models import Count, Q
+from ..db_router import reporting_reads
 from ..models import Installation, InstallerProfile
 
 
@@ -8,6 +9,9 @@ class InstallationService:
     Service class to centralize installation-related business logic
     and eliminate duplicate code across views.
     """
+
+    # Relations shown on every installation list row
+    LIST_RELATED = ('customer', 'charger_model', 'installer')
     
     @staticmethod
     def get_installations_for_user(user):
@@ -20,20 +24,22 @@ class InstallationService:
         Returns:
             QuerySet: Filtered installations for the user
         """
+        installations = Installation.objects.select_related(*InstallationService.LIST_RELATED)
         if user.role == '1':  # Admin
-            return Installation.objects.all().order_by('-created_at')
+            return installations.order_by('-created_at')
         elif user.role == '2':  # Installer
             try:
                 installer_profile = InstallerProfile.objects.get(user=user)
-                return Installation.objects.filter(
+                return installations.filter(
                     Q(assigned_installer=user) | Q(installer=installer_profile)
                 ).order_by('-created_at')
             except InstallerProfile.DoesNotExist:
-                return Installation.objects.filter(assigned_installer=user).order_by('-created_at')
+                return installations.filter(assigned_installer=user).order_by('-created_at')
         else:
             return Installation.objects.none()
     
     @staticmethod
+    @reporting_reads()
     def get_status_counts():
         """
         Get status counts for all installations.
@@ -55,9 +61,12 @@ class InstallationService:
         Returns:
             QuerySet: Installations for the installer
         """
-        return Installation.objects.filter(installer=installer_profile).order_by('-installation_created_date')
+        return Installation.objects.filter(installer=installer_profile).select_related(
+            *InstallationService.LIST_RELATED
+        ).order_by('-installation_created_date')
     
     @staticmethod
+    @reporting_reads()
     def calculate_installer_stats(installations):
         """
         Calculate KPI statistics for an installer.
@@ -68,17 +77,14 @@ class InstallationService:
         Returns:
             dict: Statistics including total, in_progress, pending, completed, completion_rate
         """
-        total_tasks = installations.count()
-        in_progress = installations.filter(status='IN_PROGRESS').count()
-        pending = installations.filter(status='PENDING_ACCEPTANCE').count()
-        completed = installations.filter(status='COMPLETED').count()
-        completion_rate = int((completed / total_tasks) * 100) if total_tasks > 0 else 0
-        
-        return {
-            'total_tasks': total_tasks,
-            'in_progress': in_progress,
-            'pending': pending,
-            'completed': completed,
-            'completion_rate': completion_rate,
-        }
+        # One query for all four counts
+        stats = installations.aggregate(
+            total_tasks=Count('pk'),
+            in_progress=Count('pk', filter=Q(status='IN_PROGRESS')),
+            pending=Count('pk', filter=Q(status='PENDING_ACCEPTANCE')),
+            completed=Count('pk', filter=Q(status='COMPLETED')),
+        )
+        total_tasks = stats['total_tasks']
+        stats['completion_rate'] = int((stats['completed'] / total_tasks) * 100) if total_tasks > 0 else 0
+        return stats
 
@@ -0,0 +1,229 @@
+# accounts/services/installation_stats_service.py
+import datetime
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Min, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from ..db_router import reporting_reads
+from ..models import Customer, Installation, InstallationDailyStats
+from ..reference_data import reference_data
+from ..utils import CUSTOMER_STATE_REGIONS
+
+
+class InstallationStatsService:
+    """
+    Service class for the InstallationDailyStats rollup: the key of an
+    installation, incremental count updates, chunked rebuilds and the
+    daily series the reporting charts read.
+
+    A key is a (date, region, house_type, charger_model_id, status) tuple.
+    """
+
+    KEY_FIELDS = ('date', 'region', 'house_type', 'charger_model_id', 'status')
+    GROUP_BY_CHOICES = ('status', 'region', 'house_type', 'charger_model')
+    MAX_DAYS = 366
+
+    @staticmethod
+    def region_for_state(customer_state):
+        """
+        The region (State.code) serving a Customer.state value, or ''.
+        """
+        return CUSTOMER_STATE_REGIONS.get(customer_state, '')
+
+    @staticmethod
+    def get_key(installation, customer_state, house_type):
+        """
+        Build the rollup key of an installation whose customer has the given
+        state and house type.
+        """
+        date = installation.installation_created_date or timezone.localdate(installation.created_at)
+        return (
+            date,
+            InstallationStatsService.region_for_state(customer_state),
+            house_type,
+            installation.charger_model_id,
+            installation.status,
+        )
+
+    @staticmethod
+    def get_saved_key(installation):
+        """
+        The rollup key of the installation as stored in the database, or None.
+        """
+        row = Installation.objects.filter(pk=installation.pk).values(
+            'installation_created_date', 'created_at', 'charger_model_id', 'status',
+            'customer__state', 'customer__house_type',
+        ).first()
+        if row is None:
+            return None
+        saved = Installation(
+            installation_created_date=row['installation_created_date'], created_at=row['created_at'],
+            charger_model_id=row['charger_model_id'], status=row['status'],
+        )
+        return InstallationStatsService.get_key(saved, row['customer__state'], row['customer__house_type'])
+
+    @staticmethod
+    def get_current_key(installation):
+        """
+        The rollup key of an installation instance, reusing its cached customer.
+        """
+        if Installation.customer.is_cached(installation):
+            customer_state, house_type = installation.customer.state, installation.customer.house_type
+        else:
+            customer_state, house_type = Customer.objects.filter(
+                pk=installation.customer_id
+            ).values_list('state', 'house_type').get()
+        return InstallationStatsService.get_key(installation, customer_state, house_type)
+
+    @staticmethod
+    def apply(changes):
+        """
+        Add count changes to the rollup, in the caller's transaction.
+
+        Args:
+            changes: Counter of key -> change in count
+        """
+        now = timezone.now()
+        for key, delta in changes.items():
+            if not delta:
+                continue
+            lookup = dict(zip(InstallationStatsService.KEY_FIELDS, key))
+            rows = InstallationDailyStats.objects.filter(**lookup)
+            if rows.update(count=F('count') + delta, updated_at=now) or delta < 0:
+                # No row to decrement: history not backfilled yet, nothing to undo
+                continue
+            try:
+                with transaction.atomic():
+                    InstallationDailyStats.objects.create(count=delta, **lookup)
+            except IntegrityError:
+                # Created by a concurrent save since the update above
+                rows.update(count=F('count') + delta, updated_at=now)
+
+    @staticmethod
+    def count_installations(start, end):
+        """
+        Group the installations created between `start` and `end` (inclusive)
+        by rollup key.
+
+        Returns:
+            Counter: Key -> number of installations
+        """
+        grouped = (
+            Installation.objects
+            .annotate(day=Coalesce('installation_created_date', TruncDate('created_at')))
+            .filter(day__gte=start, day__lte=end)
+            .values('day', 'customer__state', 'customer__house_type', 'charger_model_id', 'status')
+            .annotate(total=Count('pk'))
+            .order_by()
+        )
+        counts = Counter()
+        for row in grouped:
+            key = (
+                row['day'],
+                InstallationStatsService.region_for_state(row['customer__state']),
+                row['customer__house_type'],
+                row['charger_model_id'],
+                row['status'],
+            )
+            counts[key] += row['total']
+        return counts
+
+    @staticmethod
+    def rebuild(start, end):
+        """
+        Recount the rollup rows of the dates from `start` to `end` from the
+        installations. Runs in one transaction, so saves made meanwhile are
+        either counted here or applied after it.
+
+        Returns:
+            int: Rollup rows written
+        """
+        with transaction.atomic():
+            counts = InstallationStatsService.count_installations(start, end)
+            InstallationDailyStats.objects.filter(date__gte=start, date__lte=end).delete()
+            InstallationDailyStats.objects.bulk_create([
+                InstallationDailyStats(count=total, **dict(zip(InstallationStatsService.KEY_FIELDS, key)))
+                for key, total in counts.items()
+            ])
+        return len(counts)
+
+    @staticmethod
+    def get_date_range():
+        """
+        The first and last date with installations or rollup rows, or None
+        if there are neither.
+        """
+        dates = [
+            *Installation.objects.annotate(
+                day=Coalesce('installation_created_date', TruncDate('created_at'))
+            ).aggregate(first=Min('day'), last=Max('day')).values(),
+            *InstallationDailyStats.objects.aggregate(first=Min('date'), last=Max('date')).values(),
+        ]
+        dates = [date for date in dates if date is not None]
+        return (min(dates), max(dates)) if dates else None
+
+    @staticmethod
+    def get_label(group_by, value):
+        """
+        Display label of a group_by value for chart legends.
+        """
+        if group_by == 'status':
+            return dict(Installation.STATUS_CHOICES).get(value, value)
+        if group_by == 'house_type':
+            return dict(InstallationDailyStats._meta.get_field('house_type').choices).get(value, value)
+        if group_by == 'charger_model':
+            charger_model = reference_data.get('charger_models', value)
+            return charger_model.model_name if charger_model is not None else str(value)
+        if group_by == 'region':
+            state = reference_data.state_by_code(value)
+            return state.name if state is not None else (value or 'Unmapped')
+        return value
+
+    @staticmethod
+    @reporting_reads()
+    def get_daily_series(start, end, group_by='status', filters=None):
+        """
+        Installations created per day from `start` to `end`, one series per
+        value of `group_by`, from the rollup.
+
+        Args:
+            start, end: First and last date (inclusive)
+            group_by: One of GROUP_BY_CHOICES
+            filters: Optional key field -> value, e.g. {'region': 'Central 2'}
+
+        Returns:
+            dict: {'dates': [...], 'series': [{'key', 'label', 'counts', 'total'}], 'total'}
+        """
+        group_field = 'charger_model_id' if group_by == 'charger_model' else group_by
+        rows = (
+            InstallationDailyStats.objects
+            .filter(date__gte=start, date__lte=end, **(filters or {}))
+            .exclude(count=0)
+            .values('date', group_field)
+            .annotate(total=Sum('count'))
+            .order_by()
+        )
+
+        days = (end - start).days + 1
+        dates = [start + datetime.timedelta(days=offset) for offset in range(days)]
+        series = {}
+        for row in rows:
+            counts = series.setdefault(row[group_field], [0] * days)
+            counts[(row['date'] - start).days] += row['total']
+
+        return {
+            'dates': [date.isoformat() for date in dates],
+            'series': [
+                {
+                    'key': key,
+                    'label': InstallationStatsService.get_label(group_by, key),
+                    'counts': counts,
+                    'total': sum(counts),
+                }
+                for key, counts in sorted(series.items(), key=lambda item: (-sum(item[1]), str(item[0])))
+            ],
+            'total': sum(sum(counts) for counts in series.values()),
+        }
@@ -0,0 +1,127 @@
+# accounts/services/installation_transition_service.py
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import Installation
+from .installation_event_service import InstallationEventService
+from .installation_stats_service import InstallationStatsService
+
+
+class InstallationTransitionService:
+    """
+    Service class for moving installations between statuses.
+
+    Each transition is a single conditional UPDATE (WHERE id = ? AND
+    status = ?) of the columns it changes, so of two requests racing on the
+    same job (a double click, an accept and the expiry sweep) exactly one
+    wins, without locking the row. The winner records the status event and
+    moves the daily rollup count, which a queryset update would otherwise skip.
+    """
+
+    # Status -> statuses it may move to; every Installation.STATUS_CHOICES
+    # value is a key, final statuses map to ()
+    TRANSITIONS = {
+        'SUBMITTED': ('PENDING_ACCEPTANCE',),
+        'PENDING_ACCEPTANCE': ('ACCEPTED', 'REJECTED', 'EXPIRED'),
+        'ACCEPTED': ('IN_PROGRESS', 'COMPLETED'),
+        'REJECTED': ('PENDING_ACCEPTANCE',),
+        'IN_PROGRESS': ('COMPLETED',),
+        'COMPLETED': (),
+        'EXPIRED': ('PENDING_ACCEPTANCE',),
+    }
+    OFFER_HOURS = 24
+
+    @staticmethod
+    def can_transition(from_status, to_status):
+        return to_status in InstallationTransitionService.TRANSITIONS.get(from_status, ())
+
+    @staticmethod
+    def get_changes(to_status, now):
+        """
+        Columns a transition to `to_status` sets besides status and updated_at.
+        """
+        if to_status == 'PENDING_ACCEPTANCE':
+            return {'assignment_expires_at': now + timezone.timedelta(hours=InstallationTransitionService.OFFER_HOURS)}
+        if to_status in ('ACCEPTED', 'REJECTED', 'EXPIRED'):
+            return {'assignment_expires_at': None}
+        return {}
+
+    @staticmethod
+    def offer_new(installation, now=None):
+        """
+        Put a new, unsaved installation straight into PENDING_ACCEPTANCE,
+        setting what a SUBMITTED -> PENDING_ACCEPTANCE transition would
+        (the offer's expiry). The caller saves it.
+
+        Raises:
+            ValueError: The installation is already saved.
+        """
+        if not installation._state.adding:
+            raise ValueError("Only new installations can be offered this way; use transition().")
+        now = now or timezone.now()
+        for name, value in InstallationTransitionService.get_changes('PENDING_ACCEPTANCE', now).items():
+            setattr(installation, name, value)
+        installation.status = 'PENDING_ACCEPTANCE'
+
+    @staticmethod
+    def get_guard(from_status, to_status, now):
+        """
+        Extra WHERE condition of a transition, or None: an offer can only be
+        answered before it expires, and only expires after that.
+        """
+        if from_status != 'PENDING_ACCEPTANCE':
+            return None
+        if to_status in ('ACCEPTED', 'REJECTED'):
+            return Q(assignment_expires_at__isnull=True) | Q(assignment_expires_at__gt=now)
+        if to_status == 'EXPIRED':
+            return Q(assignment_expires_at__lte=now)
+        return None
+
+    @staticmethod
+    def transition(installation, to_status, actor=None, **fields):
+        """
+        Move an installation from the status it was loaded with to `to_status`.
+
+        Args:
+            installation: The Installation, as loaded by the caller
+            to_status: The new status
+            actor: Optional CustomUser making the change, for the status event
+            **fields: Other columns to set, e.g. assigned_installer when re-offering
+
+        Returns:
+            bool: True if this call made the change (the instance is updated),
+                False if the installation had already moved on or the offer
+                had expired.
+
+        Raises:
+            ValueError: The transition is not allowed.
+        """
+        from_status = installation.status
+        if not InstallationTransitionService.can_transition(from_status, to_status):
+            raise ValueError(f"An installation cannot move from {from_status} to {to_status}.")
+
+        now = timezone.now()
+        changes = {
+            **InstallationTransitionService.get_changes(to_status, now),
+            **fields,
+            'status': to_status,
+            'updated_at': now,
+        }
+        rows = Installation.objects.filter(pk=installation.pk, status=from_status)
+        guard = InstallationTransitionService.get_guard(from_status, to_status, now)
+        if guard is not None:
+            rows = rows.filter(guard)
+
+        with transaction.atomic():
+            if not rows.update(**changes):
+                return False
+            before = InstallationStatsService.get_current_key(installation)
+            for name, value in changes.items():
+                setattr(installation, name, value)
+            after = InstallationStatsService.get_current_key(installation)
+            InstallationStatsService.apply(Counter({before: -1, after: 1}))
+            InstallationEventService.record(installation, from_status, to_status, actor=actor)
+        return True
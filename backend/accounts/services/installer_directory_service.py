@@ -0,0 +1,156 @@
+# accounts/services/installer_directory_service.py
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.contrib.auth import get_user_model
+from ..models import State, LICENSE_CLASS_CHOICES, CIDB_GRADE_CHOICES
+
+User = get_user_model()
+
+
+class InstallerDirectoryService:
+    """
+    Service class for the admin installer directory.
+    Builds the filtered, paginated installer listing on a fixed number of
+    queries and manages the version stamp of its cached rendered fragment.
+    """
+
+    PAGE_SIZE = 50
+    CACHE_TIMEOUT = 60 * 15
+    CACHE_VERSION_KEY = 'installer_directory:version'
+
+    # Boolean registration filters: query parameter -> InstallerProfile field
+    REGISTRATION_FILTERS = {
+        'st': 'is_st_registered',
+        'cidb': 'is_cidb_registered',
+        'sst': 'is_sst_registered',
+    }
+
+    @staticmethod
+    def get_filters(params):
+        """
+        Extract the supported directory filters from request parameters.
+
+        Unknown or invalid values are dropped so they never reach the query
+        or the fragment cache key.
+
+        Args:
+            params: A QueryDict (usually request.GET)
+
+        Returns:
+            dict: Cleaned filters keyed by parameter name
+        """
+        filters = {}
+
+        region = params.get('region')
+        if region:
+            filters['region'] = region
+
+        for param in InstallerDirectoryService.REGISTRATION_FILTERS:
+            value = params.get(param)
+            if value in ('1', '0'):
+                filters[param] = value
+
+        license_class = params.get('license_class')
+        if license_class in dict(LICENSE_CLASS_CHOICES):
+            filters['license_class'] = license_class
+
+        cidb_grade = params.get('cidb_grade')
+        if cidb_grade in dict(CIDB_GRADE_CHOICES):
+            filters['cidb_grade'] = cidb_grade
+
+        return filters
+
+    @staticmethod
+    def get_installers(filters):
+        """
+        Get installer users with their profile joined and operational states
+        prefetched, so rendering a row never triggers further queries.
+
+        Args:
+            filters: Cleaned filters from get_filters()
+
+        Returns:
+            QuerySet: Filtered installer users
+        """
+        installers = (
+            User.objects.filter(role='2')
+            .select_related('installerprofile')
+            .prefetch_related('installerprofile__operational_states')
+            .order_by('-date_joined', '-pk')
+        )
+
+        # A profile holds each state at most once, so this join cannot duplicate rows
+        if 'region' in filters:
+            installers = installers.filter(installerprofile__operational_states__code=filters['region'])
+
+        for param, field in InstallerDirectoryService.REGISTRATION_FILTERS.items():
+            if param in filters:
+                installers = installers.filter(**{f'installerprofile__{field}': filters[param] == '1'})
+
+        if 'license_class' in filters:
+            installers = installers.filter(installerprofile__license_class=filters['license_class'])
+
+        if 'cidb_grade' in filters:
+            installers = installers.filter(installerprofile__cidb_grade=filters['cidb_grade'])
+
+        return installers
+
+    @staticmethod
+    def get_page(filters, page_number):
+        """
+        Paginate the filtered installer directory.
+
+        Args:
+            filters: Cleaned filters from get_filters()
+            page_number: The requested page number (any value accepted by Paginator.get_page)
+
+        Returns:
+            Page: The requested page of installers
+        """
+        installers = InstallerDirectoryService.get_installers(filters)
+        return Paginator(installers, InstallerDirectoryService.PAGE_SIZE).get_page(page_number)
+
+    @staticmethod
+    def get_region_choices():
+        """
+        Get (code, name) pairs for the region filter dropdown.
+        """
+        return list(State.objects.order_by('code').values_list('code', 'name'))
+
+    @staticmethod
+    def get_cache_version():
+        """
+        Get the current version stamp of the rendered directory fragment.
+        """
+        version = cache.get(InstallerDirectoryService.CACHE_VERSION_KEY)
+        if version is None:
+            version = 1
+            cache.add(InstallerDirectoryService.CACHE_VERSION_KEY, version, None)
+        return version
+
+    @staticmethod
+    def get_fragment_cache_key(filters, page_number):
+        """
+        Build the cache key of a rendered directory fragment.
+
+        Args:
+            filters: Cleaned filters from get_filters()
+            page_number: The requested page number
+
+        Returns:
+            str: Cache key bound to the current version stamp
+        """
+        version = InstallerDirectoryService.get_cache_version()
+        filter_key = '&'.join(f'{key}={value}' for key, value in sorted(filters.items()))
+        return f'installer_directory:v{version}:{filter_key}:page={page_number}'
+
+    @staticmethod
+    def invalidate():
+        """
+        Invalidate every cached directory fragment by bumping the version stamp.
+        Old fragments are left to expire on their own.
+        """
+        try:
+            cache.incr(InstallerDirectoryService.CACHE_VERSION_KEY)
+        except ValueError:
+            cache.set(InstallerDirectoryService.CACHE_VERSION_KEY, 2, None)
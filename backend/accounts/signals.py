@@ -0,0 +1,414 @@
+# accounts/signals.py
+from collections import Counter
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed, post_migrate
+from django.dispatch import receiver
+from .models import CustomUser, InstallerProfile, State, ChargerModel, Customer, Installation, Task
+from .services import (
+    InstallationEventService, InstallationRowCacheService, InstallationStatsService, InstallerDirectoryService,
+)
+from .reference_data import reference_data
+from .search_index import install_search_index
+from .region_index import installer_region_index
+from .sqlite_tuning import configure_connection
+from .blob_storage import adjust_blob_refs, blob_field_names, blob_refs
+from .previews import queue_previews
+
+
+# -----------------------------------------------
+# 📝 Installer Directory Cache Invalidation
+# -----------------------------------------------
+# Bumped after commit: a render that starts before the commit would
+# otherwise cache the old rows under the new version.
+@receiver([post_save, post_delete], sender=InstallerProfile)
+@receiver([post_save, post_delete], sender=State)
+def invalidate_installer_directory(sender, **kwargs):
+    """
+    Drop cached installer directory fragments when a profile or state changes.
+    """
+    transaction.on_commit(InstallerDirectoryService.invalidate)
+
+
+@receiver(m2m_changed, sender=InstallerProfile.operational_states.through)
+def invalidate_installer_directory_states(sender, action, **kwargs):
+    """
+    Drop cached installer directory fragments when operational states change.
+    """
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        transaction.on_commit(InstallerDirectoryService.invalidate)
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_installer_directory_users(sender, instance, **kwargs):
+    """
+    Drop cached installer directory fragments when an installer account changes.
+    Login only touches last_login, which the directory does not show.
+    """
+    if instance.role != '2':
+        return
+    if kwargs.get('update_fields') == frozenset({'last_login'}):
+        return
+    transaction.on_commit(InstallerDirectoryService.invalidate)
+
+
+# -----------------------------------------------
+# 🧾 Installation List Row Cache Invalidation
+# -----------------------------------------------
+@receiver(post_save, sender=Customer)
+def invalidate_customer_installation_rows(sender, instance, **kwargs):
+    """
+    Drop cached list rows that show this customer's name or location.
+    """
+    transaction.on_commit(lambda: InstallationRowCacheService.invalidate(customer=instance))
+
+
+@receiver(post_save, sender=ChargerModel)
+def invalidate_charger_model_installation_rows(sender, instance, **kwargs):
+    """
+    Drop cached list rows that show this charger model.
+    """
+    transaction.on_commit(lambda: InstallationRowCacheService.invalidate(charger_model=instance))
+
+
+@receiver(post_save, sender=InstallerProfile)
+def invalidate_installer_installation_rows(sender, instance, created=False, update_fields=None, **kwargs):
+    """
+    Drop cached list rows that show this installer's company name.
+    """
+    if created or (update_fields is not None and 'company_name' not in update_fields):
+        return
+    transaction.on_commit(lambda: InstallationRowCacheService.invalidate(installer=instance))
+
+
+# -----------------------------------------------
+# 📚 Reference Data Registry Invalidation
+# -----------------------------------------------
+@receiver([post_save, post_delete], sender=State)
+@receiver([post_save, post_delete], sender=ChargerModel)
+@receiver([post_save, post_delete], sender=InstallerProfile)
+def invalidate_reference_data(sender, **kwargs):
+    """
+    Reload the in-process reference tables when one of their rows changes.
+    Deferred to commit so a reload in between cannot cache the old rows
+    under the new version.
+    """
+    transaction.on_commit(reference_data.invalidate)
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_reference_data_users(sender, instance, **kwargs):
+    """
+    Reload the installer user choices when an account changes.
+    Login only touches last_login, which the choices do not show.
+    """
+    if kwargs.get('update_fields') == frozenset({'last_login'}):
+        return
+    transaction.on_commit(reference_data.invalidate)
+
+
+# -----------------------------------------------
+# 🔎 Autocomplete Search Index
+# -----------------------------------------------
+@receiver(post_migrate)
+def install_autocomplete_search_index(sender, app_config, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    (Re)install the FTS search index after migrations, since SQLite drops
+    triggers when a migration rebuilds one of the indexed tables.
+    """
+    if app_config.label != 'accounts':
+        return
+    connection = connections[using]
+    if 'accounts_customer' not in connection.introspection.table_names():
+        return
+    install_search_index(connection)
+
+
+# -----------------------------------------------
+# 🗺️ Region → Installer Index Maintenance
+# -----------------------------------------------
+# Updates are applied on commit so a rolled-back change never reaches the index.
+def _region_pairs(instance, reverse, pk_set):
+    """
+    Turn an operational_states m2m change into (region_code, user_id) pairs
+    for installer users, or None if a state is unknown to the registry.
+    """
+    if reverse:
+        user_ids = InstallerProfile.objects.filter(
+            pk__in=pk_set, user__role='2'
+        ).values_list('user_id', flat=True)
+        return [(instance.code, user_id) for user_id in user_ids]
+
+    if reference_data.get('installer_users', instance.user_id) is None:
+        return []
+    pairs = []
+    for state_pk in pk_set:
+        state = reference_data.get('states', state_pk)
+        if state is None:
+            return None
+        pairs.append((state.code, instance.user_id))
+    return pairs
+
+
+@receiver(m2m_changed, sender=InstallerProfile.operational_states.through)
+def update_region_index_states(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Apply operational state changes to the region index incrementally.
+    """
+    if action == 'pre_clear':
+        # pk_set is not provided for clear(), so remember what is being cleared
+        if reverse:
+            instance._region_index_cleared = [
+                (instance.code, user_id) for user_id in
+                instance.installerprofile_set.filter(user__role='2').values_list('user_id', flat=True)
+            ]
+        else:
+            instance._region_index_cleared = [
+                (code, instance.user_id) for code in instance.operational_states.values_list('code', flat=True)
+            ]
+        return
+
+    if action == 'post_clear':
+        pairs = getattr(instance, '_region_index_cleared', None)
+        update = installer_region_index.remove_memberships
+    elif action in ('post_add', 'post_remove'):
+        pairs = _region_pairs(instance, reverse, pk_set)
+        update = installer_region_index.add_memberships if action == 'post_add' else installer_region_index.remove_memberships
+    else:
+        return
+
+    if pairs is None:
+        transaction.on_commit(installer_region_index.invalidate)
+    else:
+        transaction.on_commit(lambda: update(pairs))
+
+
+@receiver(pre_save, sender=CustomUser)
+def remember_region_index_role(sender, instance, update_fields=None, **kwargs):
+    """
+    Note the account's stored role before a save that may change it.
+    """
+    instance._region_role_before = None
+    if update_fields is not None and 'role' not in update_fields:
+        return
+    if not instance._state.adding and instance.pk is not None:
+        instance._region_role_before = CustomUser.objects.filter(pk=instance.pk).values_list('role', flat=True).first()
+
+
+@receiver(post_save, sender=CustomUser)
+def update_region_index_users(sender, instance, created, **kwargs):
+    """
+    Keep the installer list of the region index in step with account roles.
+    """
+    if kwargs.get('update_fields') == frozenset({'last_login'}):
+        return
+    if created:
+        if instance.role == '2':
+            transaction.on_commit(lambda: installer_region_index.add_installer(instance.pk))
+        return
+    before = getattr(instance, '_region_role_before', None)
+    if before is not None and (before == '2') != (instance.role == '2'):
+        # Published even by processes that have not built the index
+        change = installer_region_index.add_installer if instance.role == '2' else installer_region_index.remove_installer
+        transaction.on_commit(lambda: change(instance.pk))
+        return
+    transaction.on_commit(lambda: installer_region_index.sync_installer(instance.pk, instance.role == '2'))
+
+
+@receiver(post_delete, sender=CustomUser)
+def remove_region_index_user(sender, instance, **kwargs):
+    """
+    Drop a deleted installer account from the region index.
+    """
+    if instance.role == '2':
+        transaction.on_commit(lambda: installer_region_index.remove_installer(instance.pk))
+
+
+@receiver(post_delete, sender=InstallerProfile)
+def remove_region_index_profile(sender, instance, **kwargs):
+    """
+    A deleted profile takes its operational states with it.
+    """
+    if instance.user_id:
+        transaction.on_commit(lambda: installer_region_index.clear_regions(instance.user_id))
+
+
+@receiver([post_save, post_delete], sender=State)
+def rebuild_region_index_states(sender, **kwargs):
+    """
+    Rebuild the region index when a state is renamed or removed.
+    """
+    transaction.on_commit(installer_region_index.invalidate)
+
+
+# -----------------------------------------------
+# 🗄️ SQLite Connection Tuning
+# -----------------------------------------------
+@receiver(connection_created)
+def tune_sqlite_connection(sender, connection, **kwargs):
+    """
+    Apply settings.SQLITE_TUNING (WAL, busy timeout, cache/mmap sizes and
+    periodic maintenance) to every new SQLite connection.
+    """
+    configure_connection(connection)
+
+
+# -----------------------------------------------
+# 🧮 Blob Reference Counts
+# -----------------------------------------------
+@receiver(pre_save, sender=InstallerProfile)
+@receiver(pre_save, sender=Task)
+def remember_blob_refs(sender, instance, update_fields=None, **kwargs):
+    """
+    Note which blobs the row referenced before this save.
+    """
+    field_names = blob_field_names(sender)
+    if update_fields is not None:
+        field_names = tuple(name for name in field_names if name in update_fields)
+    instance._blob_fields_saved = field_names
+    instance._blob_refs_before = None
+    if field_names and not instance._state.adding and instance.pk is not None:
+        previous = sender._default_manager.filter(pk=instance.pk).values(*field_names).first()
+        if previous is not None:
+            instance._blob_refs_before = blob_refs(sender(**previous), field_names)
+
+
+@receiver(post_save, sender=InstallerProfile)
+@receiver(post_save, sender=Task)
+def update_blob_refs(sender, instance, **kwargs):
+    """
+    Count references to blobs a file field now points at, and release the
+    ones it no longer does. Queryset updates bypass this; `gc_blobs
+    --recount` repairs the counts.
+    """
+    field_names = getattr(instance, '_blob_fields_saved', ())
+    if field_names:
+        adjust_blob_refs(blob_refs(instance, field_names), instance._blob_refs_before or {})
+
+
+@receiver(post_delete, sender=InstallerProfile)
+@receiver(post_delete, sender=Task)
+def release_blob_refs(sender, instance, **kwargs):
+    adjust_blob_refs({}, blob_refs(instance))
+
+
+# -----------------------------------------------
+# 🖼️ Document Previews
+# -----------------------------------------------
+@receiver(post_save, sender=InstallerProfile)
+@receiver(post_save, sender=Task)
+def queue_document_previews(sender, instance, **kwargs):
+    """
+    Render a thumbnail for each certificate or task document this save
+    stored, in the background (accounts/previews.py).
+    """
+    field_names = getattr(instance, '_blob_fields_saved', ())
+    if field_names:
+        added = blob_refs(instance, field_names).keys() - (instance._blob_refs_before or {}).keys()
+        if added:
+            queue_previews(added)
+
+
+# -----------------------------------------------
+# 📈 Daily Installation Rollup
+# -----------------------------------------------
+# Counts move in the saving transaction (Installation.save() and Customer.save()
+# open one), so a rolled-back save leaves them alone. Queryset updates and
+# bulk_create bypass this; `backfill_daily_stats` recounts.
+ROLLUP_FIELDS = {'installation_created_date', 'charger_model', 'charger_model_id', 'status', 'customer', 'customer_id'}
+
+
+@receiver(pre_save, sender=Installation)
+def remember_daily_stats_key(sender, instance, update_fields=None, **kwargs):
+    """
+    Note the rollup key the installation was counted under before this save.
+    """
+    instance._daily_stats_tracked = update_fields is None or bool(ROLLUP_FIELDS & set(update_fields))
+    instance._daily_stats_before = None
+    if instance._daily_stats_tracked and not instance._state.adding and instance.pk is not None:
+        instance._daily_stats_before = InstallationStatsService.get_saved_key(instance)
+
+
+@receiver(post_save, sender=Installation)
+def update_daily_stats(sender, instance, created, **kwargs):
+    """
+    Move the installation's count from its old rollup key to its new one.
+    """
+    if not getattr(instance, '_daily_stats_tracked', True):
+        return
+    before = None if created else instance._daily_stats_before
+    after = InstallationStatsService.get_current_key(instance)
+    if before != after:
+        changes = Counter({after: 1})
+        if before is not None:
+            changes[before] -= 1
+        InstallationStatsService.apply(changes)
+
+
+@receiver(post_delete, sender=Installation)
+def release_daily_stats(sender, instance, **kwargs):
+    InstallationStatsService.apply(Counter({InstallationStatsService.get_current_key(instance): -1}))
+
+
+@receiver(pre_save, sender=Customer)
+def remember_customer_region(sender, instance, **kwargs):
+    """
+    Note the customer's state and house type before this save; both are
+    part of the rollup key of their installations.
+    """
+    instance._daily_stats_location = None
+    if not instance._state.adding and instance.pk is not None:
+        instance._daily_stats_location = Customer.objects.filter(pk=instance.pk).values_list('state', 'house_type').first()
+
+
+@receiver(post_save, sender=Customer)
+def move_customer_daily_stats(sender, instance, created, **kwargs):
+    """
+    Move the counts of the customer's installations when their region or
+    house type changed.
+    """
+    before = getattr(instance, '_daily_stats_location', None)
+    if created or before is None:
+        return
+    old_region, old_house_type = InstallationStatsService.region_for_state(before[0]), before[1]
+    new_region, new_house_type = InstallationStatsService.region_for_state(instance.state), instance.house_type
+    if (old_region, old_house_type) == (new_region, new_house_type):
+        return
+    changes = Counter()
+    for installation in Installation.objects.filter(customer=instance).only(
+        'installation_created_date', 'created_at', 'charger_model_id', 'status',
+    ):
+        changes[InstallationStatsService.get_key(installation, before[0], old_house_type)] -= 1
+        changes[InstallationStatsService.get_key(installation, instance.state, new_house_type)] += 1
+    InstallationStatsService.apply(changes)
+
+
+# -----------------------------------------------
+# 🧭 Installation Status History
+# -----------------------------------------------
+@receiver(pre_save, sender=Installation)
+def remember_previous_status(sender, instance, update_fields=None, **kwargs):
+    """
+    Note the installation's stored status before a save that may change it.
+    """
+    instance._status_before = None
+    if update_fields is not None and 'status' not in update_fields:
+        return
+    if not instance._state.adding and instance.pk is not None:
+        instance._status_before = Installation.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+
+
+@receiver(post_save, sender=Installation)
+def record_status_event(sender, instance, created, **kwargs):
+    """
+    Append a status event when a save creates the installation or changes
+    its status.
+    """
+    if created:
+        from_status = ''
+    else:
+        from_status = getattr(instance, '_status_before', None)
+        if from_status is None or from_status == instance.status:
+            return
+    InstallationEventService.record(instance, from_status, instance.status)
@@ -0,0 +1,102 @@
+# accounts/sqlite_tuning.py
+"""
+Connection setup for SQLite in production.
+
+Every new SQLite connection gets the PRAGMAs from settings.SQLITE_TUNING
+(applied from the connection_created signal, see accounts/signals.py):
+WAL so readers no longer wait for writers, a busy timeout instead of
+immediate "database is locked" errors, and larger page cache / mmap.
+Periodically, a connection also checkpoints the WAL and runs
+PRAGMA optimize. Writes get BEGIN IMMEDIATE through the database's
+OPTIONS['transaction_mode'] (see settings.DATABASES).
+"""
+import threading
+import time
+
+from django.conf import settings
+
+DEFAULT_SQLITE_TUNING = {
+    'ENABLED': True,
+    'PRAGMAS': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',     # Durable with WAL; fsyncs only at checkpoints
+        'busy_timeout': 5000,        # Milliseconds to wait for a lock
+        'mmap_size': 134217728,      # 128 MiB
+        'cache_size': -20000,        # Negative values are KiB, i.e. ~20 MB
+        'temp_store': 'MEMORY',
+    },
+    'MAINTENANCE_INTERVAL': 3600,    # Seconds between checkpoint/optimize runs (None disables)
+    'CHECKPOINT_MODE': 'PASSIVE',
+}
+
+CHECKPOINT_MODES = ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE')
+
+_maintenance_lock = threading.Lock()
+_last_maintenance = {}
+
+
+def get_tuning_settings():
+    tuning = {**DEFAULT_SQLITE_TUNING, **getattr(settings, 'SQLITE_TUNING', {})}
+    tuning['PRAGMAS'] = {**DEFAULT_SQLITE_TUNING['PRAGMAS'], **tuning['PRAGMAS']}
+    return tuning
+
+
+def apply_pragmas(connection, pragmas):
+    """
+    Run PRAGMA statements on a raw connection. Values are written literally,
+    so they must come from settings, never from user input.
+    """
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            if value is not None:
+                cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def run_maintenance(connection, checkpoint_mode='PASSIVE'):
+    """
+    Checkpoint the WAL into the database file and let SQLite refresh its
+    query planner statistics.
+
+    Returns:
+        dict: The checkpoint result (busy, log pages, checkpointed pages)
+    """
+    checkpoint_mode = checkpoint_mode.upper()
+    if checkpoint_mode not in CHECKPOINT_MODES:
+        raise ValueError(f"Unknown checkpoint mode {checkpoint_mode!r}.")
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA wal_checkpoint({checkpoint_mode})')
+        busy, log_pages, checkpointed = cursor.fetchone()
+        cursor.execute('PRAGMA optimize')
+    return {'busy': busy, 'log_pages': log_pages, 'checkpointed_pages': checkpointed}
+
+
+def maintenance_due(alias, interval):
+    """
+    Claim the next periodic maintenance run for a database in this process.
+    """
+    if interval is None:
+        return False
+    now = time.monotonic()
+    with _maintenance_lock:
+        last = _last_maintenance.get(alias)
+        if last is not None and now - last < interval:
+            return False
+        _last_maintenance[alias] = now
+        return True
+
+
+def configure_connection(connection):
+    """
+    Apply settings.SQLITE_TUNING to a newly opened SQLite connection.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    tuning = get_tuning_settings()
+    if not tuning['ENABLED']:
+        return
+
+    apply_pragmas(connection, tuning['PRAGMAS'])
+    # The first connection after start-up also runs maintenance; it does not
+    # hurt and catches a WAL left large by a previous process.
+    if maintenance_due(connection.alias, tuning['MAINTENANCE_INTERVAL']):
+        run_maintenance(connection, tuning['CHECKPOINT_MODE'])
@@ -0,0 +1,76 @@
+# accounts/static_storage.py
+"""
+Static files storage for production (STORAGES['staticfiles'] without DEBUG).
+
+`collectstatic` copies every file under a content-hashed name
+(app.3f2a9c1b.css), so the front-end server can let browsers cache it for
+good: a changed file gets a new name and templates pick it up through
+{% static %}. Each hashed text file is also written pre-compressed as .gz
+and .br, so nginx serves them without compressing on every request.
+
+nginx example:
+
+    location /static/ {
+        alias /srv/app/backend/staticfiles/;
+        expires max;
+        add_header Cache-Control "public, immutable";
+        gzip_static on;
+        brotli_static on;  # ngx_brotli
+    }
+"""
+import gzip
+
+import brotli
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.map', '.xml', '.html')
+# Not worth a second request path below this size
+MIN_COMPRESS_SIZE = 256
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage that also writes .gz and .br variants of the
+    hashed files. Variants are only kept when smaller than the original.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        # Adjustable files (CSS) are yielded once per pass; compress the final name
+        hashed_names = {}
+        for original, hashed, processed in super().post_process(paths, dry_run, **options):
+            if hashed and not isinstance(processed, Exception):
+                hashed_names[original] = hashed
+            yield original, hashed, processed
+        if dry_run:
+            return
+
+        for name in hashed_names.values():
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.compress(name)
+
+    def compress(self, name):
+        """
+        Write the .gz and .br variants of `name`, unless they exist.
+
+        Returns:
+            list: Names of the variants written
+        """
+        with self.open(name) as source:
+            content = source.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return []
+
+        written = []
+        for suffix, encode in (
+            ('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0)),
+            ('.br', lambda data: brotli.compress(data, quality=11)),
+        ):
+            variant = name + suffix
+            if self.exists(variant):
+                continue
+            compressed = encode(content)
+            if len(compressed) < len(content):
+                self._save(variant, ContentFile(compressed))
+                written.append(variant)
+        return written
@@ -0,0 +1,48 @@
+# accounts/template_backends.py
+# The Jinja2 backend lives in accounts/jinja2_env.py, so that importing
+# template_engine() (views, services) does not load Jinja2 at startup.
+import time
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+from .middleware import record_template_time
+
+
+def template_engine(template_name):
+    """
+    Alias of the engine that renders `template_name`, per
+    settings.TEMPLATE_ENGINES; pass it as `using=` to render() and
+    render_to_string(). None picks the default (Django) engine.
+    """
+    return getattr(settings, 'TEMPLATE_ENGINES', {}).get(template_name)
+
+
+class InstrumentedTemplate(Template):
+    """
+    Template wrapper that reports its render time to the request
+    instrumentation middleware (see accounts/middleware.py).
+    """
+
+    def render(self, context=None, request=None):
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            record_template_time(time.perf_counter() - start)
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """
+    The standard Django template backend, returning InstrumentedTemplate objects.
+    """
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return InstrumentedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
@@ -1,9 +1,36 @@
 # accounts/templatetags/status_tags.py
 from django import template
+from django.utils.html import escape
 from django.utils.safestring import mark_safe
 
 register = template.Library()
 
+# CSS classes of each installation status badge
+STATUS_CLASSES = {
+    'COMPLETED': 'bg-[#006239] text-green-100',
+    'IN_PROGRESS': 'bg-yellow-600 text-yellow-100',
+    'SCHEDULED': 'bg-gray-500 text-gray-100',
+    'ON_HOLD': 'bg-orange-600 text-orange-100',
+    'SUBMITTED': 'bg-indigo-600 text-indigo-100',
+    'PENDING_ACCEPTANCE': 'bg-purple-600 text-purple-100',
+    'ACCEPTED': 'bg-teal-600 text-teal-100',
+    'REJECTED': 'bg-red-600 text-red-100',
+    'EXPIRED': 'bg-zinc-600 text-zinc-100',
+}
+
+# Human-readable name of each installation status
+STATUS_NAMES = {
+    'COMPLETED': 'Completed',
+    'IN_PROGRESS': 'In Progress',
+    'SCHEDULED': 'Scheduled',
+    'ON_HOLD': 'On Hold',
+    'SUBMITTED': 'Submitted',
+    'PENDING_ACCEPTANCE': 'Pending Acceptance',
+    'ACCEPTED': 'Accepted',
+    'REJECTED': 'Rejected',
+    'EXPIRED': 'Expired',
+}
+
 
 @register.filter
 def get_status_classes(status):
@@ -16,18 +43,7 @@ def get_status_classes(status):
     Returns:
         str: CSS classes for the status badge
     """
-    status_classes = {
-        'COMPLETED': 'bg-[#006239] text-green-100',
-        'IN_PROGRESS': 'bg-yellow-600 text-yellow-100',
-        'SCHEDULED': 'bg-gray-500 text-gray-100',
-        'ON_HOLD': 'bg-orange-600 text-orange-100',
-        'SUBMITTED': 'bg-indigo-600 text-indigo-100',
-        'PENDING_ACCEPTANCE': 'bg-purple-600 text-purple-100',
-        'ACCEPTED': 'bg-teal-600 text-teal-100',
-        'REJECTED': 'bg-red-600 text-red-100',
-        'EXPIRED': 'bg-red-700 text-red-100',
-    }
-    return status_classes.get(status, 'bg-gray-600 text-gray-100')
+    return STATUS_CLASSES.get(status, 'bg-gray-600 text-gray-100')
 
 
 @register.filter
@@ -41,18 +57,17 @@ def get_status_display_name(status):
     Returns:
         str: Human-readable status name
     """
-    status_names = {
-        'COMPLETED': 'Completed',
-        'IN_PROGRESS': 'In Progress',
-        'SCHEDULED': 'Scheduled',
-        'ON_HOLD': 'On Hold',
-        'SUBMITTED': 'Submitted',
-        'PENDING_ACCEPTANCE': 'Pending Acceptance',
-        'ACCEPTED': 'Accepted',
-        'REJECTED': 'Rejected',
-        'EXPIRED': 'Expired',
-    }
-    return status_names.get(status, status.title())
+    return STATUS_NAMES.get(status, status.title())
+
+
+def build_status_badge(status, size='text-xs'):
+    classes = get_status_classes(status)
+    display_name = escape(get_status_display_name(status))
+    return mark_safe(f'<span class="inline-block px-3 py-1 {size} font-semibold {classes} rounded-full">{display_name}</span>')
+
+
+# Badges of the known statuses at the default size, built once
+STATUS_BADGES = {status: build_status_badge(status) for status in STATUS_CLASSES}
 
 
 @register.filter
@@ -67,7 +82,6 @@ def render_status_badge(status, size='text-xs'):
     Returns:
         str: HTML for the status badge
     """
-    classes = get_status_classes(status)
-    display_name = get_status_display_name(status)
-    
-    return mark_safe(f'<span class="inline-block px-3 py-1 {size} font-semibold {classes} rounded-full">{display_name}</span>')
+    if size == 'text-xs' and status in STATUS_BADGES:
+        return STATUS_BADGES[status]
+    return build_status_badge(status, size)
@@ -1,3 +1,2072 @@
-from django.test import TestCase
+import datetime
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from unittest import mock
 
-# Create your tests here.
+import brotli
+from asgiref.sync import async_to_sync
+from botocore.stub import Stubber
+from channels.layers import get_channel_layer
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from django.db.models import Count
+from django.http import HttpResponse, QueryDict
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase
+from django.template import engines
+from django.template.loader import render_to_string
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import asset_build, utility_css
+from .blob_storage import blob_storage
+from .chunked_uploads import ChunkedUploadError, claim_session, expire_sessions, finalize, start_session, write_chunk
+from .consumer import ADMINS_GROUP, AdminNotificationConsumer
+from .db_router import ReportingRouter, RequestPin, current_pin, primary_reads, reporting_reads
+from .management.commands.startup_profile import parse_importtime
+from .media_cache import media_cache
+from .middleware import RequestInstrumentationMiddleware
+from .models import (
+    CustomUser, InstallerProfile, State, Customer, ChargerModel, Installation, Notification, Task,
+    CertificateUpload, StoredBlob, UploadSession, DocumentPreview, InstallationDailyStats, InstallationStatusEvent,
+    InstallerScorecard,
+)
+from .previews import preview_pool
+from .reference_data import reference_data
+from .region_index import InstallerRegionIndex, installer_region_index
+from .services import (
+    AutocompleteService, InstallationEventService, InstallationRowCacheService, InstallationService, InstallationStatsService,
+    InstallationTransitionService, InstallerDirectoryService,
+)
+from .s3_storage import CachedS3Storage, MetadataCache
+from .sqlite_tuning import maintenance_due
+from .templatetags.status_tags import STATUS_BADGES, render_status_badge
+from .upload_queue import remove_staged_file, stage_certificate, upload_pool
+from .write_queue import BatchWriter
+
+# -----------------------------------------------
+# 📏 QUERY BUDGETS
+# -----------------------------------------------
+# Maximum queries per request, by (URL name, role). Each view is rendered at
+# two data sizes and must issue the same number of queries at both, so a lazy
+# FK access in a template loop or a per-row count() fails here.
+# Lower a budget when a view gets cheaper; raising one needs a reason.
+QUERY_BUDGETS = {
+    ('installation_list', 'admin'): 9,
+    ('installation_list', 'installer'): 11,
+    ('installer_list', 'admin'): 10,
+    ('installer_dashboard', 'installer'): 10,
+    ('admin_notifications', 'admin'): 5,
+    ('admin_notifications', 'installer'): 5,
+    ('installation_detail', 'admin'): 7,
+    ('installation_detail', 'installer'): 8,
+    ('admin_dashboard', 'admin'): 9,
+}
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Renders the hot views at SMALL and LARGE rows per list and checks the
+    query count is flat and within QUERY_BUDGETS.
+    """
+
+    SMALL = 2
+    LARGE = 10
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.state = State.objects.create(code='Central 2', name='Central 2 (Selangor)')
+        cls.charger_model = ChargerModel.objects.create(
+            manufacturer='ABB', model_name='ABB Terra AC 22', power_rating_kw='22.00', connector_type='Type 2',
+        )
+        cls.admin = CustomUser.objects.create_user('budget-admin', password='x', role='1')
+        cls.installer = CustomUser.objects.create_user('budget-installer', password='x', role='2')
+        cls.profile = InstallerProfile.objects.create(
+            user=cls.installer, company_name='Budget Installer', registration_status='approved',
+        )
+        cls.profile.operational_states.add(cls.state)
+
+    def setUp(self):
+        self.rows = 0
+        self.clients = {}
+        for role, user in (('admin', self.admin), ('installer', self.installer)):
+            self.clients[role] = self.client_class()
+            self.clients[role].force_login(user)
+
+    # -----------------------------------------------
+    # Data
+    # -----------------------------------------------
+    def grow_to(self, size):
+        """
+        Add rows until every list the views show has `size` entries: the
+        installer's installations, each user's notifications, tasks and
+        further installers in the directory.
+        """
+        for number in range(self.rows, size):
+            customer = Customer.objects.create(
+                name=f'Customer {number}', email=f'customer{number}@example.com', address='1 Jalan Ujian',
+                city='Shah Alam', state='Selangor', house_type='L', postcode='40000',
+            )
+            installation = Installation.objects.create(
+                customer=customer, charger_model=self.charger_model, status='PENDING_ACCEPTANCE',
+                assigned_installer=self.installer, installer=self.profile,
+            )
+            task = Task.objects.create(title=f'Task {number}', pic='PIC', priority='High', status='Pending')
+            for user in (self.admin, self.installer):
+                Notification.objects.create(
+                    user=user, message=f'Notification {number}',
+                    related_installation=installation, related_task=task,
+                )
+            other = CustomUser.objects.create_user(f'budget-installer-{number}', role='2')
+            other_profile = InstallerProfile.objects.create(user=other, company_name=f'Installer {number}')
+            other_profile.operational_states.add(self.state)
+            self.installation = installation
+        self.rows = size
+
+    # -----------------------------------------------
+    # Harness
+    # -----------------------------------------------
+    def count_queries(self, role, url):
+        # Every measurement starts from cold caches, so both sizes take the same path
+        cache.clear()
+        reference_data.invalidate()
+        installer_region_index.invalidate()
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self.clients[role].get(url)
+        self.assertEqual(response.status_code, 200, f"GET {url} as {role}")
+        return len(captured.captured_queries)
+
+    def assertQueryBudget(self, url_name, role, url_kwargs=None):
+        budget = QUERY_BUDGETS[(url_name, role)]
+        counts = {}
+        for size in (self.SMALL, self.LARGE):
+            self.grow_to(size)
+            kwargs = url_kwargs() if url_kwargs else {}
+            counts[size] = self.count_queries(role, reverse(url_name, kwargs=kwargs))
+
+        self.assertEqual(
+            counts[self.SMALL], counts[self.LARGE],
+            f"{url_name} ({role}) issues more queries with more rows: {counts}",
+        )
+        self.assertLessEqual(
+            counts[self.LARGE], budget,
+            f"{url_name} ({role}) issues {counts[self.LARGE]} queries, over its budget of {budget}",
+        )
+
+    def detail_kwargs(self):
+        return {'installation_id': self.installation.installation_id}
+
+    # -----------------------------------------------
+    # Views
+    # -----------------------------------------------
+    def test_installation_list_admin(self):
+        self.assertQueryBudget('installation_list', 'admin')
+
+    def test_installation_list_installer(self):
+        self.assertQueryBudget('installation_list', 'installer')
+
+    def test_installer_list_admin(self):
+        self.assertQueryBudget('installer_list', 'admin')
+
+    def test_installer_dashboard_installer(self):
+        self.assertQueryBudget('installer_dashboard', 'installer')
+
+    def test_notification_list_admin(self):
+        self.assertQueryBudget('admin_notifications', 'admin')
+
+    def test_notification_list_installer(self):
+        self.assertQueryBudget('admin_notifications', 'installer')
+
+    def test_installation_detail_admin(self):
+        self.assertQueryBudget('installation_detail', 'admin', self.detail_kwargs)
+
+    def test_installation_detail_installer(self):
+        self.assertQueryBudget('installation_detail', 'installer', self.detail_kwargs)
+
+    def test_dashboard_admin(self):
+        self.assertQueryBudget('admin_dashboard', 'admin')
+
+
+class ReportingRouterTests(SimpleTestCase):
+    """
+    Reads go to the reporting alias only inside reporting_reads() and only
+    while the request is not pinned by a recent write.
+    """
+
+    def setUp(self):
+        self.router = ReportingRouter()
+        patcher = mock.patch('accounts.db_router.reporting_alias', return_value='reporting')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reads_outside_block_use_default_routing(self):
+        self.assertIsNone(self.router.db_for_read(Task))
+
+    def test_reads_inside_block_use_reporting(self):
+        with reporting_reads():
+            self.assertEqual(self.router.db_for_read(Task), 'reporting')
+
+    def test_alias_resolved_once_per_block(self):
+        with mock.patch('accounts.db_router.reporting_alias', return_value='reporting') as resolve:
+            with reporting_reads():
+                with reporting_reads():
+                    self.router.db_for_read(Task)
+                self.router.db_for_read(Task)
+        resolve.assert_called_once_with()
+
+    def test_primary_reads_override_reporting(self):
+        with reporting_reads():
+            with primary_reads():
+                self.assertIsNone(self.router.db_for_read(Task))
+                with reporting_reads():
+                    self.assertIsNone(self.router.db_for_read(Task))
+            self.assertEqual(self.router.db_for_read(Task), 'reporting')
+
+    def test_write_pins_request_to_default(self):
+        pin = RequestPin()
+        token = current_pin.set(pin)
+        try:
+            with reporting_reads():
+                self.router.db_for_write(Task)
+                self.assertTrue(pin.wrote)
+                self.assertEqual(self.router.db_for_read(Task), 'default')
+        finally:
+            current_pin.reset(token)
+
+    def test_pinned_request_reads_default(self):
+        token = current_pin.set(RequestPin(pinned=True))
+        try:
+            with reporting_reads():
+                self.assertEqual(self.router.db_for_read(Task), 'default')
+        finally:
+            current_pin.reset(token)
+
+    def test_instances_from_reporting_are_saved_to_default(self):
+        task = Task(title='Copy')
+        task._state.db = 'reporting'
+        self.assertEqual(self.router.db_for_write(Task, instance=task), 'default')
+        primary = Task(title='Primary')
+        primary._state.db = 'default'
+        self.assertTrue(self.router.allow_relation(task, primary))
+        self.assertFalse(self.router.allow_migrate('reporting', 'accounts'))
+
+
+class FailingStorage(FileSystemStorage):
+    """
+    Object storage that is down.
+    """
+
+    def _save(self, name, content):
+        raise ConnectionError("storage unavailable")
+
+
+class CertificateUploadTests(TestCase):
+    """
+    Certificates are staged by the profile edit and only appear on the
+    profile once the upload pool has stored them.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.staging_dir = os.path.join(self.media_root, 'staging')
+        self.storages = {
+            'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage', 'OPTIONS': {'location': self.media_root}},
+            'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+        }
+        overrides = override_settings(
+            STORAGES=self.storages,
+            UPLOAD_QUEUE={'STAGING_DIR': self.staging_dir, 'MAX_ATTEMPTS': 2, 'RETRY_DELAY': 0},
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        self.installer = CustomUser.objects.create_user('upload-installer', password='x', role='2')
+        self.profile = InstallerProfile.objects.create(
+            user=self.installer, company_name='Volt Works', is_st_registered=True,
+        )
+        self.client.force_login(self.installer)
+
+    def certificate(self):
+        return SimpleUploadedFile('st.pdf', b'%PDF-1.4 certificate', content_type='application/pdf')
+
+    def test_profile_edit_stages_certificate(self):
+        with mock.patch.object(upload_pool, 'submit') as submit, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('edit_company_profile'), {
+                'company_name': 'Volt Works', 'is_st_registered': 'on', 'st_certificate': self.certificate(),
+            })
+        self.assertRedirects(response, reverse('company_profile'), fetch_redirect_response=False)
+
+        upload = CertificateUpload.objects.get(profile=self.profile)
+        submit.assert_called_once_with(upload.pk)
+        self.assertEqual(upload.field_name, 'st_certificate')
+        self.assertTrue(os.path.exists(upload.staged_path))
+        self.profile.refresh_from_db()
+        self.assertFalse(self.profile.st_certificate)
+        self.assertContains(self.client.get(reverse('company_profile')), 'Uploading')
+
+    def test_upload_lands_on_profile(self):
+        with self.captureOnCommitCallbacks():
+            upload = stage_certificate(self.profile, 'st_certificate', self.certificate())
+
+        self.assertTrue(upload_pool.process(upload.pk))
+        self.profile.refresh_from_db()
+        self.assertRegex(self.profile.st_certificate.name, r'^blobs/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.pdf$')
+        self.assertEqual(self.profile.st_certificate.read(), b'%PDF-1.4 certificate')
+        self.assertFalse(CertificateUpload.objects.exists())
+        self.assertFalse(os.path.exists(upload.staged_path))
+
+    def test_newer_upload_replaces_pending_one(self):
+        with mock.patch.object(upload_pool, 'submit'):
+            with self.captureOnCommitCallbacks(execute=True):
+                first = stage_certificate(self.profile, 'st_certificate', self.certificate())
+                second = stage_certificate(self.profile, 'st_certificate', self.certificate())
+
+        self.assertEqual(list(CertificateUpload.objects.values_list('pk', flat=True)), [second.pk])
+        self.assertFalse(os.path.exists(first.staged_path))
+        self.assertFalse(upload_pool.process(first.pk))
+
+    def test_failed_upload_is_kept_for_retry(self):
+        with self.captureOnCommitCallbacks():
+            upload = stage_certificate(self.profile, 'st_certificate', self.certificate())
+
+        self.storages['default']['BACKEND'] = 'accounts.tests.FailingStorage'
+        with override_settings(STORAGES=self.storages):
+            self.assertFalse(upload_pool.process(upload.pk))
+
+        upload.refresh_from_db()
+        self.assertEqual((upload.status, upload.attempts), ('failed', 2))
+        self.assertIn('storage unavailable', upload.last_error)
+        self.assertTrue(os.path.exists(upload.staged_path))
+        self.profile.refresh_from_db()
+        self.assertFalse(self.profile.st_certificate)
+
+
+class ContentAddressedStorageTests(TestCase):
+    """
+    Identical files are stored once and reference counted; gc_blobs removes
+    blobs no field points at.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        overrides = override_settings(STORAGES={
+            'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage', 'OPTIONS': {'location': self.media_root}},
+            'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+        })
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def document(self, content=b'%PDF-1.4 method statement'):
+        return SimpleUploadedFile('method-statement.pdf', content, content_type='application/pdf')
+
+    def create_task(self, document):
+        return Task.objects.create(title='Site survey', pic='PIC', priority='Low', status='Pending', document=document)
+
+    def test_identical_files_are_stored_once(self):
+        first = self.create_task(self.document())
+        with mock.patch.object(type(blob_storage.backend), 'save') as backend_save:
+            second = self.create_task(self.document())
+        backend_save.assert_not_called()
+
+        self.assertEqual(first.document.name, second.document.name)
+        blob = StoredBlob.objects.get()
+        self.assertEqual((blob.name, blob.ref_count), (first.document.name, 2))
+        self.assertEqual(second.document.read(), b'%PDF-1.4 method statement')
+
+    def test_references_follow_field_changes(self):
+        task = self.create_task(self.document())
+        old_name = task.document.name
+        task.document = self.document(b'%PDF-1.4 revised')
+        task.save()
+
+        self.assertEqual(StoredBlob.objects.get(name=old_name).ref_count, 0)
+        self.assertEqual(StoredBlob.objects.get(name=task.document.name).ref_count, 1)
+        task.delete()
+        self.assertFalse(StoredBlob.objects.filter(ref_count__gt=0).exists())
+
+    def test_gc_deletes_unreferenced_blobs(self):
+        kept = self.create_task(self.document())
+        dropped = self.create_task(self.document(b'%PDF-1.4 superseded'))
+        dropped_name = dropped.document.name
+        # A queryset update skips the signals; --recount notices
+        Task.objects.filter(pk=dropped.pk).update(document='')
+
+        call_command('gc_blobs', '--recount', '--grace-hours', '0', stdout=open(os.devnull, 'w'))
+
+        self.assertEqual(list(StoredBlob.objects.values_list('name', flat=True)), [kept.document.name])
+        self.assertFalse(blob_storage.exists(dropped_name))
+        self.assertTrue(blob_storage.exists(kept.document.name))
+
+
+class CachedS3StorageTests(SimpleTestCase):
+    """
+    Object metadata comes from one HEAD request and is then served from the
+    cache; clients are reused per thread. Runs against a stubbed client, the
+    same way it would against a local S3 stand-in.
+    """
+
+    def setUp(self):
+        self.storage = CachedS3Storage(
+            bucket_name='test-bucket', access_key='test', secret_key='test',
+            region_name='us-east-1', endpoint_url='http://s3.local.invalid',
+        )
+        self.stubber = Stubber(self.storage.connection.meta.client)
+        self.stubber.activate()
+        self.addCleanup(self.stubber.deactivate)
+
+    def expect_head(self, key, size=None):
+        params = {'Bucket': 'test-bucket', 'Key': key}
+        if size is None:
+            self.stubber.add_client_error('head_object', http_status_code=404, expected_params=params)
+        else:
+            self.stubber.add_response('head_object', {
+                'ContentLength': size, 'ETag': '"0123abcd"',
+                'LastModified': datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc),
+            }, expected_params=params)
+
+    def test_metadata_is_fetched_once(self):
+        self.expect_head('certificates/st.pdf', size=2048)
+        self.assertTrue(self.storage.exists('certificates/st.pdf'))
+        self.assertEqual(self.storage.size('certificates/st.pdf'), 2048)
+        self.assertEqual(self.storage.etag('certificates/st.pdf'), '0123abcd')
+        self.assertTrue(async_to_sync(self.storage.aexists)('certificates/st.pdf'))
+        self.stubber.assert_no_pending_responses()
+        self.assertEqual(self.storage.metadata_cache.misses, 1)
+
+    def test_missing_objects_are_cached(self):
+        self.expect_head('missing.pdf')
+        self.assertFalse(self.storage.exists('missing.pdf'))
+        self.assertFalse(self.storage.exists('missing.pdf'))
+        with self.assertRaises(FileNotFoundError):
+            self.storage.size('missing.pdf')
+
+    def test_delete_updates_cache(self):
+        self.expect_head('tasks/doc.pdf', size=10)
+        self.assertTrue(self.storage.exists('tasks/doc.pdf'))
+        self.stubber.add_response('delete_object', {}, {'Bucket': 'test-bucket', 'Key': 'tasks/doc.pdf'})
+        self.storage.delete('tasks/doc.pdf')
+        self.assertFalse(self.storage.exists('tasks/doc.pdf'))
+        self.stubber.assert_no_pending_responses()
+
+    def test_clients_are_shared_per_thread(self):
+        other = CachedS3Storage(
+            bucket_name='other-bucket', access_key='test', secret_key='test',
+            region_name='us-east-1', endpoint_url='http://s3.local.invalid',
+        )
+        self.assertIs(other.connection, self.storage.connection)
+        elsewhere = []
+        thread = threading.Thread(target=lambda: elsewhere.append(self.storage.connection))
+        thread.start()
+        thread.join()
+        self.assertIsNot(elsewhere[0], self.storage.connection)
+
+    def test_metadata_cache_evicts_least_recent_and_expired(self):
+        cache_ = MetadataCache(max_entries=2, ttl=60)
+        with mock.patch('accounts.s3_storage.time.monotonic', return_value=0):
+            cache_.set('a', {'exists': True})
+            cache_.set('b', {'exists': True})
+            cache_.get('a')
+            cache_.set('c', {'exists': True})
+            self.assertIsNone(cache_.get('b'))
+            self.assertIsNotNone(cache_.get('a'))
+        with mock.patch('accounts.s3_storage.time.monotonic', return_value=61):
+            self.assertIsNone(cache_.get('a'))
+
+
+class MediaProxyTests(TestCase):
+    """
+    Certificates and task documents are served from the local media cache,
+    only to users allowed to see them.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.cache_dir = os.path.join(self.media_root, 'proxy-cache')
+        overrides = override_settings(
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage', 'OPTIONS': {'location': self.media_root}},
+                'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+            },
+            MEDIA_PROXY={'CACHE_DIR': self.cache_dir, 'SENDFILE': None},
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        self.installer = CustomUser.objects.create_user('proxy-installer', password='x', role='2')
+        self.profile = InstallerProfile.objects.create(
+            user=self.installer, company_name='Volt Works', is_st_registered=True,
+            st_certificate=SimpleUploadedFile('st.pdf', b'%PDF-1.4 certificate'),
+        )
+        self.admin = CustomUser.objects.create_user('proxy-admin', password='x', role='1')
+
+    def proxy_url(self, file):
+        return reverse('media_proxy', args=[file.name])
+
+    def test_installer_downloads_own_certificate(self):
+        self.client.force_login(self.installer)
+        response = self.client.get(self.proxy_url(self.profile.st_certificate) + '?download=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.4 certificate')
+        self.assertIn('attachment; filename="VOLT-WORKS_ST-CERTIFICATE.pdf"', response['Content-Disposition'])
+
+    def test_other_installer_gets_404(self):
+        other = CustomUser.objects.create_user('proxy-other', password='x', role='2')
+        self.client.force_login(other)
+        response = self.client.get(self.proxy_url(self.profile.st_certificate))
+        self.assertEqual(response.status_code, 404)
+
+    def test_admin_gets_task_document_from_cache(self):
+        task = Task.objects.create(
+            title='Site survey', pic='PIC', priority='Low', status='Pending',
+            document=SimpleUploadedFile('survey.pdf', b'%PDF-1.4 survey'),
+        )
+        self.client.force_login(self.admin)
+        hits = media_cache.hits
+        for _ in range(2):
+            response = self.client.get(self.proxy_url(task.document))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.4 survey')
+            response.close()
+        self.assertEqual(media_cache.hits, hits + 1)
+        self.assertIn('filename="site-survey.pdf"', response['Content-Disposition'])
+
+        # Installers never see task documents
+        self.client.force_login(self.installer)
+        self.assertEqual(self.client.get(self.proxy_url(task.document)).status_code, 404)
+
+    def test_front_end_server_sends_the_file(self):
+        self.client.force_login(self.admin)
+        with override_settings(MEDIA_PROXY={'CACHE_DIR': self.cache_dir, 'SENDFILE': 'x-accel-redirect'}):
+            response = self.client.get(self.proxy_url(self.profile.st_certificate))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'')
+        relative = response['X-Accel-Redirect'].removeprefix('/protected-media/')
+        self.assertTrue(os.path.isfile(os.path.join(self.cache_dir, relative)))
+
+    def test_eviction_keeps_cache_within_limit(self):
+        names = [blob_storage.save(f'file-{index}.pdf', SimpleUploadedFile('f.pdf', bytes([index]) * 100)) for index in range(3)]
+        for index, name in enumerate(names):
+            _, path = media_cache.fetch(blob_storage, name)
+            os.utime(path, (index, index))  # Oldest first
+        self.assertEqual(media_cache.evict(max_bytes=250), 100)
+        cached = [media_cache.fetch(blob_storage, name)[1] for name in names[1:]]
+        self.assertEqual(sum(os.path.getsize(path) for path in cached), 200)
+
+
+    def test_fills_walk_the_cache_only_when_over_the_limit(self):
+        names = [blob_storage.save(f'walk-{index}.pdf', SimpleUploadedFile('f.pdf', bytes([index]) * 100)) for index in range(4)]
+        media_proxy = {'CACHE_DIR': self.cache_dir, 'MAX_BYTES': 250}
+        with override_settings(MEDIA_PROXY=media_proxy), mock.patch('accounts.media_cache.os.walk', wraps=os.walk) as walk:
+            media_cache.fetch(blob_storage, names[0])  # Seeds the running total
+            self.assertEqual(walk.call_count, 1)
+            media_cache.fetch(blob_storage, names[1])
+            media_cache.fetch(blob_storage, names[0])
+            self.assertEqual(walk.call_count, 1)
+            media_cache.fetch(blob_storage, names[2])  # 300 bytes
+            self.assertEqual(walk.call_count, 2)
+            media_cache.fetch(blob_storage, names[3])
+            self.assertEqual(walk.call_count, 3)
+        cached = [name for name in names if os.path.exists(os.path.join(self.cache_dir, media_cache.cache_key(blob_storage, name)))]
+        self.assertEqual(len(cached), 2)
+
+class ChunkedUploadTests(TestCase):
+    """
+    Files sent in chunks resume from the server's offset and are attached to
+    their certificate field or task when finalized.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        overrides = override_settings(
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage', 'OPTIONS': {'location': self.media_root}},
+                'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+            },
+            UPLOAD_QUEUE={'STAGING_DIR': os.path.join(self.media_root, 'staging')},
+            CHUNKED_UPLOADS={'CHUNK_SIZE': 4, 'MAX_SIZE': 64},
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        self.installer = CustomUser.objects.create_user('chunk-installer', password='x', role='2')
+        self.profile = InstallerProfile.objects.create(user=self.installer, company_name='Volt Works')
+        self.admin = CustomUser.objects.create_user('chunk-admin', password='x', role='1')
+
+    def start(self, target, content):
+        response = self.client.post(
+            reverse('upload_session_create'),
+            {'target': target, 'filename': 'scan.pdf', 'size': len(content)},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+        return reverse('upload_session', args=[response.json()['id']])
+
+    def put(self, url, content, start, end):
+        return self.client.put(
+            url, content[start:end + 1], content_type='application/octet-stream',
+            headers={'Content-Range': f'bytes {start}-{end}/{len(content)}'},
+        )
+
+    def test_certificate_resumes_and_is_queued(self):
+        content = b'%PDF-1.4 st'
+        self.client.force_login(self.installer)
+        url = self.start('st_certificate', content)
+
+        self.assertEqual(self.put(url, content, 0, 3).json()['offset'], 4)
+        # A repeated or skipped chunk is refused with the offset to resume from
+        response = self.put(url, content, 8, 10)
+        self.assertEqual((response.status_code, response.json()['offset']), (409, 4))
+        self.assertEqual(self.client.get(url).json()['offset'], 4)
+        self.assertEqual(self.put(url, content, 4, 7).status_code, 200)
+        self.assertEqual(self.put(url, content, 8, 10).json()['complete'], True)
+
+        with mock.patch.object(upload_pool, 'submit') as submit, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url + 'finalize/')
+        self.assertEqual(response.json()['target'], 'st_certificate')
+        upload = CertificateUpload.objects.get(profile=self.profile)
+        submit.assert_called_once_with(upload.pk)
+        with open(upload.staged_path, 'rb') as staged:
+            self.assertEqual(staged.read(), content)
+        self.assertFalse(UploadSession.objects.exists())
+
+    def test_dropped_chunk_keeps_received_bytes(self):
+        session = start_session(self.installer, 'cidb_certificate', 'cidb.pdf', 8)
+        with self.assertRaises(ChunkedUploadError) as raised:
+            write_chunk(session.pk, 0, 3, 8, io.BytesIO(b'%P'))  # Connection dropped after 2 bytes
+        self.assertEqual(raised.exception.offset, 2)
+        write_chunk(session.pk, 2, 5, 8, io.BytesIO(b'DF-1'))
+        session = write_chunk(session.pk, 6, 7, 8, io.BytesIO(b'.4'))
+        self.assertTrue(session.is_complete)
+        with open(session.staged_path, 'rb') as staged:
+            self.assertEqual(staged.read(), b'%PDF-1.4')
+
+    def test_finalize_checks_staged_size(self):
+        session = start_session(self.installer, 'cidb_certificate', 'cidb.pdf', 8)
+        write_chunk(session.pk, 0, 3, 8, io.BytesIO(b'%PDF'))
+        write_chunk(session.pk, 4, 7, 8, io.BytesIO(b'-1.4'))
+        with open(session.staged_path, 'r+b') as staged:
+            staged.truncate(6)  # Lost in a crash
+
+        with self.assertRaises(ChunkedUploadError) as raised:
+            finalize(session.pk, self.installer)
+        self.assertEqual((raised.exception.status, raised.exception.offset), (409, 6))
+        self.assertEqual(UploadSession.objects.get(pk=session.pk).offset, 6)
+        self.assertFalse(CertificateUpload.objects.exists())
+
+    def test_document_stored_outside_transaction(self):
+        task = Task.objects.create(title='Wiring diagram', pic='PIC', priority='Low', status='Pending')
+        session = start_session(self.admin, 'task_document', 'wiring.pdf', 4)
+        write_chunk(session.pk, 0, 3, 4, io.BytesIO(b'%PDF'))
+        depth = len(connection.atomic_blocks)
+        storage = Task._meta.get_field('document').storage
+        depths = []
+
+        def save(*args, **kwargs):
+            depths.append(len(connection.atomic_blocks))
+            return original_save(*args, **kwargs)
+
+        original_save = storage.save
+        with mock.patch.object(storage, 'save', side_effect=save):
+            finalize(session.pk, self.admin, task_id=task.pk)
+        self.assertEqual(depths, [depth])
+        self.assertFalse(os.path.exists(session.staged_path))
+        with self.assertRaisesMessage(ChunkedUploadError, 'already been finalized'):
+            claim_session(session)
+
+    def test_failed_queue_drops_session(self):
+        session = start_session(self.installer, 'st_certificate', 'st.pdf', 4)
+        write_chunk(session.pk, 0, 3, 4, io.BytesIO(b'%PDF'))
+
+        def failing_queue(profile, field_name, staged_path, original_name):
+            remove_staged_file(staged_path)
+            raise RuntimeError("database unavailable")
+
+        with mock.patch('accounts.chunked_uploads.queue_staged_certificate', side_effect=failing_queue):
+            with self.assertRaisesMessage(RuntimeError, 'database unavailable'):
+                finalize(session.pk, self.installer)
+        self.assertFalse(UploadSession.objects.filter(pk=session.pk).exists())
+        self.assertFalse(CertificateUpload.objects.exists())
+
+    def test_admin_attaches_task_document(self):
+        task = Task.objects.create(title='Site survey', pic='PIC', priority='Low', status='Pending')
+        content = b'%PDF-1.4 survey'
+        self.client.force_login(self.admin)
+        url = self.start('task_document', content)
+        for start in range(0, len(content), 4):
+            self.put(url, content, start, min(start + 3, len(content) - 1))
+
+        response = self.client.post(url + 'finalize/', {'task_id': task.pk}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        task.refresh_from_db()
+        with task.document.open('rb') as document:
+            self.assertEqual(document.read(), content)
+        self.assertEqual(StoredBlob.objects.get(name=task.document.name).ref_count, 1)
+
+    def test_targets_and_sessions_are_private(self):
+        self.client.force_login(self.installer)
+        response = self.client.post(
+            reverse('upload_session_create'),
+            {'target': 'task_document', 'filename': 'doc.pdf', 'size': 10}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 403)
+        response = self.client.post(
+            reverse('upload_session_create'),
+            {'target': 'st_certificate', 'filename': 'st.pdf', 'size': 65}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 413)
+
+        url = self.start('st_certificate', b'%PDF')
+        self.client.force_login(self.admin)
+        self.assertEqual(self.put(url, b'%PDF', 0, 3).status_code, 404)
+
+    def test_abandoned_sessions_expire(self):
+        session = start_session(self.installer, 'st_certificate', 'st.pdf', 8)
+        UploadSession.objects.filter(pk=session.pk).update(updated_at=timezone.now() - datetime.timedelta(hours=25))
+        self.assertEqual(expire_sessions(), 1)
+        self.assertFalse(os.path.exists(session.staged_path))
+
+
+
+class ChunkedUploadRaceTests(TransactionTestCase):
+    """
+    Two PUTs of the same chunk take turns on the staged file: the loser gets
+    a 409 without touching the winner's bytes.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        overrides = override_settings(
+            UPLOAD_QUEUE={'STAGING_DIR': os.path.join(self.media_root, 'staging')},
+            CHUNKED_UPLOADS={'CHUNK_SIZE': 4, 'MAX_SIZE': 64},
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.installer = CustomUser.objects.create_user('race-installer', password='x', role='2')
+        InstallerProfile.objects.create(user=self.installer, company_name='Volt Works')
+
+    def test_losing_put_leaves_winner_bytes(self):
+        session = start_session(self.installer, 'cidb_certificate', 'cidb.pdf', 8)
+        reading, release = threading.Event(), threading.Event()
+
+        class SlowStream(io.BytesIO):
+            def read(stream, size=-1):
+                piece = super().read(2)
+                reading.set()
+                release.wait(5)
+                return piece
+
+        results = {}
+
+        def put(name, stream):
+            try:
+                results[name] = write_chunk(session.pk, 0, 3, 8, stream).offset
+            except ChunkedUploadError as error:
+                results[name] = (error.status, error.offset)
+            finally:
+                connection.close()
+
+        winner = threading.Thread(target=put, args=('winner', SlowStream(b'%PDF')))
+        winner.start()
+        self.assertTrue(reading.wait(5))
+        loser = threading.Thread(target=put, args=('loser', io.BytesIO(b'XXXX')))
+        loser.start()
+        loser.join(0.2)
+        self.assertTrue(loser.is_alive())  # Waiting for the lock
+        release.set()
+        winner.join(5)
+        loser.join(5)
+
+        self.assertEqual(results, {'winner': 4, 'loser': (409, 4)})
+        with open(session.staged_path, 'rb') as staged:
+            self.assertEqual(staged.read(), b'%PDF')
+        self.assertEqual(UploadSession.objects.get(pk=session.pk).offset, 4)
+
+
+def minimal_pdf(text):
+    """
+    A one-page PDF showing `text` in Helvetica.
+    """
+    stream = b'BT /F1 24 Tf 72 700 Td (%s) Tj ET' % text.encode()
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R '
+        b'/Resources << /Font << /F1 5 0 R >> >> >>',
+        b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    pdf = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(pdf)
+    pdf += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    pdf += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    pdf += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return pdf
+
+
+class DocumentPreviewTests(TestCase):
+    """
+    Storing a certificate or task document queues a preview, rendered off the
+    request path and shown inline on the profile and task pages.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        overrides = override_settings(
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage', 'OPTIONS': {'location': self.media_root}},
+                'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+            },
+            MEDIA_PROXY={'CACHE_DIR': os.path.join(self.media_root, 'proxy-cache'), 'SENDFILE': None},
+            DOCUMENT_PREVIEWS={'PROCESSES': 0},
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.admin = CustomUser.objects.create_user('preview-admin', password='x', role='1')
+
+    def create_task(self, name='survey.pdf', content=None):
+        with mock.patch.object(preview_pool, 'submit') as submit, self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.create(
+                title='Site survey', pic='PIC', priority='Low', status='Pending',
+                document=SimpleUploadedFile(name, content or minimal_pdf('SITE SURVEY')),
+            )
+        submit.assert_called_once_with(task.document.name)
+        return task
+
+    def test_task_document_preview_is_rendered_and_shown(self):
+        task = self.create_task()
+        self.assertTrue(preview_pool.process(task.document.name))
+
+        preview = DocumentPreview.objects.get(name=task.document.name)
+        self.assertEqual((preview.status, preview.page_count, preview.text), ('ready', 1, 'SITE SURVEY'))
+        self.assertEqual(preview.width, 320)
+
+        self.client.force_login(self.admin)
+        page = self.client.get(reverse('task_detail', args=[task.pk]))
+        self.assertContains(page, reverse('media_preview', args=[task.document.name]))
+        thumbnail = self.client.get(reverse('media_preview', args=[task.document.name]))
+        self.assertEqual(thumbnail['Content-Type'], 'image/jpeg')
+        self.assertTrue(b''.join(thumbnail.streaming_content).startswith(b'\xff\xd8'))
+
+    def test_renders_in_process_pool(self):
+        task = self.create_task()
+        self.addCleanup(preview_pool.shutdown)
+        with override_settings(DOCUMENT_PREVIEWS={'PROCESSES': 1}):
+            self.assertTrue(preview_pool.process(task.document.name))
+        self.assertEqual(DocumentPreview.objects.get(name=task.document.name).text, 'SITE SURVEY')
+
+    def test_hung_render_times_out(self):
+        task = self.create_task()
+        hung_process = mock.Mock()
+        processes = mock.Mock(_processes={1: hung_process})
+        processes.submit.return_value = Future()  # Never completes
+        preview_pool._processes = processes
+        self.addCleanup(setattr, preview_pool, '_processes', None)
+
+        with override_settings(DOCUMENT_PREVIEWS={'PROCESSES': 1, 'RENDER_TIMEOUT': 0.01}):
+            with self.assertRaises(TimeoutError):
+                preview_pool.process(task.document.name)
+        preview = DocumentPreview.objects.get(name=task.document.name)
+        self.assertEqual(preview.status, 'failed')
+        self.assertIn('longer than 0.01 seconds', preview.error)
+        hung_process.terminate.assert_called_once_with()
+        processes.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+        self.assertIsNone(preview_pool._processes)
+
+    def test_unsupported_files_are_marked(self):
+        task = self.create_task('notes.txt', b'plain text')
+        self.assertFalse(preview_pool.process(task.document.name))
+        self.assertEqual(DocumentPreview.objects.get(name=task.document.name).status, 'unsupported')
+
+    def test_installer_sees_own_certificate_preview_only(self):
+        installer = CustomUser.objects.create_user('preview-installer', password='x', role='2')
+        with mock.patch.object(preview_pool, 'submit'), self.captureOnCommitCallbacks(execute=True):
+            profile = InstallerProfile.objects.create(
+                user=installer, company_name='Volt Works', is_st_registered=True,
+                st_certificate=SimpleUploadedFile('st.pdf', minimal_pdf('ST CERTIFICATE')),
+            )
+        preview_pool.process(profile.st_certificate.name)
+
+        self.client.force_login(installer)
+        page = self.client.get(reverse('company_profile'))
+        self.assertContains(page, 'ST CERTIFICATE')
+        self.assertEqual(self.client.get(reverse('media_preview', args=[profile.st_certificate.name])).status_code, 200)
+
+        other = CustomUser.objects.create_user('preview-other', password='x', role='2')
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(reverse('media_preview', args=[profile.st_certificate.name])).status_code, 404)
+
+
+class InstallationRowCacheTests(TestCase):
+    """
+    Installation list rows are rendered once per version and dropped when
+    the installation, its customer or its charger model changes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.charger_model = ChargerModel.objects.create(
+            manufacturer='ABB', model_name='ABB Terra AC 22', power_rating_kw='22.00', connector_type='Type 2',
+        )
+        cls.customers = [
+            Customer.objects.create(
+                name=f'Row Customer {number}', email=f'row{number}@example.com', address='1 Jalan Ujian',
+                city='Shah Alam', state='Selangor', house_type='L', postcode='40000',
+            )
+            for number in range(2)
+        ]
+        cls.installations = [
+            Installation.objects.create(customer=customer, charger_model=cls.charger_model, status='SUBMITTED')
+            for customer in cls.customers
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.admin = CustomUser.objects.create_user('row-admin', password='x', role='1')
+        self.client.force_login(self.admin)
+
+    def rendered_rows(self):
+        with mock.patch(
+            'accounts.services.installation_row_cache_service.render_to_string', wraps=render_to_string,
+        ) as render:
+            response = self.client.get(reverse('installation_list'))
+        self.assertEqual(response.status_code, 200)
+        return render.call_count, response
+
+    def test_only_changed_rows_are_rendered(self):
+        self.assertEqual(self.rendered_rows()[0], 2)
+        self.assertEqual(self.rendered_rows()[0], 0)
+
+        installation = Installation.objects.get(pk=self.installations[0].pk)
+        installation.status = 'COMPLETED'
+        installation.save()
+        rendered, response = self.rendered_rows()
+        self.assertEqual(rendered, 1)
+        self.assertContains(response, STATUS_BADGES['COMPLETED'], html=True)
+
+    def test_customer_and_charger_model_edits_invalidate_rows(self):
+        self.rendered_rows()
+        customer = self.customers[1]
+        customer.name = 'Renamed Customer'
+        with self.captureOnCommitCallbacks() as callbacks:
+            customer.save()
+        # Nothing is dropped until the rename commits
+        self.assertEqual(self.rendered_rows()[0], 0)
+        for callback in callbacks:
+            callback()
+        rendered, response = self.rendered_rows()
+        self.assertEqual(rendered, 1)
+        self.assertContains(response, 'Renamed Customer')
+
+        self.charger_model.model_name = 'ABB Terra AC 11'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.charger_model.save()
+        rendered, response = self.rendered_rows()
+        self.assertEqual(rendered, 2)
+        self.assertContains(response, 'ABB Terra AC 11', count=2)
+
+    def test_rows_from_reporting_copy_render_from_primary(self):
+        installations = list(Installation.objects.select_related(*InstallationService.LIST_RELATED).order_by('pk'))
+        # As read from a copy that has not seen the rename yet
+        stale = installations[0]
+        stale._state.db = 'reporting'
+        stale.customer.name = 'Stale Customer'
+
+        rows = InstallationRowCacheService.render_rows(installations)
+        self.assertIn('Row Customer 0', rows[0])
+        self.assertNotIn('Stale Customer', ''.join(cache.get_many([
+            InstallationRowCacheService.get_row_key(i.pk, i.updated_at) for i in installations
+        ]).values()))
+
+    def test_status_badges_come_from_the_precomputed_map(self):
+        self.assertIs(render_status_badge('SUBMITTED'), STATUS_BADGES['SUBMITTED'])
+        self.assertIn('text-sm', render_status_badge('SUBMITTED', 'text-sm'))
+        self.assertIn('Custom_State', render_status_badge('CUSTOM_STATE'))
+        self.assertIn('bg-zinc-600 text-zinc-100', STATUS_BADGES['EXPIRED'])
+
+
+class JinjaTemplateTests(TestCase):
+    """
+    The Jinja2 versions of the hot list pages render the same HTML as their
+    Django templates, context processors included.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.state = State.objects.create(code='Central 2', name='Central 2 (Selangor)')
+        charger_model = ChargerModel.objects.create(
+            manufacturer='ABB', model_name='ABB Terra AC 22', power_rating_kw='22.00', connector_type='Type 2',
+        )
+        cls.admin = CustomUser.objects.create_user('jinja-admin', password='x', role='1')
+        cls.installer = CustomUser.objects.create_user('jinja-installer', password='x', role='2')
+        cls.profile = InstallerProfile.objects.create(
+            user=cls.installer, company_name='Jinja & Sons', registration_status='approved',
+            license_class='A', is_st_registered=True,
+        )
+        cls.profile.operational_states.add(cls.state)
+        CustomUser.objects.create_user('jinja-no-profile', password='x', role='2')
+        for number, status in enumerate(['COMPLETED', 'EXPIRED', 'CUSTOM_STATE']):
+            customer = Customer.objects.create(
+                name=f'<Customer {number}>', email=f'jinja{number}@example.com', address='1 Jalan Ujian',
+                city='Shah Alam', state='Selangor', house_type='L', postcode='40000',
+            )
+            Installation.objects.create(
+                customer=customer, charger_model=charger_model, status=status,
+                assigned_installer=cls.installer, installer=cls.profile if number < 2 else None,
+            )
+
+    def render_page(self, user, url_name, engines):
+        cache.clear()
+        self.client.force_login(user)
+        with override_settings(TEMPLATE_ENGINES=engines):
+            response = self.client.get(reverse(url_name), {'q': 'search "me"'})
+        self.assertEqual(response.status_code, 200)
+        # MarkupSafe and Django escape quotes with different (equivalent) entities
+        html = response.content.decode().replace('&#34;', '&quot;').replace('&#39;', '&#x27;')
+        return ' '.join(html.split())
+
+    def assertSameHTML(self, user, url_name):
+        django_html = self.render_page(user, url_name, {})
+        jinja_html = self.render_page(user, url_name, {
+            'accounts/admin/admin_installation_list.html': 'jinja2',
+            'accounts/admin/admin_installer_list.html': 'jinja2',
+            'accounts/installer/installer_dashboard.html': 'jinja2',
+            'partials/_installation_row.html': 'jinja2',
+            'partials/_installer_directory.html': 'jinja2',
+        })
+        self.assertEqual(jinja_html, django_html)
+        return jinja_html
+
+    def test_installation_list(self):
+        html = self.assertSameHTML(self.admin, 'installation_list')
+        self.assertIn('&lt;Customer 0&gt;', html)
+        self.assertIn(STATUS_BADGES['EXPIRED'], html)
+
+    def test_installer_list(self):
+        html = self.assertSameHTML(self.admin, 'installer_list')
+        self.assertIn('Jinja &amp; Sons', html)
+        self.assertIn('Missing Profile', html)
+
+    def test_installer_dashboard(self):
+        html = self.assertSameHTML(self.installer, 'installer_dashboard')
+        # `completed` only comes from the installer_task_metrics context processor
+        self.assertIn('<h3 class="text-lg text-[#EDEDED] font-semibold">Completed</h3> </div> <p class="text-2xl font-semibold text-[#EDEDED]">1</p>', html)
+        self.assertIn('value="search &quot;me&quot;"', html)
+
+    def test_django_engine_by_default(self):
+        self.assertEqual(settings.TEMPLATE_ENGINES, {})
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('installation_list'))
+        # Only Django templates report their rendering to the test client
+        self.assertTemplateUsed(response, 'accounts/admin/admin_installation_list.html')
+        self.assertTemplateUsed(response, 'partials/_installation_row.html')
+
+    def test_view_context_wins_over_context_processors(self):
+        request = RequestFactory().get('/')
+        request.user = self.installer
+        template = engines['jinja2'].from_string('{{ total_tasks }}/{{ company_name }}')
+        self.assertEqual(template.render({'total_tasks': 'view'}, request), 'view/Jinja &amp; Sons')
+
+
+class StaticAssetTests(SimpleTestCase):
+    """
+    The committed build in accounts/static/accounts/build matches its
+    sources, and collectstatic writes hashed, pre-compressed files.
+    """
+
+    def test_build_is_up_to_date(self):
+        stdout = io.StringIO()
+        call_command('build_assets', check=True, stdout=stdout)
+        self.assertIn('up to date', stdout.getvalue())
+
+    def test_utilities(self):
+        css, names = utility_css.generate({
+            'bg-[#171717]', 'hover:bg-zinc-900', 'md:grid-cols-2', 'bg-black/50', 'w-9/12',
+            'peer-checked:after:translate-x-full', 'h-[calc(100vh-3rem)]', 'fa-bell', 'font-inter',
+        })
+        self.assertNotIn('fa-bell', names)
+        self.assertNotIn('font-inter', names)
+        self.assertIn(r'.bg-\[\#171717\]{background-color:#171717}', css)
+        self.assertIn(r'.hover\:bg-zinc-900:hover{background-color:#18181b}', css)
+        self.assertIn(r'.bg-black\/50{background-color:rgb(0 0 0 / 0.5)}', css)
+        self.assertIn(r'.w-9\/12{width:75%}', css)
+        self.assertIn(r'{height:calc(100vh - 3rem)}', css)
+        self.assertIn(r'.peer:checked ~ .peer-checked\:after\:translate-x-full::after{content:var(--tw-content);', css)
+        # Breakpoints come last so they override the plain utilities
+        self.assertTrue(css.rstrip().endswith(r'@media (min-width: 768px){.md\:grid-cols-2{grid-template-columns:repeat(2, minmax(0, 1fr))}}'))
+
+    def test_file_variant(self):
+        css, names = utility_css.generate({'file:mr-4', 'hover:file:bg-indigo-700'})
+        self.assertEqual(names, ['file:mr-4', 'hover:file:bg-indigo-700'])
+        self.assertIn(r'.file\:mr-4::file-selector-button{margin-right:1rem}', css)
+        self.assertIn(r'.hover\:file\:bg-indigo-700::file-selector-button:hover{background-color:#4338ca}', css)
+
+    def test_unsupported_utilities(self):
+        self.assertEqual(utility_css.unsupported({
+            'max-w-8xl', 'text-md', 'hover:bg-darkslategray', 'bg-indigo-600', 'fa-bell', 'font-size',
+            'top-level', 'input:focus', 'path:name',
+        }), ['hover:bg-darkslategray', 'max-w-8xl', 'text-md'])
+
+    def test_check_fails_on_unsupported_utilities(self):
+        stderr = io.StringIO()
+        with mock.patch.object(asset_build, 'collect_candidates', return_value={'flex', 'max-w-8xl'}):
+            with mock.patch.object(asset_build, 'stale_outputs', return_value=[]):
+                with self.assertRaisesMessage(CommandError, 'max-w-8xl'):
+                    call_command('build_assets', check=True, stdout=io.StringIO(), stderr=stderr)
+        self.assertIn('Unsupported utility class (not compiled): max-w-8xl', stderr.getvalue())
+
+    def test_pages_load_the_build_not_the_cdn(self):
+        for template in ('base.html', 'accounts/login.html'):
+            source = engines['django'].get_template(template).template.source
+            self.assertNotIn('cdn.tailwindcss.com', source)
+            self.assertIn("accounts/build/app.css", source)
+
+    def test_collectstatic_writes_compressed_variants(self):
+        static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static_root)
+        storages = {
+            'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+            'staticfiles': {'BACKEND': 'accounts.static_storage.CompressedManifestStaticFilesStorage'},
+        }
+        with override_settings(STATIC_ROOT=static_root, STORAGES=storages):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            hashed = staticfiles_storage.stored_name('accounts/build/app.css')
+
+        self.assertRegex(hashed, r'^accounts/build/app\.[0-9a-f]{12}\.css$')
+        with open(os.path.join(static_root, hashed), 'rb') as source:
+            content = source.read()
+        with gzip.open(os.path.join(static_root, hashed + '.gz')) as variant:
+            self.assertEqual(variant.read(), content)
+        with open(os.path.join(static_root, hashed + '.br'), 'rb') as variant:
+            self.assertEqual(brotli.decompress(variant.read()), content)
+
+
+class StartupProfileTests(SimpleTestCase):
+    """
+    Worker boot stays lean: optional heavy dependencies are only imported
+    when first used, not by the WSGI application or the URLconf.
+    """
+
+    LAZY_MODULES = ['boto3', 'channels.layers', 'jinja2', 'PIL', 'pypdfium2']
+
+    def test_lazy_imports(self):
+        output = tempfile.NamedTemporaryFile(suffix='.json', delete=False)
+        output.close()
+        self.addCleanup(os.remove, output.name)
+        call_command('startup_profile', runs=1, top=10000, output=output.name, stdout=io.StringIO())
+        with open(output.name) as report_file:
+            report = json.load(report_file)
+
+        imported = {row['module'] for row in report['modules']}
+        # URLconf modules load through import_module, which -X importtime
+        # does not log; the view modules they import are listed
+        self.assertIn('accounts.views.admin_views', imported)
+        for module in self.LAZY_MODULES:
+            self.assertNotIn(module, imported)
+        self.assertGreater(report['boot_ms'], 0)
+
+    def test_parse_importtime(self):
+        stderr = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        120 |     jinja2.utils\n'
+            'import time:       337 |      29367 | jinja2\n'
+        )
+        self.assertEqual(parse_importtime(stderr), {'jinja2.utils': (120, 120, 2), 'jinja2': (337, 29367, 0)})
+
+
+class InstallationDailyStatsTests(TestCase):
+    """
+    The daily rollup always equals a GROUP BY over the installations:
+    after creates, status changes, customer moves and deletes, and after a
+    chunked backfill. The chart endpoint reads it.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.charger_model = ChargerModel.objects.create(
+            manufacturer='ABB', model_name='ABB Terra AC 22', power_rating_kw='22.00', connector_type='Type 2',
+        )
+        cls.admin = CustomUser.objects.create_user('stats-admin', password='x', role='1')
+        cls.installer = CustomUser.objects.create_user('stats-installer', password='x', role='2')
+
+    def setUp(self):
+        self.customer = Customer.objects.create(
+            name='Stats Customer', email='stats@example.com', address='1 Jalan Ujian',
+            city='Shah Alam', state='Selangor', house_type='L', postcode='40000',
+        )
+
+    def create_installation(self, **fields):
+        return Installation.objects.create(customer=self.customer, charger_model=self.charger_model, **fields)
+
+    def rollup(self):
+        return Counter({
+            tuple(row[field] for field in InstallationStatsService.KEY_FIELDS): row['count']
+            for row in InstallationDailyStats.objects.exclude(count=0).values(*InstallationStatsService.KEY_FIELDS, 'count')
+        })
+
+    def assertRollupMatches(self):
+        self.assertEqual(
+            self.rollup(), InstallationStatsService.count_installations(datetime.date.min, datetime.date.max),
+        )
+
+    def test_incremental_updates(self):
+        first = self.create_installation()
+        second = self.create_installation(installation_created_date=datetime.date(2026, 1, 5))
+        self.assertRollupMatches()
+        key = (first.installation_created_date, 'Central 2', 'L', self.charger_model.pk, 'SUBMITTED')
+        self.assertEqual(self.rollup()[key], 1)
+
+        first.status = 'ACCEPTED'
+        first.save()
+        second.notes = 'Unrelated change'
+        with CaptureQueriesContext(connection) as queries:
+            second.save(update_fields=['notes'])
+        self.assertEqual(len(queries), 1)
+        self.assertRollupMatches()
+
+        self.customer.state = 'Johor'
+        self.customer.house_type = 'H'
+        self.customer.save()
+        self.assertRollupMatches()
+        self.assertEqual(self.rollup()[(datetime.date(2026, 1, 5), 'Southern', 'H', self.charger_model.pk, 'SUBMITTED')], 1)
+
+        first.delete()
+        self.assertRollupMatches()
+
+    def test_rolled_back_save_leaves_counts(self):
+        installation = self.create_installation()
+        before = self.rollup()
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            installation.status = 'COMPLETED'
+            installation.save()
+            raise RuntimeError
+        self.assertEqual(self.rollup(), before)
+
+    def test_seeded_installations_are_counted(self):
+        call_command(
+            'seed_synthetic', installers=3, installations=20, notifications=0, tasks=0, days=30, stdout=io.StringIO(),
+        )
+        self.assertEqual(Installation.objects.filter(customer__email__endswith='@synthetic.invalid').count(), 20)
+        self.assertRollupMatches()
+
+    def test_backfill(self):
+        for day in range(1, 6):
+            self.create_installation(installation_created_date=datetime.date(2026, 3, day), status='COMPLETED')
+        InstallationDailyStats.objects.all().delete()
+        InstallationDailyStats.objects.create(
+            date=datetime.date(2025, 1, 1), region='Northern', house_type='L', charger_model=self.charger_model,
+            status='EXPIRED', count=7,
+        )
+
+        stdout = io.StringIO()
+        call_command('backfill_daily_stats', chunk_days=2, stdout=stdout)
+        self.assertIn('rollup row(s)', stdout.getvalue())
+        self.assertRollupMatches()
+
+        # A status change after the backfill keeps counting from the rebuilt rows
+        Installation.objects.filter(installation_created_date=datetime.date(2026, 3, 1)).get().delete()
+        self.assertRollupMatches()
+
+    def test_chart_endpoint(self):
+        self.create_installation(installation_created_date=datetime.date(2026, 2, 1))
+        self.create_installation(installation_created_date=datetime.date(2026, 2, 3), status='COMPLETED')
+        self.client.force_login(self.admin)
+        url = reverse('installation_daily_stats')
+
+        response = self.client.get(url, {'start': '2026-02-01', 'end': '2026-02-03', 'group_by': 'status'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['dates'], ['2026-02-01', '2026-02-02', '2026-02-03'])
+        self.assertEqual(data['total'], 2)
+        series = {row['key']: row for row in data['series']}
+        self.assertEqual(series['SUBMITTED']['counts'], [1, 0, 0])
+        self.assertEqual(series['COMPLETED']['label'], 'Completed')
+
+        response = self.client.get(url, {
+            'start': '2026-02-01', 'end': '2026-02-03', 'group_by': 'region', 'status': 'COMPLETED',
+        })
+        self.assertEqual([(row['key'], row['counts']) for row in response.json()['series']], [('Central 2', [0, 0, 1])])
+
+        self.assertEqual(self.client.get(url, {'group_by': 'installer'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'start': 'yesterday'}).status_code, 400)
+        self.client.force_login(self.installer)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+class InstallationSaveTransactionTests(TransactionTestCase):
+    """
+    An installation save and the rollup and history rows its receivers write
+    commit together, also outside an atomic block.
+    """
+
+    def test_failing_receiver_rolls_back_save(self):
+        customer = Customer.objects.create(
+            name='Atomic Customer', address='1 Jalan Ujian', city='Shah Alam', state='Selangor', postcode='40000',
+        )
+        charger_model = ChargerModel.objects.create(
+            manufacturer='ABB', model_name='ABB Terra AC 22', power_rating_kw='22.00', connector_type='Type 2',
+        )
+        with mock.patch('accounts.signals.InstallationEventService.record', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                Installation.objects.create(customer=customer, charger_model=charger_model)
+        self.assertFalse(Installation.objects.exists())
+        self.assertFalse(InstallationDailyStats.objects.exists())
+
+
+
+class InstallationStatusEventTests(TestCase):
+    """
+    Every status change appends an event, the installer scorecards follow
+    the events incrementally and match a rebuild from the log, and
+    auto-assignment breaks ties on them.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.charger_model = ChargerModel.objects.create(
+            manufacturer='ABB', model_name='ABB Terra AC 22', power_rating_kw='22.00', connector_type='Type 2',
+        )
+        cls.admin = CustomUser.objects.create_user('events-admin', password='x', role='1')
+        cls.installer = CustomUser.objects.create_user('events-installer', password='x', role='2')
+        cls.other_installer = CustomUser.objects.create_user('events-installer-2', password='x', role='2')
+        cls.customer = Customer.objects.create(
+            name='Events Customer', email='events@example.com', address='1 Jalan Ujian',
+            city='Shah Alam', state='Selangor', house_type='L', postcode='40000',
+        )
+
+    def offer(self, installer=None):
+        return Installation.objects.create(
+            customer=self.customer, charger_model=self.charger_model, status='PENDING_ACCEPTANCE',
+            assigned_installer=installer or self.installer,
+        )
+
+    def move(self, installation, status):
+        installation.status = status
+        installation.save()
+
+    def test_transitions_are_recorded(self):
+        installation = self.offer()
+        installation.notes = 'Unrelated change'
+        installation.save(update_fields=['notes'])
+        self.move(installation, 'ACCEPTED')
+        self.move(installation, 'COMPLETED')
+
+        self.assertEqual(
+            list(installation.status_events.values_list('from_status', 'to_status', 'installer_id')),
+            [
+                ('', 'PENDING_ACCEPTANCE', self.installer.pk),
+                ('PENDING_ACCEPTANCE', 'ACCEPTED', self.installer.pk),
+                ('ACCEPTED', 'COMPLETED', self.installer.pk),
+            ],
+        )
+        event = installation.status_events.first()
+        event.to_status = 'REJECTED'
+        with self.assertRaises(ValueError):
+            event.save()
+
+        scorecard = InstallerScorecard.objects.get(installer=self.installer)
+        self.assertEqual((scorecard.offered, scorecard.accepted, scorecard.completed), (1, 1, 1))
+        self.assertEqual(sum(scorecard.accept_seconds), 1)
+
+    def test_recorded_without_rollup_receivers(self):
+        installation = self.offer()
+        with mock.patch.object(InstallationStatsService, 'get_saved_key', return_value=None):
+            self.move(installation, 'ACCEPTED')
+        self.assertEqual(installation.status_events.last().from_status, 'PENDING_ACCEPTANCE')
+
+    def test_seeded_installations_have_history(self):
+        call_command(
+            'seed_synthetic', installers=3, installations=20, notifications=0, tasks=0, days=30, stdout=io.StringIO(),
+        )
+        seeded = Installation.objects.filter(customer__email__endswith='@synthetic.invalid')
+        for installation in seeded:
+            events = list(installation.status_events.values_list('from_status', 'to_status'))
+            self.assertEqual(events[-1][1], installation.status)
+            self.assertEqual([from_status for from_status, _ in events[1:]], [to_status for _, to_status in events[:-1]])
+        offered = seeded.exclude(status='SUBMITTED').count()
+        self.assertEqual(sum(InstallerScorecard.objects.values_list('offered', flat=True)), offered)
+
+    def test_scorecard_rates_and_rebuild(self):
+        accepted = self.offer()
+        InstallationStatusEvent.objects.filter(installation=accepted).update(
+            created_at=timezone.now() - datetime.timedelta(hours=2),
+        )
+        self.move(accepted, 'ACCEPTED')
+        self.move(accepted, 'COMPLETED')
+        self.move(self.offer(), 'REJECTED')
+        self.move(self.offer(), 'EXPIRED')
+        self.move(self.offer(), 'ACCEPTED')
+
+        summary = InstallationEventService.get_scorecards(self.installer.pk)[0]
+        self.assertEqual(summary['offered'], 4)
+        self.assertEqual(summary['acceptance_rate'], 0.5)
+        self.assertEqual(summary['rejection_rate'], 0.25)
+        self.assertEqual(summary['completion_rate'], 0.5)
+        self.assertLess(summary['median_accept_seconds'], 3600)
+        self.assertEqual(InstallationEventService.median([0, 0, 0, 0, 0, 1]), 5400)
+
+        InstallerScorecard.objects.update(accepted=0, accept_seconds=[])
+        stdout = io.StringIO()
+        call_command('rebuild_scorecards', stdout=stdout)
+        self.assertIn('Rebuilt 1 scorecard(s)', stdout.getvalue())
+        rebuilt = InstallationEventService.get_scorecards(self.installer.pk)[0]
+        self.assertEqual({**rebuilt, 'updated_at': None}, {**summary, 'updated_at': None})
+
+    def test_scorecard_endpoint(self):
+        self.move(self.offer(), 'ACCEPTED')
+        self.offer(self.other_installer)
+        url = reverse('installer_scorecards')
+        self.client.force_login(self.admin)
+
+        scorecards = self.client.get(url).json()['scorecards']
+        self.assertEqual([row['username'] for row in scorecards], ['events-installer', 'events-installer-2'])
+        self.assertIsNone(scorecards[1]['acceptance_rate'])
+        response = self.client.get(url, {'installer': self.installer.pk})
+        self.assertEqual([row['acceptance_rate'] for row in response.json()['scorecards']], [1.0])
+
+        self.assertEqual(self.client.get(url, {'installer': 'me'}).status_code, 400)
+        self.client.force_login(self.installer)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_auto_assign_prefers_accepting_installers(self):
+        from .views.installation_views import auto_assign_installers
+
+        self.move(self.offer(), 'REJECTED')
+        self.move(self.offer(self.other_installer), 'ACCEPTED')
+        installation = Installation(customer=self.customer, charger_model=self.charger_model)
+        candidates = {self.installer.pk, self.other_installer.pk}
+        with mock.patch('accounts.views.installation_views.get_installer_candidates', return_value=candidates):
+            for _ in range(5):
+                self.assertEqual(auto_assign_installers([installation]), [self.other_installer])
+
+
+class InstallationTransitionTests(TestCase):
+    """
+    A transition is one conditional UPDATE: of two callers holding the same
+    pending job only the first wins, expired offers cannot be answered,
+    and the winner records the event and moves the rollup count.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.charger_model = ChargerModel.objects.create(
+            manufacturer='ABB', model_name='ABB Terra AC 22', power_rating_kw='22.00', connector_type='Type 2',
+        )
+        cls.installer = CustomUser.objects.create_user('transition-installer', password='x', role='2')
+        cls.customer = Customer.objects.create(
+            name='Transition Customer', email='transition@example.com', address='1 Jalan Ujian',
+            city='Shah Alam', state='Selangor', house_type='L', postcode='40000',
+        )
+
+    def setUp(self):
+        self.installation = Installation.objects.create(
+            customer=self.customer, charger_model=self.charger_model, status='PENDING_ACCEPTANCE',
+            assigned_installer=self.installer, assignment_expires_at=timezone.now() + datetime.timedelta(hours=24),
+            notes='Original notes',
+        )
+
+    def load(self):
+        return Installation.objects.select_related('customer').get(pk=self.installation.pk)
+
+    def test_only_first_transition_wins(self):
+        first, second = self.load(), self.load()
+        first.notes = 'Edited in memory'
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(InstallationTransitionService.transition(first, 'ACCEPTED', actor=self.installer))
+        update = next(query['sql'] for query in queries if query['sql'].startswith('UPDATE "accounts_installation"'))
+        self.assertNotIn('notes', update)
+        self.assertEqual(first.status, 'ACCEPTED')
+        self.assertIsNone(first.assignment_expires_at)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertFalse(InstallationTransitionService.transition(second, 'REJECTED', actor=self.installer))
+        statements = [query['sql'] for query in queries if 'SAVEPOINT' not in query['sql']]
+        self.assertEqual(len(statements), 1)
+
+        saved = Installation.objects.get(pk=self.installation.pk)
+        self.assertEqual((saved.status, saved.notes), ('ACCEPTED', 'Original notes'))
+        self.assertEqual(
+            list(saved.status_events.values_list('to_status', 'actor_id')),
+            [('PENDING_ACCEPTANCE', None), ('ACCEPTED', self.installer.pk)],
+        )
+        self.assertEqual(
+            InstallationDailyStats.objects.exclude(count=0).get().status, 'ACCEPTED',
+        )
+        self.assertEqual(InstallerScorecard.objects.get(installer=self.installer).accepted, 1)
+
+        with self.assertRaises(ValueError):
+            InstallationTransitionService.transition(first, 'EXPIRED')
+
+    def test_every_status_is_declared(self):
+        statuses = {status for status, _ in Installation.STATUS_CHOICES}
+        self.assertEqual(set(InstallationTransitionService.TRANSITIONS), statuses)
+        for targets in InstallationTransitionService.TRANSITIONS.values():
+            self.assertLessEqual(set(targets), statuses)
+
+    def test_offer_new_only_for_unsaved(self):
+        with self.assertRaises(ValueError):
+            InstallationTransitionService.offer_new(self.load())
+
+    def test_expired_offer(self):
+        Installation.objects.filter(pk=self.installation.pk).update(
+            assignment_expires_at=timezone.now() - datetime.timedelta(minutes=1),
+        )
+        self.assertFalse(InstallationTransitionService.transition(self.load(), 'ACCEPTED'))
+
+        stdout = io.StringIO()
+        call_command('expire_offers', stdout=stdout)
+        self.assertIn('Expired 1 offer(s)', stdout.getvalue())
+        self.assertEqual(self.load().status, 'EXPIRED')
+        self.assertEqual(InstallerScorecard.objects.get(installer=self.installer).expired, 1)
+
+    def test_installer_response_view(self):
+        self.client.force_login(self.installer)
+        url = reverse('handle_installation_response', args=[self.installation.installation_id, 'accept'])
+
+        response = self.client.post(url, follow=False)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.load().status, 'ACCEPTED')
+
+        reject_url = reverse('handle_installation_response', args=[self.installation.installation_id, 'reject'])
+        self.client.post(reject_url)
+        self.assertEqual(self.load().status, 'ACCEPTED')
+        self.assertEqual(self.installation.status_events.filter(to_status='ACCEPTED').count(), 1)
+
+
+class InstallerDirectoryTests(TestCase):
+    """
+    The directory fragment is cached per cleaned filters and page, carries
+    only those filters in its links, and is invalidated once changes commit.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_user('directory-admin', password='x', role='1')
+        for number in range(2):
+            user = CustomUser.objects.create_user(f'directory-installer-{number}', password='x', role='2')
+            InstallerProfile.objects.create(user=user, company_name=f'Directory Co {number}', is_st_registered=True)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def test_filters_drop_unknown_values(self):
+        params = QueryDict('region=Central+2&st=1&cidb=maybe&license_class=ZZ&utm_source=mail&page=2')
+        self.assertEqual(InstallerDirectoryService.get_filters(params), {'region': 'Central 2', 'st': '1'})
+
+    def test_cached_links_carry_only_clean_filters(self):
+        url = reverse('installer_list')
+        with mock.patch.object(InstallerDirectoryService, 'PAGE_SIZE', 1):
+            first = self.client.get(url, {'st': '1', 'utm_source': 'mail', 'cidb': 'maybe'}).content.decode()
+            second = self.client.get(url, {'st': '1'}).content.decode()
+        self.assertRegex(first, r'href="\?st=1&(amp;)?page=2"')
+        self.assertNotIn('utm_source', first)
+        self.assertEqual(first.count('Directory Co'), 1)
+        self.assertRegex(second, r'href="\?st=1&(amp;)?page=2"')
+
+    def test_invalidated_after_commit(self):
+        url = reverse('installer_list')
+        self.assertContains(self.client.get(url), 'Directory Co 0')
+        version = InstallerDirectoryService.get_cache_version()
+
+        profile = InstallerProfile.objects.get(company_name='Directory Co 0')
+        profile.company_name = 'Renamed Co'
+        with self.captureOnCommitCallbacks() as callbacks:
+            profile.save()
+            self.assertEqual(InstallerDirectoryService.get_cache_version(), version)
+        for callback in callbacks:
+            callback()
+        self.assertGreater(InstallerDirectoryService.get_cache_version(), version)
+        self.assertContains(self.client.get(url), 'Renamed Co')
+
+
+class ReferenceDataTests(TestCase):
+    """
+    Reference tables load once per process, reload once a change commits,
+    and are never older than MAX_AGE when the invalidation does not reach
+    this process.
+    """
+
+    def setUp(self):
+        cache.clear()
+        reference_data.invalidate()
+        State.objects.create(code='Central 2', name='Central 2 (Selangor)')
+
+    def codes(self):
+        return [state.code for state in reference_data.all('states')]
+
+    def test_served_from_memory(self):
+        self.assertEqual(self.codes(), ['Central 2'])
+        with self.assertNumQueries(0):
+            self.assertEqual(reference_data.state_by_code('Central 2').name, 'Central 2 (Selangor)')
+            self.assertIsNone(reference_data.get('states', 'not-a-pk'))
+
+    def test_reloaded_after_commit(self):
+        self.codes()
+        with self.captureOnCommitCallbacks() as callbacks:
+            State.objects.create(code='Southern', name='Southern (Johor)')
+            self.assertEqual(self.codes(), ['Central 2'])
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.codes(), ['Central 2', 'Southern'])
+
+    def test_max_age_bounds_staleness(self):
+        self.codes()
+        # bulk_create sends no signals, like a change made by another worker
+        # whose invalidation only reached its own LocMemCache
+        State.objects.bulk_create([State(code='Northern', name='Northern (Penang)')])
+        self.assertEqual(self.codes(), ['Central 2'])
+        later = time.monotonic() + reference_data.MAX_AGE + 1
+        with mock.patch('accounts.reference_data.time.monotonic', return_value=later):
+            self.assertEqual(self.codes(), ['Central 2', 'Northern'])
+
+
+class AutocompleteTests(TestCase):
+    """
+    The FTS5 triggers keep the search index in step with inserts, updates
+    and deletes, and the endpoints are admin-only and return the documented
+    result shape.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_user('search-admin', password='x', role='1')
+        cls.installer = CustomUser.objects.create_user('voltworks', password='x', role='2')
+        cls.profile = InstallerProfile.objects.create(user=cls.installer, company_name='Volt Works')
+        cls.customer = Customer.objects.create(
+            name='Aminah Rahman', email='aminah@example.com', address='1 Jalan Ujian',
+            city='Shah Alam', state='Selangor', house_type='L', postcode='40000',
+        )
+        cls.charger_model = ChargerModel.objects.create(
+            manufacturer='ABB', model_name='Terra AC 22', power_rating_kw='22.00', connector_type='Type 2',
+        )
+
+    def ids(self, search, term):
+        return [row['id'] for row in search(term)]
+
+    def test_customer_index_follows_writes(self):
+        search = AutocompleteService.search_customers
+        self.assertEqual(self.ids(search, 'ami'), [self.customer.pk])
+
+        Customer.objects.filter(pk=self.customer.pk).update(name='Siti Rahman', email='siti@example.com')
+        self.assertEqual(self.ids(search, 'ami'), [])
+        self.assertEqual(self.ids(search, 'siti rah'), [self.customer.pk])
+
+        self.customer.delete()
+        self.assertEqual(self.ids(search, 'siti'), [])
+
+    def test_charger_model_index_follows_writes(self):
+        search = AutocompleteService.search_charger_models
+        self.assertEqual(search('terra'), [{'id': self.charger_model.pk, 'text': str(self.charger_model)}])
+        ChargerModel.objects.filter(pk=self.charger_model.pk).update(manufacturer='Wallbox')
+        self.assertEqual(self.ids(search, 'abb'), [])
+        self.assertEqual(self.ids(search, 'wallb'), [self.charger_model.pk])
+
+    def test_installer_index_follows_users_and_profiles(self):
+        search = AutocompleteService.search_installers
+        self.assertEqual(self.ids(search, 'volt works'), [self.installer.pk])
+
+        InstallerProfile.objects.filter(pk=self.profile.pk).update(company_name='Spark Co')
+        self.assertEqual(self.ids(search, 'spark'), [self.installer.pk])
+        self.profile.delete()
+        self.assertEqual(self.ids(search, 'spark'), [])
+
+        CustomUser.objects.filter(pk=self.installer.pk).update(role='1')
+        self.assertEqual(self.ids(search, 'voltw'), [])
+        other = CustomUser.objects.create_user('gridline', password='x', role='2')
+        self.assertEqual(self.ids(search, 'grid'), [other.pk])
+
+    def test_endpoints(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('installer_autocomplete'), {'q': 'volt'})
+        self.assertEqual(response.json(), {'results': [{
+            'id': self.installer.pk, 'profile_id': self.profile.pk, 'username': 'voltworks',
+            'company_name': 'Volt Works', 'text': 'Volt Works (voltworks)',
+        }]})
+
+        results = self.client.get(reverse('customer_autocomplete'), {'q': 'aminah', 'limit': '500'}).json()['results']
+        self.assertEqual([row['id'] for row in results], [self.customer.pk])
+        self.assertEqual(results[0]['text'], 'Aminah Rahman <aminah@example.com>')
+        self.assertEqual(results[0]['state'], 'Selangor')
+
+        response = self.client.get(reverse('charger_model_autocomplete'), {'q': ''})
+        self.assertEqual(response.json(), {'results': []})
+
+        self.client.force_login(self.installer)
+        for name in ('installer_autocomplete', 'customer_autocomplete', 'charger_model_autocomplete'):
+            self.assertEqual(self.client.get(reverse(name), {'q': 'a'}).status_code, 403)
+        self.client.logout()
+        self.assertNotEqual(self.client.get(reverse('customer_autocomplete'), {'q': 'a'}).status_code, 200)
+
+
+class InstallerRegionIndexTests(TestCase):
+    """
+    Incremental updates leave the region index equal to a fresh build, an
+    evicted version stamp still reaches every copy, and creating an
+    installation with nobody to assign reports an error.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.central = State.objects.create(code='Central 2', name='Central 2 (Selangor)')
+        cls.southern = State.objects.create(code='Southern', name='Southern (Johor)')
+        cls.charger_model = ChargerModel.objects.create(
+            manufacturer='ABB', model_name='ABB Terra AC 22', power_rating_kw='22.00', connector_type='Type 2',
+        )
+
+    def setUp(self):
+        cache.clear()
+        reference_data.invalidate()
+        installer_region_index.invalidate()
+
+    def create_installer(self, username, *states):
+        user = CustomUser.objects.create_user(username, password='x', role='2')
+        profile = InstallerProfile.objects.create(user=user, company_name=username)
+        profile.operational_states.add(*states)
+        return user, profile
+
+    def snapshot(self, index):
+        return (
+            {code: list(index.candidates(code)) for code in ('Central 2', 'Southern')},
+            list(index.all_installers()),
+        )
+
+    def assertMatchesRebuild(self):
+        self.assertEqual(self.snapshot(installer_region_index), self.snapshot(InstallerRegionIndex()))
+
+    def test_incremental_updates_match_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first, first_profile = self.create_installer('region-first', self.central)
+        self.snapshot(installer_region_index)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second, second_profile = self.create_installer('region-second', self.central, self.southern)
+        self.assertMatchesRebuild()
+        self.assertEqual(list(installer_region_index.candidates('Southern')), [second.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first_profile.operational_states.add(self.southern)
+            second_profile.operational_states.remove(self.central)
+        self.assertMatchesRebuild()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.southern.installerprofile_set.clear()
+        self.assertMatchesRebuild()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.role = '1'
+            first.save()
+            second_profile.delete()
+        self.assertMatchesRebuild()
+        self.assertEqual(self.snapshot(installer_region_index), ({'Central 2': [], 'Southern': []}, [second.pk]))
+
+    def test_evicted_version_reaches_other_copies(self):
+        self.assertEqual(list(installer_region_index.all_installers()), [])
+        cache.delete(InstallerRegionIndex.CACHE_VERSION_KEY)
+
+        # Another process adds an installer after the stamp was evicted
+        user, _ = self.create_installer('region-late')
+        InstallerRegionIndex().add_installer(user.pk)
+        self.assertEqual(list(installer_region_index.all_installers()), [user.pk])
+
+    def test_unbuilt_index_publishes_only_role_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            user, profile = self.create_installer('region-unbuilt', self.central)
+        installer_region_index.invalidate()
+        version = cache.get(InstallerRegionIndex.CACHE_VERSION_KEY)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.first_name = 'Renamed'
+            user.save()
+            profile.company_name = 'Renamed Sdn Bhd'
+            profile.save()
+        self.assertEqual(cache.get(InstallerRegionIndex.CACHE_VERSION_KEY), version)
+
+        # Other processes still hear about a role change
+        other = InstallerRegionIndex()
+        self.assertEqual(list(other.all_installers()), [user.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            user.role = '1'
+            user.save()
+        self.assertNotEqual(cache.get(InstallerRegionIndex.CACHE_VERSION_KEY), version)
+        self.assertEqual(list(other.all_installers()), [])
+
+    def test_create_without_installers(self):
+        admin = CustomUser.objects.create_user('region-admin', password='x', role='1')
+        self.client.force_login(admin)
+        response = self.client.post(reverse('create_installation'), {
+            'customer_name': 'Nobody Nearby', 'customer_email': 'nobody@example.com',
+            'address': '1 Jalan Ujian', 'city': 'Shah Alam', 'state': 'Selangor', 'house_type': 'L',
+            'postcode': '40000', 'charger_model': self.charger_model.pk,
+        })
+        self.assertContains(response, 'No installers are available for auto-assignment.')
+        self.assertFalse(Installation.objects.exists())
+
+    def test_create_offers_through_transition_service(self):
+        admin = CustomUser.objects.create_user('region-admin', password='x', role='1')
+        with self.captureOnCommitCallbacks(execute=True):
+            installer, _ = self.create_installer('region-nearby', self.central)
+        self.client.force_login(admin)
+        with mock.patch.object(InstallationTransitionService, 'OFFER_HOURS', 2):
+            self.client.post(reverse('create_installation'), {
+                'customer_name': 'Someone Nearby', 'customer_email': 'nearby@example.com',
+                'address': '1 Jalan Ujian', 'city': 'Shah Alam', 'state': 'Selangor', 'house_type': 'L',
+                'postcode': '40000', 'charger_model': self.charger_model.pk,
+            })
+        installation = Installation.objects.get()
+        self.assertEqual((installation.status, installation.assigned_installer), ('PENDING_ACCEPTANCE', installer))
+        offered_for = installation.assignment_expires_at - installation.created_at
+        self.assertAlmostEqual(offered_for.total_seconds(), 2 * 3600, delta=60)
+
+
+class InstallationIndexTests(TestCase):
+    """
+    The status GROUP BY and per-installer status counts read an index
+    instead of scanning the table and sorting in a temp B-tree.
+    """
+
+    def test_status_queries_use_indexes(self):
+        plans = [
+            Installation.objects.values('status').annotate(count=Count('status')).order_by().explain(),
+            Installation.objects.filter(status='COMPLETED').values('pk').explain(),
+            Installation.objects.filter(installer_id=1, status='COMPLETED').values('pk').explain(),
+        ]
+        for plan in plans:
+            self.assertIn('USING', plan)
+            self.assertNotIn('TEMP B-TREE', plan)
+        self.assertIn('status', plans[0])
+
+
+def repeated_query_view(request):
+    for _ in range(3):
+        list(State.objects.filter(code='Central 2'))
+    return HttpResponse('ok')
+
+
+def repeated_query_from_string_view(request):
+    # Frames of code compiled from a string ('<string>') are skipped
+    exec(compile("for _ in range(3): list(State.objects.all())", '<string>', 'exec'), {'State': State})
+    return HttpResponse('ok')
+
+
+class RequestInstrumentationTests(TestCase):
+    """
+    Every response gets Server-Timing; sampled requests log a JSON line
+    naming the project call site of repeated statements.
+    """
+
+    def run_middleware(self, view, **config):
+        with override_settings(REQUEST_INSTRUMENTATION={'SAMPLE_RATE': 0.0, **config}):
+            middleware = RequestInstrumentationMiddleware(view)
+        return middleware(RequestFactory().get('/instrumented/'))
+
+    def test_server_timing_without_log(self):
+        with self.assertNoLogs('accounts.instrumentation'):
+            response = self.run_middleware(repeated_query_view)
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('desc="3 queries"', response['Server-Timing'])
+
+    def test_sampled_log_names_call_site(self):
+        with self.assertLogs('accounts.instrumentation', 'INFO') as logs:
+            self.run_middleware(repeated_query_view, SAMPLE_RATE=1.0)
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertEqual((entry['event'], entry['path'], entry['queries']), ('request_metrics', '/instrumented/', 3))
+        [duplicate] = entry['duplicates']
+        self.assertEqual(duplicate['count'], 3)
+        self.assertRegex(duplicate['call_site'], r'^accounts/tests\.py:\d+ in repeated_query_view$')
+
+    def test_call_site_skips_string_frames(self):
+        with self.assertLogs('accounts.instrumentation', 'INFO') as logs:
+            self.run_middleware(repeated_query_from_string_view, SAMPLE_RATE=1.0)
+        [duplicate] = json.loads(logs.records[0].getMessage())['duplicates']
+        self.assertRegex(duplicate['call_site'], r'^accounts/tests\.py:\d+ in repeated_query_from_string_view$')
+
+    def test_slow_requests_always_logged(self):
+        with self.assertLogs('accounts.instrumentation', 'INFO'):
+            self.run_middleware(repeated_query_view, SLOW_REQUEST_MS=0)
+
+
+class NotificationSocketTests(TestCase):
+    """
+    Only admin sockets join the admins group; the load test refuses to touch
+    the database unless told it may.
+    """
+
+    def connect(self, user):
+        from channels.testing import WebsocketCommunicator
+
+        async def run():
+            communicator = WebsocketCommunicator(AdminNotificationConsumer.as_asgi(), '/ws/admin/notifications/')
+            communicator.scope['user'] = user
+            connected, _ = await communicator.connect()
+            await get_channel_layer().group_send(
+                ADMINS_GROUP, {'type': 'send_notification', 'message': 'hello', 'timestamp': 'now'},
+            )
+            received = not await communicator.receive_nothing(timeout=0.2)
+            await communicator.disconnect()
+            return connected, received
+
+        return async_to_sync(run)()
+
+    def test_admin_receives_broadcasts(self):
+        admin = CustomUser.objects.create_user('socket-admin', password='x', role='1')
+        self.assertEqual(self.connect(admin), (True, True))
+
+    def test_installer_connects_without_broadcasts(self):
+        installer = CustomUser.objects.create_user('socket-installer', password='x', role='2')
+        self.assertEqual(self.connect(installer), (True, False))
+
+    def test_loadtest_requires_allow_writes(self):
+        with self.assertRaisesMessage(CommandError, '--allow-writes'):
+            call_command('ws_loadtest', stdout=io.StringIO())
+        self.assertFalse(CustomUser.objects.filter(username__startswith='wsload-').exists())
+
+
+class SQLiteTuningTests(SimpleTestCase):
+    """
+    New SQLite connections get the SQLITE_TUNING pragmas; sqlite_maintenance
+    checkpoints the WAL.
+    """
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = os.path.join(directory, 'tuning.sqlite3')
+        self.wrapper = SQLiteDatabaseWrapper({**connection.settings_dict, 'NAME': self.path}, alias='tuning')
+        self.addCleanup(self.wrapper.close)
+
+    def pragma(self, name):
+        with self.wrapper.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def write_rows(self, count):
+        with self.wrapper.cursor() as cursor:
+            cursor.execute('CREATE TABLE IF NOT EXISTS rows (value TEXT)')
+            cursor.executemany('INSERT INTO rows VALUES (%s)', [('x' * 500,)] * count)
+
+    def test_new_connection_gets_pragmas(self):
+        self.assertEqual(self.pragma('journal_mode'), 'wal')
+        self.assertEqual(self.pragma('busy_timeout'), 5000)
+        self.assertEqual(self.pragma('synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma('mmap_size'), 134217728)
+        self.assertEqual(self.pragma('cache_size'), -20000)
+
+    def test_tuning_can_be_disabled(self):
+        with override_settings(SQLITE_TUNING={'ENABLED': False}):
+            self.assertEqual(self.pragma('journal_mode'), 'delete')
+            self.assertEqual(self.pragma('mmap_size'), 0)
+
+    def test_periodic_maintenance_once_per_interval(self):
+        self.assertTrue(maintenance_due('interval-test', 3600))
+        self.assertFalse(maintenance_due('interval-test', 3600))
+        self.assertTrue(maintenance_due('interval-test', 0))
+        self.assertFalse(maintenance_due('interval-test', None))
+
+    def test_maintenance_command_truncates_wal(self):
+        self.write_rows(200)
+        self.assertGreater(os.path.getsize(f'{self.path}-wal'), 0)
+        stdout = io.StringIO()
+        with mock.patch('accounts.management.commands.sqlite_maintenance.connections', {'default': self.wrapper}):
+            call_command('sqlite_maintenance', stdout=stdout)
+        self.assertRegex(stdout.getvalue(), r'Checkpointed (\d+) of \1 WAL pages \(journal_mode=wal\)')
+        self.assertEqual(os.path.getsize(f'{self.path}-wal'), 0)
+
+    def test_maintenance_command_rejects_other_databases(self):
+        other = mock.Mock(vendor='postgresql')
+        with mock.patch('accounts.management.commands.sqlite_maintenance.connections', {'default': other}):
+            with self.assertRaisesMessage(CommandError, 'only applies to SQLite'):
+                call_command('sqlite_maintenance', stdout=io.StringIO())
+
+
+class BatchWriterTests(TransactionTestCase):
+    """
+    Queued rows are inserted in one batch after commit; a bad row fails
+    only its own caller.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user('queue-user', password='x', role='1')
+        self.writer = BatchWriter()
+        self.addCleanup(self.writer.shutdown)
+
+    def notification(self, message='queued'):
+        return Notification(user=self.user, message=message)
+
+    @override_settings(WRITE_QUEUE={'MAX_DELAY_MS': 500})
+    def test_burst_is_one_batch(self):
+        futures = [self.writer.enqueue(self.notification(f'row {n}')) for n in range(3)]
+        self.writer.flush(timeout=5)
+        self.assertEqual((self.writer.batches_written, self.writer.rows_written), (1, 3))
+        self.assertTrue(all(future.result(0)[0].pk for future in futures))
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 3)
+
+    def test_rows_wait_for_commit(self):
+        with transaction.atomic():
+            future = self.writer.enqueue(self.notification())
+            self.assertFalse(future.done())
+        self.writer.flush(timeout=5)
+        self.assertTrue(future.result(0)[0].pk)
+
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            dropped = self.writer.enqueue(self.notification('rolled back'))
+            raise RuntimeError
+        self.writer.flush(timeout=5)
+        self.assertFalse(dropped.done())
+        self.assertFalse(Notification.objects.filter(message='rolled back').exists())
+
+    @override_settings(WRITE_QUEUE={'MAX_DELAY_MS': 500})
+    def test_bad_row_falls_back_per_item(self):
+        good = self.writer.enqueue(self.notification('good'))
+        bad = self.writer.enqueue(self.notification(None))
+        also_good = self.writer.enqueue(self.notification('also good'))
+        with self.assertLogs('accounts.write_queue', 'ERROR'):
+            self.writer.flush(timeout=5)
+        self.assertIsNotNone(bad.exception(0))
+        self.assertEqual([good.result(0)[0].message, also_good.result(0)[0].message], ['good', 'also good'])
+        self.assertEqual(
+            sorted(Notification.objects.filter(user=self.user).values_list('message', flat=True)),
+            ['also good', 'good'],
+        )
+
+    @override_settings(WRITE_QUEUE={'MAX_DELAY_MS': 500})
+    def test_shutdown_drains_queue(self):
+        future = self.writer.enqueue(self.notification())
+        self.writer.shutdown(timeout=5)
+        self.assertIsNone(self.writer._thread)
+        self.assertTrue(future.result(0)[0].pk)
+
+    @override_settings(WRITE_QUEUE={'ENABLED': False})
+    def test_disabled_writes_inline(self):
+        future = self.writer.enqueue(self.notification())
+        self.assertTrue(future.result(0)[0].pk)
+        self.assertIsNone(self.writer._thread)
+
+    def test_rejects_models_not_listed(self):
+        with self.assertRaises(ValueError):
+            self.writer.enqueue(Task(title='not append-only'))
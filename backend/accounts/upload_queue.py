@@ -0,0 +1,226 @@
+# accounts/upload_queue.py
+"""
+Background upload of installer certificates.
+
+Saving a certificate FileField straight to S3 keeps the profile edit
+request waiting for every PUT (plus boto's existence checks). Instead the
+view stages each file on local disk with stage_certificate() and answers
+immediately; a small thread pool pushes staged files to the field's storage,
+retrying with backoff, and sets them on the profile once they land.
+Pending files are recorded as CertificateUpload rows, which the profile
+pages show, and which `manage.py process_uploads` picks up again after a
+restart or repeated failures.
+
+The pool writes through the field's storage (STORAGES['default']), so it
+runs unchanged against a local S3 stand-in such as MinIO or moto server by
+pointing that storage's endpoint_url at it.
+"""
+import contextlib
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files import File
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import CertificateUpload, InstallerProfile
+
+logger = logging.getLogger(__name__)
+
+# Defaults for settings.UPLOAD_QUEUE
+DEFAULT_UPLOAD_QUEUE = {
+    'ENABLED': True,
+    'STAGING_DIR': None,     # Defaults to MEDIA_ROOT/upload-staging
+    'WORKERS': 4,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_DELAY': 2,        # Seconds before the first retry, doubled after each failure
+}
+
+
+def get_upload_settings():
+    return {**DEFAULT_UPLOAD_QUEUE, **getattr(settings, 'UPLOAD_QUEUE', {})}
+
+
+def get_staging_dir():
+    staging_dir = get_upload_settings()['STAGING_DIR'] or os.path.join(settings.MEDIA_ROOT, 'upload-staging')
+    os.makedirs(staging_dir, exist_ok=True)
+    return str(staging_dir)
+
+
+def remove_staged_file(path):
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+
+
+def stage_certificate(profile, field_name, uploaded_file):
+    """
+    Copy an uploaded certificate to local staging and queue it for storage.
+
+    A certificate that is still pending for the same field is replaced.
+
+    Args:
+        profile: The InstallerProfile the certificate belongs to
+        field_name (str): One of InstallerProfile.CERTIFICATE_FIELDS
+        uploaded_file: The UploadedFile from request.FILES
+
+    Returns:
+        CertificateUpload: The pending upload
+    """
+    if field_name not in InstallerProfile.CERTIFICATE_FIELDS:
+        raise ValueError(f"{field_name!r} is not a certificate field.")
+
+    extension = os.path.splitext(uploaded_file.name)[1]
+    staged_path = os.path.join(get_staging_dir(), f'{uuid.uuid4().hex}{extension}')
+    with open(staged_path, 'wb') as staged:
+        for chunk in uploaded_file.chunks():
+            staged.write(chunk)
+    return queue_staged_certificate(profile, field_name, staged_path, uploaded_file.name)
+
+
+def queue_staged_certificate(profile, field_name, staged_path, original_name):
+    """
+    Queue a certificate that is already on local disk for storage. The
+    queue owns the staged file from here on and removes it when done.
+
+    Returns:
+        CertificateUpload: The pending upload
+    """
+    if field_name not in InstallerProfile.CERTIFICATE_FIELDS:
+        remove_staged_file(staged_path)
+        raise ValueError(f"{field_name!r} is not a certificate field.")
+
+    try:
+        with transaction.atomic():
+            for previous in CertificateUpload.objects.filter(profile=profile, field_name=field_name):
+                previous.delete()
+                transaction.on_commit(lambda path=previous.staged_path: remove_staged_file(path))
+            upload = CertificateUpload.objects.create(
+                profile=profile,
+                field_name=field_name,
+                original_name=os.path.basename(original_name),
+                staged_path=staged_path,
+            )
+    except Exception:
+        remove_staged_file(staged_path)
+        raise
+
+    transaction.on_commit(lambda: upload_pool.submit(upload.pk))
+    return upload
+
+
+class UploadPool:
+    """
+    Worker threads that move staged certificates into storage.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def submit(self, upload_id):
+        """
+        Queue a pending upload for a worker.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=get_upload_settings()['WORKERS'], thread_name_prefix='certificate-upload',
+                )
+            return self._executor.submit(self._run, upload_id)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _after_fork(self):
+        # A forked worker does not inherit the parent's threads
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _run(self, upload_id):
+        close_old_connections()
+        try:
+            return self.process(upload_id)
+        except Exception:  # Keep the worker alive; the row stays for process_uploads
+            logger.exception("Certificate upload %s failed", upload_id)
+            return False
+        finally:
+            close_old_connections()
+
+    # -----------------------------------------------
+    # Processing
+    # -----------------------------------------------
+    def process(self, upload_id):
+        """
+        Upload one staged certificate, retrying with backoff, and set it on
+        the profile. Runs synchronously; workers and process_uploads call it.
+
+        Args:
+            upload_id (int): CertificateUpload primary key
+
+        Returns:
+            bool: True if the certificate landed on the profile
+        """
+        # Claim the row so a certificate is never uploaded by two workers
+        claimed = CertificateUpload.objects.filter(
+            pk=upload_id, status__in=['pending', 'failed'],
+        ).update(status='uploading', updated_at=timezone.now())
+        if not claimed:
+            return False
+        upload = CertificateUpload.objects.select_related('profile').get(pk=upload_id)
+
+        config = get_upload_settings()
+        while True:
+            try:
+                name = self._store(upload)
+                break
+            except Exception as exc:
+                upload.attempts += 1
+                failed = upload.attempts >= config['MAX_ATTEMPTS']
+                logger.warning(
+                    "Certificate upload %s failed (attempt %s of %s): %s",
+                    upload.pk, upload.attempts, config['MAX_ATTEMPTS'], exc,
+                )
+                still_queued = CertificateUpload.objects.filter(pk=upload.pk, status='uploading').update(
+                    attempts=upload.attempts, last_error=str(exc), status='failed' if failed else 'uploading',
+                    updated_at=timezone.now(),
+                )
+                if failed or not still_queued:
+                    return False
+                time.sleep(config['RETRY_DELAY'] * 2 ** (upload.attempts - 1))
+
+        return self._finish(upload, name)
+
+    @staticmethod
+    def _store(upload):
+        profile = upload.profile
+        field = profile._meta.get_field(upload.field_name)
+        # upload_to_cert names the file after the field currently holding it
+        setattr(profile, upload.field_name, upload.original_name)
+        name = field.generate_filename(profile, upload.original_name)
+        with open(upload.staged_path, 'rb') as staged:
+            return field.storage.save(name, File(staged, name=upload.original_name), max_length=field.max_length)
+
+    @staticmethod
+    def _finish(upload, name):
+        with transaction.atomic():
+            # A newer upload of the same certificate deleted this row; it wins
+            if not CertificateUpload.objects.filter(pk=upload.pk, status='uploading').delete()[0]:
+                return False
+            profile = InstallerProfile.objects.select_for_update().get(pk=upload.profile_id)
+            setattr(profile, upload.field_name, name)
+            profile.save(update_fields=[upload.field_name])
+        remove_staged_file(upload.staged_path)
+        return True
+
+
+upload_pool = UploadPool()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=upload_pool._after_fork)
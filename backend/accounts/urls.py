@@ -1,43 +1,71 @@
 from django.urls import path
-from . import views
-from .views import ProfileDetailView, ProfileUpdateView
+from .views import (
+    admin_views,
+    auth_views,
+    autocomplete_views,
+    installation_views,
+    installer_views,
+    media_views,
+    report_views,
+    test_views,
+    upload_views,
+)
 
 urlpatterns = [
-    path('login/', views.login_view, name='login'),
-    path('register/admin/', views.admin_register_view, name='admin_register'),
-    path('register_installer/', views.installer_register, name='installer_register'),
-    path('logout/', views.logout_view, name='logout'),
+    path('login/', auth_views.login_view, name='login'),
+    path('register/admin/', auth_views.admin_register_view, name='admin_register'),
+    path('register_installer/', auth_views.installer_register, name='installer_register'),
+    path('logout/', auth_views.logout_view, name='logout'),
 
     # Dashboards
-    path('admin_dashboard/', views.dashboard_view, name='admin_dashboard'),
-    path('installer_dashboard/', views.installer_dashboard_view, name='installer_dashboard'),
-    path('company-profile/', ProfileDetailView.as_view(), name='company_profile'),
-    path('company-profile/edit/', ProfileUpdateView.as_view(), name='edit_company_profile'),
+    path('admin_dashboard/', admin_views.dashboard_view, name='admin_dashboard'),
+    path('installer_dashboard/', installer_views.installer_dashboard_view, name='installer_dashboard'),
+    path('company-profile/', installer_views.ProfileDetailView.as_view(), name='company_profile'),
+    path('company-profile/edit/', installer_views.ProfileUpdateView.as_view(), name='edit_company_profile'),
 
     # Installer List (Admin only)
-    path('admin/installers/', views.installer_list_view, name='installer_list'),
-    path('installations/', views.installation_page_view, name='installation_page_view'),
-    path('installations/create/', views.create_installation_view, name='create_installation'),
-    path('admin/installations/', views.installation_list_view, name='installation_list'),
+    path('admin/installers/', admin_views.installer_list_view, name='installer_list'),
+    path('installations/', installation_views.installation_page_view, name='installation_page_view'),
+    path('installations/create/', installation_views.create_installation_view, name='create_installation'),
+    path('admin/installations/', installation_views.installation_list_view, name='installation_list'),
+
+    # Autocomplete (Admin only)
+    path('autocomplete/installers/', autocomplete_views.installer_autocomplete_view, name='installer_autocomplete'),
+    path('autocomplete/customers/', autocomplete_views.customer_autocomplete_view, name='customer_autocomplete'),
+    path('autocomplete/charger-models/', autocomplete_views.charger_model_autocomplete_view, name='charger_model_autocomplete'),
+
+    # 📈 Reporting chart data (Admin only)
+    path('reports/installations/daily/', report_views.installation_daily_stats_view, name='installation_daily_stats'),
+    path('reports/installers/scorecards/', report_views.installer_scorecards_view, name='installer_scorecards'),
+
     # Task CRUD
-    path('task/add/', views.add_task, name='add_task'),
-    path('task/<int:pk>/', views.task_detail, name='task_detail'),
-    path('task/edit/<int:pk>/', views.edit_task, name='edit_task'),
-    path('task/delete/<int:pk>/', views.delete_task, name='delete_task'),
-    path('task/<int:task_id>/update-status/', views.update_task_status_view, name='update_task_status'),
+    path('task/add/', admin_views.add_task, name='add_task'),
+    path('task/<int:pk>/', admin_views.task_detail, name='task_detail'),
+    path('task/edit/<int:pk>/', admin_views.edit_task, name='edit_task'),
+    path('task/delete/<int:pk>/', admin_views.delete_task, name='delete_task'),
+    path('task/<int:task_id>/update-status/', admin_views.update_task_status_view, name='update_task_status'),
 
     # TEST
-    path('upload/', views.upload_file, name='upload_file'),
+    path('upload/', test_views.upload_file, name='upload_file'),
+
+    # 📎 Certificates & task documents (served from the local media cache)
+    path('media-proxy/<path:name>', media_views.media_proxy_view, name='media_proxy'),
+    path('media-preview/<path:name>', media_views.media_preview_view, name='media_preview'),
+
+    # 📦 Resumable chunked uploads
+    path('uploads/', upload_views.upload_session_create_view, name='upload_session_create'),
+    path('uploads/<uuid:session_id>/', upload_views.upload_session_view, name='upload_session'),
+    path('uploads/<uuid:session_id>/finalize/', upload_views.upload_session_finalize_view, name='upload_session_finalize'),
     
     # 🔔 Notification URLs (Admin only)
-    path('notifications/', views.notification_list_view, name='admin_notifications'),
-    path('notifications/page/', views.notifications_page_view, name='notifications_page'),
-    path('notifications/<int:notification_id>/mark-read/', views.mark_notification_read_view, name='mark_notification_read'),
-    path('notifications/mark-all-read/', views.mark_all_notifications_read_view, name='mark_all_notifications_read'),
-    path('notifications/<int:notification_id>/delete/', views.delete_notification_view, name='delete_notification'),
-    path('notifications/clear/', views.clear_notifications_view, name='clear_notifications'),
+    path('notifications/', admin_views.notification_list_view, name='admin_notifications'),
+    path('notifications/page/', admin_views.notifications_page_view, name='notifications_page'),
+    path('notifications/<int:notification_id>/mark-read/', admin_views.mark_notification_read_view, name='mark_notification_read'),
+    path('notifications/mark-all-read/', admin_views.mark_all_notifications_read_view, name='mark_all_notifications_read'),
+    path('notifications/<int:notification_id>/delete/', admin_views.delete_notification_view, name='delete_notification'),
+    path('notifications/clear/', admin_views.clear_notifications_view, name='clear_notifications'),
 
     # Catch-all installation detail routes MUST be last
-    path('<str:installation_id>/', views.installation_detail, name='installation_detail'),
-    path('<str:installation_id>/<str:action>/', views.handle_installation_response, name='handle_installation_response'),
+    path('<str:installation_id>/', installation_views.installation_detail, name='installation_detail'),
+    path('<str:installation_id>/<str:action>/', installation_views.handle_installation_response, name='handle_installation_response'),
 ]
@@ -0,0 +1,716 @@
+# accounts/utility_css.py
+"""
+Offline compiler for the Tailwind CSS utility classes used by the templates.
+
+The pages used to load the Tailwind CDN script, which downloads a compiler
+and generates the stylesheet in the browser on every page load. This module
+produces the same CSS at build time, in Python, for exactly the classes the
+project uses: `manage.py build_assets` (accounts/asset_build.py) feeds it
+the class names found in the templates, scripts and forms.
+
+It follows Tailwind v3's default theme and class syntax: the spacing, size
+and color scales, `/50` opacity modifiers, `[...]` arbitrary values, `-`
+negative values, `!` important, and the variants the templates use
+(hover:, focus:, last:, group-hover:, peer-checked:, peer-focus:, after:,
+file:, dark: and the sm:/md:/lg:/xl:/2xl: breakpoints). Names it does not
+know, such as the project's own classes, generate nothing; `unsupported()`
+lists the ones that look like Tailwind utilities, so a class the compiler
+cannot build is reported by `build_assets` instead of silently unstyled.
+"""
+import re
+
+# -----------------------------------------------
+# Theme (Tailwind v3 defaults)
+# -----------------------------------------------
+SPACING = {
+    '0': '0px', 'px': '1px', '0.5': '0.125rem', '1': '0.25rem', '1.5': '0.375rem', '2': '0.5rem',
+    '2.5': '0.625rem', '3': '0.75rem', '3.5': '0.875rem', '4': '1rem', '5': '1.25rem', '6': '1.5rem',
+    '7': '1.75rem', '8': '2rem', '9': '2.25rem', '10': '2.5rem', '11': '2.75rem', '12': '3rem',
+    '14': '3.5rem', '16': '4rem', '20': '5rem', '24': '6rem', '28': '7rem', '32': '8rem', '36': '9rem',
+    '40': '10rem', '44': '11rem', '48': '12rem', '52': '13rem', '56': '14rem', '60': '15rem',
+    '64': '16rem', '72': '18rem', '80': '20rem', '96': '24rem',
+}
+
+SCREENS = {'sm': '640px', 'md': '768px', 'lg': '1024px', 'xl': '1280px', '2xl': '1536px'}
+
+PALETTE = {
+    'slate': ('#f8fafc #f1f5f9 #e2e8f0 #cbd5e1 #94a3b8 #64748b #475569 #334155 #1e293b #0f172a #020617'),
+    'gray': ('#f9fafb #f3f4f6 #e5e7eb #d1d5db #9ca3af #6b7280 #4b5563 #374151 #1f2937 #111827 #030712'),
+    'zinc': ('#fafafa #f4f4f5 #e4e4e7 #d4d4d8 #a1a1aa #71717a #52525b #3f3f46 #27272a #18181b #09090b'),
+    'neutral': ('#fafafa #f5f5f5 #e5e5e5 #d4d4d4 #a3a3a3 #737373 #525252 #404040 #262626 #171717 #0a0a0a'),
+    'stone': ('#fafaf9 #f5f5f4 #e7e5e4 #d6d3d1 #a8a29e #78716c #57534e #44403c #292524 #1c1917 #0c0a09'),
+    'red': ('#fef2f2 #fee2e2 #fecaca #fca5a5 #f87171 #ef4444 #dc2626 #b91c1c #991b1b #7f1d1d #450a0a'),
+    'orange': ('#fff7ed #ffedd5 #fed7aa #fdba74 #fb923c #f97316 #ea580c #c2410c #9a3412 #7c2d12 #431407'),
+    'amber': ('#fffbeb #fef3c7 #fde68a #fcd34d #fbbf24 #f59e0b #d97706 #b45309 #92400e #78350f #451a03'),
+    'yellow': ('#fefce8 #fef9c3 #fef08a #fde047 #facc15 #eab308 #ca8a04 #a16207 #854d0e #713f12 #422006'),
+    'lime': ('#f7fee7 #ecfccb #d9f99d #bef264 #a3e635 #84cc16 #65a30d #4d7c0f #3f6212 #365314 #1a2e05'),
+    'green': ('#f0fdf4 #dcfce7 #bbf7d0 #86efac #4ade80 #22c55e #16a34a #15803d #166534 #14532d #052e16'),
+    'emerald': ('#ecfdf5 #d1fae5 #a7f3d0 #6ee7b7 #34d399 #10b981 #059669 #047857 #065f46 #064e3b #022c22'),
+    'teal': ('#f0fdfa #ccfbf1 #99f6e4 #5eead4 #2dd4bf #14b8a6 #0d9488 #0f766e #115e59 #134e4a #042f2e'),
+    'cyan': ('#ecfeff #cffafe #a5f3fc #67e8f9 #22d3ee #06b6d4 #0891b2 #0e7490 #155e75 #164e63 #083344'),
+    'sky': ('#f0f9ff #e0f2fe #bae6fd #7dd3fc #38bdf8 #0ea5e9 #0284c7 #0369a1 #075985 #0c4a6e #082f49'),
+    'blue': ('#eff6ff #dbeafe #bfdbfe #93c5fd #60a5fa #3b82f6 #2563eb #1d4ed8 #1e40af #1e3a8a #172554'),
+    'indigo': ('#eef2ff #e0e7ff #c7d2fe #a5b4fc #818cf8 #6366f1 #4f46e5 #4338ca #3730a3 #312e81 #1e1b4b'),
+    'violet': ('#f5f3ff #ede9fe #ddd6fe #c4b5fd #a78bfa #8b5cf6 #7c3aed #6d28d9 #5b21b6 #4c1d95 #2e1065'),
+    'purple': ('#faf5ff #f3e8ff #e9d5ff #d8b4fe #c084fc #a855f7 #9333ea #7e22ce #6b21a8 #581c87 #3b0764'),
+    'fuchsia': ('#fdf4ff #fae8ff #f5d0fe #f0abfc #e879f9 #d946ef #c026d3 #a21caf #86198f #701a75 #4a044e'),
+    'pink': ('#fdf2f8 #fce7f3 #fbcfe8 #f9a8d4 #f472b6 #ec4899 #db2777 #be185d #9d174d #831843 #500724'),
+    'rose': ('#fff1f2 #ffe4e6 #fecdd3 #fda4af #fb7185 #f43f5e #e11d48 #be123c #9f1239 #881337 #4c0519'),
+}
+SHADES = ('50', '100', '200', '300', '400', '500', '600', '700', '800', '900', '950')
+
+COLORS = {'white': '#ffffff', 'black': '#000000'}
+for _family, _values in PALETTE.items():
+    COLORS.update({f'{_family}-{shade}': value for shade, value in zip(SHADES, _values.split())})
+KEYWORD_COLORS = {'transparent': 'transparent', 'current': 'currentColor', 'inherit': 'inherit'}
+
+FONT_SIZES = {
+    'xs': ('0.75rem', '1rem'), 'sm': ('0.875rem', '1.25rem'), 'base': ('1rem', '1.5rem'),
+    'lg': ('1.125rem', '1.75rem'), 'xl': ('1.25rem', '1.75rem'), '2xl': ('1.5rem', '2rem'),
+    '3xl': ('1.875rem', '2.25rem'), '4xl': ('2.25rem', '2.5rem'), '5xl': ('3rem', '1'),
+    '6xl': ('3.75rem', '1'), '7xl': ('4.5rem', '1'), '8xl': ('6rem', '1'), '9xl': ('8rem', '1'),
+}
+FONT_WEIGHTS = {
+    'thin': '100', 'extralight': '200', 'light': '300', 'normal': '400', 'medium': '500',
+    'semibold': '600', 'bold': '700', 'extrabold': '800', 'black': '900',
+}
+FONT_FAMILIES = {
+    'sans': 'ui-sans-serif, system-ui, sans-serif, "Apple Color Emoji", "Segoe UI Emoji", "Segoe UI Symbol", "Noto Color Emoji"',
+    'serif': 'ui-serif, Georgia, Cambria, "Times New Roman", Times, serif',
+    'mono': 'ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace',
+}
+LINE_HEIGHTS = {
+    'none': '1', 'tight': '1.25', 'snug': '1.375', 'normal': '1.5', 'relaxed': '1.625', 'loose': '2',
+    **{str(n): f'{n * 0.25:g}rem' for n in range(3, 11)},
+}
+LETTER_SPACING = {
+    'tighter': '-0.05em', 'tight': '-0.025em', 'normal': '0em', 'wide': '0.025em', 'wider': '0.05em', 'widest': '0.1em',
+}
+RADII = {
+    'none': '0px', 'sm': '0.125rem', '': '0.25rem', 'md': '0.375rem', 'lg': '0.5rem', 'xl': '0.75rem',
+    '2xl': '1rem', '3xl': '1.5rem', 'full': '9999px',
+}
+MAX_WIDTHS = {
+    'none': 'none', 'xs': '20rem', 'sm': '24rem', 'md': '28rem', 'lg': '32rem', 'xl': '36rem', '2xl': '42rem',
+    '3xl': '48rem', '4xl': '56rem', '5xl': '64rem', '6xl': '72rem', '7xl': '80rem', 'full': '100%',
+    'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content', 'prose': '65ch',
+    **{f'screen-{name}': width for name, width in SCREENS.items()},
+}
+SHADOWS = {
+    'sm': '0 1px 2px 0 rgb(0 0 0 / 0.05)',
+    '': '0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)',
+    'md': '0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)',
+    'lg': '0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)',
+    'xl': '0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)',
+    '2xl': '0 25px 50px -12px rgb(0 0 0 / 0.25)',
+    'inner': 'inset 0 2px 4px 0 rgb(0 0 0 / 0.05)',
+    'none': '0 0 #0000',
+}
+BORDER_WIDTHS = {'': '1px', '0': '0px', '2': '2px', '4': '4px', '8': '8px'}
+RING_WIDTHS = {'': '3px', '0': '0px', '1': '1px', '2': '2px', '4': '4px', '8': '8px'}
+OPACITIES = {str(n): f'{n / 100:g}' for n in (0, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 80, 85, 90, 95, 100)}
+DURATIONS = {str(n): f'{n}ms' for n in (0, 75, 100, 150, 200, 300, 500, 700, 1000)}
+EASINGS = {
+    'linear': 'linear', 'in': 'cubic-bezier(0.4, 0, 1, 1)', 'out': 'cubic-bezier(0, 0, 0.2, 1)',
+    'in-out': 'cubic-bezier(0.4, 0, 0.2, 1)',
+}
+Z_INDEX = {str(n): str(n) for n in (0, 10, 20, 30, 40, 50)} | {'auto': 'auto'}
+
+TRANSITIONS = {
+    '': 'color, background-color, border-color, text-decoration-color, fill, stroke, opacity, box-shadow, transform, filter, backdrop-filter',
+    'all': 'all',
+    'colors': 'color, background-color, border-color, text-decoration-color, fill, stroke',
+    'opacity': 'opacity',
+    'shadow': 'box-shadow',
+    'transform': 'transform',
+}
+TRANSFORM = (
+    'translate(var(--tw-translate-x), var(--tw-translate-y)) rotate(var(--tw-rotate)) '
+    'skewX(var(--tw-skew-x)) skewY(var(--tw-skew-y)) scaleX(var(--tw-scale-x)) scaleY(var(--tw-scale-y))'
+)
+BOX_SHADOW = 'var(--tw-ring-offset-shadow, 0 0 #0000), var(--tw-ring-shadow, 0 0 #0000), var(--tw-shadow)'
+CHILDREN = ' > :not([hidden]) ~ :not([hidden])'
+
+# Utilities without a value, in output order within their group
+STATIC = {
+    'sr-only': [
+        ('position', 'absolute'), ('width', '1px'), ('height', '1px'), ('padding', '0'), ('margin', '-1px'),
+        ('overflow', 'hidden'), ('clip', 'rect(0, 0, 0, 0)'), ('white-space', 'nowrap'), ('border-width', '0'),
+    ],
+    'pointer-events-none': [('pointer-events', 'none')],
+    'pointer-events-auto': [('pointer-events', 'auto')],
+    'visible': [('visibility', 'visible')],
+    'invisible': [('visibility', 'hidden')],
+    'static': [('position', 'static')],
+    'fixed': [('position', 'fixed')],
+    'absolute': [('position', 'absolute')],
+    'relative': [('position', 'relative')],
+    'sticky': [('position', 'sticky')],
+    'block': [('display', 'block')],
+    'inline-block': [('display', 'inline-block')],
+    'inline': [('display', 'inline')],
+    'flex': [('display', 'flex')],
+    'inline-flex': [('display', 'inline-flex')],
+    'table': [('display', 'table')],
+    'grid': [('display', 'grid')],
+    'contents': [('display', 'contents')],
+    'hidden': [('display', 'none')],
+    'flex-1': [('flex', '1 1 0%')],
+    'flex-auto': [('flex', '1 1 auto')],
+    'flex-none': [('flex', 'none')],
+    'shrink-0': [('flex-shrink', '0')],
+    'flex-shrink-0': [('flex-shrink', '0')],
+    'grow': [('flex-grow', '1')],
+    'flex-grow': [('flex-grow', '1')],
+    'cursor-pointer': [('cursor', 'pointer')],
+    'cursor-not-allowed': [('cursor', 'not-allowed')],
+    'resize-none': [('resize', 'none')],
+    'resize-y': [('resize', 'vertical')],
+    'list-none': [('list-style-type', 'none')],
+    'list-disc': [('list-style-type', 'disc')],
+    'flex-row': [('flex-direction', 'row')],
+    'flex-col': [('flex-direction', 'column')],
+    'flex-wrap': [('flex-wrap', 'wrap')],
+    'items-start': [('align-items', 'flex-start')],
+    'items-end': [('align-items', 'flex-end')],
+    'items-center': [('align-items', 'center')],
+    'items-baseline': [('align-items', 'baseline')],
+    'items-stretch': [('align-items', 'stretch')],
+    'justify-start': [('justify-content', 'flex-start')],
+    'justify-end': [('justify-content', 'flex-end')],
+    'justify-center': [('justify-content', 'center')],
+    'justify-between': [('justify-content', 'space-between')],
+    'justify-around': [('justify-content', 'space-around')],
+    'self-start': [('align-self', 'flex-start')],
+    'self-center': [('align-self', 'center')],
+    'overflow-auto': [('overflow', 'auto')],
+    'overflow-hidden': [('overflow', 'hidden')],
+    'overflow-x-auto': [('overflow-x', 'auto')],
+    'overflow-y-auto': [('overflow-y', 'auto')],
+    'overflow-x-hidden': [('overflow-x', 'hidden')],
+    'overflow-y-hidden': [('overflow-y', 'hidden')],
+    'truncate': [('overflow', 'hidden'), ('text-overflow', 'ellipsis'), ('white-space', 'nowrap')],
+    'whitespace-normal': [('white-space', 'normal')],
+    'whitespace-nowrap': [('white-space', 'nowrap')],
+    'whitespace-pre': [('white-space', 'pre')],
+    'whitespace-pre-line': [('white-space', 'pre-line')],
+    'whitespace-pre-wrap': [('white-space', 'pre-wrap')],
+    'break-normal': [('overflow-wrap', 'normal'), ('word-break', 'normal')],
+    'break-words': [('overflow-wrap', 'break-word')],
+    'break-all': [('word-break', 'break-all')],
+    'border-solid': [('border-style', 'solid')],
+    'border-dashed': [('border-style', 'dashed')],
+    'border-dotted': [('border-style', 'dotted')],
+    'border-none': [('border-style', 'none')],
+    'object-cover': [('object-fit', 'cover')],
+    'object-contain': [('object-fit', 'contain')],
+    'text-left': [('text-align', 'left')],
+    'text-center': [('text-align', 'center')],
+    'text-right': [('text-align', 'right')],
+    'text-justify': [('text-align', 'justify')],
+    'align-top': [('vertical-align', 'top')],
+    'align-middle': [('vertical-align', 'middle')],
+    'align-bottom': [('vertical-align', 'bottom')],
+    'uppercase': [('text-transform', 'uppercase')],
+    'lowercase': [('text-transform', 'lowercase')],
+    'capitalize': [('text-transform', 'capitalize')],
+    'normal-case': [('text-transform', 'none')],
+    'italic': [('font-style', 'italic')],
+    'not-italic': [('font-style', 'normal')],
+    'underline': [('text-decoration-line', 'underline')],
+    'line-through': [('text-decoration-line', 'line-through')],
+    'no-underline': [('text-decoration-line', 'none')],
+    'antialiased': [('-webkit-font-smoothing', 'antialiased'), ('-moz-osx-font-smoothing', 'grayscale')],
+    'outline-none': [('outline', '2px solid transparent'), ('outline-offset', '2px')],
+    'ring-inset': [('--tw-ring-inset', 'inset')],
+    'transform': [('transform', TRANSFORM)],
+}
+
+# Output order of the utility groups, after Tailwind's core plugin order, so
+# that e.g. `p-4 px-6` gives px-6 precedence on the x axis as it does there
+ORDER = [
+    'container', 'sr-only', 'pointer-events', 'visibility', 'position', 'inset', 'inset-x', 'inset-y',
+    'start', 'end', 'top', 'right', 'bottom', 'left', 'z', 'order', 'col-span', 'col-start', 'row-span',
+    'float', 'm', 'mx', 'my', 'mt', 'mr', 'mb', 'ml', 'box', 'line-clamp', 'display', 'aspect', 'h', 'max-h', 'min-h',
+    'w', 'min-w', 'max-w', 'flex', 'shrink', 'grow', 'basis', 'transform', 'translate-x', 'translate-y', 'rotate',
+    'scale', 'animation', 'cursor', 'resize', 'list', 'grid-cols', 'grid-rows', 'flex-direction', 'flex-wrap',
+    'place', 'content', 'items', 'justify', 'gap', 'gap-x', 'gap-y', 'space-x', 'space-y', 'divide-x',
+    'divide-y', 'divide-style', 'divide-color', 'self', 'overflow', 'truncate', 'whitespace', 'break',
+    'rounded', 'rounded-t', 'rounded-r', 'rounded-b', 'rounded-l', 'rounded-tl', 'rounded-tr', 'rounded-br',
+    'rounded-bl', 'border', 'border-x', 'border-y', 'border-t', 'border-r', 'border-b', 'border-l',
+    'border-style', 'border-color', 'bg', 'object', 'p', 'px', 'py', 'pt', 'pr', 'pb', 'pl', 'text-align',
+    'align', 'font-family', 'font-size', 'font-weight', 'text-transform', 'font-style', 'leading', 'tracking',
+    'text-color', 'decoration', 'smoothing', 'placeholder', 'opacity', 'shadow', 'outline', 'ring', 'ring-color',
+    'ring-opacity', 'ring-offset', 'ring-offset-color', 'transition', 'duration', 'ease', 'delay', 'content-value',
+]
+STATIC_GROUPS = {
+    'sr-only': 'sr-only', 'pointer-events': 'pointer-events', 'visible': 'visibility', 'invisible': 'visibility',
+    'static': 'position', 'fixed': 'position', 'absolute': 'position', 'relative': 'position', 'sticky': 'position',
+    'flex-1': 'flex', 'flex-auto': 'flex', 'flex-none': 'flex', 'shrink': 'shrink', 'flex-shrink': 'shrink',
+    'grow': 'grow', 'flex-grow': 'grow', 'cursor': 'cursor', 'resize': 'resize', 'list': 'list',
+    'flex-row': 'flex-direction', 'flex-col': 'flex-direction', 'flex-wrap': 'flex-wrap', 'items': 'items',
+    'justify': 'justify', 'self': 'self', 'overflow': 'overflow', 'truncate': 'truncate',
+    'whitespace': 'whitespace', 'break': 'break', 'border-solid': 'border-style', 'border-dashed': 'border-style',
+    'border-dotted': 'border-style', 'border-none': 'border-style', 'object': 'object', 'text': 'text-align',
+    'align': 'align', 'uppercase': 'text-transform', 'lowercase': 'text-transform',
+    'capitalize': 'text-transform', 'normal-case': 'text-transform', 'italic': 'font-style',
+    'not-italic': 'font-style', 'underline': 'decoration', 'line-through': 'decoration',
+    'no-underline': 'decoration', 'antialiased': 'smoothing', 'outline': 'outline', 'ring-inset': 'ring',
+    'transform': 'transform',
+}
+DISPLAY = {'block', 'inline-block', 'inline', 'flex', 'inline-flex', 'table', 'grid', 'contents', 'hidden'}
+
+# Variants: rank (output order) and how each rewrites the rule
+PSEUDO_CLASSES = {
+    'first': ':first-child', 'last': ':last-child', 'odd': ':nth-child(odd)', 'even': ':nth-child(even)',
+    'checked': ':checked', 'focus-within': ':focus-within', 'hover': ':hover', 'focus': ':focus',
+    'focus-visible': ':focus-visible', 'active': ':active', 'disabled': ':disabled',
+}
+PSEUDO_ELEMENTS = {
+    'before': '::before', 'after': '::after', 'placeholder': '::placeholder', 'file': '::file-selector-button',
+}
+# Pseudo-elements that take user-action states after them (`hover:file:`)
+STATEFUL_PSEUDO_ELEMENTS = {'::file-selector-button'}
+VARIANT_RANKS = {
+    **{name: 1 for name in PSEUDO_ELEMENTS},
+    **{name: 2 + index for index, name in enumerate(PSEUDO_CLASSES)},
+    'group': 20, 'peer': 21, 'dark': 30,
+    **{name: 40 + index for index, name in enumerate(SCREENS)},
+}
+
+CANDIDATE = re.compile(r"[!\w:./#%-]*\[[^\]\s<>\"`]+\][\w./%-]*|[!\w:./#%-]+")
+
+
+def extract_candidates(text):
+    """
+    Every token of `text` that could be a class name, the way Tailwind scans
+    content files: attributes, scripts and Python strings alike.
+    """
+    return set(CANDIDATE.findall(text))
+
+
+def escape_class(name):
+    return re.sub(r'([^a-zA-Z0-9_-])', r'\\\1', name)
+
+
+# -----------------------------------------------
+# Values
+# -----------------------------------------------
+def arbitrary(value):
+    """
+    The CSS value of an `[...]` arbitrary value: underscores are spaces and
+    operators in calc() get the spaces CSS requires.
+    """
+    if not (value.startswith('[') and value.endswith(']')) or len(value) < 3:
+        return None
+    value = value[1:-1].replace('_', ' ')
+    return re.sub(
+        r'calc\((.*)\)',
+        lambda match: 'calc(' + re.sub(r'(?<=[\w)%])([+*/-])(?=[\w(.])', r' \1 ', match.group(1)) + ')',
+        value,
+    )
+
+
+def spacing(value, negative=False, extra=None):
+    result = arbitrary(value)
+    if result is None:
+        if extra and value in extra:
+            result = extra[value]
+        elif value in SPACING:
+            result = SPACING[value]
+        elif re.fullmatch(r'\d+/\d+', value):
+            numerator, denominator = map(int, value.split('/'))
+            result = f'{numerator / denominator * 100:g}%'
+        else:
+            return None
+    if negative:
+        result = f'calc({result} * -1)'
+    return result
+
+
+def color(value):
+    """
+    Returns:
+        tuple: (CSS color, hex or None), honouring a `/NN` opacity modifier
+    """
+    value, _, alpha = value.partition('/')
+    if value in KEYWORD_COLORS and not alpha:
+        return KEYWORD_COLORS[value], None
+    hex_value = COLORS.get(value)
+    if hex_value is None:
+        raw = arbitrary(value)
+        if raw is None or not re.fullmatch(r'#[0-9a-fA-F]{3}|#[0-9a-fA-F]{6}', raw):
+            return (raw, None) if raw is not None and not alpha and not raw[0].isdigit() else (None, None)
+        hex_value = raw
+    if not alpha:
+        return hex_value, hex_value
+    opacity = OPACITIES.get(alpha) or arbitrary(alpha)
+    if opacity is None:
+        return None, None
+    return f'rgb({rgb(hex_value)} / {opacity})', hex_value
+
+
+def rgb(hex_value):
+    digits = hex_value.lstrip('#')
+    if len(digits) == 3:
+        digits = ''.join(digit * 2 for digit in digits)
+    return ' '.join(str(int(digits[index:index + 2], 16)) for index in (0, 2, 4))
+
+
+# -----------------------------------------------
+# Utilities
+# -----------------------------------------------
+SPACING_PROPERTIES = {
+    'm': ['margin'], 'mx': ['margin-left', 'margin-right'], 'my': ['margin-top', 'margin-bottom'],
+    'mt': ['margin-top'], 'mr': ['margin-right'], 'mb': ['margin-bottom'], 'ml': ['margin-left'],
+    'p': ['padding'], 'px': ['padding-left', 'padding-right'], 'py': ['padding-top', 'padding-bottom'],
+    'pt': ['padding-top'], 'pr': ['padding-right'], 'pb': ['padding-bottom'], 'pl': ['padding-left'],
+    'inset': ['inset'], 'inset-x': ['left', 'right'], 'inset-y': ['top', 'bottom'],
+    'top': ['top'], 'right': ['right'], 'bottom': ['bottom'], 'left': ['left'],
+    'gap': ['gap'], 'gap-x': ['column-gap'], 'gap-y': ['row-gap'],
+}
+NEGATABLE = {'m', 'mx', 'my', 'mt', 'mr', 'mb', 'ml', 'inset', 'inset-x', 'inset-y', 'top', 'right', 'bottom',
+             'left', 'translate-x', 'translate-y', 'space-x', 'space-y'}
+SIZE_EXTRAS = {
+    'w': {'auto': 'auto', 'full': '100%', 'screen': '100vw', 'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content'},
+    'h': {'auto': 'auto', 'full': '100%', 'screen': '100vh', 'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content'},
+    'min-w': {'0': '0px', 'full': '100%', 'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content'},
+    'min-h': {'0': '0px', 'full': '100%', 'screen': '100vh', 'fit': 'fit-content'},
+    'max-h': {'none': 'none', 'full': '100%', 'screen': '100vh', 'fit': 'fit-content'},
+    'inset': {'auto': 'auto', 'full': '100%'},
+    'm': {'auto': 'auto'},
+}
+SIZE_PROPERTIES = {'w': 'width', 'h': 'height', 'min-w': 'min-width', 'min-h': 'min-height', 'max-h': 'max-height'}
+BORDER_SIDES = {
+    'border': ['border-width'], 'border-x': ['border-left-width', 'border-right-width'],
+    'border-y': ['border-top-width', 'border-bottom-width'], 'border-t': ['border-top-width'],
+    'border-r': ['border-right-width'], 'border-b': ['border-bottom-width'], 'border-l': ['border-left-width'],
+}
+RADIUS_SIDES = {
+    'rounded': ['border-radius'],
+    'rounded-t': ['border-top-left-radius', 'border-top-right-radius'],
+    'rounded-r': ['border-top-right-radius', 'border-bottom-right-radius'],
+    'rounded-b': ['border-bottom-right-radius', 'border-bottom-left-radius'],
+    'rounded-l': ['border-top-left-radius', 'border-bottom-left-radius'],
+    'rounded-tl': ['border-top-left-radius'], 'rounded-tr': ['border-top-right-radius'],
+    'rounded-br': ['border-bottom-right-radius'], 'rounded-bl': ['border-bottom-left-radius'],
+}
+
+
+def split_prefix(utility, prefixes):
+    """
+    Split `utility` into the longest matching prefix and its value.
+    """
+    for prefix in sorted(prefixes, key=len, reverse=True):
+        if utility == prefix:
+            return prefix, ''
+        if utility.startswith(prefix + '-'):
+            return prefix, utility[len(prefix) + 1:]
+    return None, None
+
+
+def resolve(utility):
+    """
+    Declarations of one utility without variants.
+
+    Returns:
+        tuple: (group, declarations, child selector suffix) or None for an unknown name
+    """
+    negative = utility.startswith('-')
+    if negative:
+        utility = utility[1:]
+
+    if not negative and utility in STATIC:
+        if utility in DISPLAY:
+            group = 'display'
+        else:
+            group = STATIC_GROUPS.get(utility) or STATIC_GROUPS.get(utility.split('-')[0]) or STATIC_GROUPS.get(
+                utility.rsplit('-', 1)[0])
+        if group is None:
+            for key, value in STATIC_GROUPS.items():
+                if utility.startswith(key):
+                    group = value
+                    break
+        return group, STATIC[utility], ''
+
+    prefix, value = split_prefix(utility, list(SPACING_PROPERTIES) + list(SIZE_PROPERTIES) + ['max-w'])
+    if prefix is not None and value and (not negative or prefix in NEGATABLE):
+        if prefix == 'max-w':
+            result = arbitrary(value) or MAX_WIDTHS.get(value)
+            return (prefix, [('max-width', result)], '') if result else None
+        if prefix in SIZE_PROPERTIES:
+            result = spacing(value, extra=SIZE_EXTRAS.get(prefix))
+            return (prefix, [(SIZE_PROPERTIES[prefix], result)], '') if result else None
+        extra = SIZE_EXTRAS.get('inset' if prefix in ('inset', 'inset-x', 'inset-y', 'top', 'right', 'bottom', 'left')
+                                else prefix[:1] if prefix.startswith('m') else prefix)
+        result = spacing(value, negative, extra)
+        return (prefix, [(prop, result) for prop in SPACING_PROPERTIES[prefix]], '') if result else None
+
+    prefix, value = split_prefix(utility, ['space-x', 'space-y'])
+    if prefix is not None:
+        result = spacing(value, negative)
+        if result is None:
+            return None
+        side = 'margin-left' if prefix == 'space-x' else 'margin-top'
+        other = 'margin-right' if prefix == 'space-x' else 'margin-bottom'
+        return prefix, [(other, '0px'), (side, result)], CHILDREN
+
+    if negative:
+        prefix, value = split_prefix(utility, ['translate-x', 'translate-y'])
+        if prefix is None:
+            return None
+        result = spacing(value, True, {'full': '100%'})
+        return (prefix, [(f'--tw-{prefix}', result), ('transform', TRANSFORM)], '') if result else None
+    return resolve_named(utility)
+
+
+def resolve_named(utility):
+    prefix, value = split_prefix(utility, ['translate-x', 'translate-y'])
+    if prefix is not None:
+        result = spacing(value, extra={'full': '100%', '1/2': '50%'})
+        return (prefix, [(f'--tw-{prefix}', result), ('transform', TRANSFORM)], '') if result else None
+
+    match = re.fullmatch(r'(col-span|grid-cols|grid-rows|z|order|line-clamp)-(.+)', utility)
+    if match:
+        prefix, value = match.groups()
+        if prefix == 'col-span':
+            if value == 'full':
+                return prefix, [('grid-column', '1 / -1')], ''
+            return (prefix, [('grid-column', f'span {value} / span {value}')], '') if value.isdigit() else None
+        if prefix in ('grid-cols', 'grid-rows'):
+            prop = 'grid-template-columns' if prefix == 'grid-cols' else 'grid-template-rows'
+            if value == 'none':
+                return prefix, [(prop, 'none')], ''
+            return (prefix, [(prop, f'repeat({value}, minmax(0, 1fr))')], '') if value.isdigit() else None
+        if prefix == 'z':
+            result = Z_INDEX.get(value) or arbitrary(value)
+            return (prefix, [('z-index', result)], '') if result else None
+        if prefix == 'order':
+            return (prefix, [('order', value)], '') if value.isdigit() else None
+        if value.isdigit():
+            return prefix, [
+                ('overflow', 'hidden'), ('display', '-webkit-box'), ('-webkit-box-orient', 'vertical'),
+                ('-webkit-line-clamp', value),
+            ], ''
+        return None
+
+    prefix, value = split_prefix(utility, list(RADIUS_SIDES))
+    if prefix is not None:
+        result = arbitrary(value) if value.startswith('[') else RADII.get(value)
+        return (prefix, [(prop, result) for prop in RADIUS_SIDES[prefix]], '') if result else None
+
+    prefix, value = split_prefix(utility, list(BORDER_SIDES))
+    if prefix is not None:
+        width = BORDER_WIDTHS.get(value)
+        if width is not None:
+            return prefix, [(prop, width) for prop in BORDER_SIDES[prefix]], ''
+        if prefix == 'border':
+            css, _ = color(value)
+            return ('border-color', [('border-color', css)], '') if css else None
+        return None
+
+    prefix, value = split_prefix(utility, ['divide-x', 'divide-y', 'divide'])
+    if prefix in ('divide-x', 'divide-y'):
+        width = BORDER_WIDTHS.get(value)
+        if width is None:
+            return None
+        if prefix == 'divide-y':
+            return prefix, [('border-top-width', width), ('border-bottom-width', '0px')], CHILDREN
+        return prefix, [('border-right-width', '0px'), ('border-left-width', width)], CHILDREN
+    if prefix == 'divide' and value:
+        css, _ = color(value)
+        return ('divide-color', [('border-color', css)], CHILDREN) if css else None
+
+    prefix, value = split_prefix(utility, ['bg', 'text', 'font', 'leading', 'tracking', 'opacity', 'shadow',
+                                           'ring-offset', 'ring-opacity', 'ring', 'transition', 'duration',
+                                           'ease', 'delay', 'content'])
+    if prefix == 'bg':
+        css, _ = color(value)
+        return ('bg', [('background-color', css)], '') if css else None
+    if prefix == 'text':
+        if value in FONT_SIZES:
+            size, line_height = FONT_SIZES[value]
+            return 'font-size', [('font-size', size), ('line-height', line_height)], ''
+        raw = arbitrary(value)
+        if raw is not None and re.match(r'[\d.]+(px|rem|em|%)$', raw):
+            return 'font-size', [('font-size', raw)], ''
+        css, _ = color(value)
+        return ('text-color', [('color', css)], '') if css else None
+    if prefix == 'font':
+        if value in FONT_WEIGHTS:
+            return 'font-weight', [('font-weight', FONT_WEIGHTS[value])], ''
+        if value in FONT_FAMILIES:
+            return 'font-family', [('font-family', FONT_FAMILIES[value])], ''
+        return None
+    if prefix == 'leading':
+        result = LINE_HEIGHTS.get(value) or arbitrary(value)
+        return (prefix, [('line-height', result)], '') if result else None
+    if prefix == 'tracking':
+        result = LETTER_SPACING.get(value) or arbitrary(value)
+        return (prefix, [('letter-spacing', result)], '') if result else None
+    if prefix == 'opacity':
+        result = OPACITIES.get(value) or arbitrary(value)
+        return (prefix, [('opacity', result)], '') if result else None
+    if prefix == 'shadow':
+        if value in SHADOWS:
+            return prefix, [('--tw-shadow', SHADOWS[value]), ('box-shadow', BOX_SHADOW)], ''
+        return None
+    if prefix == 'ring-opacity':
+        result = OPACITIES.get(value)
+        return (prefix, [('--tw-ring-opacity', result)], '') if result else None
+    if prefix == 'ring-offset':
+        if value in RING_WIDTHS and value:
+            return prefix, [('--tw-ring-offset-width', RING_WIDTHS[value])], ''
+        css, _ = color(value)
+        return ('ring-offset-color', [('--tw-ring-offset-color', css)], '') if css else None
+    if prefix == 'ring':
+        if value in RING_WIDTHS:
+            return prefix, [
+                ('--tw-ring-offset-shadow', 'var(--tw-ring-inset) 0 0 0 var(--tw-ring-offset-width) var(--tw-ring-offset-color)'),
+                ('--tw-ring-shadow', f'var(--tw-ring-inset) 0 0 0 calc({RING_WIDTHS[value]} + var(--tw-ring-offset-width)) var(--tw-ring-color)'),
+                ('box-shadow', 'var(--tw-ring-offset-shadow), var(--tw-ring-shadow), var(--tw-shadow, 0 0 #0000)'),
+            ], ''
+        css, hex_value = color(value)
+        if css is None:
+            return None
+        if hex_value and '/' not in value:
+            # Solid ring colors honour ring-opacity-*, as in Tailwind
+            return 'ring-color', [
+                ('--tw-ring-opacity', '1'), ('--tw-ring-color', f'rgb({rgb(hex_value)} / var(--tw-ring-opacity))'),
+            ], ''
+        return 'ring-color', [('--tw-ring-color', css)], ''
+    if prefix == 'transition':
+        if value not in TRANSITIONS:
+            return None
+        return prefix, [
+            ('transition-property', TRANSITIONS[value]),
+            ('transition-timing-function', 'cubic-bezier(0.4, 0, 0.2, 1)'),
+            ('transition-duration', '150ms'),
+        ], ''
+    if prefix in ('duration', 'delay'):
+        result = DURATIONS.get(value) or arbitrary(value)
+        prop = 'transition-duration' if prefix == 'duration' else 'transition-delay'
+        return (prefix, [(prop, result)], '') if result else None
+    if prefix == 'ease':
+        return (prefix, [('transition-timing-function', EASINGS[value])], '') if value in EASINGS else None
+    if prefix == 'content':
+        result = arbitrary(value) if value.startswith('[') else ('none' if value == 'none' else None)
+        return ('content-value', [('--tw-content', result), ('content', 'var(--tw-content)')], '') if result else None
+    return None
+
+
+# -----------------------------------------------
+# Rules
+# -----------------------------------------------
+def compile_class(name):
+    """
+    The CSS rule of one class name with its variants.
+
+    Returns:
+        tuple: (sort key, media query or None, CSS rule) or None for
+               names that are not Tailwind utilities
+    """
+    *variants, utility = name.split(':')
+    important = utility.startswith('!')
+    if important:
+        utility = utility[1:]
+    if not utility or any(variant not in VARIANT_RANKS and not _is_group_variant(variant) for variant in variants):
+        return None
+
+    resolved = resolve(utility)
+    if resolved is None:
+        return None
+    group, declarations, children = resolved
+    if any(value is None for _, value in declarations):
+        return None
+
+    selector = '.' + escape_class(name)
+    pseudo_element = ''
+    element_states = ''
+    media = []
+    rank = 0
+    for variant in reversed(variants):
+        if variant in PSEUDO_ELEMENTS:
+            pseudo_element = PSEUDO_ELEMENTS[variant]
+            if variant in ('before', 'after') and group != 'content-value':
+                declarations = [('content', 'var(--tw-content)')] + declarations
+        elif variant in PSEUDO_CLASSES:
+            if pseudo_element in STATEFUL_PSEUDO_ELEMENTS:
+                element_states += PSEUDO_CLASSES[variant]
+            else:
+                selector += PSEUDO_CLASSES[variant]
+        elif variant == 'dark':
+            media.append('(prefers-color-scheme: dark)')
+        elif variant in SCREENS:
+            media.append(f'(min-width: {SCREENS[variant]})')
+        else:
+            kind, _, state = variant.partition('-')
+            combinator = ' ' if kind == 'group' else ' ~ '
+            selector = f'.{kind}{PSEUDO_CLASSES[state]}{combinator}{selector}'
+        rank = max(rank, VARIANT_RANKS.get(variant) or VARIANT_RANKS[variant.partition('-')[0]])
+
+    suffix = ' !important' if important else ''
+    body = ';'.join(f'{prop}:{value}{suffix}' for prop, value in declarations)
+    rule = f'{selector}{children}{pseudo_element}{element_states}{{{body}}}'
+    key = (rank, len(variants), ORDER.index(group), name)
+    return key, ' and '.join(media) or None, rule
+
+
+def _is_group_variant(variant):
+    kind, _, state = variant.partition('-')
+    return kind in ('group', 'peer') and state in PSEUDO_CLASSES
+
+
+def generate(candidates):
+    """
+    Compile the utilities among `candidates` into one stylesheet, in
+    Tailwind's order: plain utilities, then variants, then breakpoints.
+
+    Returns:
+        tuple: (CSS text, sorted list of the class names compiled)
+    """
+    rules = []
+    for name in candidates:
+        compiled = compile_class(name)
+        if compiled is not None:
+            rules.append((compiled, name))
+    rules.sort()
+
+    lines = []
+    for (key, media, rule), _ in rules:
+        lines.append(f'@media {media}{{{rule}}}' if media else rule)
+    return '\n'.join(lines) + '\n', sorted(name for _, name in rules)
+
+
+# Value-taking utility prefixes and the theme-like values that mark a
+# candidate without variants as meant for Tailwind (`max-w-8xl`, `text-md`),
+# as opposed to prose or CSS property names (`font-size`, `top-level`)
+UTILITY_ROOTS = (
+    {name.split('-')[0] for name in [*STATIC, *SPACING_PROPERTIES, *SIZE_PROPERTIES, *BORDER_SIDES, *RADIUS_SIDES]}
+    | {'max', 'space', 'translate', 'col', 'grid', 'z', 'order', 'line', 'divide', 'bg', 'text', 'font', 'leading',
+       'tracking', 'opacity', 'shadow', 'ring', 'transition', 'duration', 'ease', 'delay', 'content'}
+)
+THEME_VALUE = re.compile(r'.*\d.*|\[.+\]|\d*(xs|sm|md|base|lg|xl)|full|screen|auto|none')
+UTILITY_SHAPE = re.compile(r'-?[a-z][a-z0-9]*(-[\w./%#]+|-\[[^\]]+\])+(/\d+)?')
+
+
+def looks_like_utility(name):
+    """
+    Whether `name` has the shape of a Tailwind utility: known variants, or
+    a known utility prefix with a theme-like value.
+    """
+    *variants, utility = name.split(':')
+    utility = utility.removeprefix('!')
+    if not UTILITY_SHAPE.fullmatch(utility) or utility.lstrip('-').split('-')[0] not in UTILITY_ROOTS:
+        return False
+    if variants:
+        return all(variant in VARIANT_RANKS or _is_group_variant(variant) for variant in variants)
+    return bool(THEME_VALUE.fullmatch(utility.rsplit('-', 1)[1]))
+
+
+def unsupported(candidates):
+    """
+    Sorted names among `candidates` that look like Tailwind utilities but
+    that `compile_class` cannot compile.
+    """
+    return sorted(name for name in candidates if looks_like_utility(name) and compile_class(name) is None)
@@ -1,30 +1,31 @@
-from .models import State
+from .reference_data import reference_data
+
+# Maps a Customer.state value to the State.code of the region serving it
+CUSTOMER_STATE_REGIONS = {
+    'Selangor': 'Central 2',
+    'Kuala Lumpur': 'Central 1',
+    'Putrajaya': 'Central 1',
+    'Perak': 'Northern',
+    'Kedah': 'Northern',
+    'Perlis': 'Northern',
+    'Penang': 'Northern',
+    'Negeri Sembilan': 'Southern',
+    'Melaka': 'Southern',
+    'Johor': 'Southern',
+    'Pahang': 'East Coast',
+    'Terengganu': 'East Coast',
+    'Kelantan': 'East Coast',
+    'Sabah': "East M'sia",
+    'Sarawak': "East M'sia",
+}
+
 
 def get_customer_state_obj(customer_state_str):
     """
     Convert a Customer.state string to the corresponding State model instance.
+    States are served from the in-process reference data registry.
     """
-    state_mapping = {
-        'Selangor': 'Central 2',
-        'Kuala Lumpur': 'Central 1',
-        'Putrajaya': 'Central 1',
-        'Perak': 'Northern',
-        'Kedah': 'Northern',
-        'Perlis': 'Northern',
-        'Penang': 'Northern',
-        'Negeri Sembilan': 'Southern',
-        'Melaka': 'Southern',
-        'Johor': 'Southern',
-        'Pahang': 'East Coast',
-        'Terengganu': 'East Coast',
-        'Kelantan': 'East Coast',
-        'Sabah': "East M'sia",
-        'Sarawak': "East M'sia",
-    }
-    state_code = state_mapping.get(customer_state_str)
+    state_code = CUSTOMER_STATE_REGIONS.get(customer_state_str)
     if not state_code:
         return None
-    try:
-        return State.objects.get(code=state_code)
-    except State.DoesNotExist:
-        return None
+    return reference_data.state_by_code(state_code)
@@ -1,11 +1,6 @@
 # views/__init__.py
 
-# This file can be left empty. Its presence indicates to Python that
-# the directory should be treated as a package, allowing for imports
-# like `from .views import auth_views`.
-
-from .auth_views import *
-from .admin_views import *
-from .installer_views import *
-from .installation_views import *
-from .test_views import *
\ No newline at end of file
+# Views are imported by module, e.g. `from .views import auth_views`;
+# accounts/urls.py references each view through its module. The package
+# deliberately re-exports nothing, so importing one view module does not
+# import (and set up the forms, services and storages of) all the others.
@@ -3,14 +3,19 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.http import HttpResponseForbidden
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.template.loader import render_to_string
+from django.utils.http import urlencode
 from functools import wraps
-from ..models import Task, Installation, Notification
+from ..models import Task, Installation, Notification, LICENSE_CLASS_CHOICES, CIDB_GRADE_CHOICES
 from ..forms import TaskForm
-
-
-# 🌱 NEW imports for Channels
+from ..services import InstallationRowCacheService, InstallationService, InstallerDirectoryService
+from ..db_router import reporting_reads
+from ..write_queue import batch_writer
+from ..previews import previews_for
+from ..template_backends import template_engine
 from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
 import datetime
 from django.contrib import messages
 
@@ -35,17 +40,42 @@ def role_required(required_role):
     return decorator
 
 
+# -----------------------------------------------
+# 🌱 Real-time notifications (Channels)
+# -----------------------------------------------
+def broadcast_to_admins(message):
+    """
+    Push `message` to the admins' notification WebSocket (accounts/consumer.py).
+    Channels is imported here, on first use, to keep it out of worker startup.
+    """
+    from channels.layers import get_channel_layer
+
+    async_to_sync(get_channel_layer().group_send)(
+        "admins",
+        {
+            "type": "send_notification",
+            "message": message,
+            "timestamp": datetime.datetime.now().strftime("%d %b %Y %H:%M"),
+        },
+    )
+
+
 # -----------------------------------------------
 # 📊 Admin Dashboard View
 # -----------------------------------------------
 @role_required('1')
+@reporting_reads()
 def dashboard_view(request):
     tasks = Task.objects.all().order_by('created_at')
 
-    total_tasks = tasks.count()
-    in_progress = tasks.filter(status="In Progress").count()
-    pending = tasks.filter(status="Pending").count()
-    completed = tasks.filter(status="Completed").count()
+    counts = tasks.aggregate(
+        total=Count('pk'),
+        in_progress=Count('pk', filter=Q(status="In Progress")),
+        pending=Count('pk', filter=Q(status="Pending")),
+        completed=Count('pk', filter=Q(status="Completed")),
+    )
+    total_tasks, in_progress = counts['total'], counts['in_progress']
+    pending, completed = counts['pending'], counts['completed']
 
     completion_rate = int((completed / total_tasks) * 100) if total_tasks > 0 else 0
     
@@ -89,31 +119,23 @@ def add_task(request):
             # 🌱 Flash message for yourself
             messages.success(request, f"✅ Task '{task.title}' added successfully!")
 
-            # 🌱 Create notifications for all admin users
-            admin_users = User.objects.filter(role='1')
-            print(f"🔔 Found {admin_users.count()} admin users")
-            
-            for admin_user in admin_users:
-                print(f"🔔 Creating notification for admin: {admin_user.username}")
-                Notification.objects.create(
-                    user=admin_user,
+            # 🌱 Create notifications for all admin users (one batched insert)
+            admin_ids = list(User.objects.filter(role='1').values_list('id', flat=True))
+            print(f"🔔 Found {len(admin_ids)} admin users")
+
+            batch_writer.enqueue(*[
+                Notification(
+                    user_id=admin_id,
                     message=f"✅ New Task Added: {task.title} by {request.user.username}",
                     priority=task.priority,
                     related_installation=None,
                     related_task=task
                 )
-                print(f"🔔 Notification created for {admin_user.username}")
+                for admin_id in admin_ids
+            ])
 
             # 🌱 Send real-time notification to all admins
-            channel_layer = get_channel_layer()
-            async_to_sync(channel_layer.group_send)(
-                "admins",  # group name
-                {
-                    "type": "send_notification",
-                    "message": f"✅ New Task Added: {task.title} by {request.user.username}",
-                    "timestamp": datetime.datetime.now().strftime("%d %b %Y %H:%M"),
-                },
-            )
+            broadcast_to_admins(f"✅ New Task Added: {task.title} by {request.user.username}")
             return redirect('admin_dashboard')
     else:
         form = TaskForm()
@@ -137,28 +159,21 @@ def edit_task(request, pk):
             old_title = task.title
             form.save()
             
-            # 🌱 Create notifications for all admin users
-            admin_users = User.objects.filter(role='1')
-            for admin_user in admin_users:
-                if admin_user != request.user:  # Don't notify yourself
-                    Notification.objects.create(
-                        user=admin_user,
-                        message=f"✏️ Task Updated: '{old_title}' by {request.user.username}",
-                        priority=task.priority,
-                        related_installation=None,
-                        related_task=task
-                    )
+            # 🌱 Create notifications for all admin users (one batched insert)
+            admin_ids = User.objects.filter(role='1').exclude(pk=request.user.pk).values_list('id', flat=True)  # Don't notify yourself
+            batch_writer.enqueue(*[
+                Notification(
+                    user_id=admin_id,
+                    message=f"✏️ Task Updated: '{old_title}' by {request.user.username}",
+                    priority=task.priority,
+                    related_installation=None,
+                    related_task=task
+                )
+                for admin_id in admin_ids
+            ])
             
             # 🌱 Send real-time notification
-            channel_layer = get_channel_layer()
-            async_to_sync(channel_layer.group_send)(
-                "admins",
-                {
-                    "type": "send_notification",
-                    "message": f"✏️ Task Updated: '{old_title}' by {request.user.username}",
-                    "timestamp": datetime.datetime.now().strftime("%d %b %Y %H:%M"),
-                },
-            )
+            broadcast_to_admins(f"✏️ Task Updated: '{old_title}' by {request.user.username}")
             
             return redirect('admin_dashboard')
     else:
@@ -168,6 +183,7 @@ def edit_task(request, pk):
         'form': form,
         'form_title': 'Edit Task',
         'submit_label': 'Update Task',
+        'upload_task_id': task.pk,  # The document can be sent in resumable chunks
     })
 
 
@@ -187,7 +203,8 @@ def delete_task(request, pk):
 def task_detail(request, pk):
     task = get_object_or_404(Task, pk=pk)
     return render(request, 'accounts/admin/task_detail.html', {
-        'task': task
+        'task': task,
+        'preview': previews_for([task.document.name]).get(task.document.name),
     })
     
     # 🌱 Create notifications for all admin users
@@ -202,15 +219,7 @@ def task_detail(request, pk):
             )
     
     # 🌱 Send real-time notification
-    channel_layer = get_channel_layer()
-    async_to_sync(channel_layer.group_send)(
-        "admins",
-        {
-            "type": "send_notification",
-            "message": f"🗑️ Task Deleted: '{task_title}' by {request.user.username}",
-            "timestamp": datetime.datetime.now().strftime("%d %b %Y %H:%M"),
-        },
-    )
+    broadcast_to_admins(f"🗑️ Task Deleted: '{task_title}' by {request.user.username}")
     
     return redirect('admin_dashboard')
 
@@ -220,16 +229,46 @@ def task_detail(request, pk):
 # -----------------------------------------------
 @role_required('1')
 def installer_list_view(request):
-    installers = User.objects.filter(role='2').select_related('installerprofile')
-    return render(request, 'accounts/admin/admin_installer_list.html', {'installers': installers})
+    filters = InstallerDirectoryService.get_filters(request.GET)
+    try:
+        page_number = max(int(request.GET.get('page', 1)), 1)
+    except (TypeError, ValueError):
+        page_number = 1
+
+    # Serve the rendered directory from cache; it is invalidated by signals
+    # whenever an installer profile, account or operational state changes.
+    # Misses read the default database (no reporting_reads): a fragment
+    # rendered from a lagging copy would outlive the invalidation.
+    cache_key = InstallerDirectoryService.get_fragment_cache_key(filters, page_number)
+    directory_html = cache.get(cache_key)
+    if directory_html is None:
+        page_obj = InstallerDirectoryService.get_page(filters, page_number)
+        directory_template = 'partials/_installer_directory.html'
+        directory_html = render_to_string(directory_template, {
+            'installers': page_obj.object_list,
+            'page_obj': page_obj,
+            'filters': filters,
+            # Built from the cleaned filters: the fragment is shared by every
+            # request with the same cache key, whatever else their URL carried
+            'query_string': urlencode(filters),
+            'region_choices': InstallerDirectoryService.get_region_choices(),
+            'license_class_choices': LICENSE_CLASS_CHOICES,
+            'cidb_grade_choices': CIDB_GRADE_CHOICES,
+        }, using=template_engine(directory_template))
+        cache.set(cache_key, directory_html, InstallerDirectoryService.CACHE_TIMEOUT)
+
+    template_name = 'accounts/admin/admin_installer_list.html'
+    return render(request, template_name, {'directory_html': directory_html}, using=template_engine(template_name))
 
 
 @role_required('1')
+@reporting_reads()
 def installation_list_view(request):
-    installations = Installation.objects.select_related('customer', 'charger_model').order_by('-created_at')
-    return render(request, 'accounts/admin/admin_installation_list.html', {
-        'installations': installations
-    })
+    installations = Installation.objects.select_related(*InstallationService.LIST_RELATED).order_by('-created_at')
+    template_name = 'accounts/admin/admin_installation_list.html'
+    return render(request, template_name, {
+        'installation_rows': InstallationRowCacheService.render_rows(installations),
+    }, using=template_engine(template_name))
 
 
 # -----------------------------------------------
@@ -258,7 +297,7 @@ def notification_list_view(request):
     if user is None:
         return JsonResponse({'notifications': [], 'unread_count': 0})
     
-    notifications = Notification.objects.filter(user=user).order_by('-created_at')
+    notifications = Notification.objects.filter(user=user).select_related('related_installation').order_by('-created_at')
     print(f"🔔 Found {notifications.count()} notifications for user")
     
     notification_data = []
@@ -270,7 +309,7 @@ def notification_list_view(request):
             'priority': notification.priority,
             'created_at': notification.created_at.strftime('%d %b %Y %H:%M'),
             'related_installation': notification.related_installation.installation_id if notification.related_installation else None,
-            'related_task': notification.related_task.id if notification.related_task else None
+            'related_task': notification.related_task_id
         })
         print(f"🔔 Notification: {notification.message}")
     
@@ -344,15 +383,17 @@ def update_task_status_view(request, task_id):
                 task.status = new_status
                 task.save()
                 
-                # Create notification about status change
-                admin_users = User.objects.filter(role='1')
-                for admin_user in admin_users:
-                    Notification.objects.create(
-                        user=admin_user,
+                # Create notification about status change (one batched insert)
+                admin_ids = User.objects.filter(role='1').values_list('id', flat=True)
+                batch_writer.enqueue(*[
+                    Notification(
+                        user_id=admin_id,
                         message=f"🔄 Task '{task.title}' status changed from {old_status} to {new_status}",
                         priority='Medium',
                         related_task=task
                     )
+                    for admin_id in admin_ids
+                ])
                 
                 return JsonResponse({
                     'status': 'success',
@@ -0,0 +1,34 @@
+# views/autocomplete_views.py
+from django.http import JsonResponse
+from ..services import AutocompleteService
+from accounts.views.admin_views import role_required
+
+
+# -----------------------------------------------
+# 🔎 Autocomplete Endpoints (Admin Only)
+# -----------------------------------------------
+def _autocomplete_response(request, search):
+    """
+    Run an AutocompleteService search for the `q` and `limit` query parameters.
+    """
+    term = request.GET.get('q', '').strip()
+    limit = AutocompleteService.clean_limit(request.GET.get('limit'))
+    return JsonResponse({'results': search(term, limit)})
+
+
+@role_required('1')
+def installer_autocomplete_view(request):
+    """Search installers by company name or username."""
+    return _autocomplete_response(request, AutocompleteService.search_installers)
+
+
+@role_required('1')
+def customer_autocomplete_view(request):
+    """Search customers by name or email."""
+    return _autocomplete_response(request, AutocompleteService.search_customers)
+
+
+@role_required('1')
+def charger_model_autocomplete_view(request):
+    """Search charger models by model name or manufacturer."""
+    return _autocomplete_response(request, AutocompleteService.search_charger_models)
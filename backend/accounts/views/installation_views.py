@@ -11,7 +11,7 @@ from django.http import JsonResponse, HttpResponseForbidden
 # Make sure these imports match the actual location of your models
 from ..models import CustomUser # Your custom user model
 # Assuming these are in 'your_app' (or wherever your Customer, ChargerModel, InstallerProfile are)
-from ..models import Customer, ChargerModel, InstallerProfile, State
+from ..models import Customer, ChargerModel, InstallerProfile
 from ..models import Installation # Your Installation model
 from ..models import Notification # Your Notification model
 from django.db import models # Needed for Q objects in installation_list
@@ -21,31 +21,42 @@ from django.db.models import Count, Q
 from ..forms import InstallationForm # Adjust this import path if your form is elsewhere
 # Import your role_required decorator
 from accounts.views.admin_views import role_required # Adjust this import path if decorator is elsewhere
+from ..utils import get_customer_state_obj, CUSTOMER_STATE_REGIONS
+from ..region_index import installer_region_index
+from ..db_router import reporting_reads
+from ..services import InstallationEventService, InstallationRowCacheService, InstallationTransitionService
+from ..template_backends import template_engine
 
+import logging
 import random
 
 # User = get_user_model() # Typically not needed if CustomUser is directly imported
 # --- END IMPORTANT IMPORTS ---
 
+logger = logging.getLogger(__name__)
+
 
 @login_required
+@reporting_reads()
 def installation_list_view(request):
     """
     Displays a list of installation jobs and status statistics based on the logged-in user's role.
     """
     # 1. Determine the base queryset of installations based on the user's role
+    # Rows show the customer, charger model and installer company
+    installations = Installation.objects.select_related('customer', 'charger_model', 'installer')
     if request.user.role == '1':  # Admin
-        installations_queryset = Installation.objects.all().order_by('-created_at')
+        installations_queryset = installations.order_by('-created_at')
         page_title = "Admin Dashboard - All Installations"
     elif request.user.role == '2':  # Installer
         try:
             installer_profile = InstallerProfile.objects.get(user=request.user)
-            installations_queryset = Installation.objects.filter(
+            installations_queryset = installations.filter(
                 Q(assigned_installer=request.user) | Q(installer=installer_profile)
             ).order_by('-created_at')
             page_title = f"Installer Dashboard - {installer_profile.company_name} Installations"
         except InstallerProfile.DoesNotExist:
-            installations_queryset = Installation.objects.filter(assigned_installer=request.user).order_by('-created_at')
+            installations_queryset = installations.filter(assigned_installer=request.user).order_by('-created_at')
             page_title = "Installer Dashboard - Your Installations (Profile Missing)"
     else:
         # Deny access for any other role
@@ -59,7 +70,7 @@ def installation_list_view(request):
 
     # 3. Prepare the final context to pass to the template
     context = {
-        'installations': installations_queryset,  # This is for the table
+        'installation_rows': InstallationRowCacheService.render_rows(installations_queryset),  # This is for the table
         'page_title': page_title,
         'total_installations': total_installations, # This is for the sidebar
         'status_counts': status_counts,
@@ -68,86 +79,86 @@ def installation_list_view(request):
 
     # Use the correct template name, which might be different for Admin/Installer
     # In your example, you're using two different templates. You will need to decide which template to render here.
-    return render(request, 'accounts/admin/admin_installation_list.html', context)
+    template_name = 'accounts/admin/admin_installation_list.html'
+    return render(request, template_name, context, using=template_engine(template_name))
 
-def get_customer_state_obj(customer_state_str):
+# --- Helper functions for automatic installer assignment ---
+def get_installer_candidates(customer_state):
     """
-    Convert a Customer.state string to the corresponding State instance
-    based on your State table.
+    Get the IDs of installer users eligible for a customer's state from the
+    in-memory region index, falling back to every installer when nobody
+    operates in that region.
     """
-    state_mapping = {
-        'Selangor': 'Central 2',
-        'Kuala Lumpur': 'Central 1',
-        'Putrajaya': 'Central 1',
-        'Perak': 'Northern',
-        'Kedah': 'Northern',
-        'Perlis': 'Northern',
-        'Penang': 'Northern',
-        'Negeri Sembilan': 'Southern',
-        'Melaka': 'Southern',
-        'Johor': 'Southern',
-        'Pahang': 'East Coast',
-        'Terengganu': 'East Coast',
-        'Kelantan': 'East Coast',
-        'Sabah': "East M'sia",
-        'Sarawak': "East M'sia",
-    }
-    state_code = state_mapping.get(customer_state_str)
-    if not state_code:
-        return None
-    try:
-        return State.objects.get(code=state_code)
-    except State.DoesNotExist:
-        return None
+    region_code = CUSTOMER_STATE_REGIONS.get(customer_state)
+    candidates = installer_region_index.candidates(region_code) if region_code else None
+    if not candidates:
+        # Fallback: pick any installer
+        candidates = installer_region_index.all_installers()
+    return candidates
 
 
-# --- Helper function for automatic installer assignment ---
-def auto_assign_installer(installation):
+def auto_assign_installers(installations):
     """
-    Automatically assign an installer based on:
+    Automatically assign installers to a batch of installations based on:
     1. Same state priority (operational_states of installer)
-    2. Fewer past jobs
-    3. Round-robin fairness among equal candidates
-    """
-    # Step 0: Get the installation's customer state object
-    state_obj = get_customer_state_obj(installation.customer.state)
-    customer_state = installation.customer.state
-    # Step 1: Filter installers who operate in this state
-    if state_obj:
-        state_installers = CustomUser.objects.filter(
-            role='2',  # '2' = Installer
-            installerprofile__operational_states=state_obj
-        ).distinct()
-    else:
-        # Fallback: pick any installer
-        state_installers = CustomUser.objects.filter(role='2').distinct()
-
-    if not state_installers.exists():
-        # Safety fallback
-        state_installers = CustomUser.objects.filter(role='2').distinct()
+    2. Fewer past jobs, counting jobs assigned earlier in the batch
+    3. Higher acceptance score from the installer scorecards
+    4. Round-robin fairness among equal candidates
 
-    # Step 2: Count past jobs per installer
-    installers_with_jobs = []
-    for installer in state_installers:
-        job_count = Installation.objects.filter(assigned_installer=installer).count()
-        installers_with_jobs.append((installer, job_count))
-
-    # Step 3: Sort ascending by number of jobs
-    installers_with_jobs.sort(key=lambda x: x[1])
-
-    # Step 4: Candidates with the least jobs
-    min_jobs = installers_with_jobs[0][1]
-    candidates = [inst for inst, jobs in installers_with_jobs if jobs == min_jobs]
-
-    # Step 5: Random choice among candidates (fairness / round-robin)
-    selected_installer = random.choice(candidates)
+    Returns:
+        list: The selected CustomUser for each installation (None if no installer exists)
+    """
+    # Step 1: Eligible installers per installation, from the region index
+    candidates_per_installation = [
+        get_installer_candidates(installation.customer.state) for installation in installations
+    ]
+    all_candidates = set().union(*candidates_per_installation)
+
+    # Step 2: Count past jobs for every candidate in one query
+    job_counts = dict(
+        Installation.objects.filter(assigned_installer_id__in=all_candidates)
+        .values('assigned_installer_id')
+        .annotate(job_count=Count('id'))
+        .values_list('assigned_installer_id', 'job_count')
+    )
+    acceptance_scores = InstallationEventService.get_acceptance_scores(all_candidates)
+
+    selected_ids = []
+    for installation, candidates in zip(installations, candidates_per_installation):
+        if not candidates:
+            selected_ids.append(None)
+            continue
+
+        # Step 3: Candidates with the least jobs
+        min_jobs = min(job_counts.get(user_id, 0) for user_id in candidates)
+        least_loaded = [user_id for user_id in candidates if job_counts.get(user_id, 0) == min_jobs]
+
+        # Step 4: Of those, the installers most likely to accept
+        best_score = max(acceptance_scores[user_id] for user_id in least_loaded)
+        most_reliable = [user_id for user_id in least_loaded if acceptance_scores[user_id] == best_score]
+
+        # Step 5: Random choice among candidates (fairness / round-robin)
+        selected_id = random.choice(most_reliable)
+        job_counts[selected_id] = job_counts.get(selected_id, 0) + 1
+        selected_ids.append(selected_id)
+
+        logger.debug(
+            "Auto-assigned installer %s to installation %s (state %s, %d candidates, least jobs %d)",
+            selected_id, installation.installation_id, installation.customer.state, len(candidates), min_jobs,
+        )
+
+    users = CustomUser.objects.select_related('installerprofile').in_bulk(
+        [user_id for user_id in selected_ids if user_id is not None]
+    )
+    return [users.get(user_id) for user_id in selected_ids]
 
-    print(f"[DEBUG] Auto-assign installer for Installation {installation.installation_id}")
-    print(f"        Customer state: {customer_state}")
-    print(f"        Candidate installers & past jobs: {[ (i.username,j) for i,j in installers_with_jobs ]}")
-    print(f"        Chosen installer: {selected_installer.username}")
 
-    return selected_installer
+def auto_assign_installer(installation):
+    """
+    Automatically assign an installer to a single installation.
+    See auto_assign_installers for the selection rules.
+    """
+    return auto_assign_installers([installation])[0]
 
 
 # --- Main view ---
@@ -182,8 +193,7 @@ def create_installation_view(request):
                             {'form': form}
                         )
 
-                    installation.status = 'PENDING_ACCEPTANCE'
-                    installation.assignment_expires_at = timezone.now() + timezone.timedelta(hours=24)
+                    InstallationTransitionService.offer_new(installation)
 
                     if installer_profile and not assigned_user:
                         installation.assigned_installer = installer_profile.user
@@ -195,9 +205,10 @@ def create_installation_view(request):
                 else:
                     # AUTO ASSIGN installer
                     selected_installer = auto_assign_installer(installation)
+                    if selected_installer is None:
+                        raise ValueError("No installers are available for auto-assignment.")
                     installation.assigned_installer = selected_installer
-                    installation.status = 'PENDING_ACCEPTANCE'
-                    installation.assignment_expires_at = timezone.now() + timezone.timedelta(hours=24)
+                    InstallationTransitionService.offer_new(installation)
 
                     # Attach installer_profile if exists
                     try:
@@ -243,7 +254,10 @@ def installation_detail(request, installation_id):
     Displays the detailed information for a single installation job.
     Includes comprehensive permission checks.
     """
-    installation = get_object_or_404(Installation, installation_id=installation_id)
+    installation = get_object_or_404(
+        Installation.objects.select_related('customer', 'charger_model', 'assigned_installer', 'installer__user'),
+        installation_id=installation_id,
+    )
 
     # Permission Checks:
     # 1. Allow if the user is an Admin
@@ -278,7 +292,9 @@ def handle_installation_response(request, installation_id, action):
     """
     Handles an installer's acceptance or rejection of an installation job.
     """
-    installation = get_object_or_404(Installation, installation_id=installation_id)
+    installation = get_object_or_404(
+        Installation.objects.select_related('customer', 'installer'), installation_id=installation_id,
+    )
 
     # --- Security checks ---
     is_assigned_to_user = (installation.assigned_installer == request.user)
@@ -292,15 +308,19 @@ def handle_installation_response(request, installation_id, action):
         return redirect(request.META.get('HTTP_REFERER', 'installation_list'))
 
     if request.method == 'POST':
+        # Conditional update: a double submit or an expired offer loses
+        # instead of overwriting the status
         if action == 'accept':
-            installation.status = 'ACCEPTED'
-            installation.save()
-            messages.success(request, "Job accepted successfully!")
-            
+            if InstallationTransitionService.transition(installation, 'ACCEPTED', actor=request.user):
+                messages.success(request, "Job accepted successfully!")
+            else:
+                messages.error(request, "This job was already answered or its offer has expired.")
+
         elif action == 'reject':
-            installation.status = 'REJECTED'
-            installation.save()
-            messages.success(request, "Job rejected successfully!")
+            if InstallationTransitionService.transition(installation, 'REJECTED', actor=request.user):
+                messages.success(request, "Job rejected successfully!")
+            else:
+                messages.error(request, "This job was already answered or its offer has expired.")
 
         return redirect(request.META.get('HTTP_REFERER', 'installation_list'))
 
@@ -10,6 +10,11 @@ from django.http import HttpResponseForbidden
 from functools import wraps
 from ..models import InstallerProfile, Installation
 from ..forms import InstallerProfileForm
+from ..db_router import reporting_reads
+from ..services import InstallationService
+from ..upload_queue import get_upload_settings, stage_certificate
+from ..previews import previews_for
+from ..template_backends import template_engine
 
 # -----------------------------------------------
 # 🛡️ Role-Based Access Control Decorator
@@ -53,24 +58,25 @@ def installer_dashboard_view(request):
         return redirect('logout')
 
     # Filter installations for this installer only
-    installations = Installation.objects.filter(installer=profile).order_by('-installation_created_date')
-
-    # Your KPI stats code here (optional)
-    total_tasks = installations.count()
-    in_progress = installations.filter(status='IN_PROGRESS').count()
-    pending = installations.filter(status='PENDING_ACCEPTANCE').count()
-    completed = installations.filter(status='COMPLETED').count()
-    completion_rate = int((completed / total_tasks) * 100) if total_tasks > 0 else 0
-
-    context = {
-        'profile': profile,
-        'installations': installations,
-        'total_tasks': total_tasks,
-        'in_progress': in_progress,
-        'pending': pending,
-        'completion_rate': completion_rate,
-    }
-    return render(request, 'accounts/installer/installer_dashboard.html', context)
+    installations = Installation.objects.filter(installer=profile).select_related(
+        'customer', 'charger_model', 'installer'
+    ).order_by('-installation_created_date')
+
+    # The job list and KPIs are read from the reporting database; the
+    # profile above is not, so a newly approved installer is never turned away
+    with reporting_reads():
+        stats = InstallationService.calculate_installer_stats(installations)
+
+        context = {
+            'profile': profile,
+            'installations': installations,
+            'total_tasks': stats['total_tasks'],
+            'in_progress': stats['in_progress'],
+            'pending': stats['pending'],
+            'completion_rate': stats['completion_rate'],
+        }
+        template_name = 'accounts/installer/installer_dashboard.html'
+        return render(request, template_name, context, using=template_engine(template_name))
 
 # -----------------------------------------------
 # 📋 Installer Profile Detail View (Class-Based)
@@ -89,6 +95,18 @@ class ProfileDetailView(LoginRequiredMixin, DetailView):
         # It retrieves the InstallerProfile instance associated with the logged-in user.
         return self.request.user.installerprofile
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # Certificates still on their way to storage, by field name
+        context['pending_uploads'] = {
+            upload.field_name: upload for upload in self.object.certificate_uploads.all()
+        }
+        # Thumbnails of the stored certificates, by file name
+        context['previews'] = previews_for(
+            getattr(self.object, field_name).name for field_name in InstallerProfile.CERTIFICATE_FIELDS
+        )
+        return context
+
 # -----------------------------------------------
 # 📝 Installer Profile Update View (Class-Based)
 # -----------------------------------------------
@@ -105,4 +123,33 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
 
     def get_object(self):
         # Ensures that an installer can only edit their own profile.
-        return self.request.user.installerprofile
\ No newline at end of file
+        return self.request.user.installerprofile
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['pending_uploads'] = {
+            upload.field_name: upload for upload in self.object.certificate_uploads.all()
+        }
+        return context
+
+    def form_valid(self, form):
+        if not get_upload_settings()['ENABLED']:
+            return super().form_valid(form)
+
+        # New certificates are staged and uploaded in the background instead
+        # of during this request; the profile keeps its current files until
+        # the upload lands.
+        staged = {}
+        for field_name in InstallerProfile.CERTIFICATE_FIELDS:
+            uploaded_file = form.files.get(field_name)
+            if uploaded_file and field_name in form.changed_data:
+                staged[field_name] = uploaded_file
+                current = form.initial.get(field_name)
+                setattr(form.instance, field_name, current.name if current else None)
+
+        response = super().form_valid(form)
+        for field_name, uploaded_file in staged.items():
+            stage_certificate(self.object, field_name, uploaded_file)
+        if staged:
+            messages.info(self.request, "📤 Your certificates are uploading and will appear on your profile shortly.")
+        return response
\ No newline at end of file
@@ -0,0 +1,84 @@
+# views/media_views.py
+import os
+
+from django.contrib.auth.decorators import login_required
+from django.db.models import Q
+from django.http import Http404
+from django.utils.text import slugify
+
+from ..blob_storage import blob_storage
+from ..media_cache import media_cache
+from ..models import DocumentPreview, InstallerProfile, Task
+from ..models.installer_models import upload_to_cert
+
+
+# -----------------------------------------------
+# 📎 Media Proxy (Certificates & Task Documents)
+# -----------------------------------------------
+def _resolve_media(user, name):
+    """
+    Find the file field holding `name` that the user may read.
+
+    Installers can read their own certificates; admins can read every
+    certificate and task document.
+
+    Returns:
+        str: Filename to offer the browser
+
+    Raises:
+        Http404: No readable file has that name
+    """
+    is_admin = user.role == '1'
+
+    certificate_match = Q()
+    for field_name in InstallerProfile.CERTIFICATE_FIELDS:
+        certificate_match |= Q(**{field_name: name})
+    profiles = InstallerProfile.objects.filter(certificate_match)
+    if not is_admin:
+        profiles = profiles.filter(user=user)
+    profile = profiles.first()
+    if profile is not None:
+        # Blob names are content hashes; offer the readable certificate name
+        return os.path.basename(upload_to_cert(profile, name))
+
+    if is_admin:
+        task = Task.objects.filter(document=name).only('title', 'document').first()
+        if task is not None:
+            extension = os.path.splitext(name)[1].lower()
+            return f"{slugify(task.title) or 'document'}{extension}"
+
+    raise Http404("File not found")
+
+
+@login_required
+def media_proxy_view(request, name):
+    """
+    Serve a certificate or task document from the local media cache.
+
+    The file is fetched from storage on the first request and handed to the
+    front-end server (X-Accel-Redirect / X-Sendfile) afterwards; see
+    accounts/media_cache.py. `?download=1` serves it as an attachment.
+    """
+    filename = _resolve_media(request.user, name)
+    try:
+        relative, path = media_cache.fetch(blob_storage, name)
+    except FileNotFoundError:
+        raise Http404("File not found")
+    return media_cache.response(relative, path, filename, as_attachment='download' in request.GET)
+
+
+@login_required
+def media_preview_view(request, name):
+    """
+    Serve the thumbnail of a certificate or task document, with the same
+    access rules as the file itself.
+    """
+    filename = _resolve_media(request.user, name)
+    preview = DocumentPreview.objects.filter(name=name, status='ready').first()
+    if preview is None or not preview.thumbnail:
+        raise Http404("Preview not ready")
+    try:
+        relative, path = media_cache.fetch(preview.thumbnail.storage, preview.thumbnail.name)
+    except FileNotFoundError:
+        raise Http404("Preview not found")
+    return media_cache.response(relative, path, f'{os.path.splitext(filename)[0]}.jpg')
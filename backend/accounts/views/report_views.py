@@ -0,0 +1,91 @@
+# views/report_views.py
+import datetime
+
+from django.http import JsonResponse
+from django.utils import timezone
+
+from ..services import InstallationEventService, InstallationStatsService
+from accounts.views.admin_views import role_required
+
+
+# -----------------------------------------------
+# 📈 Reporting Chart Data (Admin Only)
+# -----------------------------------------------
+DEFAULT_DAYS = 30
+
+
+def _parse_date(request, name):
+    value = request.GET.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a date in YYYY-MM-DD format.")
+
+
+@role_required('1')
+def installation_daily_stats_view(request):
+    """
+    Installations created per day for charts, from the InstallationDailyStats
+    rollup: one series per status, region, house type or charger model.
+
+    Query parameters: start and end (YYYY-MM-DD, default the last 30 days),
+    group_by (status, region, house_type or charger_model; default status)
+    and optional status, region, house_type and charger_model filters.
+    """
+    try:
+        end = _parse_date(request, 'end') or timezone.localdate()
+        start = _parse_date(request, 'start') or end - datetime.timedelta(days=DEFAULT_DAYS - 1)
+    except ValueError as error:
+        return JsonResponse({'error': str(error)}, status=400)
+    if start > end:
+        return JsonResponse({'error': "start must not be after end."}, status=400)
+    if (end - start).days >= InstallationStatsService.MAX_DAYS:
+        return JsonResponse({'error': f"At most {InstallationStatsService.MAX_DAYS} days per request."}, status=400)
+
+    group_by = request.GET.get('group_by', 'status')
+    if group_by not in InstallationStatsService.GROUP_BY_CHOICES:
+        choices = ', '.join(InstallationStatsService.GROUP_BY_CHOICES)
+        return JsonResponse({'error': f"group_by must be one of: {choices}."}, status=400)
+
+    filters = {}
+    for name in InstallationStatsService.GROUP_BY_CHOICES:
+        value = request.GET.get(name)
+        if value is None:
+            continue
+        if name == 'charger_model':
+            if not value.isdigit():
+                return JsonResponse({'error': "charger_model must be a charger model id."}, status=400)
+            filters['charger_model_id'] = int(value)
+        else:
+            filters[name] = value
+
+    data = InstallationStatsService.get_daily_series(start, end, group_by, filters)
+    return JsonResponse({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'group_by': group_by,
+        'filters': {name.removesuffix('_id'): value for name, value in filters.items()},
+        **data,
+    })
+
+
+# -----------------------------------------------
+# 🧭 Installer Scorecards (Admin Only)
+# -----------------------------------------------
+@role_required('1')
+def installer_scorecards_view(request):
+    """
+    Installer scorecards kept current from the installation status events:
+    offers, outcomes, acceptance, rejection and completion rates, and
+    median seconds to accept and to complete.
+
+    Query parameters: optional installer (user id) for one installer.
+    """
+    installer_id = request.GET.get('installer')
+    if installer_id is not None:
+        if not installer_id.isdigit():
+            return JsonResponse({'error': "installer must be an installer user id."}, status=400)
+        installer_id = int(installer_id)
+    return JsonResponse({'scorecards': InstallationEventService.get_scorecards(installer_id)})
@@ -0,0 +1,94 @@
+# views/upload_views.py
+import json
+
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_http_methods, require_POST
+
+from ..chunked_uploads import (
+    ChunkedUploadError, finalize, get_chunked_upload_settings, parse_content_range, start_session, write_chunk,
+)
+from ..models import Task, UploadSession
+
+
+# -----------------------------------------------
+# 📦 Resumable Chunked Uploads (see accounts/chunked_uploads.py)
+# -----------------------------------------------
+def _session_data(session):
+    return {
+        'id': str(session.id),
+        'target': session.target,
+        'filename': session.original_name,
+        'size': session.size,
+        'offset': session.offset,
+        'complete': session.is_complete,
+        'chunk_size': get_chunked_upload_settings()['CHUNK_SIZE'],
+    }
+
+
+def _error_response(error):
+    data = {'status': 'error', 'message': str(error)}
+    if error.offset is not None:
+        data['offset'] = error.offset
+    return JsonResponse(data, status=error.status)
+
+
+def _request_data(request):
+    if request.content_type == 'application/json':
+        try:
+            return json.loads(request.body or b'{}')
+        except ValueError:
+            raise ChunkedUploadError("Invalid JSON body.")
+    return request.POST
+
+
+@login_required
+@require_POST
+def upload_session_create_view(request):
+    """Open an upload session: target, filename and size in bytes."""
+    try:
+        data = _request_data(request)
+        try:
+            size = int(data.get('size'))
+        except (TypeError, ValueError):
+            raise ChunkedUploadError("size must be the file size in bytes.")
+        session = start_session(request.user, data.get('target'), data.get('filename'), size)
+    except ChunkedUploadError as error:
+        return _error_response(error)
+    return JsonResponse(_session_data(session), status=201)
+
+
+@login_required
+@require_http_methods(['GET', 'HEAD', 'PUT'])
+def upload_session_view(request, session_id):
+    """GET: where to resume. PUT: one chunk of the file."""
+    session = get_object_or_404(UploadSession, pk=session_id, user=request.user)
+    if request.method != 'PUT':
+        return JsonResponse(_session_data(session))
+
+    try:
+        start, end, total = parse_content_range(request.headers.get('Content-Range'))
+        # Read from the request stream, never buffered whole in request.body
+        session = write_chunk(session.pk, start, end, total, request)
+    except ChunkedUploadError as error:
+        return _error_response(error)
+    return JsonResponse(_session_data(session))
+
+
+@login_required
+@require_POST
+def upload_session_finalize_view(request, session_id):
+    """Attach a fully received file to its certificate field or task."""
+    get_object_or_404(UploadSession, pk=session_id, user=request.user)
+    try:
+        task_id = _request_data(request).get('task_id')
+        result = finalize(session_id, request.user, task_id=task_id)
+    except ChunkedUploadError as error:
+        return _error_response(error)
+    except (Task.DoesNotExist, ValueError):
+        raise Http404("Task not found")
+
+    if isinstance(result, Task):
+        return JsonResponse({'status': 'success', 'target': 'task_document', 'task_id': result.pk, 'name': result.document.name})
+    return JsonResponse({'status': 'success', 'target': result.field_name, 'pending': True})
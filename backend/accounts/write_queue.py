@@ -0,0 +1,223 @@
+# accounts/write_queue.py
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+# Defaults for settings.WRITE_QUEUE
+DEFAULT_WRITE_QUEUE = {
+    'ENABLED': True,
+    'MAX_BATCH_ROWS': 500,       # Flush once this many rows are waiting...
+    'MAX_DELAY_MS': 5,           # ...or this long after the first one arrived
+    'MODELS': ['accounts.Notification'],  # Append-only models that may be queued
+}
+
+_STOP = object()
+
+
+class _Item:
+    __slots__ = ('objs', 'future', 'using')
+
+    def __init__(self, objs, future, using):
+        self.objs = objs
+        self.future = future
+        self.using = using
+
+
+class BatchWriter:
+    """
+    Coalesces inserts into append-only tables. Callers enqueue unsaved model
+    instances; a single writer thread bulk-inserts everything that arrives
+    within MAX_DELAY_MS (or MAX_BATCH_ROWS rows) in one transaction, so a
+    burst takes the SQLite write lock once instead of once per row.
+
+    enqueue() returns a Future that resolves to the saved instances once they
+    are committed; wait on it only when the caller needs the rows durable.
+    Rows are written with bulk_create, so save() and post_save do not run.
+
+    The queue lives in this process's memory and is fed only from on_commit,
+    so rows the writer has not yet inserted are lost if the process dies
+    (atexit drains it on a clean exit). Only queue rows that can be lost.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self.batches_written = 0
+        self.rows_written = 0
+
+    @staticmethod
+    def get_settings():
+        return {**DEFAULT_WRITE_QUEUE, **getattr(settings, 'WRITE_QUEUE', {})}
+
+    # -----------------------------------------------
+    # Producer side
+    # -----------------------------------------------
+    def enqueue(self, *objs, using=DEFAULT_DB_ALIAS):
+        """
+        Queue unsaved instances for insertion.
+
+        Inside a transaction the rows are queued when it commits (and dropped
+        if it rolls back), so they never wait on a lock the caller holds.
+
+        Args:
+            *objs: Unsaved instances of models listed in WRITE_QUEUE['MODELS']
+            using (str): Database alias
+
+        Returns:
+            Future: Resolves to the list of saved instances
+        """
+        config = self.get_settings()
+        for obj in objs:
+            if obj._meta.label not in config['MODELS']:
+                raise ValueError(f"{obj._meta.label} is not an append-only model listed in WRITE_QUEUE['MODELS'].")
+
+        future = Future()
+        objs = list(objs)
+        if not config['ENABLED']:
+            # Synchronous fallback: write inline, in the caller's transaction
+            try:
+                future.set_result(self._bulk_create(objs, using))
+            except Exception as exc:
+                future.set_exception(exc)
+                raise
+            return future
+
+        item = _Item(objs, future, using)
+        transaction.on_commit(lambda: self._put(item), using=using)
+        return future
+
+    def flush(self, timeout=None):
+        """
+        Block until everything queued so far has been written.
+        """
+        if self._thread is None:
+            return
+        future = Future()
+        self._put(_Item([], future, DEFAULT_DB_ALIAS))
+        future.result(timeout)
+
+    def shutdown(self, timeout=5):
+        """
+        Write what is still queued and stop the writer thread.
+        """
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+            self._thread = None
+        thread.join(timeout)
+
+    def _put(self, item):
+        self._ensure_thread()
+        self._queue.put(item)
+
+    def _ensure_thread(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='batch-writer', daemon=True)
+                self._thread.start()
+
+    def _after_fork(self):
+        # A forked worker gets neither the parent's thread nor its queued rows
+        self._lock = threading.Lock()
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+
+    # -----------------------------------------------
+    # Writer thread
+    # -----------------------------------------------
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            config = self.get_settings()
+            batch, rows = [item], len(item.objs)
+            deadline = time.monotonic() + config['MAX_DELAY_MS'] / 1000
+            while rows < config['MAX_BATCH_ROWS']:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                rows += len(item.objs)
+
+            try:
+                self._write(batch)
+            except Exception:  # Never let the writer thread die
+                logger.exception("Batch writer failed to write %s rows", rows)
+
+        for alias in connections:
+            connections[alias].close()
+
+    def _write(self, batch):
+        by_alias = {}
+        for item in batch:
+            by_alias.setdefault(item.using, []).append(item)
+
+        for using, items in by_alias.items():
+            connections[using].close_if_unusable_or_obsolete()
+            objs = [obj for item in items for obj in item.objs]
+            try:
+                with transaction.atomic(using=using):
+                    self._bulk_create(objs, using)
+            except Exception:
+                # One bad row must not lose everyone else's: retry per caller
+                for item in items:
+                    for obj in item.objs:
+                        # Keys assigned by the rolled-back insert are void
+                        obj.pk = None
+                        obj._state.adding = True
+                    try:
+                        with transaction.atomic(using=using):
+                            self._bulk_create(item.objs, using)
+                    except Exception as exc:
+                        logger.exception("Batch writer dropped %s queued rows", len(item.objs))
+                        item.future.set_exception(exc)
+                    else:
+                        item.future.set_result(item.objs)
+                continue
+
+            self.batches_written += 1
+            self.rows_written += len(objs)
+            for item in items:
+                item.future.set_result(item.objs)
+
+    @staticmethod
+    def _bulk_create(objs, using):
+        """
+        Insert instances grouped by model, keeping their order.
+        """
+        by_model = {}
+        for obj in objs:
+            by_model.setdefault(type(obj), []).append(obj)
+        for model, model_objs in by_model.items():
+            model._default_manager.using(using).bulk_create(model_objs)
+        return objs
+
+
+batch_writer = BatchWriter()
+atexit.register(batch_writer.shutdown)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=batch_writer._after_fork)
@@ -9,15 +9,17 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 
 import os
 from django.core.asgi import get_asgi_application
-from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
-import accounts.routing  
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-# Traditional Django ASGI application
+# Traditional Django ASGI application. It sets up Django, so it must be
+# created before anything that imports models (the consumers) is imported.
 django_asgi_app = get_asgi_application()
 
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from channels.auth import AuthMiddlewareStack  # noqa: E402
+import accounts.routing  # noqa: E402
+
 # Add WebSocket support
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
@@ -58,6 +58,8 @@ CHANNEL_LAYERS = {
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'accounts.middleware.RequestInstrumentationMiddleware',
+    'accounts.middleware.ReadYourWritesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -69,11 +71,38 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
 ]
 
+# Per-request query/latency instrumentation (accounts/middleware.py).
+# Server-Timing is sent on every response; SAMPLE_RATE of requests are logged.
+# Set REQUEST_LOG_SAMPLE_RATE=1 to log every request while profiling locally.
+REQUEST_INSTRUMENTATION = {
+    'ENABLED': True,
+    'SAMPLE_RATE': float(os.environ.get('REQUEST_LOG_SAMPLE_RATE', 0.01)),
+    'SLOW_REQUEST_MS': 1000,
+    'SERVER_TIMING': True,
+    'DUPLICATE_THRESHOLD': 3,
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'accounts.instrumentation': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'NAME': 'django',
+        'BACKEND': 'accounts.template_backends.InstrumentedDjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -89,8 +118,40 @@ TEMPLATES = [
             ],
         },
     },
+    {
+        # Jinja2 versions of the hottest list templates (accounts/jinja2/);
+        # TEMPLATE_ENGINES below picks which templates it renders
+        'NAME': 'jinja2',
+        'BACKEND': 'accounts.jinja2_env.InstrumentedJinja2',
+        'DIRS': [],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'environment': 'accounts.jinja2_env.environment',
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'accounts.context_processors.task_metrics',
+                'accounts.context_processors.installer_task_metrics',
+                'accounts.context_processors.current_company',
+                'accounts.context_processors.user_company_info',
+            ],
+        },
+    },
 ]
 
+# Engine (TEMPLATES NAME) rendering each template; unlisted templates use the
+# Django engine, which renders every page by default. A deployment opts a page
+# in to its Jinja2 version (accounts/jinja2/) by adding its template, e.g.
+#     'accounts/admin/admin_installation_list.html': 'jinja2',
+#     'accounts/admin/admin_installer_list.html': 'jinja2',
+#     'accounts/installer/installer_dashboard.html': 'jinja2',
+#     'partials/_installation_row.html': 'jinja2',
+#     'partials/_installer_directory.html': 'jinja2',
+# Compare both with `python manage.py benchmark_templates`.
+TEMPLATE_ENGINES = {}
+
 WSGI_APPLICATION = 'config.wsgi.application'
 
 
@@ -101,7 +162,71 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Transactions take the write lock up front (BEGIN IMMEDIATE), so
+            # they wait on busy_timeout instead of failing with "database is
+            # locked" when upgrading from a read lock.
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+    # Heavy reads (KPIs, statistics, list pages) go here, see accounts/db_router.py.
+    # Either a Postgres replica, or this SQLite copy refreshed from 'default'
+    # with `manage.py refresh_reporting_db`; until the copy exists, reads use 'default'.
+    'reporting': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_reporting.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+DATABASE_ROUTERS = ['accounts.db_router.ReportingRouter']
+
+# Cache for rendered fragments and the version stamps that invalidate them
+# (installer directory, reference data, region index). Only a shared backend
+# lets one worker's invalidation reach the others: set REDIS_CACHE_URL (e.g.
+# redis://127.0.0.1:6379/1) in production. The LocMemCache fallback is per
+# process, so there other workers only catch up as their entries expire.
+if os.environ.get('REDIS_CACHE_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_CACHE_URL'],
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
     }
+
+# Read-your-writes: a user who wrote reads from 'default' for PIN_SECONDS
+REPORTING_DATABASE = {
+    'ALIAS': 'reporting',
+    'PIN_SECONDS': 10,
+}
+
+# Coalesced inserts for append-only tables (accounts/write_queue.py)
+WRITE_QUEUE = {
+    'ENABLED': True,
+    'MAX_BATCH_ROWS': 500,
+    'MAX_DELAY_MS': 5,
+    'MODELS': ['accounts.Notification'],
+}
+
+# PRAGMAs applied to every new SQLite connection (accounts/sqlite_tuning.py)
+SQLITE_TUNING = {
+    'ENABLED': True,
+    'PRAGMAS': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'mmap_size': 134217728,
+        'cache_size': -20000,
+        'temp_store': 'MEMORY',
+    },
+    'MAINTENANCE_INTERVAL': 3600,
+    'CHECKPOINT_MODE': 'PASSIVE',
 }
 
 
@@ -152,21 +277,67 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 STORAGES = {
     "default": {
-        "BACKEND": "storages.backends.s3boto3.S3Boto3Storage",
+        # S3Boto3Storage with pooled clients and cached object metadata
+        "BACKEND": "accounts.s3_storage.CachedS3Storage",
         "OPTIONS": {
             "bucket_name": "evtracker-bucket",
             "custom_domain": "hmvdtnlmdllirvjeyxfb.supabase.co/storage/v1/object/public/evtracker-bucket",
             "endpoint_url": "https://hmvdtnlmdllirvjeyxfb.storage.supabase.co/storage/v1/s3",
             "access_key": "5a3b4ef8e8714dad304c5051ca987c75",
             "secret_key": "01999aa6294d26a37025531277f3428c0199177c9f3a7a1dd3e784b1753c0143",
+            "max_pool_connections": 32,
+            "metadata_cache_size": 10000,
+            "metadata_cache_ttl": 300,
         },
     },
+    # Hashed names plus .gz/.br variants in production (accounts/static_storage.py)
     "staticfiles": {
-        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+        "BACKEND": (
+            "django.contrib.staticfiles.storage.StaticFilesStorage" if DEBUG
+            else "accounts.static_storage.CompressedManifestStaticFilesStorage"
+        ),
     },
 }
 
-ASGI_APPLICATION = "accounts.asgi.application"
+# Certificates are staged locally and pushed to STORAGES['default'] by a
+# background pool (accounts/upload_queue.py); `manage.py process_uploads`
+# resumes whatever is left after a restart.
+UPLOAD_QUEUE = {
+    'ENABLED': True,
+    'STAGING_DIR': os.path.join(MEDIA_ROOT, 'upload-staging'),
+    'WORKERS': 4,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_DELAY': 2,
+}
+
+# Resumable chunked uploads of task documents and certificates (accounts/chunked_uploads.py)
+CHUNKED_UPLOADS = {
+    'CHUNK_SIZE': 2 * 1024 * 1024,
+    'MAX_SIZE': 100 * 1024 * 1024,
+    'EXPIRE_HOURS': 24,
+}
+
+# Background thumbnails of certificates and task documents (accounts/previews.py)
+DOCUMENT_PREVIEWS = {
+    'ENABLED': True,
+    'PROCESSES': 2,
+    'THUMBNAIL_WIDTH': 320,
+    'TEXT_CHARS': 2000,
+    'MAX_SOURCE_BYTES': 50 * 1024 * 1024,
+    'RENDER_TIMEOUT': 60,
+}
+
+# Read-through cache for certificates and task documents (accounts/media_cache.py).
+# In production nginx serves CACHE_DIR at the internal location ACCEL_PREFIX.
+MEDIA_PROXY = {
+    'CACHE_DIR': os.path.join(MEDIA_ROOT, 'proxy-cache'),
+    'MAX_BYTES': 2 * 1024 ** 3,
+    'SENDFILE': None if DEBUG else 'x-accel-redirect',
+    'ACCEL_PREFIX': '/protected-media/',
+    'BROWSER_MAX_AGE': 3600,
+}
+
+ASGI_APPLICATION = "config.asgi.application"
 
 CHANNEL_LAYERS = {
     "default": {